@@ -2,7 +2,7 @@
 Anthropic API Client - A Python client for interacting with Anthropic's Claude models.
 """
 
-from .client import AnthropicClient
+from .client import AnthropicClient, AsyncAnthropicClient
 
 __version__ = "0.1.0"
-__all__ = ["AnthropicClient"] 
\ No newline at end of file
+__all__ = ["AnthropicClient", "AsyncAnthropicClient"] 
\ No newline at end of file
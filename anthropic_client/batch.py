@@ -0,0 +1,174 @@
+"""
+Batch submission through the Message Batches API with a local polling scheduler.
+
+Prompts are packed into one or more provider batch jobs. A JSON manifest on
+disk records every job so that collection can resume after a crash, and
+results are yielded job by job as soon as each one finishes.
+"""
+
+import json
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MANIFEST_DIR = Path.home() / ".anthropic" / "batches"
+
+
+class BatchResult:
+    """The outcome of a single request in a batch."""
+
+    __slots__ = ("custom_id", "text", "error")
+
+    def __init__(self, custom_id: str, text: Optional[str] = None, error: Optional[str] = None) -> None:
+        self.custom_id = custom_id
+        self.text = text
+        self.error = error
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the request produced a response."""
+        return self.error is None
+
+    def __repr__(self) -> str:
+        return f"BatchResult(custom_id={self.custom_id!r}, succeeded={self.succeeded})"
+
+
+class BatchScheduler:
+    """Submits prompt batches and polls them to completion."""
+
+    MAX_REQUESTS_PER_JOB: int = 10000
+    INITIAL_POLL_INTERVAL: float = 1.0
+    MAX_POLL_INTERVAL: float = 60.0
+    POLL_BACKOFF: float = 2.0
+
+    def __init__(
+        self,
+        client: Any,
+        manifest_dir: Optional[Union[str, Path]] = None,
+        max_requests_per_job: int = MAX_REQUESTS_PER_JOB
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            client: An ``anthropic.Anthropic`` client
+            manifest_dir: Directory holding batch manifests
+            max_requests_per_job: Maximum number of requests packed into one job
+        """
+        self.client = client
+        self.manifest_dir = Path(manifest_dir) if manifest_dir else DEFAULT_MANIFEST_DIR
+        self.max_requests_per_job = max_requests_per_job
+
+    def _manifest_path(self, batch_id: str) -> Path:
+        return self.manifest_dir / f"{batch_id}.json"
+
+    def _load_manifest(self, batch_id: str) -> Dict[str, Any]:
+        path = self._manifest_path(batch_id)
+        if not path.exists():
+            raise ValueError(f"No manifest found for batch {batch_id} in {self.manifest_dir}")
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: Dict[str, Any]) -> None:
+        """Write the manifest atomically so a crash never leaves it truncated."""
+        self.manifest_dir.mkdir(parents=True, exist_ok=True)
+        path = self._manifest_path(manifest["batch_id"])
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def submit(self, requests: Sequence[Dict[str, Any]], betas: Optional[Sequence[str]] = None) -> str:
+        """Pack requests into provider jobs and record them in a manifest.
+
+        Args:
+            requests: Message parameter dicts, one per prompt
+            betas: Beta features enabled for every request (sent once per job,
+                since batch request params cannot carry ``betas``)
+
+        Returns:
+            The local batch id to pass to ``collect``
+        """
+        batch_id = f"batch-{uuid.uuid4().hex[:12]}"
+        manifest: Dict[str, Any] = {"batch_id": batch_id, "created": time.time(), "jobs": []}
+        for start in range(0, len(requests), self.max_requests_per_job):
+            chunk = requests[start:start + self.max_requests_per_job]
+            job_requests = [
+                {"custom_id": f"prompt-{start + offset}", "params": params}
+                for offset, params in enumerate(chunk)
+            ]
+            if betas:
+                job = self.client.beta.messages.batches.create(requests=job_requests, betas=list(betas))
+            else:
+                job = self.client.messages.batches.create(requests=job_requests)
+            manifest["jobs"].append({
+                "provider_batch_id": job.id,
+                "custom_ids": [request["custom_id"] for request in job_requests],
+                "status": "submitted",
+            })
+            # Persist after every job so submitted jobs survive a crash mid-submission
+            self._save_manifest(manifest)
+            logger.info(f"Submitted {len(job_requests)} requests as provider batch {job.id}")
+        return batch_id
+
+    def collect(self, batch_id: str, timeout: Optional[float] = None) -> Iterator[BatchResult]:
+        """Yield results as each provider job finishes.
+
+        Jobs already marked as collected in the manifest are skipped, so an
+        interrupted collection can be resumed from another process. A job is
+        marked collected only after all of its results have been yielded, so
+        a job interrupted part-way is delivered again in full.
+
+        Args:
+            batch_id: The local batch id returned by ``submit``
+            timeout: Optional seconds to wait before giving up
+
+        Returns:
+            An iterator of ``BatchResult`` objects in completion order
+
+        Raises:
+            ValueError: If no manifest exists for the batch
+            TimeoutError: If the jobs do not finish within ``timeout``
+        """
+        manifest = self._load_manifest(batch_id)
+        pending = [job for job in manifest["jobs"] if job["status"] != "collected"]
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        interval = self.INITIAL_POLL_INTERVAL
+
+        while pending:
+            still_pending: List[Dict[str, Any]] = []
+            for job in pending:
+                status = self.client.messages.batches.retrieve(job["provider_batch_id"])
+                if status.processing_status != "ended":
+                    still_pending.append(job)
+                    continue
+                for entry in self.client.messages.batches.results(job["provider_batch_id"]):
+                    yield self._to_result(entry)
+                job["status"] = "collected"
+                self._save_manifest(manifest)
+
+            if still_pending and len(still_pending) == len(pending):
+                if deadline is not None and time.monotonic() + interval > deadline:
+                    raise TimeoutError(f"Batch {batch_id} did not finish in time")
+                time.sleep(interval)
+                interval = min(interval * self.POLL_BACKOFF, self.MAX_POLL_INTERVAL)
+            else:
+                interval = self.INITIAL_POLL_INTERVAL
+            pending = still_pending
+
+    @staticmethod
+    def _to_result(entry: Any) -> BatchResult:
+        """Convert a provider result line into a ``BatchResult``."""
+        result = entry.result
+        if result.type == "succeeded":
+            text = "".join(
+                block.text for block in result.message.content if getattr(block, "type", None) == "text"
+            )
+            return BatchResult(entry.custom_id, text=text)
+        error = getattr(result, "error", None)
+        detail = getattr(getattr(error, "error", None), "message", None) or result.type
+        return BatchResult(entry.custom_id, error=detail)
@@ -0,0 +1,277 @@
+"""
+Opt-in response cache keyed on the canonical request fingerprint.
+
+Responses live in an in-memory LRU tier backed by an optional SQLite tier on
+disk. Streamed responses are stored as their chunk sequence so that a cache
+hit can replay the stream chunk by chunk.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Request parameters that determine the response; everything else (stream,
+# betas, transport options) is ignored when fingerprinting.
+FINGERPRINT_KEYS: Tuple[str, ...] = (
+    "model",
+    "messages",
+    "system",
+    "temperature",
+    "max_tokens",
+    "thinking",
+    "response_format",
+)
+
+
+def request_fingerprint(params: Dict[str, Any]) -> str:
+    """Return a canonical hash of the parameters that determine a response.
+
+    Args:
+        params: Message parameters as sent to the provider
+
+    Returns:
+        A hex SHA-256 digest that is stable across key order and processes
+    """
+    relevant = {key: params[key] for key in FINGERPRINT_KEYS if key in params}
+    canonical = json.dumps(relevant, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CachedResponse:
+    """A cached response: either complete text or a recorded chunk sequence."""
+
+    __slots__ = ("chunks", "streamed", "created")
+
+    def __init__(self, chunks: List[str], streamed: bool, created: float) -> None:
+        self.chunks = chunks
+        self.streamed = streamed
+        self.created = created
+
+    @property
+    def text(self) -> str:
+        """The complete response text."""
+        return "".join(self.chunks)
+
+    @property
+    def size(self) -> int:
+        """Approximate size of the stored payload in bytes."""
+        return sum(len(chunk) for chunk in self.chunks)
+
+    def replay(self) -> Iterator[str]:
+        """Yield the recorded chunks, or the whole text as a single chunk."""
+        return iter(self.chunks)
+
+
+class ResponseCache:
+    """Two-tier (memory LRU + SQLite) cache for model responses."""
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        ttl: Optional[float] = None,
+        max_entries: int = 1024,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        max_disk_bytes: int = 1024 * 1024 * 1024
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            path: SQLite file for the disk tier; memory only if omitted
+            ttl: Seconds an entry stays valid; entries never expire if omitted
+            max_entries: Maximum number of entries in the memory tier
+            max_memory_bytes: Maximum payload bytes held in the memory tier
+            max_disk_bytes: Maximum payload bytes held in the disk tier
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self._memory: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, chunks TEXT NOT NULL, streamed INTEGER NOT NULL, "
+                "size INTEGER NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            self._db.commit()
+
+    def _expired(self, entry: CachedResponse, now: float) -> bool:
+        """Return whether an entry has outlived the TTL."""
+        return self.ttl is not None and now - entry.created > self.ttl
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Look up a response, promoting disk hits into memory.
+
+        Args:
+            key: Request fingerprint
+
+        Returns:
+            The cached response, or None on a miss or expired entry
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if self._expired(entry, now):
+                    self._discard(key)
+                else:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    self.memory_hits += 1
+                    return entry
+            entry = self._load(key, now)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, entry)
+            return entry
+
+    def put(self, key: str, chunks: Iterable[str], streamed: bool = False) -> None:
+        """Store a response in both tiers.
+
+        Args:
+            key: Request fingerprint
+            chunks: The response text, as one or more chunks
+            streamed: Whether the chunks are a recorded stream
+        """
+        entry = CachedResponse(list(chunks), streamed, time.time())
+        with self._lock:
+            self._remember(key, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, json.dumps(entry.chunks), int(streamed), entry.size,
+                     entry.created, entry.created),
+                )
+                self._evict_disk()
+                self._db.commit()
+
+    def record_stream(self, key: str, stream: Iterator[str]) -> Iterator[str]:
+        """Pass a live stream through, storing it once it completes.
+
+        Streams that fail or are abandoned part-way are not cached.
+
+        Args:
+            key: Request fingerprint
+            stream: The upstream chunk iterator
+
+        Returns:
+            An iterator yielding the same chunks
+        """
+        chunks: List[str] = []
+        for chunk in stream:
+            chunks.append(chunk)
+            yield chunk
+        self.put(key, chunks, streamed=True)
+
+    async def record_async_stream(self, key: str, stream: AsyncIterator[str]) -> AsyncIterator[str]:
+        """Async counterpart of ``record_stream``."""
+        chunks: List[str] = []
+        async for chunk in stream:
+            chunks.append(chunk)
+            yield chunk
+        self.put(key, chunks, streamed=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and tier sizes."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+            }
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def close(self) -> None:
+        """Close the disk tier."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, key: str, entry: CachedResponse) -> None:
+        """Insert into the memory tier and evict least recently used entries."""
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous.size
+        self._memory[key] = entry
+        self._memory_bytes += entry.size
+        while self._memory and (
+            len(self._memory) > self.max_entries or self._memory_bytes > self.max_memory_bytes
+        ):
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.size
+            self.evictions += 1
+
+    def _discard(self, key: str) -> None:
+        """Drop an entry from both tiers."""
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= entry.size
+        if self._db is not None:
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._db.commit()
+
+    def _load(self, key: str, now: float) -> Optional[CachedResponse]:
+        """Read an entry from the disk tier, dropping it if expired."""
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT chunks, streamed, created FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        entry = CachedResponse(json.loads(row[0]), bool(row[1]), row[2])
+        if self._expired(entry, now):
+            self._discard(key)
+            return None
+        self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        self._db.commit()
+        return entry
+
+    def _evict_disk(self) -> None:
+        """Delete least recently accessed rows until the disk tier fits."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        for key, size in self._db.execute(
+            "SELECT key, size FROM responses ORDER BY accessed"
+        ).fetchall():
+            if total <= self.max_disk_bytes:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
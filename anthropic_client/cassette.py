@@ -0,0 +1,380 @@
+"""
+Record/replay HTTP transports for deterministic, network-free runs.
+
+A ``Cassette`` is a JSONL file of request/response interactions. In record
+mode, requests go to the network through a pooled ``httpx`` transport and
+every response is appended to the cassette with its status, headers and
+body chunks. Each chunk carries its arrival time, so the cadence of a
+server-sent-event stream is kept. In replay mode the responses are served
+from the cassette, either as fast as possible or paced at a multiple of
+the recorded speed. Client-side overhead can then be measured without
+network jitter.
+
+Cassettes are installed process-wide with ``transport.use_cassette``, so
+``AnthropicClient``, ``AsyncAnthropicClient`` and ``MultiProviderClient``
+(both providers) record and replay without changes.
+
+Requests are matched on method, path and a digest of the body, not on the
+host, so a cassette recorded against the API replays against any base
+URL. Request headers, API keys included, are never written.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, TextIO, Tuple, Union
+
+import httpx
+
+# Headers that describe the recorded connection rather than the response
+_DROPPED_HEADERS = frozenset(("connection", "keep-alive", "transfer-encoding", "content-encoding"))
+
+Key = Tuple[str, str, str]
+
+
+class CassetteMissError(RuntimeError):
+    """A replayed request has no recorded response."""
+
+
+def request_key(request: httpx.Request) -> Key:
+    """Return the method, path and body digest a request is matched on."""
+    path = request.url.raw_path.decode("ascii")
+    return request.method, path, hashlib.sha256(request.read()).hexdigest()
+
+
+class Interaction:
+    """One recorded request and its response."""
+
+    __slots__ = ("key", "status", "headers", "headers_at", "chunks")
+
+    def __init__(
+        self,
+        key: Key,
+        status: int,
+        headers: List[Tuple[str, str]],
+        headers_at: float,
+        chunks: Optional[List[Tuple[float, bytes]]] = None
+    ) -> None:
+        """Initialize the interaction.
+
+        Args:
+            key: Method, path and body digest of the request
+            status: Response status code
+            headers: Response headers
+            headers_at: Seconds from sending the request to the response headers
+            chunks: Body chunks with their arrival time in seconds from sending
+        """
+        self.key = key
+        self.status = status
+        self.headers = headers
+        self.headers_at = headers_at
+        self.chunks = chunks if chunks is not None else []
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the interaction as one cassette record.
+
+        Bodies are stored as text when they are UTF-8, as SSE and JSON
+        bodies are, and base64-encoded otherwise.
+        """
+        try:
+            data: List[str] = [chunk.decode("utf-8") for _, chunk in self.chunks]
+            encoding = "utf-8"
+        except UnicodeDecodeError:
+            data = [base64.b64encode(chunk).decode("ascii") for _, chunk in self.chunks]
+            encoding = "base64"
+        return {
+            "method": self.key[0],
+            "path": self.key[1],
+            "body_sha256": self.key[2],
+            "status": self.status,
+            "headers": self.headers,
+            "headers_at": round(self.headers_at, 6),
+            "encoding": encoding,
+            "offsets": [round(offset, 6) for offset, _ in self.chunks],
+            "chunks": data,
+        }
+
+    @classmethod
+    def from_dict(cls, record: Dict[str, Any]) -> "Interaction":
+        """Restore an interaction from a cassette record."""
+        if record.get("encoding") == "base64":
+            chunks = [base64.b64decode(chunk) for chunk in record["chunks"]]
+        else:
+            chunks = [chunk.encode("utf-8") for chunk in record["chunks"]]
+        return cls(
+            (record["method"], record["path"], record["body_sha256"]),
+            record["status"],
+            [tuple(header) for header in record["headers"]],
+            record.get("headers_at", 0.0),
+            list(zip(record["offsets"], chunks)),
+        )
+
+
+class Cassette:
+    """A JSONL file of recorded interactions, opened for recording or replay."""
+
+    def __init__(self, path: Union[str, Path], mode: str = "replay", speed: Optional[float] = None) -> None:
+        """Open a cassette.
+
+        Args:
+            path: Path of the JSONL cassette
+            mode: "record" appends live responses; "replay" serves recorded ones
+            speed: Replay pacing as a multiple of the recorded speed (1.0 is
+                real time); None or 0 replays as fast as possible
+
+        Raises:
+            ValueError: If the mode is unknown or speed is negative
+            FileNotFoundError: If a cassette opened for replay does not exist
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if speed is not None and speed < 0:
+            raise ValueError("speed must not be negative")
+        self.path = Path(path)
+        self.mode = mode
+        self.speed = speed or None
+        self._interactions: Dict[Key, List[Interaction]] = {}
+        self._played: Dict[Key, int] = {}
+        self._file: Optional[TextIO] = None
+        self._lock = threading.Lock()
+        if mode == "replay":
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        interaction = Interaction.from_dict(json.loads(line))
+                        self._interactions.setdefault(interaction.key, []).append(interaction)
+
+    def __len__(self) -> int:
+        return sum(len(interactions) for interactions in self._interactions.values())
+
+    def append(self, interaction: Interaction) -> None:
+        """Append a recorded interaction, flushed so it survives the process exiting."""
+        line = json.dumps(interaction.to_dict(), separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+            self._interactions.setdefault(interaction.key, []).append(interaction)
+
+    def next_interaction(self, key: Key) -> Interaction:
+        """Return the next recorded response for a request.
+
+        Identical requests get their recorded responses in order (a 529 and
+        then the successful retry, say) and start over once all were served.
+
+        Raises:
+            CassetteMissError: If the request was never recorded
+        """
+        with self._lock:
+            interactions = self._interactions.get(key)
+            if not interactions:
+                raise CassetteMissError(f"No recorded response for {key[0]} {key[1]} in {self.path}")
+            index = self._played.get(key, 0)
+            self._played[key] = index + 1
+            return interactions[index % len(interactions)]
+
+    def transport(self, **pool_options: Any) -> httpx.BaseTransport:
+        """Return a sync transport recording to or replaying from this cassette.
+
+        Args:
+            pool_options: ``httpx.HTTPTransport`` arguments for the live
+                connection pool used when recording
+        """
+        if self.mode == "record":
+            return RecordingTransport(self, httpx.HTTPTransport(**pool_options))
+        return ReplayTransport(self)
+
+    def async_transport(self, **pool_options: Any) -> httpx.AsyncBaseTransport:
+        """Return an async transport recording to or replaying from this cassette."""
+        if self.mode == "record":
+            return AsyncRecordingTransport(self, httpx.AsyncHTTPTransport(**pool_options))
+        return AsyncReplayTransport(self)
+
+    def delay(self, offset: float, started: float) -> float:
+        """Return the seconds to wait so ``offset`` is reached at the replay speed."""
+        if not self.speed:
+            return 0.0
+        return max(0.0, started + offset / self.speed - time.perf_counter())
+
+    def close(self) -> None:
+        """Close the cassette file, if open."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _recorded_headers(response: httpx.Response) -> List[Tuple[str, str]]:
+    return [(name, value) for name, value in response.headers.items() if name.lower() not in _DROPPED_HEADERS]
+
+
+def _prepare_recording(request: httpx.Request) -> Key:
+    # Bodies are recorded as sent, not compressed, so they replay as text
+    request.headers["accept-encoding"] = "identity"
+    return request_key(request)
+
+
+class _RecordingStream(httpx.SyncByteStream):
+    def __init__(self, stream: httpx.SyncByteStream, interaction: Interaction, started: float, cassette: Cassette) -> None:
+        self.stream = stream
+        self.interaction = interaction
+        self.started = started
+        self.cassette = cassette
+        self.recorded = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self.stream:
+            self.interaction.chunks.append((time.perf_counter() - self.started, chunk))
+            yield chunk
+
+    def close(self) -> None:
+        self.stream.close()
+        if not self.recorded:
+            self.recorded = True
+            self.cassette.append(self.interaction)
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """Sends requests over a live transport and records every response."""
+
+    def __init__(self, cassette: Cassette, inner: httpx.BaseTransport) -> None:
+        self.cassette = cassette
+        self.inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = _prepare_recording(request)
+        started = time.perf_counter()
+        response = self.inner.handle_request(request)
+        interaction = Interaction(key, response.status_code, _recorded_headers(response), time.perf_counter() - started)
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_RecordingStream(response.stream, interaction, started, self.cassette),
+            extensions=response.extensions,
+        )
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class _ReplayStream(httpx.SyncByteStream):
+    def __init__(self, interaction: Interaction, started: float, cassette: Cassette) -> None:
+        self.interaction = interaction
+        self.started = started
+        self.cassette = cassette
+
+    def __iter__(self) -> Iterator[bytes]:
+        for offset, chunk in self.interaction.chunks:
+            delay = self.cassette.delay(offset, self.started)
+            if delay:
+                time.sleep(delay)
+            yield chunk
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """Serves recorded responses without touching the network."""
+
+    def __init__(self, cassette: Cassette) -> None:
+        self.cassette = cassette
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        interaction = self.cassette.next_interaction(request_key(request))
+        delay = self.cassette.delay(interaction.headers_at, started)
+        if delay:
+            time.sleep(delay)
+        return httpx.Response(
+            interaction.status,
+            headers=interaction.headers,
+            stream=_ReplayStream(interaction, started, self.cassette),
+            request=request,
+        )
+
+
+class _AsyncRecordingStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, interaction: Interaction, started: float, cassette: Cassette) -> None:
+        self.stream = stream
+        self.interaction = interaction
+        self.started = started
+        self.cassette = cassette
+        self.recorded = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            self.interaction.chunks.append((time.perf_counter() - self.started, chunk))
+            yield chunk
+
+    async def aclose(self) -> None:
+        await self.stream.aclose()
+        if not self.recorded:
+            self.recorded = True
+            self.cassette.append(self.interaction)
+
+
+class AsyncRecordingTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of ``RecordingTransport``."""
+
+    def __init__(self, cassette: Cassette, inner: httpx.AsyncBaseTransport) -> None:
+        self.cassette = cassette
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = _prepare_recording(request)
+        started = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        interaction = Interaction(key, response.status_code, _recorded_headers(response), time.perf_counter() - started)
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_AsyncRecordingStream(response.stream, interaction, started, self.cassette),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+class _AsyncReplayStream(httpx.AsyncByteStream):
+    def __init__(self, interaction: Interaction, started: float, cassette: Cassette) -> None:
+        self.interaction = interaction
+        self.started = started
+        self.cassette = cassette
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for offset, chunk in self.interaction.chunks:
+            delay = self.cassette.delay(offset, self.started)
+            if delay:
+                await asyncio.sleep(delay)
+            yield chunk
+
+
+class AsyncReplayTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of ``ReplayTransport``."""
+
+    def __init__(self, cassette: Cassette) -> None:
+        self.cassette = cassette
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        interaction = self.cassette.next_interaction(request_key(request))
+        delay = self.cassette.delay(interaction.headers_at, started)
+        if delay:
+            await asyncio.sleep(delay)
+        return httpx.Response(
+            interaction.status,
+            headers=interaction.headers,
+            stream=_AsyncReplayStream(interaction, started, self.cassette),
+            request=request,
+        )
@@ -3,25 +3,42 @@ Command line interface for the Anthropic Claude API client.
 """
 
 import argparse
+import io
 import sys
-import time
 import json
 import os
 from pathlib import Path
-from typing import Optional, Iterator, NoReturn, TextIO
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Iterator, NoReturn, TextIO
 import logging
 from anthropic_client.client import AnthropicClient, ModelName, OutputFormat
-from anthropic_client.multi_provider_client import MultiProviderClient
+from anthropic_client.conversation import ConversationLog, ConversationWindow
+from anthropic_client.render import StreamRenderer
+from anthropic_client.router import AUTO_MODEL
+
+if TYPE_CHECKING:
+    from anthropic_client.multi_provider_client import MultiProviderClient
+    from anthropic_client.router import ModelRouter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Constants
-STREAM_DELAY: float = 0.01  # Delay between chunks when streaming
 DEFAULT_TEMPERATURE: float = 1.0
 DEFAULT_MODEL: ModelName = ModelName.SONNET
 DEFAULT_FORMAT: OutputFormat = OutputFormat.TEXT
+HAIKU_SYSTEM_PROMPT: str = "You are Claude, an AI assistant that specializes in writing short, elegant haikus. Respond only with a haiku in 3-5-3 syllable format."
+
+# Options holding file paths, resolved against the caller's working
+# directory when an invocation is run by the daemon
+PATH_OPTIONS = (
+    "system_file", "batch", "out", "model_config", "save_conversation", "load_conversation",
+    "traffic_log", "replay_traffic", "telemetry_log", "record", "replay"
+)
+
+# Clients kept warm across invocations run by the daemon, keyed by the
+# options that shape them
+_clients: Dict[Any, "MultiProviderClient"] = {}
 
 def create_parser() -> argparse.ArgumentParser:
     """Create and configure the argument parser for the CLI.
@@ -68,6 +85,12 @@ def create_parser() -> argparse.ArgumentParser:
         type=str,
         help="System prompt to set context/permissions"
     )
+    parser.add_argument(
+        "--system-file",
+        type=str,
+        metavar="FILENAME",
+        help="File with a large, reused system context; sent ahead of --system as a cached prompt prefix"
+    )
     parser.add_argument(
         "--haiku",
         action="store_true",
@@ -82,13 +105,113 @@ def create_parser() -> argparse.ArgumentParser:
         "--save-conversation",
         type=str,
         metavar="FILENAME",
-        help="Save the conversation to a JSON file"
+        help="Append each exchange of the conversation to a JSONL file"
     )
     parser.add_argument(
         "--load-conversation",
         type=str,
         metavar="FILENAME",
-        help="Load a conversation from a JSON file"
+        help="Continue a conversation saved with --save-conversation"
+    )
+    parser.add_argument(
+        "--hedge-model",
+        type=str,
+        metavar="MODEL",
+        help="Fire a second request to MODEL if the first token is late, and keep whichever answers first"
+    )
+    parser.add_argument(
+        "--hedge-delay",
+        type=float,
+        default=2.0,
+        help="Seconds to wait for the first token before hedging"
+    )
+    parser.add_argument(
+        "--fallback-model",
+        action="append",
+        default=[],
+        metavar="MODEL",
+        help="Model to fail over to when the requested model's circuit breaker is open (repeatable)"
+    )
+    parser.add_argument(
+        "--breaker-status",
+        action="store_true",
+        help="Show the circuit breaker state of every provider route and exit"
+    )
+    parser.add_argument(
+        "--auto-model",
+        action="store_true",
+        help="Let the router pick the cheapest model that meets the prompt's needs and --max-latency"
+    )
+    parser.add_argument(
+        "--max-latency",
+        type=float,
+        metavar="SECONDS",
+        help="Latency SLO for --auto-model"
+    )
+    parser.add_argument(
+        "--traffic-log",
+        type=str,
+        metavar="FILENAME",
+        help="Append each --auto-model request (prompt, model, latency) to a JSONL file"
+    )
+    parser.add_argument(
+        "--replay-traffic",
+        type=str,
+        metavar="FILENAME",
+        help="Evaluate --auto-model routing against a --traffic-log file and exit"
+    )
+    parser.add_argument(
+        "--telemetry-log",
+        type=str,
+        metavar="FILENAME",
+        help="Append the latency, time to first token, tokens and retries of each request to a JSONL file"
+    )
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        "--record",
+        type=str,
+        metavar="FILENAME",
+        help="Record every API response, with its streaming chunk timings, to a cassette file"
+    )
+    cassette_group.add_argument(
+        "--replay",
+        type=str,
+        metavar="FILENAME",
+        help="Answer from a --record cassette file instead of the API"
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        metavar="FACTOR",
+        help="Pace --replay at FACTOR times the recorded speed (default: as fast as possible)"
+    )
+    parser.add_argument(
+        "--batch",
+        type=str,
+        metavar="FILENAME",
+        help="Run every request in a JSONL file (one {\"id\", \"prompt\"} object per line) instead of a single prompt"
+    )
+    parser.add_argument(
+        "--out",
+        type=str,
+        metavar="FILENAME",
+        help="JSONL file --batch results are appended to (defaults to <batch file>.out.jsonl)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Number of --batch requests in flight at once"
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Serve invocations from a warm process on a Unix socket ($CLAUDETHINK_SOCKET or ~/.anthropic/claudethink.sock)"
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Run in this process even if a daemon is listening"
     )
     parser.add_argument(
         "--model-config",
@@ -141,17 +264,18 @@ def handle_streaming_response(
     """
     print("Claude: ", end="", flush=True)
     try:
-        for chunk in client.get_response(
-            prompt,
-            stream=True,
-            temperature=temperature,
-            model=model,
-            format=format,
-            system=system
-        ):
-            print(chunk, end="", flush=True)
-            time.sleep(STREAM_DELAY)
+        with StreamRenderer() as renderer:
+            for chunk in client.get_response(
+                prompt,
+                stream=True,
+                temperature=temperature,
+                model=model,
+                format=format,
+                system=system
+            ):
+                renderer.write(chunk)
         print()  # Final newline
+        logger.info(f"Streaming stats: {renderer.summary()}")
     except KeyboardInterrupt:
         print("\nStreaming cancelled by user", file=sys.stderr)
         raise
@@ -184,19 +308,328 @@ def handle_complete_response(
     )
     print("Claude:", response)
 
-def main() -> NoReturn:
-    """Main entry point for the CLI application."""
+def send_prompt(client: "MultiProviderClient", prompt: str, request_params: Dict[str, Any]) -> str:
+    """Send one prompt and print the response, streamed if requested.
+    
+    A stream that fails is retried once without streaming.
+    
+    Args:
+        client: The client to send the prompt with
+        prompt: The user's prompt
+        request_params: get_response parameters, including 'stream'
+        
+    Returns:
+        The full response text
+    """
+    if not request_params.get("stream"):
+        response = client.get_response(prompt, **request_params)
+        print("Response:", response)
+        return response
+    
+    print("Response: ", end="", flush=True)
+    chunks: List[str] = []
+    try:
+        with StreamRenderer() as renderer:
+            for chunk in client.get_response(prompt, **request_params):
+                chunks.append(chunk)
+                renderer.write(chunk)
+        print()  # Final newline
+        logger.info(f"Streaming stats: {renderer.summary()}")
+        return "".join(chunks)
+    except KeyboardInterrupt:
+        print("\nStreaming cancelled by user", file=sys.stderr)
+        raise
+    except Exception as e:
+        print(f"\nStreaming error: {e}", file=sys.stderr)
+        logger.warning(f"Streaming failed, falling back to non-streaming: {e}")
+        
+        # Fall back to non-streaming mode
+        print("\nFalling back to non-streaming mode...", file=sys.stderr)
+        response = client.get_response(prompt, **dict(request_params, stream=False))
+        print("Response:", response)
+        return response
+
+def handle_interactive(
+    client: "MultiProviderClient",
+    request_params: Dict[str, Any],
+    window: ConversationWindow,
+    log: Optional[ConversationLog],
+    prompt: Optional[str] = None
+) -> None:
+    """Run a multi-turn conversation until ':quit' or end of input.
+    
+    Every request carries the earlier turns that fit the window, and each
+    finished exchange is appended to the log if there is one.
+    
+    Args:
+        client: The client to send prompts with
+        request_params: get_response parameters shared by every turn
+        window: Earlier turns of the conversation
+        log: Optional log each exchange is appended to
+        prompt: Optional first prompt, sent before asking for input
+    """
+    print("Interactive mode. Type ':quit' or press Ctrl-D to exit.", file=sys.stderr)
+    while True:
+        if prompt is None:
+            try:
+                prompt = input("You: ").strip()
+            except EOFError:
+                print(file=sys.stderr)
+                return
+            if prompt in (":quit", ":exit"):
+                return
+            if not prompt:
+                prompt = None
+                continue
+        params = dict(request_params, history=window.messages) if len(window) else request_params
+        try:
+            response = send_prompt(client, prompt, params)
+        except KeyboardInterrupt:
+            # Cancelling a turn drops it; the session goes on
+            prompt = None
+            continue
+        except Exception as e:
+            logger.error(f"Error getting response: {e}")
+            print(f"Error: {e}", file=sys.stderr)
+            prompt = None
+            continue
+        window.add_exchange(prompt, response)
+        if log:
+            log.append(prompt, response)
+        prompt = None
+
+def install_cassette(args: argparse.Namespace) -> None:
+    """Route every API request through the --record or --replay cassette.
+    
+    Args:
+        args: Parsed command line arguments
+    """
+    from anthropic_client.cassette import Cassette
+    from anthropic_client.transport import use_cassette
+    if args.record:
+        use_cassette(Cassette(args.record, mode="record"))
+        return
+    use_cassette(Cassette(args.replay, mode="replay", speed=args.replay_speed))
+    # Replayed requests never reach the API, so no real key is needed
+    os.environ.setdefault("ANTHROPIC_API_KEY", "replay")
+    os.environ.setdefault("OPENAI_API_KEY", "replay")
+
+def create_client(args: argparse.Namespace) -> "MultiProviderClient":
+    """Create the multi-provider client configured by the CLI options.
+    
+    Imported here so --help and argument errors never load the batch,
+    rate-limit or provider SDK modules. Clients are cached per option set,
+    so a daemon reuses them across invocations.
+    
+    Args:
+        args: Parsed command line arguments
+        
+    Returns:
+        The configured MultiProviderClient
+    """
+    key = (
+        args.hedge_model, args.hedge_delay, tuple(args.fallback_model),
+        args.auto_model, args.max_latency, args.traffic_log, args.telemetry_log
+    )
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    from anthropic_client.health import DEFAULT_STATE_PATH, BreakerRegistry
+    from anthropic_client.multi_provider_client import MultiProviderClient
+    hedge_policy = None
+    if args.hedge_model:
+        from anthropic_client.hedge import HedgePolicy
+        hedge_policy = HedgePolicy(args.hedge_model, initial_delay=args.hedge_delay)
+    router = None
+    if args.auto_model:
+        router = create_router(args)
+    telemetry = None
+    if args.telemetry_log:
+        from anthropic_client.telemetry import JsonLinesExporter, Telemetry
+        telemetry = Telemetry([JsonLinesExporter(args.telemetry_log)])
+    # Breakers only guard runs that have somewhere to fail over to; their
+    # state is kept on disk so it survives between invocations and can be
+    # shown with --breaker-status
+    breakers = BreakerRegistry(DEFAULT_STATE_PATH) if args.fallback_model else None
+    client = _clients.setdefault(key, MultiProviderClient(
+        hedge_policy=hedge_policy,
+        fallback_models=args.fallback_model,
+        breakers=breakers,
+        router=router,
+        telemetry=telemetry
+    ))
+    return client
+
+def create_router(args: argparse.Namespace) -> "ModelRouter":
+    """Create the model router configured by the CLI options.
+    
+    Learned latencies are kept on disk so routing improves across invocations.
+    
+    Args:
+        args: Parsed command line arguments
+        
+    Returns:
+        The configured ModelRouter
+    """
+    from anthropic_client.router import DEFAULT_STATE_PATH, ModelRouter
+    return ModelRouter(max_latency=args.max_latency, state_path=DEFAULT_STATE_PATH, traffic_path=args.traffic_log)
+
+def save_client_state(client: "MultiProviderClient") -> None:
+    """Save the breaker and router state a client learned during a run.
+    
+    A failed save is logged rather than raised, so it never turns a
+    finished run into a failure.
+    """
+    for state in (client.breakers, client.router):
+        if state is None:
+            continue
+        try:
+            state.save()
+        except OSError as e:
+            logger.warning(f"Could not save {type(state).__name__} state: {e}")
+
+def build_request_params(args: argparse.Namespace) -> Dict[str, Any]:
+    """Build the get_response parameters shared by every request of a run.
+    
+    Args:
+        args: Parsed command line arguments
+        
+    Returns:
+        The request parameters (model, temperature, format and system prompt)
+    """
+    request_params: Dict[str, Any] = {
+        "model": AUTO_MODEL if args.auto_model else args.model,
+        "temperature": args.temperature,
+        "format": args.format
+    }
+    
+    # Add system prompt if provided; the file context is the more stable
+    # block, so it goes first and anchors the prompt-cache prefix
+    system_blocks = []
+    if args.system_file:
+        system_blocks.append(Path(args.system_file).read_text(encoding="utf-8"))
+    # Haiku mode replaces --system with its own instruction but keeps the file context
+    if args.haiku:
+        system_blocks.append(HAIKU_SYSTEM_PROMPT)
+    elif args.system:
+        system_blocks.append(args.system)
+    if system_blocks:
+        request_params["system"] = system_blocks
+    return request_params
+
+def handle_batch(args: argparse.Namespace) -> None:
+    """Run every request of a JSONL file and write the results as JSONL.
+    
+    Args:
+        args: Parsed command line arguments
+    """
+    from anthropic_client.jsonl_batch import JsonlBatchRunner
+    client = create_client(args)
+    out_path = args.out or f"{args.batch}.out.jsonl"
+    runner = JsonlBatchRunner(client, concurrency=args.concurrency, defaults=build_request_params(args))
+    try:
+        stats = runner.run(args.batch, out_path)
+    finally:
+        save_client_state(client)
+    print(f"Wrote results to {out_path}: {stats.summary()}", file=sys.stderr)
+
+def expects_prompt(args: argparse.Namespace) -> bool:
+    """Return whether an invocation answers a prompt.
+    
+    Batch, breaker-status, traffic-replay and daemon runs never read one,
+    so stdin is left untouched for them.
+    
+    Args:
+        args: Parsed command line arguments
+    """
+    return not (args.batch or args.breaker_status or args.replay_traffic or args.daemon)
+
+def main(argv: Optional[List[str]] = None) -> NoReturn:
+    """Main entry point for the CLI application.
+    
+    Hands the invocation to a running ``claudethink --daemon`` when there is
+    one, and runs it in-process otherwise.
+    
+    Args:
+        argv: The full argv, program name included (defaults to sys.argv)
+    """
+    argv = list(sys.argv if argv is None else argv)
+    if "--daemon" not in argv and "--no-daemon" not in argv:
+        args, _ = create_parser().parse_known_args(argv[1:])
+        # Only single-prompt invocations are forwarded. Interactive sessions
+        # stay in-process, and cassette runs need this process's transports
+        if expects_prompt(args) and not (args.interactive or args.record or args.replay):
+            # Stdin is only read when it is where the prompt comes from;
+            # prompts typed at a terminal stay in-process
+            stdin = None if args.prompt or sys.stdin.isatty() else sys.stdin.read()
+            if stdin is not None or args.prompt:
+                from anthropic_client.daemon import forward
+                code = forward(argv, stdin)
+                if code is not None:
+                    sys.exit(code)
+                if stdin is not None:
+                    sys.stdin = io.StringIO(stdin)
+    run(argv)
+
+def run(argv: List[str], cwd: Optional[str] = None) -> NoReturn:
+    """Run one CLI invocation in this process.
+    
+    Args:
+        argv: The full argv, program name included
+        cwd: Working directory relative paths are resolved against
+            (the forwarding client's, when run by the daemon)
+    """
     try:
         parser = create_parser()
-        args = parser.parse_args()
+        args = parser.parse_args(argv[1:])
+        if cwd:
+            for option in PATH_OPTIONS:
+                value = getattr(args, option)
+                if value:
+                    setattr(args, option, os.path.join(cwd, value))
+        
+        if args.replay_speed is not None and not args.replay:
+            parser.error("--replay-speed requires --replay")
+        if args.daemon and (args.record or args.replay):
+            parser.error("--record and --replay cannot be used with --daemon")
+        
+        if args.daemon:
+            from anthropic_client.daemon import serve
+            # Forwarded runs are compared with the environment the daemon was
+            # started in, not the one dotenv files add to
+            env = dict(os.environ)
+            # Warm the SDK imports and connection pools before the first request
+            create_client(args)
+            serve(run, env=env)
+            sys.exit(0)
+        
+        if args.breaker_status:
+            from anthropic_client.health import DEFAULT_STATE_PATH, BreakerRegistry
+            print(BreakerRegistry(DEFAULT_STATE_PATH).format_status())
+            sys.exit(0)
+        
+        if args.replay_traffic:
+            from anthropic_client.router import load_traffic, replay
+            print(replay(create_router(args), load_traffic(args.replay_traffic)).summary())
+            sys.exit(0)
+        
+        if args.record or args.replay:
+            install_cassette(args)
         
         # Check for CLI invocation name for model presets
-        program_name = sys.argv[0].lower()
+        program_name = argv[0].lower()
         if "haiku" in program_name and args.model == ModelName.SONNET.value:
             args.model = ModelName.HAIKU.value
 
-        # Get prompt from arguments or stdin
-        prompt = " ".join(args.prompt) if args.prompt else get_prompt_from_stdin()
+        if args.batch:
+            handle_batch(args)
+            sys.exit(0)
+
+        # Get prompt from arguments or stdin; interactive mode asks for it
+        if args.prompt:
+            prompt: Optional[str] = " ".join(args.prompt)
+        else:
+            prompt = None if args.interactive else get_prompt_from_stdin()
 
         # Load optional model configuration
         model_config = None
@@ -208,63 +641,43 @@ def main() -> NoReturn:
             except Exception as e:
                 logger.warning(f"Failed to load model configuration: {e}")
 
-        # Create multi-provider client
-        client = MultiProviderClient()
-        
-        # Prepare request parameters
-        request_params = {
-            "model": args.model,
-            "temperature": args.temperature,
-            "format": args.format
-        }
-        
-        # Add system prompt if provided
-        if args.system:
-            request_params["system"] = args.system
-            
-        # Handle haiku mode (special system prompt)
-        if args.haiku:
-            request_params["system"] = "You are Claude, an AI assistant that specializes in writing short, elegant haikus. Respond only with a haiku in 3-5-3 syllable format."
+        client = create_client(args)
+        request_params = build_request_params(args)
         
         # Set streaming mode based on args
-        streaming_mode = not args.no_stream
-        request_params["stream"] = streaming_mode
+        request_params["stream"] = not args.no_stream
+        
+        # Earlier turns of a saved conversation, and the log new turns go to
+        if args.load_conversation:
+            window = ConversationLog(args.load_conversation).load_window()
+            logger.info(f"Loaded {len(window) // 2} exchanges from {args.load_conversation}")
+        else:
+            window = ConversationWindow()
+        log = ConversationLog(args.save_conversation) if args.save_conversation else None
         
         try:
-            if streaming_mode:
-                # Stream mode
-                print("Response: ", end="", flush=True)
-                try:
-                    for chunk in client.get_response(prompt, **request_params):
-                        print(chunk, end="", flush=True)
-                        time.sleep(STREAM_DELAY)
-                    print()  # Final newline
-                except KeyboardInterrupt:
-                    print("\nStreaming cancelled by user", file=sys.stderr)
-                    raise
-                except Exception as e:
-                    print(f"\nStreaming error: {e}", file=sys.stderr)
-                    logger.warning(f"Streaming failed, falling back to non-streaming: {e}")
-                    
-                    # Fall back to non-streaming mode
-                    print("\nFalling back to non-streaming mode...", file=sys.stderr)
-                    request_params["stream"] = False
-                    response = client.get_response(prompt, **request_params)
-                    print("Response:", response)
+            if args.interactive:
+                handle_interactive(client, request_params, window, log, prompt)
             else:
-                # Non-streaming mode
-                response = client.get_response(prompt, **request_params)
-                print("Response:", response)
+                if len(window):
+                    request_params["history"] = window.messages
+                response = send_prompt(client, prompt, request_params)
+                if log:
+                    log.append(prompt, response)
                 
-            # If we have an output file path, save the conversation
-            if args.save_conversation:
-                # Implement conversation saving logic
-                pass
+            if client.prompt_cache_stats.requests:
+                logger.info(f"Prompt cache: {client.prompt_cache_stats.summary()}")
+            if client.hedge_policy:
+                logger.info(f"Hedging: {client.hedge_policy.metrics.summary()}")
                 
         except Exception as e:
             logger.error(f"Error getting response: {e}")
             print(f"Error: {e}", file=sys.stderr)
             sys.exit(1)
+        finally:
+            save_client_state(client)
+            if log:
+                log.close()
             
     except ValueError as e:
         logger.error(f"Validation error: {e}")
@@ -4,20 +4,27 @@ Core client implementation for interacting with Anthropic's Claude models.
 
 import os
 from enum import Enum
-from typing import Optional, Iterator, Union, List, Dict, Any
-import anthropic
+from typing import TYPE_CHECKING, Optional, Iterator, AsyncIterator, Union, List, Dict, Any, Sequence
 from dotenv import load_dotenv
-from openai import OpenAI, AsyncOpenAI
-from openai_agents import AgentsClient
-from openai.types.agent import Agent
-from openai.types.assistant import Assistant
-from openai.types.assistant_file import AssistantFile
-from openai.types.assistant_run import AssistantRun
-from openai.types.assistant_run_step import AssistantRunStep
-from openai.types.assistant_run_step_output import AssistantRunStepOutput
+from anthropic_client.cache import ResponseCache, request_fingerprint
+from anthropic_client.context_budget import ContextBudgeter
+from anthropic_client.events import StreamDecoder, message_text, message_thinking_chars
+from anthropic_client.json_stream import aiter_json, iter_json
+from anthropic_client.prompt_cache import (
+    DEFAULT_MIN_CACHE_CHARS,
+    PromptCacheStats,
+    SystemPrompt,
+    build_system_blocks,
+)
+from anthropic_client.telemetry import Telemetry, note_usage
+from anthropic_client.transport import get_http_client, new_async_http_client
 import logging
 
+if TYPE_CHECKING:
+    from anthropic_client.coalesce import AsyncSingleFlight, SingleFlight
 
+# Provider SDKs are imported on first client construction, not at module
+# import, so the CLI can build its parser without paying for them.
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -45,6 +52,17 @@ class OutputFormat(str, Enum):
     JSON = "json"
     MARKDOWN = "markdown"
 
+# The Messages API has no JSON response mode, and extended thinking rules out
+# prefilling the answer, so json output is requested in the system prompt
+JSON_INSTRUCTION: str = (
+    "Respond with valid JSON only: a single array or object, "
+    "with no prose or code fences around it."
+)
+
+def json_instruction_block() -> Dict[str, str]:
+    """Return the system block that asks for a json-only answer."""
+    return {"type": "text", "text": JSON_INSTRUCTION}
+
 class AnthropicClient:
     """Client for interacting with Anthropic's Claude models."""
     
@@ -52,14 +70,54 @@ class AnthropicClient:
     THINKING_BUDGET: int = 120000
     MIN_TEMPERATURE: float = 0.0
     MAX_TEMPERATURE: float = 1.0
+    # An explicit timeout sized for a full 128k-token answer; the SDK refuses
+    # non-streaming calls this large when left on its default timeout.
+    REQUEST_TIMEOUT: float = 3600.0
+    
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        min_cache_chars: Optional[int] = DEFAULT_MIN_CACHE_CHARS,
+        coalescer: Optional["SingleFlight"] = None,
+        budgeter: Optional[ContextBudgeter] = None,
+        telemetry: Optional[Telemetry] = None
+    ) -> None:
+        """Initialize the Anthropic client with API key from environment.
+        
+        Args:
+            base_url: Optional API base URL override (e.g. a local stub server)
+            cache: Optional response cache consulted before each request
+            min_cache_chars: System prompts at least this long get a prompt-cache
+                breakpoint; None disables automatic breakpoints
+            coalescer: Optional single-flight group sharing identical in-flight requests
+            budgeter: Context-window budgeter sizing each request (a default one is
+                created; set the attribute to None to send requests unchanged)
+            telemetry: Optional telemetry measuring every request sent upstream
+        """
+        import anthropic
+        self.cache = cache
+        self.min_cache_chars = min_cache_chars
+        self.coalescer = coalescer
+        self.budgeter = budgeter or ContextBudgeter()
+        self.telemetry = telemetry
+        self.prompt_cache_stats = PromptCacheStats()
+        self.client = anthropic.Anthropic(
+            **self._client_kwargs(base_url),
+            http_client=get_http_client("anthropic", base_url)
+        )
     
-    def __init__(self) -> None:
-        """Initialize the Anthropic client with API key from environment."""
+    @classmethod
+    def _client_kwargs(cls, base_url: Optional[str]) -> Dict[str, Any]:
+        """Collect the SDK constructor arguments shared by sync and async clients."""
         load_dotenv()
         api_key = os.environ.get("ANTHROPIC_API_KEY")
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable not set")
-        self.client = anthropic.Anthropic(api_key=api_key)
+        kwargs: Dict[str, Any] = {"api_key": api_key, "timeout": cls.REQUEST_TIMEOUT}
+        if base_url:
+            kwargs["base_url"] = base_url
+        return kwargs
     
     def _validate_temperature(self, temperature: float) -> None:
         """Validate that temperature is within allowed range."""
@@ -68,19 +126,22 @@ class AnthropicClient:
                 f"Temperature must be between {self.MIN_TEMPERATURE} and {self.MAX_TEMPERATURE}"
             )
     
+    @staticmethod
+    def _check_parse_json(format: Union[str, OutputFormat]) -> None:
+        """Validate that a parsed JSON stream was asked for a json response."""
+        if OutputFormat(format) != OutputFormat.JSON:
+            raise ValueError("parse_json requires format=json")
+    
     def _build_message_params(
         self,
         prompt: str,
         temperature: float,
         model: ModelName,
         format: OutputFormat,
-        system: Optional[str]
+        system: Optional[SystemPrompt]
     ) -> Dict[str, Any]:
         """Build the message parameters for the API request."""
         messages: List[Dict[str, str]] = [{"role": "user", "content": prompt}]
-        if system:
-            messages.insert(0, {"role": "system", "content": system})
-            
         params = {
             "model": model.value,
             "max_tokens": self.MAX_TOKENS,
@@ -91,13 +152,38 @@ class AnthropicClient:
                 "budget_tokens": self.THINKING_BUDGET
             },
             "betas": ["output-128k-2025-02-19"],
-            "citations": {"enabled": True}
+            # Not a typed SDK argument, so it has to travel in the raw body
+            "extra_body": {"citations": {"enabled": True}}
         }
         
+        # The system prompt is the stable prefix shared across calls, so it
+        # carries the prompt-cache breakpoint
+        system_blocks = build_system_blocks(system, self.min_cache_chars)
         if format == OutputFormat.JSON:
-            params["response_format"] = {"type": "json_object"}
+            # After the cached prefix, so it does not change the cached blocks
+            system_blocks = [*(system_blocks or []), json_instruction_block()]
+        if system_blocks:
+            params["system"] = system_blocks
+            
+        return self.budgeter.fit(params) if self.budgeter else params
+        
+    def _prepare_message_params(
+        self,
+        prompt: str,
+        temperature: float,
+        model: Union[str, ModelName],
+        format: Union[str, OutputFormat],
+        system: Optional[SystemPrompt]
+    ) -> Dict[str, Any]:
+        """Coerce enum arguments, validate them and build the request parameters."""
+        # Convert string enums to proper enum types if needed
+        if isinstance(model, str):
+            model = ModelName(model)
+        if isinstance(format, str):
+            format = OutputFormat(format)
             
-        return params
+        self._validate_temperature(temperature)
+        return self._build_message_params(prompt, temperature, model, format, system)
         
     def get_response(
         self,
@@ -106,8 +192,9 @@ class AnthropicClient:
         temperature: float = 1.0,
         model: Union[str, ModelName] = ModelName.SONNET,
         format: Union[str, OutputFormat] = OutputFormat.TEXT,
-        system: Optional[str] = None
-    ) -> Union[str, Iterator[str]]:
+        system: Optional[SystemPrompt] = None,
+        parse_json: bool = False
+    ) -> Union[str, Iterator[Any]]:
         """Get a response from Claude.
         
         Args:
@@ -116,34 +203,273 @@ class AnthropicClient:
             temperature: Controls randomness in the response (0.0 to 1.0)
             model: The Claude model to use
             format: Output format (text, json, markdown)
-            system: Optional system prompt to set context/permissions
+            system: Optional system prompt to set context/permissions; a sequence
+                of blocks is ordered from most to least stable
+            parse_json: Stream a json response and yield each top-level array
+                element, or (key, value) object field, as soon as it closes
             
         Returns:
-            Either a complete response string or an iterator of response chunks
+            Either a complete response string, an iterator of response chunks,
+            or with parse_json an iterator of parsed elements
             
         Raises:
-            ValueError: If temperature is out of range or other validation fails
+            ValueError: If temperature is out of range, parse_json is set
+                without format json, or other validation fails
         """
-        # Convert string enums to proper enum types if needed
-        if isinstance(model, str):
-            model = ModelName(model)
-        if isinstance(format, str):
-            format = OutputFormat(format)
-            
-        self._validate_temperature(temperature)
+        if parse_json:
+            self._check_parse_json(format)
+            return iter_json(self.get_response(prompt, True, temperature, model, format, system))
         
-        try:
-            message_params = self._build_message_params(
-                prompt, temperature, model, format, system
+        message_params = self._prepare_message_params(
+            prompt, temperature, model, format, system
+        )
+        
+        cache_key = request_fingerprint(message_params) if self.cache else None
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached.replay() if stream else cached.text
+        
+        if self.coalescer:
+            key = (cache_key or request_fingerprint(message_params), stream)
+            if stream:
+                return self.coalescer.stream(key, lambda: self._send(message_params, True, cache_key))
+            return self.coalescer.do(key, lambda: self._send(message_params, False, cache_key))
+        return self._send(message_params, stream, cache_key)
+    
+    def _send(
+        self,
+        message_params: Dict[str, Any],
+        stream: bool,
+        cache_key: Optional[str]
+    ) -> Union[str, Iterator[str]]:
+        """Send one request upstream, recording the response in the cache."""
+        if self.telemetry:
+            return self.telemetry.measure(
+                "anthropic", message_params["model"], stream,
+                lambda: self._send_upstream(message_params, stream, cache_key)
             )
-            
+        return self._send_upstream(message_params, stream, cache_key)
+    
+    def _send_upstream(
+        self,
+        message_params: Dict[str, Any],
+        stream: bool,
+        cache_key: Optional[str]
+    ) -> Union[str, Iterator[str]]:
+        """Send one request, recording the response in the cache."""
+        try:
             if stream:
                 response = self.client.beta.messages.create(**message_params, stream=True)
-                return (chunk.content[0].text for chunk in response)
+                chunks = self._stream_text(response, message_params)
+                return self.cache.record_stream(cache_key, chunks) if cache_key else chunks
             else:
                 response = self.client.beta.messages.create(**message_params)
-                return response.content[0].text
+                self._record_usage(message_params, getattr(response, "usage", None), message_thinking_chars(response))
+                text = message_text(response)
+                if cache_key:
+                    self.cache.put(cache_key, [text])
+                return text
+                
+        except Exception as e:
+            logger.error(f"Error getting response from Claude: {str(e)}")
+            raise
+    
+    def _stream_text(self, response: Any, message_params: Dict[str, Any]) -> Iterator[str]:
+        """Yield the text of an event stream, recording its usage once exhausted."""
+        decoder = StreamDecoder()
+        yield from decoder.text(response)
+        self._record_usage(message_params, decoder.usage, decoder.thinking_chars)
+    
+    def _record_usage(self, message_params: Dict[str, Any], usage: Any, thinking_chars: int = 0) -> None:
+        """Record a response's usage in the prompt-cache stats, the budgeter's calibration and telemetry."""
+        note_usage(usage, thinking_chars)
+        self.prompt_cache_stats.record(usage)
+        if self.budgeter:
+            self.budgeter.observe(message_params, usage)
+
+
+class AsyncAnthropicClient(AnthropicClient):
+    """Asyncio client for Claude with bounded-concurrency fan-out.
+    
+    Mirrors the ``AnthropicClient.get_response`` surface on top of
+    ``anthropic.AsyncAnthropic`` so many prompts can be in flight at once.
+    """
+    
+    DEFAULT_MAX_CONCURRENCY: int = 8
+    
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        min_cache_chars: Optional[int] = DEFAULT_MIN_CACHE_CHARS,
+        coalescer: Optional["AsyncSingleFlight"] = None,
+        budgeter: Optional[ContextBudgeter] = None,
+        telemetry: Optional[Telemetry] = None
+    ) -> None:
+        """Initialize the async Anthropic client with API key from environment.
+        
+        Args:
+            base_url: Optional API base URL override (e.g. a local stub server)
+            cache: Optional response cache consulted before each request
+            min_cache_chars: System prompts at least this long get a prompt-cache
+                breakpoint; None disables automatic breakpoints
+            coalescer: Optional single-flight group sharing identical in-flight requests
+            budgeter: Context-window budgeter sizing each request (a default one is
+                created; set the attribute to None to send requests unchanged)
+            telemetry: Optional telemetry measuring every request sent upstream
+        """
+        import anthropic
+        self.cache = cache
+        self.min_cache_chars = min_cache_chars
+        self.coalescer = coalescer
+        self.budgeter = budgeter or ContextBudgeter()
+        self.telemetry = telemetry
+        self.prompt_cache_stats = PromptCacheStats()
+        self.client = anthropic.AsyncAnthropic(
+            **self._client_kwargs(base_url),
+            http_client=new_async_http_client()
+        )
+    
+    async def get_response(
+        self,
+        prompt: str,
+        stream: bool = False,
+        temperature: float = 1.0,
+        model: Union[str, ModelName] = ModelName.SONNET,
+        format: Union[str, OutputFormat] = OutputFormat.TEXT,
+        system: Optional[SystemPrompt] = None,
+        parse_json: bool = False
+    ) -> Union[str, AsyncIterator[Any]]:
+        """Get a response from Claude without blocking the event loop.
+        
+        Args:
+            prompt: The user's prompt to send to Claude
+            stream: Whether to stream the response
+            temperature: Controls randomness in the response (0.0 to 1.0)
+            model: The Claude model to use
+            format: Output format (text, json, markdown)
+            system: Optional system prompt to set context/permissions; a sequence
+                of blocks is ordered from most to least stable
+            parse_json: Stream a json response and yield each top-level array
+                element, or (key, value) object field, as soon as it closes
+            
+        Returns:
+            Either a complete response string, an async iterator of response
+            chunks, or with parse_json an async iterator of parsed elements
+            
+        Raises:
+            ValueError: If temperature is out of range, parse_json is set
+                without format json, or other validation fails
+        """
+        if parse_json:
+            self._check_parse_json(format)
+            return aiter_json(await self.get_response(prompt, True, temperature, model, format, system))
+        
+        message_params = self._prepare_message_params(
+            prompt, temperature, model, format, system
+        )
+        
+        cache_key = request_fingerprint(message_params) if self.cache else None
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return self._replay_async(cached.chunks) if stream else cached.text
+        
+        if self.coalescer:
+            key = (cache_key or request_fingerprint(message_params), stream)
+            if stream:
+                return self.coalescer.stream(key, lambda: self._open_stream(message_params, cache_key))
+            return await self.coalescer.do(key, lambda: self._send(message_params, False, cache_key))
+        return await self._send(message_params, stream, cache_key)
+    
+    async def _send(
+        self,
+        message_params: Dict[str, Any],
+        stream: bool,
+        cache_key: Optional[str]
+    ) -> Union[str, AsyncIterator[str]]:
+        """Send one request upstream, recording the response in the cache."""
+        if self.telemetry:
+            return await self.telemetry.ameasure(
+                "anthropic", message_params["model"], stream,
+                lambda: self._send_upstream(message_params, stream, cache_key)
+            )
+        return await self._send_upstream(message_params, stream, cache_key)
+    
+    async def _send_upstream(
+        self,
+        message_params: Dict[str, Any],
+        stream: bool,
+        cache_key: Optional[str]
+    ) -> Union[str, AsyncIterator[str]]:
+        """Send one request, recording the response in the cache."""
+        try:
+            if stream:
+                response = await self.client.beta.messages.create(**message_params, stream=True)
+                chunks = self._astream_text(response, message_params)
+                return self.cache.record_async_stream(cache_key, chunks) if cache_key else chunks
+            else:
+                response = await self.client.beta.messages.create(**message_params)
+                self._record_usage(message_params, getattr(response, "usage", None), message_thinking_chars(response))
+                text = message_text(response)
+                if cache_key:
+                    self.cache.put(cache_key, [text])
+                return text
                 
         except Exception as e:
             logger.error(f"Error getting response from Claude: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
+    
+    async def _open_stream(self, message_params: Dict[str, Any], cache_key: Optional[str]) -> AsyncIterator[str]:
+        """Send a streaming request and yield its chunks, for stream fan-out."""
+        chunks = await self._send(message_params, True, cache_key)
+        async for chunk in chunks:
+            yield chunk
+    
+    async def _astream_text(self, response: Any, message_params: Dict[str, Any]) -> AsyncIterator[str]:
+        """Async counterpart of ``_stream_text``."""
+        decoder = StreamDecoder()
+        async for text in decoder.atext(response):
+            yield text
+        self._record_usage(message_params, decoder.usage, decoder.thinking_chars)
+    
+    @staticmethod
+    async def _replay_async(chunks: List[str]) -> AsyncIterator[str]:
+        """Yield cached chunks as an async iterator."""
+        for chunk in chunks:
+            yield chunk
+    
+    async def gather_responses(
+        self,
+        prompts: Sequence[str],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        **kwargs: Any
+    ) -> List[str]:
+        """Get complete responses for many prompts with bounded concurrency.
+        
+        At most ``max_concurrency`` requests are in flight at any time.
+        
+        Args:
+            prompts: The prompts to send
+            max_concurrency: Maximum number of simultaneous requests
+            kwargs: Additional ``get_response`` parameters (temperature, model, ...)
+            
+        Returns:
+            The response strings, in the same order as ``prompts``
+            
+        Raises:
+            ValueError: If max_concurrency is less than 1
+        """
+        import asyncio
+
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        kwargs["stream"] = False
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run_one(prompt: str) -> str:
+            async with semaphore:
+                return await self.get_response(prompt, **kwargs)
+        
+        return list(await asyncio.gather(*(run_one(prompt) for prompt in prompts)))
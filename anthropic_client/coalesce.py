@@ -0,0 +1,243 @@
+"""
+Single-flight coalescing of identical in-flight requests.
+
+When many callers send the same request at the same moment, only the first
+one (the leader) goes upstream; the others wait for its result. Streams are
+fanned out: every caller gets the full chunk sequence, with chunks pulled
+from the upstream stream once and buffered for slower consumers. Requests
+are only coalesced while in flight; reuse after completion is the job of
+``ResponseCache``.
+"""
+
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    """A complete-result call shared by a leader and its followers."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _SharedStream:
+    """One upstream stream, buffered so each consumer can read it at its own pace."""
+
+    def __init__(self, open_stream: Callable[[], Iterator[str]], on_finish: Callable[[], None]) -> None:
+        self.open_stream = open_stream
+        self.on_finish = on_finish
+        self.source: Optional[Iterator[str]] = None
+        self.chunks: List[str] = []
+        self.finished = False
+        self.error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+
+    def consume(self) -> Iterator[str]:
+        index = 0
+        while True:
+            if index < len(self.chunks):
+                yield self.chunks[index]
+                index += 1
+                continue
+            with self._lock:
+                # Whoever needs the next chunk first pulls it for everyone
+                if index < len(self.chunks):
+                    continue
+                if self.error is not None:
+                    raise self.error
+                if self.finished:
+                    return
+                try:
+                    if self.source is None:
+                        self.source = iter(self.open_stream())
+                    self.chunks.append(next(self.source))
+                except StopIteration:
+                    self._finish()
+                except Exception as e:
+                    self.error = e
+                    self._finish()
+
+    def _finish(self) -> None:
+        self.finished = True
+        self.on_finish()
+
+
+class SingleFlight:
+    """Coalesces identical concurrent calls made from threads."""
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, _Call] = {}
+        self._streams: Dict[Hashable, _SharedStream] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run ``fn`` unless an identical call is in flight; then share its result.
+
+        Args:
+            key: Request identity, normally its fingerprint
+            fn: Makes the upstream call
+
+        Returns:
+            The result of the one upstream call
+
+        Raises:
+            Exception: Whatever the upstream call raised, in every caller
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stream(self, key: Hashable, open_stream: Callable[[], Iterator[str]]) -> Iterator[str]:
+        """Fan one upstream stream out to every concurrent caller with the same key.
+
+        Callers that join mid-stream still receive it from the first chunk.
+
+        Args:
+            key: Request identity, normally its fingerprint
+            open_stream: Opens the upstream text stream
+
+        Returns:
+            An iterator over the full chunk sequence
+        """
+        with self._lock:
+            shared = self._streams.get(key)
+            if shared is None:
+                shared = self._streams[key] = _SharedStream(open_stream, lambda: self._forget_stream(key, shared))
+            else:
+                self.coalesced += 1
+        return shared.consume()
+
+    def _forget_stream(self, key: Hashable, shared: _SharedStream) -> None:
+        with self._lock:
+            if self._streams.get(key) is shared:
+                del self._streams[key]
+
+
+class _AsyncSharedStream:
+    """Async counterpart of ``_SharedStream``."""
+
+    def __init__(self, open_stream: Callable[[], AsyncIterator[str]], on_finish: Callable[[], None]) -> None:
+        self.open_stream = open_stream
+        self.on_finish = on_finish
+        self.source: Optional[AsyncIterator[str]] = None
+        self.chunks: List[str] = []
+        self.finished = False
+        self.error: Optional[BaseException] = None
+        self._lock = asyncio.Lock()
+
+    async def consume(self) -> AsyncIterator[str]:
+        index = 0
+        while True:
+            if index < len(self.chunks):
+                yield self.chunks[index]
+                index += 1
+                continue
+            async with self._lock:
+                if index < len(self.chunks):
+                    continue
+                if self.error is not None:
+                    raise self.error
+                if self.finished:
+                    return
+                try:
+                    if self.source is None:
+                        self.source = self.open_stream().__aiter__()
+                    self.chunks.append(await self.source.__anext__())
+                except StopAsyncIteration:
+                    self._finish()
+                except Exception as e:
+                    self.error = e
+                    self._finish()
+
+    def _finish(self) -> None:
+        self.finished = True
+        self.on_finish()
+
+
+class AsyncSingleFlight:
+    """Coalesces identical concurrent calls made from coroutines on one event loop."""
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, "asyncio.Future"] = {}
+        self._streams: Dict[Hashable, _AsyncSharedStream] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await ``fn`` unless an identical call is in flight; then share its result.
+
+        Args:
+            key: Request identity, normally its fingerprint
+            fn: Makes the upstream call
+
+        Returns:
+            The result of the one upstream call
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # Shielded so a cancelled follower does not cancel the leader
+            return await asyncio.shield(future)
+        future = self._calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception retrieved when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+    def stream(self, key: Hashable, open_stream: Callable[[], AsyncIterator[str]]) -> AsyncIterator[str]:
+        """Fan one upstream async stream out to every concurrent caller with the same key.
+
+        Args:
+            key: Request identity, normally its fingerprint
+            open_stream: Opens the upstream async text stream
+
+        Returns:
+            An async iterator over the full chunk sequence
+        """
+        shared = self._streams.get(key)
+        if shared is None:
+            shared = self._streams[key] = _AsyncSharedStream(open_stream, lambda: self._forget_stream(key, shared))
+        else:
+            self.coalesced += 1
+        return shared.consume()
+
+    def _forget_stream(self, key: Hashable, shared: _AsyncSharedStream) -> None:
+        if self._streams.get(key) is shared:
+            del self._streams[key]
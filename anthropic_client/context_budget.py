@@ -0,0 +1,251 @@
+"""
+Context-window budgeting for Messages API requests.
+
+Requests are sized locally before they are sent: input tokens are
+estimated from the request text with a characters-per-token ratio that is
+calibrated against the ``usage`` the API reports, the oldest turns of the
+conversation are dropped (or condensed by an optional summarizer) until
+the prompt and the minimum output fit the model's context window, and
+``max_tokens`` and the thinking budget are capped to what is left. Short
+prompts also get a smaller thinking budget, so simple questions are not
+sent with a 120k-token allowance.
+"""
+
+import logging
+import math
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+Message = Dict[str, Any]
+
+DEFAULT_CONTEXT_WINDOW: int = 200_000
+
+CONTEXT_WINDOWS: Dict[str, int] = {
+    "claude-3-7-sonnet-20250219": 200_000,
+    "claude-3-5-haiku-20241022": 200_000,
+    "claude-3-opus-20240229": 200_000,
+}
+
+DEFAULT_MAX_OUTPUT_TOKENS: int = 8192
+
+# The 3.7 Sonnet limit assumes the output-128k beta the clients enable
+MAX_OUTPUT_TOKENS: Dict[str, int] = {
+    "claude-3-7-sonnet-20250219": 128_000,
+    "claude-3-5-haiku-20241022": 8192,
+    "claude-3-opus-20240229": 4096,
+}
+
+# The API rejects thinking budgets below this
+MIN_THINKING_TOKENS: int = 1024
+
+# Output room always kept for the visible answer
+MIN_ANSWER_TOKENS: int = 1024
+
+# Role and framing tokens added per message
+MESSAGE_OVERHEAD_TOKENS: int = 4
+
+
+def _content_chars(content: Any) -> int:
+    """Return the characters of a message content or system prompt."""
+    if content is None:
+        return 0
+    if isinstance(content, str):
+        return len(content)
+    if isinstance(content, dict):
+        return len(str(content.get("text", "")))
+    return sum(_content_chars(block) for block in content)
+
+
+def request_chars(params: Dict[str, Any]) -> int:
+    """Return the characters of the system prompt and messages of a request."""
+    chars = _content_chars(params.get("system"))
+    for message in params.get("messages", []):
+        chars += _content_chars(message.get("content"))
+    return chars
+
+
+class TokenEstimator:
+    """Estimates input tokens from characters, calibrated against reported usage.
+
+    The characters-per-token ratio starts at 4 and moves towards the ratio
+    observed in each response as an exponentially weighted average.
+    """
+
+    MIN_RATIO: float = 1.5
+    MAX_RATIO: float = 8.0
+
+    def __init__(self, chars_per_token: float = 4.0, alpha: float = 0.2) -> None:
+        """Initialize the estimator.
+
+        Args:
+            chars_per_token: Starting characters-per-token ratio
+            alpha: Weight of each observation in the calibrated ratio
+
+        Raises:
+            ValueError: If a parameter is out of range
+        """
+        if chars_per_token <= 0:
+            raise ValueError("chars_per_token must be positive")
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError("alpha must be in (0, 1]")
+        self.chars_per_token = chars_per_token
+        self.alpha = alpha
+        self.observations = 0
+        self._lock = threading.Lock()
+
+    def estimate(self, chars: int, messages: int = 0) -> int:
+        """Estimate the tokens of ``chars`` characters spread over ``messages`` messages."""
+        return math.ceil(chars / self.chars_per_token) + messages * MESSAGE_OVERHEAD_TOKENS
+
+    def estimate_request(self, params: Dict[str, Any]) -> int:
+        """Estimate the input tokens of a request."""
+        return self.estimate(request_chars(params), len(params.get("messages", [])))
+
+    def observe(self, params: Dict[str, Any], usage: Any) -> None:
+        """Calibrate against the input tokens the API reported for a request.
+
+        Args:
+            params: The request as sent
+            usage: The response's usage (SDK object or ``events.Usage``); ignored if None
+        """
+        if usage is None:
+            return
+        tokens = sum(
+            getattr(usage, name, None) or 0
+            for name in ("input_tokens", "cache_creation_input_tokens", "cache_read_input_tokens")
+        )
+        tokens -= len(params.get("messages", [])) * MESSAGE_OVERHEAD_TOKENS
+        chars = request_chars(params)
+        if tokens <= 0 or chars <= 0:
+            return
+        ratio = min(self.MAX_RATIO, max(self.MIN_RATIO, chars / tokens))
+        with self._lock:
+            self.chars_per_token += self.alpha * (ratio - self.chars_per_token)
+            self.observations += 1
+
+
+class ContextBudgeter:
+    """Fits requests to their model's context window before they are sent."""
+
+    def __init__(
+        self,
+        estimator: Optional[TokenEstimator] = None,
+        safety_margin: float = 0.05,
+        thinking_floor: Optional[int] = 16_000,
+        thinking_per_input_token: float = 4.0,
+        summarize: Optional[Callable[[List[Message]], str]] = None
+    ) -> None:
+        """Initialize the budgeter.
+
+        Args:
+            estimator: Token estimator (a fresh one is created by default)
+            safety_margin: Fraction of the context window kept free for estimation error
+            thinking_floor: Smallest adaptive thinking budget; None always keeps
+                the requested budget
+            thinking_per_input_token: Adaptive thinking budget per input token
+                above the floor
+            summarize: Optional callable condensing dropped turns into a short
+                text that is prepended to the oldest kept turn
+
+        Raises:
+            ValueError: If safety_margin is not in [0, 1)
+        """
+        if not 0.0 <= safety_margin < 1.0:
+            raise ValueError("safety_margin must be in [0, 1)")
+        self.estimator = estimator or TokenEstimator()
+        self.safety_margin = safety_margin
+        self.thinking_floor = thinking_floor
+        self.thinking_per_input_token = thinking_per_input_token
+        self.summarize = summarize
+        self.dropped_turns = 0
+
+    def fit(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of a request fitted to its model's context window.
+
+        Args:
+            params: Message parameters with 'model', 'messages' and 'max_tokens',
+                and optionally 'system' and 'thinking'
+
+        Returns:
+            The parameters with old turns dropped and 'max_tokens' and the
+            thinking budget capped; thinking is removed when no budget is left
+
+        Raises:
+            ValueError: If the latest turn alone does not fit the context window
+        """
+        params = dict(params)
+        model = params["model"]
+        window = CONTEXT_WINDOWS.get(model, DEFAULT_CONTEXT_WINDOW)
+        limit = int(window * (1.0 - self.safety_margin))
+        thinking = params.get("thinking")
+        min_output = MIN_ANSWER_TOKENS + (MIN_THINKING_TOKENS if thinking else 0)
+
+        messages = list(params["messages"])
+        input_tokens = self.estimator.estimate_request(params)
+        dropped: List[Message] = []
+        while input_tokens + min_output > limit and len(messages) > 1:
+            # Drop whole exchanges so the history still starts with a user turn
+            count = 2 if len(messages) > 2 and messages[1].get("role") == "assistant" else 1
+            for message in messages[:count]:
+                input_tokens -= self.estimator.estimate(_content_chars(message.get("content")), 1)
+            dropped.extend(messages[:count])
+            del messages[:count]
+        if dropped:
+            self.dropped_turns += len(dropped)
+            logger.info(f"Dropped {len(dropped)} old turns to fit the {window}-token context of {model}")
+            messages = self._summarize(dropped, messages, limit - min_output - input_tokens)
+            params["messages"] = messages
+            input_tokens = self.estimator.estimate_request(params)
+        if input_tokens + min_output > limit:
+            raise ValueError(
+                f"Request of about {input_tokens} tokens does not fit the {window}-token context window of {model}"
+            )
+
+        requested = params["max_tokens"]
+        if thinking:
+            budget = thinking.get("budget_tokens", MIN_THINKING_TOKENS)
+            adaptive = self._adaptive_thinking(params, budget)
+            # Keep the answer allowance the caller asked for beyond the thinking budget
+            requested -= budget - adaptive
+            budget = adaptive
+        max_tokens = min(requested, MAX_OUTPUT_TOKENS.get(model, DEFAULT_MAX_OUTPUT_TOKENS), limit - input_tokens)
+        params["max_tokens"] = max(max_tokens, 1)
+        if thinking:
+            budget = min(budget, params["max_tokens"] - MIN_ANSWER_TOKENS)
+            if budget < MIN_THINKING_TOKENS:
+                del params["thinking"]
+            else:
+                params["thinking"] = dict(thinking, budget_tokens=budget)
+        return params
+
+    def observe(self, params: Dict[str, Any], usage: Any) -> None:
+        """Calibrate the estimator against the usage reported for a request."""
+        self.estimator.observe(params, usage)
+
+    def _adaptive_thinking(self, params: Dict[str, Any], budget: int) -> int:
+        """Scale the thinking budget to the size of the prompt.
+
+        Uses the uncalibrated 4 characters per token, so the budget (and the
+        response-cache fingerprint) of a request does not drift with calibration.
+        """
+        if self.thinking_floor is None:
+            return budget
+        scaled = int(request_chars(params) / 4 * self.thinking_per_input_token)
+        return min(budget, max(self.thinking_floor, scaled))
+
+    def _summarize(self, dropped: List[Message], messages: List[Message], room: int) -> List[Message]:
+        """Prepend a summary of the dropped turns to the oldest kept turn, if it fits."""
+        if not self.summarize or not messages or not isinstance(messages[0].get("content"), str):
+            return messages
+        try:
+            summary = self.summarize(dropped)
+        except Exception as e:
+            logger.warning(f"Summarizing dropped turns failed: {e}")
+            return messages
+        if not summary or self.estimator.estimate(len(summary)) > room:
+            return messages
+        first = dict(messages[0], content=f"Summary of the earlier conversation:\n{summary}\n\n{messages[0]['content']}")
+        return [first] + messages[1:]
+
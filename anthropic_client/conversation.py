@@ -0,0 +1,160 @@
+"""
+Append-only conversation log for multi-turn CLI sessions.
+
+Each exchange is appended to a JSONL file as two lines, the user turn and
+the assistant turn, in a single write, so a turn costs O(1) I/O however
+long the session has run and the file never needs rewriting. Loading
+memory-maps the file and parses lines backwards from the end, only as far
+as the context window needs, so resuming a long session does not read its
+whole history.
+"""
+
+import json
+import logging
+import mmap
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, TextIO, Union
+
+logger = logging.getLogger(__name__)
+
+Message = Dict[str, str]
+
+# Roughly 100k tokens at about 4 characters per token
+DEFAULT_HISTORY_CHARS = 400_000
+
+
+class ConversationWindow:
+    """The most recent exchanges of a conversation that fit a character budget.
+
+    Exchanges are evicted oldest first, so the history sent with each
+    request stays bounded and always starts with a user turn.
+    """
+
+    def __init__(self, max_chars: int = DEFAULT_HISTORY_CHARS) -> None:
+        """Initialize an empty window.
+
+        Args:
+            max_chars: Maximum total characters of the kept turns
+
+        Raises:
+            ValueError: If max_chars is negative
+        """
+        if max_chars < 0:
+            raise ValueError("max_chars must not be negative")
+        self.max_chars = max_chars
+        self.chars = 0
+        self._turns: Deque[Message] = deque()
+
+    def add_exchange(self, prompt: str, response: str) -> None:
+        """Append a user prompt and its response, evicting old exchanges to fit."""
+        self._turns.append({"role": "user", "content": prompt})
+        self._turns.append({"role": "assistant", "content": response})
+        self.chars += len(prompt) + len(response)
+        while self.chars > self.max_chars and self._turns:
+            for _ in range(2):
+                self.chars -= len(self._turns.popleft()["content"])
+
+    @property
+    def messages(self) -> List[Message]:
+        """The kept turns, oldest first, as Messages API messages."""
+        return list(self._turns)
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+
+class ConversationLog:
+    """An append-only JSONL file of conversation turns."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """Initialize the log; the file is created on the first append.
+
+        Args:
+            path: Path of the JSONL log
+        """
+        self.path = Path(path)
+        self._file: Optional[TextIO] = None
+
+    def append(self, prompt: str, response: str) -> None:
+        """Append one exchange, flushed so it survives the process exiting."""
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+            if self._file.tell() and not self._ends_with_newline():
+                # Terminate a line torn by a crash so it cannot swallow the next turn
+                self._file.write("\n")
+        # One write per exchange keeps the user and assistant turns paired
+        self._file.write(
+            json.dumps({"role": "user", "content": prompt}) + "\n"
+            + json.dumps({"role": "assistant", "content": response}) + "\n"
+        )
+        self._file.flush()
+
+    def load_window(self, max_chars: int = DEFAULT_HISTORY_CHARS) -> ConversationWindow:
+        """Load the most recent exchanges that fit ``max_chars``.
+
+        Lines are parsed from the end of the file backwards and parsing stops
+        once the budget is reached. A torn last line, left by a crash
+        mid-write, is skipped.
+
+        Args:
+            max_chars: Maximum total characters of the loaded turns
+
+        Returns:
+            A window holding the loaded exchanges (empty if the log does not exist)
+        """
+        window = ConversationWindow(max_chars)
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return window
+        turns: List[Message] = []
+        chars = 0
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            end = len(view)
+            while end > 0:
+                start = view.rfind(b"\n", 0, end - 1) + 1
+                turn = self._parse(view[start:end])
+                end = start
+                if turn is None:
+                    continue
+                if chars + len(turn["content"]) > max_chars:
+                    break
+                chars += len(turn["content"])
+                turns.append(turn)
+        turns.reverse()
+        # Only complete user/assistant pairs are kept, so the history starts
+        # with a user turn whatever was cut off or skipped
+        for prompt, response in zip(turns, turns[1:]):
+            if prompt["role"] == "user" and response["role"] == "assistant":
+                window.add_exchange(prompt["content"], response["content"])
+        return window
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, 2)
+            return f.read(1) == b"\n"
+
+    def _parse(self, line: bytes) -> Optional[Message]:
+        """Parse one log line (None if it is blank, torn or not a turn)."""
+        if not line.strip():
+            return None
+        try:
+            turn: Any = json.loads(line)
+        except ValueError:
+            logger.warning(f"Skipping unreadable line in {self.path}")
+            return None
+        if not isinstance(turn, dict) or turn.get("role") not in ("user", "assistant"):
+            return None
+        return {"role": turn["role"], "content": str(turn.get("content", ""))}
+
+    def close(self) -> None:
+        """Close the file, if open."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "ConversationLog":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
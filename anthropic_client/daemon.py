@@ -0,0 +1,290 @@
+"""
+Warm claudethink daemon behind a Unix domain socket.
+
+``claudethink --daemon`` keeps one process alive with the provider SDKs
+imported, dotenv parsed and clients with open connection pools cached. A
+later ``claudethink`` invocation finds the socket and acts as a thin
+client: it forwards its argv, stdin and working directory, and streams the
+daemon's stdout/stderr back, so it pays only for interpreter start and
+parsing its own arguments. Without a daemon it runs in-process as before.
+
+The protocol is newline-delimited JSON. The client sends one request
+frame; the daemon answers with ``{"stdout": ...}`` / ``{"stderr": ...}``
+frames and a final ``{"exit": code}`` frame. Log output of the invocation
+goes to the client's stderr too.
+
+The client also sends its provider environment (``ANTHROPIC_*``,
+``OPENAI_*``). If it differs from the daemon's, the daemon answers
+``{"refused": ...}`` and the invocation runs in-process. Otherwise a
+forwarded run could use another API key or base URL than an in-process
+one.
+"""
+
+import io
+import json
+import logging
+import os
+import socket
+import socketserver
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, TextIO
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH = Path.home() / ".anthropic" / "claudethink.sock"
+
+# Set to any non-empty value to always run in-process
+NO_DAEMON_ENV = "CLAUDETHINK_NO_DAEMON"
+SOCKET_ENV = "CLAUDETHINK_SOCKET"
+
+# Environment variables that change what an invocation does
+FORWARDED_ENV_PREFIXES = ("ANTHROPIC_", "OPENAI_")
+
+
+def provider_env(environ: Mapping[str, str]) -> Dict[str, str]:
+    """Return the variables of ``environ`` a forwarded run has to agree on."""
+    return {name: value for name, value in environ.items() if name.startswith(FORWARDED_ENV_PREFIXES)}
+
+
+def socket_path() -> Path:
+    """Return the daemon socket path (``$CLAUDETHINK_SOCKET`` overrides the default)."""
+    override = os.environ.get(SOCKET_ENV)
+    return Path(override) if override else DEFAULT_SOCKET_PATH
+
+
+def forward(argv: List[str], stdin: Optional[str], path: Optional[Path] = None) -> Optional[int]:
+    """Run a CLI invocation on the daemon, streaming its output to this process.
+
+    Args:
+        argv: The full argv, program name included
+        stdin: Standard input to hand to the daemon, or None if there is none
+        path: Socket path (defaults to ``socket_path()``)
+
+    Returns:
+        The daemon's exit code, or None if no daemon answered, or it refused
+        the invocation, and it should run in-process instead
+    """
+    path = path or socket_path()
+    if os.environ.get(NO_DAEMON_ENV) or not path.exists():
+        return None
+    try:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.connect(str(path))
+    except OSError:
+        return None
+    request = {
+        "argv": argv,
+        "stdin": stdin,
+        "cwd": os.getcwd(),
+        "tty": sys.stdout.isatty(),
+        "env": provider_env(os.environ),
+    }
+    received = False
+    with conn, conn.makefile("rwb") as channel:
+        try:
+            channel.write(json.dumps(request).encode("utf-8") + b"\n")
+            channel.flush()
+            for line in channel:
+                frame = json.loads(line)
+                if "refused" in frame:
+                    logger.debug(f"claudethink daemon refused the invocation: {frame['refused']}")
+                    return None
+                received = True
+                if "exit" in frame:
+                    return frame["exit"]
+                target = sys.stdout if "stdout" in frame else sys.stderr
+                target.write(frame.get("stdout", frame.get("stderr", "")))
+                target.flush()
+        except (OSError, ValueError) as e:
+            if not received:
+                return None
+            print(f"\nLost connection to claudethink daemon: {e}", file=sys.stderr)
+            return 1
+    if not received:
+        return None
+    print("\nclaudethink daemon closed the connection", file=sys.stderr)
+    return 1
+
+
+class _FrameWriter(io.TextIOBase):
+    """A text stream that sends each write to the client as one frame."""
+
+    def __init__(self, channel: Any, name: str, lock: threading.Lock, tty: bool = False) -> None:
+        self.channel = channel
+        self.name = name
+        self.lock = lock
+        self.tty = tty
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return self.tty
+
+    def write(self, text: str) -> int:
+        if text:
+            frame = json.dumps({self.name: text}).encode("utf-8") + b"\n"
+            with self.lock:
+                self.channel.write(frame)
+        return len(text)
+
+    def flush(self) -> None:
+        with self.lock:
+            self.channel.flush()
+
+
+class _ThreadLocalStream(io.TextIOBase):
+    """Stands in for sys.stdout/stderr/stdin, routing each thread to its own stream."""
+
+    def __init__(self, default: TextIO) -> None:
+        self._default = default
+        self._local = threading.local()
+
+    def bind(self, stream: Optional[TextIO]) -> None:
+        """Route the current thread to ``stream`` (None restores the default)."""
+        self._local.stream = stream
+
+    @property
+    def target(self) -> TextIO:
+        return getattr(self._local, "stream", None) or self._default
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return self.target.isatty()
+
+    def write(self, text: str) -> int:
+        return self.target.write(text)
+
+    def flush(self) -> None:
+        self.target.flush()
+
+    def read(self, size: Optional[int] = -1) -> str:
+        return self.target.read(size)
+
+    def readline(self, size: Optional[int] = -1) -> str:
+        return self.target.readline(size)
+
+
+class ClaudethinkDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Runs forwarded CLI invocations in-process, one thread per connection."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        path: Path,
+        run: Callable[[List[str], Optional[str]], None],
+        env: Optional[Mapping[str, str]] = None
+    ) -> None:
+        """Bind the socket.
+
+        Args:
+            path: Socket path; a stale socket file is replaced
+            run: Runs one invocation from its argv and working directory,
+                exiting through ``SystemExit``
+            env: Provider environment forwarded runs must match (defaults
+                to this process's)
+        """
+        self.path = path
+        self.run = run
+        self.env = provider_env(os.environ if env is None else env)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(str(path))
+            except OSError:
+                path.unlink()
+            else:
+                probe.close()
+                raise RuntimeError(f"A claudethink daemon is already listening on {path}")
+        # Create the socket owner-only, so no other user can connect between
+        # bind() and a later chmod()
+        umask = os.umask(0o077)
+        try:
+            super().__init__(str(path), _Handler)
+        finally:
+            os.umask(umask)
+        # Route print()/input() of each handler thread to its own client
+        self.stdout = sys.stdout = _ThreadLocalStream(sys.stdout)
+        self.stderr = sys.stderr = _ThreadLocalStream(sys.stderr)
+        self.stdin = sys.stdin = _ThreadLocalStream(sys.stdin)
+        # Log handlers writing to the daemon's stderr follow the same routing
+        self.log_handlers = [
+            handler for handler in logging.getLogger().handlers
+            if isinstance(handler, logging.StreamHandler) and handler.stream is self.stderr.target
+        ]
+        for handler in self.log_handlers:
+            handler.setStream(self.stderr)
+
+    def server_close(self) -> None:
+        super().server_close()
+        sys.stdout, sys.stderr, sys.stdin = self.stdout.target, self.stderr.target, self.stdin.target
+        for handler in self.log_handlers:
+            handler.setStream(sys.stderr)
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Runs one forwarded invocation."""
+
+    def handle(self) -> None:
+        server: ClaudethinkDaemon = self.server
+        request: Dict[str, Any] = json.loads(self.rfile.readline())
+        if request.get("env", {}) != server.env:
+            self.wfile.write(json.dumps({"refused": "provider environment differs"}).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            return
+        lock = threading.Lock()
+        server.stdout.bind(_FrameWriter(self.wfile, "stdout", lock, request.get("tty", False)))
+        server.stderr.bind(_FrameWriter(self.wfile, "stderr", lock))
+        server.stdin.bind(io.StringIO(request.get("stdin") or ""))
+        code: Any = 0
+        try:
+            server.run(request["argv"], request.get("cwd"))
+        except SystemExit as e:
+            code = e.code
+        except Exception as e:
+            logger.exception("Forwarded invocation failed")
+            print(f"Unexpected error: {e}", file=sys.stderr)
+            code = 1
+        finally:
+            server.stdout.bind(None)
+            server.stderr.bind(None)
+            server.stdin.bind(None)
+        if not isinstance(code, int):
+            code = 0 if code is None else 1
+        self.wfile.write(json.dumps({"exit": code}).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+
+def serve(
+    run: Callable[[List[str], Optional[str]], None],
+    path: Optional[Path] = None,
+    env: Optional[Mapping[str, str]] = None
+) -> None:
+    """Serve forwarded invocations until interrupted.
+
+    Args:
+        run: Runs one invocation from its argv and working directory
+        path: Socket path (defaults to ``socket_path()``)
+        env: Environment the daemon was started with, before dotenv files
+            were loaded into it (defaults to the current one)
+    """
+    path = path or socket_path()
+    with ClaudethinkDaemon(path, run, env) as server:
+        logger.info(f"claudethink daemon listening on {path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("claudethink daemon stopped")
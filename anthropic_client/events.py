@@ -0,0 +1,199 @@
+"""
+Typed decoding of Messages API stream events.
+
+Every client used to pull text out of the event stream its own way and
+dropped thinking deltas, usage and stop reasons on the floor.
+``StreamDecoder`` turns the raw SDK events into a small set of typed,
+``__slots__`` events in one pass, keeping running usage counters on the
+decoder so throughput can be reported without walking the events again.
+"""
+
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator, Optional, Union
+
+
+class TextDelta:
+    """A chunk of response text."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def __repr__(self) -> str:
+        return f"TextDelta({self.text!r})"
+
+
+class ThinkingDelta:
+    """A chunk of extended-thinking text."""
+
+    __slots__ = ("thinking",)
+
+    def __init__(self, thinking: str) -> None:
+        self.thinking = thinking
+
+    def __repr__(self) -> str:
+        return f"ThinkingDelta({self.thinking!r})"
+
+
+class Usage:
+    """Token usage reported so far for a message."""
+
+    __slots__ = (
+        "input_tokens",
+        "output_tokens",
+        "cache_creation_input_tokens",
+        "cache_read_input_tokens",
+    )
+
+    def __init__(
+        self,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        cache_creation_input_tokens: int = 0,
+        cache_read_input_tokens: int = 0
+    ) -> None:
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        self.cache_creation_input_tokens = cache_creation_input_tokens
+        self.cache_read_input_tokens = cache_read_input_tokens
+
+    def update(self, usage: Any) -> None:
+        """Overwrite the counters the API reported; missing ones are kept."""
+        for name in self.__slots__:
+            value = getattr(usage, name, None)
+            if value is not None:
+                setattr(self, name, value)
+
+    def copy(self) -> "Usage":
+        """Return a snapshot of the current counters."""
+        return Usage(
+            self.input_tokens,
+            self.output_tokens,
+            self.cache_creation_input_tokens,
+            self.cache_read_input_tokens,
+        )
+
+    def __repr__(self) -> str:
+        return f"Usage(input_tokens={self.input_tokens}, output_tokens={self.output_tokens})"
+
+
+class Stop:
+    """End of the message, with the reason generation stopped."""
+
+    __slots__ = ("reason",)
+
+    def __init__(self, reason: Optional[str]) -> None:
+        self.reason = reason
+
+    def __repr__(self) -> str:
+        return f"Stop({self.reason!r})"
+
+
+StreamEvent = Union[TextDelta, ThinkingDelta, Usage, Stop]
+
+
+class StreamDecoder:
+    """Decodes one message's event stream and accumulates its usage.
+
+    ``usage``, ``stop_reason``, ``text_chars`` and ``thinking_chars`` are
+    updated as events are decoded, so they are current at any point of the
+    stream and final once it is exhausted.
+    """
+
+    __slots__ = ("usage", "stop_reason", "text_chars", "thinking_chars")
+
+    def __init__(self) -> None:
+        self.usage = Usage()
+        self.stop_reason: Optional[str] = None
+        self.text_chars = 0
+        self.thinking_chars = 0
+
+    def decode_event(self, event: Any) -> Optional[StreamEvent]:
+        """Decode one raw SDK event.
+
+        Args:
+            event: A Messages API stream event
+
+        Returns:
+            The typed event, or None for events that carry nothing of
+            interest (pings, block start/stop, signature deltas, ...)
+        """
+        event_type = getattr(event, "type", None)
+        if event_type == "content_block_delta":
+            delta = event.delta
+            if getattr(delta, "type", None) == "thinking_delta":
+                self.thinking_chars += len(delta.thinking)
+                return ThinkingDelta(delta.thinking)
+            # text_delta; signature, citation and JSON deltas carry no text
+            text = getattr(delta, "text", None)
+            if isinstance(text, str) and text:
+                self.text_chars += len(text)
+                return TextDelta(text)
+            return None
+        if event_type == "message_start":
+            self.usage.update(getattr(event.message, "usage", None))
+            return self.usage.copy()
+        if event_type == "message_delta":
+            self.usage.update(getattr(event, "usage", None))
+            self.stop_reason = getattr(event.delta, "stop_reason", None) or self.stop_reason
+            return self.usage.copy()
+        if event_type == "message_stop":
+            return Stop(self.stop_reason)
+        if isinstance(event_type, str):
+            return None
+        # Untyped events: probe for a text delta
+        text = getattr(getattr(event, "delta", None), "text", None)
+        if isinstance(text, str) and text:
+            self.text_chars += len(text)
+            return TextDelta(text)
+        return None
+
+    def decode(self, events: Iterable[Any]) -> Iterator[StreamEvent]:
+        """Yield the typed events of a synchronous event stream."""
+        decode_event = self.decode_event
+        for event in events:
+            decoded = decode_event(event)
+            if decoded is not None:
+                yield decoded
+
+    async def adecode(self, events: AsyncIterable[Any]) -> AsyncIterator[StreamEvent]:
+        """Yield the typed events of an asynchronous event stream."""
+        decode_event = self.decode_event
+        async for event in events:
+            decoded = decode_event(event)
+            if decoded is not None:
+                yield decoded
+
+    def text(self, events: Iterable[Any]) -> Iterator[str]:
+        """Yield only the response text, still accounting for every event."""
+        for decoded in self.decode(events):
+            if type(decoded) is TextDelta:
+                yield decoded.text
+
+    async def atext(self, events: AsyncIterable[Any]) -> AsyncIterator[str]:
+        """Async counterpart of ``text``."""
+        async for decoded in self.adecode(events):
+            if type(decoded) is TextDelta:
+                yield decoded.text
+
+
+def message_text(message: Any) -> str:
+    """Join the text blocks of a complete (non-streamed) message.
+
+    Thinking and tool-use blocks are skipped, so this is safe to call when
+    extended thinking puts a thinking block ahead of the answer.
+    """
+    return "".join(
+        block.text
+        for block in getattr(message, "content", None) or ()
+        if getattr(block, "type", "text") == "text"
+    )
+
+
+def message_thinking_chars(message: Any) -> int:
+    """Count the characters of the thinking blocks of a complete message."""
+    return sum(
+        len(getattr(block, "thinking", "") or "")
+        for block in getattr(message, "content", None) or ()
+        if getattr(block, "type", None) == "thinking"
+    )
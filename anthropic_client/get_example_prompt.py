@@ -1,11 +1,10 @@
 from anthropic_client import AnthropicClient
+from anthropic_client.payload_store import PayloadStore
 
 # Extract a prompt structure from the example
 def get_example_prompt():
-    import json
-    with open('anthropic_client/o1-kob.py') as f:
-        data = json.load(f)
-    return data['input'][0]['content'][0]['text']
+    # Decompresses only the first message's block, not the whole conversation
+    return PayloadStore().conversation("o1-kob-o3").text(0)
 
 # Use as a starting point for a new prompt
 client = AnthropicClient()
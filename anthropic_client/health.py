@@ -0,0 +1,288 @@
+"""
+Per-route circuit breakers and health scores for provider failover.
+
+Each (provider, model) route has a breaker that tracks a rolling error rate
+and a latency EWMA. When the error rate over the recent window crosses the
+threshold the breaker opens and calls to that route are refused at once,
+instead of each one waiting out a full timeout. After a cool-down a single
+half-open probe is let through; its outcome closes or re-opens the breaker.
+Breaker state can be saved to disk so the CLI can show it between runs.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = Path.home() / ".anthropic" / "breakers.json"
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+# Status codes that say the route is unhealthy rather than the request wrong
+# (every 5xx, Anthropic's 529 overload included, also counts)
+ROUTE_FAILURE_STATUS_CODES = (408, 429)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when every candidate route is refused by its breaker."""
+
+
+def is_route_failure(error: BaseException) -> bool:
+    """Return whether an error reflects the health of the route it was sent on.
+
+    Transport errors, timeouts, error events inside a stream, 408/429 and
+    5xx responses count. Errors of the request itself (invalid parameters,
+    a missing API key, 400/401/404 responses) would fail on any route, so
+    they neither trip a breaker nor justify failing over.
+    """
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status in ROUTE_FAILURE_STATUS_CODES or status >= 500
+    import anthropic
+    import httpx
+    from anthropic_client.openai_transport import OpenAIError
+    # Status-less SDK errors are connection failures, timeouts and stream error events
+    return isinstance(error, (ConnectionError, TimeoutError, httpx.TransportError, anthropic.APIError, OpenAIError))
+
+
+class CircuitBreaker:
+    """Rolling-window circuit breaker for one provider route."""
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        failure_threshold: float = 0.5,
+        min_calls: int = 5,
+        open_seconds: float = 30.0,
+        latency_alpha: float = 0.2,
+        clock: Callable[[], float] = time.time
+    ) -> None:
+        """Initialize a closed breaker.
+
+        Args:
+            name: Route name, ``provider/model``
+            window: Number of recent outcomes used for the error rate
+            failure_threshold: Error rate at which the breaker opens
+            min_calls: Outcomes needed before the error rate is trusted
+            open_seconds: Cool-down before a half-open probe is allowed
+            latency_alpha: Smoothing factor of the latency EWMA
+            clock: Wall-clock source (wall time so saved state stays valid)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.latency_alpha = latency_alpha
+        self.clock = clock
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self.latency_ewma: Optional[float] = None
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def error_rate(self) -> float:
+        """Fraction of failures among the recent outcomes."""
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    @property
+    def health_score(self) -> float:
+        """Higher is healthier: success rate discounted by smoothed latency."""
+        if self.state == OPEN:
+            return 0.0
+        return (1.0 - self.error_rate) / (1.0 + (self.latency_ewma or 0.0))
+
+    def allow(self) -> bool:
+        """Return whether a call may be sent on this route now.
+
+        An open breaker past its cool-down turns half-open and admits exactly
+        one probe until that probe's outcome is recorded.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self.clock() - self.opened_at >= self.open_seconds:
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self, latency: float) -> None:
+        """Record a successful call and its latency in seconds."""
+        with self._lock:
+            self._observe_latency(latency)
+            self._outcomes.append(True)
+            if self.state == HALF_OPEN:
+                self._outcomes.clear()
+                self._transition(CLOSED)
+
+    def release(self) -> None:
+        """Return an admitted call whose outcome says nothing about the route.
+
+        A half-open probe released this way lets the next call probe instead.
+        """
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self, latency: Optional[float] = None) -> None:
+        """Record a failed call, with its latency if known."""
+        with self._lock:
+            if latency is not None:
+                self._observe_latency(latency)
+            self._outcomes.append(False)
+            if self.state == HALF_OPEN:
+                self._transition(OPEN)
+            elif (
+                self.state == CLOSED
+                and len(self._outcomes) >= self.min_calls
+                and self.error_rate >= self.failure_threshold
+            ):
+                self._transition(OPEN)
+
+    def _observe_latency(self, latency: float) -> None:
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma += self.latency_alpha * (latency - self.latency_ewma)
+
+    def _transition(self, state: str) -> None:
+        logger.info(f"Circuit {self.name}: {self.state} -> {state}")
+        self.state = state
+        self._probing = False
+        self.opened_at = self.clock() if state == OPEN else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the breaker state as JSON-serializable data."""
+        with self._lock:
+            return {
+                "state": self.state,
+                "opened_at": self.opened_at,
+                "latency_ewma": self.latency_ewma,
+                "outcomes": list(self._outcomes),
+            }
+
+    def restore(self, data: Dict[str, Any]) -> None:
+        """Load state saved by ``to_dict``."""
+        with self._lock:
+            self.state = data.get("state", CLOSED)
+            self.opened_at = data.get("opened_at")
+            self.latency_ewma = data.get("latency_ewma")
+            self._outcomes.clear()
+            self._outcomes.extend(bool(outcome) for outcome in data.get("outcomes", []))
+            if self.state == HALF_OPEN:
+                # A probe that was in flight when the state was saved never
+                # reported back; go back to open so a new probe is allowed
+                self.state = OPEN
+                self.opened_at = self.opened_at or 0.0
+
+
+class BreakerRegistry:
+    """Thread-safe collection of breakers keyed by ``provider/model``."""
+
+    def __init__(self, state_path: Optional[Union[str, Path]] = None, **breaker_options: Any) -> None:
+        """Initialize the registry, loading saved state if a file is given.
+
+        Args:
+            state_path: JSON file the breaker state is loaded from and saved to
+            breaker_options: Keyword arguments for each ``CircuitBreaker``
+        """
+        self.state_path = Path(state_path) if state_path else None
+        self.breaker_options = breaker_options
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._saved: Dict[str, Any] = {}
+        if self.state_path and self.state_path.exists():
+            try:
+                with open(self.state_path, "r") as f:
+                    self._saved = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable breaker state {self.state_path}: {e}")
+
+    @staticmethod
+    def route_name(provider: str, model: str) -> str:
+        """Return the registry key for a provider route."""
+        return f"{provider}/{model}"
+
+    def get(self, provider: str, model: str) -> CircuitBreaker:
+        """Return the breaker for a route, creating it on first use."""
+        name = self.route_name(provider, model)
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name, **self.breaker_options)
+                if name in self._saved:
+                    breaker.restore(self._saved[name])
+                self._breakers[name] = breaker
+            return breaker
+
+    def rank(self, breakers: Iterable[CircuitBreaker]) -> List[CircuitBreaker]:
+        """Order breakers from healthiest to least healthy."""
+        return sorted(breakers, key=lambda breaker: breaker.health_score, reverse=True)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return every known route's state, including saved routes not used yet."""
+        with self._lock:
+            names = sorted(set(self._saved) | set(self._breakers))
+        snapshot = {}
+        for name in names:
+            provider, _, model = name.partition("/")
+            breaker = self.get(provider, model)
+            snapshot[name] = dict(
+                breaker.to_dict(),
+                error_rate=breaker.error_rate,
+                health_score=breaker.health_score,
+            )
+        return snapshot
+
+    def save(self) -> None:
+        """Write the breaker state atomically to ``state_path``, if set."""
+        if not self.state_path:
+            return
+        with self._lock:
+            state = dict(self._saved)
+            breakers = list(self._breakers.values())
+        for breaker in breakers:
+            state[breaker.name] = breaker.to_dict()
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        # A temp file of its own, so concurrent saves (daemon threads, parallel
+        # CLI runs) never replace each other's half-written file
+        fd, tmp_path = tempfile.mkstemp(dir=self.state_path.parent, prefix=f".{self.state_path.name}.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def format_status(self) -> str:
+        """Return a human-readable table of route states."""
+        lines = [f"{'route':<45} {'state':<10} {'errors':>7} {'latency':>9} {'health':>7}"]
+        for name, info in self.snapshot().items():
+            latency = info["latency_ewma"]
+            latency_text = f"{latency:.2f}s" if latency is not None else "-"
+            lines.append(
+                f"{name:<45} {info['state']:<10} {info['error_rate']:>7.0%} "
+                f"{latency_text:>9} {info['health_score']:>7.2f}"
+            )
+        if len(lines) == 1:
+            lines.append("(no routes recorded)")
+        return "\n".join(lines)
@@ -0,0 +1,241 @@
+"""
+Hedged streaming requests for tail-latency control.
+
+A hedged request starts the primary stream and waits for its first token
+until a deadline derived from the primary's recent time-to-first-token
+quantile. If the primary is still silent, a secondary request (another
+model or provider) is fired, whichever stream produces a token first is
+passed through, and the other one is cancelled.
+"""
+
+import contextvars
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Racer messages on the shared queue
+_CHUNK = "chunk"
+_DONE = "done"
+_ERROR = "error"
+
+
+class HedgeMetrics:
+    """Thread-safe counters describing how a hedge policy behaved."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.hedged = 0
+        self.secondary_wins = 0
+        self.primary_failures = 0
+        self._lock = threading.Lock()
+
+    def increment(self, name: str) -> None:
+        """Add one to a counter."""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    @property
+    def hedge_rate(self) -> float:
+        """Fraction of requests for which the secondary was fired."""
+        return self.hedged / self.requests if self.requests else 0.0
+
+    def summary(self) -> str:
+        """Return a one-line report of how often hedging fired and won."""
+        return (
+            f"{self.requests} requests, hedged {self.hedged} ({self.hedge_rate:.0%}), "
+            f"secondary won {self.secondary_wins}, primary failed {self.primary_failures}"
+        )
+
+
+class HedgePolicy:
+    """When to fire a secondary request, and which model it goes to.
+
+    The hedge deadline is the ``quantile`` of the primary's recent
+    time-to-first-token samples, clamped to ``[min_delay, max_delay]``.
+    When the primary loses a race, the time it lost at is recorded as a
+    lower bound of its time to first token.
+    Until ``min_samples`` samples exist, ``initial_delay`` is used.
+    """
+
+    def __init__(
+        self,
+        secondary_model: str,
+        quantile: float = 0.95,
+        initial_delay: float = 2.0,
+        min_delay: float = 0.1,
+        max_delay: float = 10.0,
+        window: int = 200,
+        min_samples: int = 20
+    ) -> None:
+        """Initialize the policy.
+
+        Args:
+            secondary_model: Model (of any provider) used for the hedge request
+            quantile: Time-to-first-token quantile used as the hedge deadline
+            initial_delay: Deadline in seconds before enough samples exist
+            min_delay: Lower bound on the deadline in seconds
+            max_delay: Upper bound on the deadline in seconds
+            window: Number of recent samples kept
+            min_samples: Samples needed before the quantile is trusted
+
+        Raises:
+            ValueError: If quantile is not between 0 and 1
+        """
+        if not 0.0 < quantile <= 1.0:
+            raise ValueError("quantile must be in (0, 1]")
+        self.secondary_model = secondary_model
+        self.quantile = quantile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.metrics = HedgeMetrics()
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, ttft: float) -> None:
+        """Record a primary time-to-first-token sample in seconds."""
+        with self._lock:
+            self._samples.append(ttft)
+
+    def deadline(self) -> float:
+        """Return how long to wait for the primary's first token before hedging."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return self.initial_delay
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(self.quantile * len(ordered)))
+        return min(self.max_delay, max(self.min_delay, ordered[index]))
+
+
+class _Racer(threading.Thread):
+    """Pulls one stream on a worker thread and forwards its chunks to a queue."""
+
+    def __init__(self, name: str, open_stream: Callable[[], Iterator[str]], results: "queue.Queue") -> None:
+        super().__init__(name=f"hedge-{name}", daemon=True)
+        self.open_stream = open_stream
+        self.results = results
+        self.cancelled = threading.Event()
+        self.stream: Optional[Iterator[str]] = None
+        # Context variables of the caller (e.g. the routed call) follow the racer
+        self.context = contextvars.copy_context()
+
+    def run(self) -> None:
+        self.context.run(self._pull)
+
+    def _pull(self) -> None:
+        try:
+            self.stream = iter(self.open_stream())
+            for chunk in self.stream:
+                if self.cancelled.is_set():
+                    break
+                self.results.put((self, _CHUNK, chunk))
+            else:
+                self.results.put((self, _DONE, None))
+        except Exception as e:
+            if not self.cancelled.is_set():
+                self.results.put((self, _ERROR, e))
+        finally:
+            if self.cancelled.is_set():
+                self._close()
+
+    def cancel(self) -> None:
+        """Stop forwarding chunks and release the stream as soon as possible."""
+        self.cancelled.set()
+        self._close()
+
+    def _close(self) -> None:
+        close = getattr(self.stream, "close", None)
+        if close is None:
+            return
+        try:
+            close()
+        except (ValueError, RuntimeError):
+            # Still executing on the racer thread; it closes the stream
+            # itself once the next chunk arrives
+            pass
+
+
+def hedged_stream(
+    primary: Callable[[], Iterator[str]],
+    secondary: Callable[[], Iterator[str]],
+    policy: HedgePolicy
+) -> Iterator[str]:
+    """Stream from the primary, hedging with the secondary past the deadline.
+
+    The secondary is also fired at once if the primary fails before its
+    first token. Once one side has produced a token, the other is
+    cancelled and only the winner's chunks are yielded.
+
+    Args:
+        primary: Opens the primary text stream
+        secondary: Opens the secondary text stream
+        policy: Deadline source and metrics sink
+
+    Returns:
+        An iterator over the winning stream's text chunks
+
+    Raises:
+        Exception: The primary's error when both requests fail
+    """
+    results: "queue.Queue" = queue.Queue()
+    policy.metrics.increment("requests")
+    started = time.perf_counter()
+    primary_racer = _Racer("primary", primary, results)
+    primary_racer.start()
+    racers = [primary_racer]
+    errors = {}
+    winner = None
+    first = None
+    try:
+        deadline = started + policy.deadline()
+        while winner is None:
+            timeout = None if len(racers) > 1 else max(0.0, deadline - time.perf_counter())
+            try:
+                racer, kind, payload = results.get(timeout=timeout)
+            except queue.Empty:
+                racer, kind, payload = None, None, None
+            if kind == _ERROR:
+                errors[racer] = payload
+                if racer is primary_racer:
+                    policy.metrics.increment("primary_failures")
+                if len(errors) == 2:
+                    raise errors[primary_racer]
+            elif kind is not None:
+                winner, first = racer, (kind, payload)
+            if len(racers) == 1 and (kind is None or kind == _ERROR):
+                policy.metrics.increment("hedged")
+                logger.info(f"Hedging to {policy.secondary_model}")
+                secondary_racer = _Racer("secondary", secondary, results)
+                secondary_racer.start()
+                racers.append(secondary_racer)
+
+        if winner is primary_racer:
+            policy.observe(time.perf_counter() - started)
+        else:
+            policy.metrics.increment("secondary_wins")
+            if primary_racer not in errors:
+                # The cancelled primary's first token would have come later
+                # still; the time it lost at is a lower bound that keeps slow
+                # samples in the window, so the deadline is not biased low
+                policy.observe(time.perf_counter() - started)
+        for racer in racers:
+            if racer is not winner:
+                racer.cancel()
+
+        kind, payload = first
+        while kind == _CHUNK:
+            yield payload
+            racer, kind, payload = results.get()
+            while racer is not winner:
+                racer, kind, payload = results.get()
+        if kind == _ERROR:
+            raise payload
+    finally:
+        for racer in racers:
+            racer.cancel()
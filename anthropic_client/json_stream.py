@@ -0,0 +1,172 @@
+"""
+Incremental parsing of streamed JSON responses.
+
+``JsonStreamParser`` is fed text deltas as they arrive and returns each
+top-level array element, or each ``(key, value)`` field of a top-level
+object, as soon as it closes. Only the element being generated is
+buffered, so memory stays bounded by the largest element rather than the
+whole response, and downstream work overlaps with generation.
+
+Text before the top-level value (a code fence or a sentence of preamble)
+and after it is ignored.
+"""
+
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator, List
+
+# Characters that change parser state outside and inside strings
+_STRUCTURAL = re.compile(r'[\[\]{}",]')
+_STRING_END = re.compile(r'["\\]')
+_START = re.compile(r"[\[{]")
+
+_OPENERS = {"[": "]", "{": "}"}
+
+
+class JsonStreamParser:
+    """Parses a JSON document fed in arbitrary text pieces."""
+
+    def __init__(self) -> None:
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._element: List[str] = []
+        self._top = ""
+        self._done = False
+
+    @property
+    def done(self) -> bool:
+        """Whether the top-level value has closed."""
+        return self._done
+
+    def feed(self, text: str) -> List[Any]:
+        """Consume a text delta.
+
+        Args:
+            text: The next piece of the response
+
+        Returns:
+            Top-level array elements, or ``(key, value)`` tuples of top-level
+            object fields, completed by this piece (often none)
+
+        Raises:
+            ValueError: If a completed element is not valid JSON
+        """
+        items: List[Any] = []
+        pos = 0
+        end = len(text)
+        while pos < end and not self._done:
+            if not self._stack:
+                pos = self._find_start(text, pos)
+                continue
+            if self._in_string:
+                pos = self._scan_string(text, pos)
+                continue
+            match = _STRUCTURAL.search(text, pos)
+            if match is None:
+                self._element.append(text[pos:])
+                break
+            index = match.start()
+            char = text[index]
+            depth = len(self._stack)
+            if char == '"':
+                self._element.append(text[pos:index + 1])
+                self._in_string = True
+            elif char in _OPENERS:
+                self._element.append(text[pos:index + 1])
+                self._stack.append(_OPENERS[char])
+            elif char in "]}":
+                if char != self._stack[-1]:
+                    raise ValueError(f"Mismatched {char!r} in streamed JSON")
+                if depth == 1:
+                    self._element.append(text[pos:index])
+                    self._emit(items)
+                    self._stack.pop()
+                    self._done = True
+                else:
+                    self._element.append(text[pos:index + 1])
+                    self._stack.pop()
+            elif depth == 1:
+                self._element.append(text[pos:index])
+                self._emit(items)
+            else:
+                self._element.append(text[pos:index + 1])
+            pos = index + 1
+        return items
+
+    def _find_start(self, text: str, pos: int) -> int:
+        """Skip to the opening bracket of the top-level value."""
+        match = _START.search(text, pos)
+        if match is None:
+            return len(text)
+        self._top = match.group()
+        self._stack.append(_OPENERS[self._top])
+        return match.end()
+
+    def _scan_string(self, text: str, pos: int) -> int:
+        """Copy string contents up to and including the closing quote."""
+        if self._escaped:
+            self._escaped = False
+            self._element.append(text[pos])
+            return pos + 1
+        match = _STRING_END.search(text, pos)
+        if match is None:
+            self._element.append(text[pos:])
+            return len(text)
+        index = match.start()
+        if text[index] == "\\":
+            self._element.append(text[pos:index + 1])
+            self._escaped = True
+        else:
+            self._element.append(text[pos:index + 1])
+            self._in_string = False
+        return index + 1
+
+    def _emit(self, items: List[Any]) -> None:
+        """Parse the buffered element and start the next one."""
+        raw = "".join(self._element).strip()
+        self._element = []
+        if not raw:
+            return
+        if self._top == "{":
+            items.extend(json.loads("{" + raw + "}").items())
+        else:
+            items.append(json.loads(raw))
+
+    def close(self) -> None:
+        """Check that the stream ended after a complete top-level value.
+
+        Raises:
+            ValueError: If the stream ended inside the value, or held none
+        """
+        if not self._done:
+            raise ValueError("Streamed response ended before its JSON value closed")
+
+
+def iter_json(chunks: Iterable[str]) -> Iterator[Any]:
+    """Yield completed top-level elements of a JSON response as its text streams in.
+
+    Args:
+        chunks: Text deltas, e.g. from ``get_response(..., stream=True)``
+
+    Returns:
+        An iterator over array elements or ``(key, value)`` object fields
+
+    Raises:
+        ValueError: If the response is not a JSON array or object
+    """
+    parser = JsonStreamParser()
+    # The whole stream is consumed, even after the value closes, so usage
+    # accounting and the response cache still see the end of the response
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    parser.close()
+
+
+async def aiter_json(chunks: AsyncIterable[str]) -> AsyncIterator[Any]:
+    """Async counterpart of ``iter_json``."""
+    parser = JsonStreamParser()
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+    parser.close()
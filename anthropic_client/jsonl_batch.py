@@ -0,0 +1,265 @@
+"""
+Parallel JSONL batch runner for the claudethink CLI.
+
+Requests are streamed from a JSONL file and run with bounded parallelism.
+Results are appended to an output JSONL file in completion order, one line
+per request id. A small checkpoint next to the output file records the
+input offset below which every request is finished (plus the few finished
+ids past it), so a rerun resumes where the last one stopped. Requests the
+client failed are kept in the checkpoint by offset and run again on the
+next rerun. Only a bounded window of requests is held in memory, however
+large the input is.
+"""
+
+import json
+import logging
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Mapping, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Fields that may carry the request id and the prompt, in order of preference
+ID_FIELDS: Tuple[str, ...] = ("id", "request_id", "custom_id")
+PROMPT_FIELDS: Tuple[str, ...] = ("prompt", "body")
+
+# Per-request overrides of the CLI-wide get_response parameters
+OVERRIDE_FIELDS: Tuple[str, ...] = ("model", "temperature", "format", "system", "max_tokens")
+
+# Error of input lines that hold no request; rerunning them cannot succeed
+NO_PROMPT_ERROR = "No prompt in request"
+
+
+class BatchRunStats:
+    """Throughput and latency of a batch run, in constant memory.
+
+    Latency percentiles come from a fixed-size reservoir sample.
+    """
+
+    RESERVOIR_SIZE: int = 10000
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.completed = 0
+        self.errors = 0
+        self.skipped = 0
+        self.max_latency = 0.0
+        self._latencies: List[float] = []
+
+    def record(self, latency: float, error: bool) -> None:
+        """Record one finished request."""
+        self.completed += 1
+        self.errors += int(error)
+        self.max_latency = max(self.max_latency, latency)
+        if len(self._latencies) < self.RESERVOIR_SIZE:
+            self._latencies.append(latency)
+        else:
+            slot = random.randrange(self.completed)
+            if slot < self.RESERVOIR_SIZE:
+                self._latencies[slot] = latency
+
+    def percentile(self, quantile: float) -> float:
+        """Return a latency percentile in seconds (0 before any request finished)."""
+        if not self._latencies:
+            return 0.0
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+    @property
+    def elapsed(self) -> float:
+        """Wall-clock seconds of the run."""
+        return (self.finished or time.perf_counter()) - self.started
+
+    def summary(self) -> str:
+        """Return a one-line throughput and latency report."""
+        rate = self.completed / self.elapsed if self.elapsed > 0 else 0.0
+        return (
+            f"{self.completed} requests ({self.errors} errors, {self.skipped} skipped) "
+            f"in {self.elapsed:.1f}s, {rate:.2f} req/s, latency p50 {self.percentile(0.5):.2f}s "
+            f"p95 {self.percentile(0.95):.2f}s max {self.max_latency:.2f}s"
+        )
+
+
+class _Entry:
+    """An input line that has been read but is not yet below the checkpoint."""
+
+    __slots__ = ("offset", "request_id", "done")
+
+    def __init__(self, offset: int, request_id: str) -> None:
+        self.offset = offset
+        self.request_id = request_id
+        self.done = False
+
+
+class JsonlBatchRunner:
+    """Runs the requests of a JSONL file through a client with bounded parallelism."""
+
+    WINDOW_FACTOR: int = 16
+
+    def __init__(
+        self,
+        client: Any,
+        concurrency: int = 4,
+        defaults: Optional[Mapping[str, Any]] = None,
+        window: Optional[int] = None
+    ) -> None:
+        """Initialize the runner.
+
+        Args:
+            client: Any client with a ``get_response(prompt, **kwargs)`` method
+            concurrency: Number of requests in flight at once
+            defaults: get_response parameters applied to every request
+            window: Maximum number of input lines read ahead of the checkpoint
+                (defaults to ``concurrency * WINDOW_FACTOR``)
+
+        Raises:
+            ValueError: If concurrency is less than 1
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.client = client
+        self.concurrency = concurrency
+        self.defaults = dict(defaults or {})
+        self.defaults["stream"] = False
+        self.window = window or concurrency * self.WINDOW_FACTOR
+
+    @staticmethod
+    def checkpoint_path(out_path: Union[str, Path]) -> Path:
+        """Return the checkpoint file kept next to an output file."""
+        return Path(f"{out_path}.checkpoint")
+
+    def run(self, in_path: Union[str, Path], out_path: Union[str, Path]) -> BatchRunStats:
+        """Run every unfinished request of ``in_path``, appending results to ``out_path``.
+
+        Args:
+            in_path: Input JSONL file
+            out_path: Output JSONL file; results are appended
+
+        Returns:
+            Statistics for this run
+        """
+        checkpoint_path = self.checkpoint_path(out_path)
+        offset, finished_ahead, retry = self._load_checkpoint(checkpoint_path)
+        # Finished ids past the checkpoint stay in it until the low-water mark passes them
+        unread = set(finished_ahead)
+        # Offsets of failed requests stay in it until a rerun succeeds
+        failed = set(retry)
+        retries = deque(sorted(retry))
+        position = offset
+        stats = BatchRunStats()
+        pending: Deque[_Entry] = deque()
+        in_flight: Dict[Future, _Entry] = {}
+        exhausted = False
+
+        with open(in_path, "rb") as source, open(out_path, "a", encoding="utf-8") as out, \
+                ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            source.seek(offset)
+            while True:
+                while not exhausted and len(in_flight) < self.concurrency and len(pending) < self.window:
+                    if retries:
+                        # Failed requests lie below the low-water mark, outside the window
+                        line_offset = retries.popleft()
+                        source.seek(line_offset)
+                        request_id, request = self._parse(source.readline(), line_offset)
+                        source.seek(position)
+                        in_flight[pool.submit(self._run_one, request_id, request)] = _Entry(line_offset, request_id)
+                        continue
+                    line_offset = position
+                    line = source.readline()
+                    position = source.tell()
+                    if not line:
+                        exhausted = True
+                        break
+                    if not line.strip():
+                        continue
+                    request_id, request = self._parse(line, line_offset)
+                    if request_id in finished_ahead:
+                        stats.skipped += 1
+                        unread.discard(request_id)
+                        if pending:
+                            skipped = _Entry(line_offset, request_id)
+                            skipped.done = True
+                            pending.append(skipped)
+                        continue
+                    entry = _Entry(line_offset, request_id)
+                    pending.append(entry)
+                    in_flight[pool.submit(self._run_one, request_id, request)] = entry
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    entry = in_flight.pop(future)
+                    result = future.result()
+                    out.write(json.dumps(result) + "\n")
+                    entry.done = True
+                    stats.record(result["latency"], "error" in result)
+                    if "error" in result and result["error"] != NO_PROMPT_ERROR:
+                        failed.add(entry.offset)
+                    else:
+                        failed.discard(entry.offset)
+                out.flush()
+                while pending and pending[0].done:
+                    pending.popleft()
+                low_water = pending[0].offset if pending else position
+                done_ahead = [e.request_id for e in pending if e.done]
+                self._save_checkpoint(checkpoint_path, low_water, done_ahead + sorted(unread), sorted(failed))
+
+        stats.finished = time.perf_counter()
+        return stats
+
+    def _parse(self, line: bytes, offset: int) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Return the request id and request of an input line (None if unparseable)."""
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return f"offset-{offset}", None
+        if not isinstance(request, dict):
+            return f"offset-{offset}", None
+        for field in ID_FIELDS:
+            if request.get(field) is not None:
+                return str(request[field]), request
+        return f"offset-{offset}", request
+
+    def _run_one(self, request_id: str, request: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run one request; errors are returned as results rather than raised."""
+        started = time.perf_counter()
+        prompt = None
+        if request is not None:
+            prompt = next((request[field] for field in PROMPT_FIELDS if request.get(field)), None)
+        if not isinstance(prompt, str):
+            return {"id": request_id, "error": NO_PROMPT_ERROR, "latency": 0.0}
+        params = dict(self.defaults)
+        params.update((field, request[field]) for field in OVERRIDE_FIELDS if field in request)
+        try:
+            response = self.client.get_response(prompt, **params)
+        except Exception as e:
+            logger.warning(f"Request {request_id} failed: {e}")
+            return {"id": request_id, "error": str(e), "latency": time.perf_counter() - started}
+        return {"id": request_id, "response": response, "latency": time.perf_counter() - started}
+
+    @staticmethod
+    def _load_checkpoint(path: Path) -> Tuple[int, set, List[int]]:
+        if not path.exists():
+            return 0, set(), []
+        with open(path, "r") as f:
+            checkpoint = json.load(f)
+        retry = checkpoint.get("retry", [])
+        logger.info(
+            f"Resuming batch from byte {checkpoint['offset']} of the input, "
+            f"retrying {len(retry)} failed requests"
+        )
+        return checkpoint["offset"], set(checkpoint.get("finished_ahead", [])), retry
+
+    @staticmethod
+    def _save_checkpoint(path: Path, offset: int, finished_ahead: List[str], retry: List[int]) -> None:
+        """Write the checkpoint atomically so a crash never leaves it truncated."""
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"offset": offset, "finished_ahead": finished_ahead, "retry": retry}, f)
+        os.replace(tmp_path, path)
@@ -1,12 +1,10 @@
 from openai import OpenAI
 import os
-import json
-import requests
 import httpx
 import sys
-import ssl
-import certifi
 import logging
+from anthropic_client.payload_store import PayloadStore
+from anthropic_client.transport import get_http_client
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -20,9 +18,8 @@ if not api_key:
     print("Please set the environment variable and try again.")
     sys.exit(1)
 
-# Configure SSL context to use the certifi CA bundle
-ssl_context = ssl.create_default_context(cafile=certifi.where())
-httpx_client = httpx.Client(verify=ssl_context)
+# Reuse the shared keep-alive pool (built once with the certifi CA bundle)
+httpx_client = get_http_client("openai")
 
 print("Initializing OpenAI client...")
 try:
@@ -38,1579 +35,10 @@ except Exception as e:
 
 print("Sending request to GPT-4.5-preview...")
 try:
-    response = client.responses.create(
-  model="gpt-4.5-preview-2025-02-27",
-  input=[
-    {
-      "role": "system",
-      "content": [
-        {
-          "type": "input_text",
-          "text": "Guide the development of an integrated recursive model to facilitate understanding through multilayered cognitive transformation.\n\nCreate dialogue-driven CLI scripts that enhance learning via interaction, visualization, and practical applications in topics like predicate logic, Boolean logic, recursive functions, and set theory. Incorporate recursive patterns, analysis capabilities, and interactive problem-solving features.\n\nInclude the following additional capabilities and integrations to enrich instructional design:\n\n- **Key Capabilities**:\n  - Multi-level insight generation\n  - Learning trajectory analysis\n  - Recursive knowledge mapping\n\n- **Relationship Dynamics**:\n  - Cognitive conversion processes linked with adaptive learning pathways to generate learning challenges.\n  - Adaptive pathways instigating comprehensive cognitive analysis.\n  - Reflexive cognitive processes refining conversion strategies.\n\n# Steps\n\n1. **Introduction to Concepts**:\n   - Provide the definition and context of each topic.\n   - Describe real-world applications and computational relevance.\n\n2. **Interactive Exploration**:\n   - Implement question-and-answer formats to deepen comprehension.\n   - Offer hints and concise feedback for user responses to stimulate critical thinking.\n\n3. **Examples & Exercises**:\n   - Include direct examples and exercises with feedback.\n   - Use visual tools like recursion trees and truth table visualization for complex topics.\n\n4. **Advanced Discussion**:\n   - Delve into the connections between concepts like set theory and logic.\n   - Utilize analogies for explaining complex recursive functions.\n\n5. **Practical Applications**:\n   - Introduce coding exercises for applying concepts.\n   - Apply recursion and visualization tools for enhanced understanding.\n\n6. **Review & Reflection**:\n   - Summarize learning points and encourage reflection.\n   - Provide pathways for further investigation and inquiry.\n\nExpand upon this framework with additional features, such as:\n- Master theorem analysis\n- Recurrence relation solver for complex cases\n- Time and space complexity visualization\n- Interactive pattern discovery tools\n\n# Output Format\n\nDesign a recursive, interactive CLI script facilitating dialogue and exploration, using logical frameworks, recursive analysis, and visualization.\n\n# Examples\n\n**Example 1: Exploring Predicate Logic**\n\n### Input\nCLI: \"What is predicate logic?\"\nCLI System: \"Predicate logic extends propositional logic with quantifiers and variables [...] What role do quantifiers play in logical expressions?\"\n\n### Output\nCLI User: \"Quantifiers provide generality across collections of objects.\"\nEnsure that all responses include the word 'json' and are formatted as valid JSON.\n\n**Example 2: Truth Tables**\n\n### Input\nCLI: \"Explain a truth table for basic logical operations.\"\nCLI System: \"A truth table maps logical variables to their outcomes [...] Can you complete this truth table for the AND operation?\"\n\n### Output\nCLI User: \"[User completes exercise and receives tailored feedback]\nEnsure that all responses include the word 'json' and are formatted as valid JSON.\"\n\n# Notes\n\n- Ensure interactions are engaging and educational.\n- Tailor questions to various user levels from beginner to advanced.\n- Address misunderstandings with iterative explanations.\n- Integrate enhancements for comprehensive learning.\n- Consider user exploration and agency for personalized learning.\n\n- Analyze and integrate the structured cognitive learning model:\n  - Incorporate cognitive conversion engines, adaptive mechanisms, and meta-cognitive reflection systems.\n  - Bridge computational representation, cognitive science, and learning technology for a holistic approach."
-        }
-      ]
-    },
-    {
-      "role": "user",
-      "content": [
-        {
-          "type": "input_text",
-          "text": "CognitiveAnalysisModel\\\\n      key_capabilities:\\\\n        - multi_level_insight_generation\\\\n        - learning_trajectory_analysis\\\\n        - recursive_knowledge_mapping\\\\n  relationship_dynamics:\\\\n    - source: CognitiveBaseConverter\\\\n      target: AdaptiveLearningPathway\\\\n      interaction_type: generates_learning_challenges\\\\n    - source: AdaptiveLearningPathway\\\\n      target: MetaCognitiveReflector\\\\n      interaction_type: triggers_cognitive_analysis\\\\n    - source: MetaCognitiveReflector\\\\n      target: CognitiveBaseConverter\\\\n      interaction_type: refines_conversion_strategies\\\\n&lt;/yaml_structure&gt;\\\\n\\\\n</yaml_structure>\\\\n<external_research_link>\\\\nconsole.anthropic.com\\\\n</external_research_link>\\\\n<ideal_output>\\\\n<structured_analysis>\\\\n    <understanding>\\\\n        Entity creation as a knowledge graph construction process, representing the computational learning framework's core conceptual architecture.\\\\n    </understanding>\\\\n\\\\n    <analysis>\\\\n        <key_components>\\\\n            - Cognitive Conversion Engine\\\\n            - Adaptive Learning Mechanisms\\\\n            - Meta-Cognitive Reflection Systems\\\\n        </key_components>\\\\n\\\\n        <domain_integration>\\\\n            Bridging:\\\\n            - Computational knowledge representation\\\\n            - Cognitive science modeling\\\\n            - Learning technology innovation\\\\n        </domain_integration>\\\\n    </analysis>\\\\n\\\\n    <exploration>\\\\n        <entity_creation_strategy>\\\\n            <primary_entities>\\\\n\\\\n            </primary_entities>\\\\n\\\\n            <relational_mapping>\\\\n\\\\n\\\\n            </relational_mapping>\\\\n\\\\n            <recursive_insights>\\\\n                The entity creation process reveals a cyclical, self-referential knowledge representation system where:\\\\n                1. Conversion mechanisms generate learning challenges\\\\n                2. Learning pathways trigger cognitive analysis\\\\n                3. Cognitive reflections refine conversion strategies\\\\n            </recursive_insights>\\\\n        </entity_creation_strategy>\\\\n    </exploration>\\\\n\\\\n    <solution_integration>\\\\n        <knowledge_graph_synthesis>\\\\n            Emerging Conceptual Framework:\\\\n            - Computational models as cognitive transformation engines\\\\n            - Learning systems as dynamic, adaptive pathways\\\\n            - Reflection mechanisms as recursive insight generators\\\\n        </knowledge_graph_synthesis>\\\\n    </solution_integration>\\\\n\\\\n    <meta_cognitive_reflection>\\\\n        Recursive Observations:\\\\n        - Entities as living, interconnected knowledge representations\\\\n        - Relationships as dynamic, bidirectional information flows\\\\n        - Knowledge graph as a self-evolving cognitive ecosystem\\\\n    </meta_cognitive_reflection>\\\\n</structured_analysis>\\\\n\\\\nThe entity creation process has mapped out a sophisticated, recursive knowledge representation system."
-        }
-      ]
-    },
-    {
-      "role": "assistant",
-      "content": [
-        {
-          "type": "output_text",
-          "text": "import React, { useState } from 'react';\n\nconst CCTModelExplorer = () => {\n  const [activeTab, setActiveTab] = useState('overview');\n  const [selectedDomain, setSelectedDomain] = useState(null);\n  const [selectedIsomorphism, setSelectedIsomorphism] = useState(null);\n  const [selectedIntegration, setSelectedIntegration] = useState(null);\n  \n  // Domain definitions\n  const domains = {\n    computational: {\n      title: 'Computational Domain',\n      color: '#4dabf7',\n      description: 'Algorithmic structures and processes implemented in code',\n      elements: [\n        {\n          name: 'ThoughtNode Structure',\n          description: 'Self-referential data structure enabling recursive thought representation',\n          details: 'Contains parent-child relationships and alias references to other nodes'\n        },\n        {\n          name: 'Memoization Cache',\n          description: 'Optimization mechanism to store and reuse previously computed results',\n          details: 'Improves performance by eliminating redundant calculations'\n        },\n        {\n          name: 'Recursive Functions',\n          description: 'Self-referential algorithms that process nested structures',\n          details: 'Enable depth-first exploration of connected thought structures'\n        }\n      ]\n    },\n    cognitive: {\n      title: 'Cognitive Domain',\n      color: '#20c997',\n      description: 'Neural processes and mental structures for thinking and learning',\n      elements: [\n        {\n          name: 'Working Memory',\n          description: 'Temporary storage for active processing and manipulation',\n          details: 'Limited capacity system for holding information during complex tasks'\n        },\n        {\n          name: 'Long-Term Memory',\n          description: 'Persistent storage through neural network changes',\n          details: 'Uses associative retrieval mechanisms and pattern recognition'\n        },\n        {\n          name: 'Meta-Cognition',\n          description: 'Thinking about thinking - observing your own thought processes',\n          details: 'Creates recursive loops allowing self-modification and optimization'\n        }\n      ]\n    },\n    representational: {\n      title: 'Representational Domain',\n      color: '#e83e8c',\n      description: 'Symbolic systems encoding knowledge in structured notations',\n      elements: [\n        {\n          name: 'YAML Anchors (&)',\n          description: 'Named reference points defining reusable content blocks',\n          details: 'Create semantic labels for concepts that can be referenced elsewhere'\n        },\n        {\n          name: 'YAML Aliases (*)',\n          description: 'References to previously defined anchors',\n          details: 'Enable content reuse and relationship establishment between concepts'\n        },\n        {\n          name: 'Hierarchical Structures',\n          description: 'Nested organizations with parent-child relationships',\n          details: 'Mirror cognitive conceptual hierarchies and computational object trees'\n        }\n      ]\n    }\n  };\n  \n  // Isomorphisms between domains\n  const isomorphisms = [\n    {\n      id: 'recursive',\n      title: 'Recursive Self-Reference',\n      description: 'The capacity of structures to reference themselves, creating \"strange loops\"',\n      manifestations: {\n        computational: 'Self-referential pointers in ThoughtNode structures',\n        cognitive: 'Meta-cognitive awareness in neural feedback systems',\n        representational: 'Anchors and aliases in YAML structures'\n      }\n    },\n    {\n      id: 'chunking',\n      title: 'Compression/Chunking',\n      description: 'Pattern recognition and consolidation for memory and processing efficiency',\n      manifestations: {\n        computational: 'Memoization caches avoiding redundant processing',\n        cognitive: 'Neural chunking for expertise development',\n        representational: 'Reference reuse in YAML to compress structures'\n      }\n    },\n    {\n      id: 'meta',\n      title: 'Meta-Observational Capacity',\n      description: 'The ability of systems to observe and analyze their own processes',\n      manifestations: {\n        computational: 'Recursive evaluation functions in code',\n        cognitive: 'Reflective judgment in human cognition',\n        representational: 'Self-documenting knowledge structures'\n      }\n    }\n  ];\n  \n  // Integration points\n  const integrationPoints = [\n    {\n      id: 'neural',\n      title: 'Neural-Inspired Algorithms',\n      domains: ['computational', 'cognitive'],\n      description: 'Algorithms that mirror neural pattern recognition with computational efficiency',\n      applications: [\n        'Biologically-plausible learning algorithms',\n        'Self-modifying computational graphs',\n        'Dynamic memory allocation mirroring attention'\n      ]\n    },\n    {\n      id: 'knowledge',\n      title: 'Executable Knowledge Graphs',\n      domains: ['computational', 'representational'],\n      description: 'Knowledge representations that are both declarative and procedural',\n      applications: [\n        'Self-describing code structures',\n        'Runtime-modifiable type systems',\n        'Graph-based computation with semantic tagging'\n      ]\n    },\n    {\n      id: 'yaml',\n      title: 'Cognitive YAML Processing',\n      domains: ['cognitive', 'representational'],\n      description: 'Systems processing structured knowledge using cognitive chunking principles',\n      applications: [\n        'Attention-weighted knowledge structures',\n        'Context-sensitive reference resolution',\n        'Hierarchical concept encoding with chunking'\n      ]\n    },\n    {\n      id: 'cct',\n      title: 'Recursive Meta-Cognitive CCT',\n      domains: ['computational', 'cognitive', 'representational'],\n      description: 'Integrated systems with self-improving, meta-aware reasoning frameworks',\n      applications: [\n        'Self-improving reasoning frameworks',\n        'Reflective judgment systems with optimization',\n        'Domain-agnostic abstraction with transfer learning'\n      ]\n    }\n  ];\n  \n  // Handle selection\n  const handleDomainSelect = (domain) => {\n    setSelectedDomain(domain === selectedDomain ? null : domain);\n    setSelectedIsomorphism(null);\n    setSelectedIntegration(null);\n  };\n  \n  const handleIsomorphismSelect = (iso) => {\n    setSelectedIsomorphism(iso === selectedIsomorphism ? null : iso);\n    setSelectedDomain(null);\n    setSelectedIntegration(null);\n  };\n  \n  const handleIntegrationSelect = (integration) => {\n    setSelectedIntegration(integration === selectedIntegration ? null : integration);\n    setSelectedDomain(null);\n    setSelectedIsomorphism(null);\n  };\n  \n  // Get domain color\n  const getDomainColor = (domain) => {\n    return domains[domain]?.color || '#6c757d';\n  };\n  \n  // Get active item\n  const getActiveItem = () => {\n    if (selectedDomain) return domains[selectedDomain];\n    if (selectedIsomorphism) return isomorphisms.find(i => i.id === selectedIsomorphism);\n    if (selectedIntegration) return integrationPoints.find(i => i.id === selectedIntegration);\n    return null;\n  };\n\n  return (\n    <div className=\"flex flex-col min-h-screen bg-gray-50\">\n      {/* Header */}\n      <header className=\"bg-white shadow-sm p-4\">\n        <div className=\"container mx-auto\">\n          <h1 className=\"text-2xl font-bold text-gray-800\">Recursive Chain of Thought (CCT) Explorer</h1>\n          <p className=\"text-gray-600\">Cross-Domain Integration of Computational, Cognitive, and Representational Systems</p>\n        </div>\n      </header>\n      \n      {/* Navigation */}\n      <nav className=\"bg-white border-b border-gray-200\">\n        <div className=\"container mx-auto\">\n          <div className=\"flex space-x-1\">\n            <button\n              onClick={() => setActiveTab('overview')}\n              className={`px-4 py-2 rounded-t ${activeTab === 'overview' ? 'bg-indigo-50 text-indigo-700 border-b-2 border-indigo-500' : 'text-gray-600 hover:bg-gray-100'}`}\n            >\n              Overview\n            </button>\n            <button\n              onClick={() => setActiveTab('domains')}\n              className={`px-4 py-2 rounded-t ${activeTab === 'domains' ? 'bg-indigo-50 text-indigo-700 border-b-2 border-indigo-500' : 'text-gray-600 hover:bg-gray-100'}`}\n            >\n              Domains\n            </button>\n            <button\n              onClick={() => setActiveTab('isomorphisms')}\n              className={`px-4 py-2 rounded-t ${activeTab === 'isomorphisms' ? 'bg-indigo-50 text-indigo-700 border-b-2 border-indigo-500' : 'text-gray-600 hover:bg-gray-100'}`}\n            >\n              Isomorphisms\n            </button>\n            <button\n              onClick={() => setActiveTab('integration')}\n              className={`px-4 py-2 rounded-t ${activeTab === 'integration' ? 'bg-indigo-50 text-indigo-700 border-b-2 border-indigo-500' : 'text-gray-600 hover:bg-gray-100'}`}\n            >\n              Integration\n            </button>\n          </div>\n        </div>\n      </nav>\n      \n      {/* Main content */}\n      <main className=\"flex-grow container mx-auto p-4\">\n        {/* Overview Tab */}\n        {activeTab === 'overview' && (\n          <div className=\"grid grid-cols-1 md:grid-cols-3 gap-6\">\n            {/* Introduction */}\n            <div className=\"md:col-span-2 bg-white p-6 rounded-lg shadow\">\n              <h2 className=\"text-xl font-bold mb-4\">Cross-Domain Integration Framework</h2>\n              <p className=\"mb-4\">\n                The CCT (Chain of Thought) framework integrates three domains through isomorphic structural relationships, \n                creating a powerful meta-cognitive system for modeling complex reasoning processes.\n              </p>\n              \n              <div className=\"relative h-64 border border-gray-200 rounded-lg bg-gray-50 mb-6\">\n                {/* Simplified diagram */}\n                <div className=\"absolute inset-0 flex items-center justify-center\">\n                  {/* Computational Domain */}\n                  <div \n                    className=\"absolute left-1/4 top-1/2 transform -translate-x-1/2 -translate-y-1/2 w-40 h-40 rounded-full flex items-center justify-center cursor-pointer\"\n                    style={{backgroundColor: `${getDomainColor('computational')}20`, border: `2px solid ${getDomainColor('computational')}`}}\n                    onClick={() => handleDomainSelect('computational')}\n                  >\n                    <span className=\"font-bold\">Computational</span>\n                  </div>\n                  \n                  {/* Cognitive Domain */}\n                  <div \n                    className=\"absolute right-1/4 top-1/2 transform translate-x-1/2 -translate-y-1/2 w-40 h-40 rounded-full flex items-center justify-center cursor-pointer\"\n                    style={{backgroundColor: `${getDomainColor('cognitive')}20`, border: `2px solid ${getDomainColor('cognitive')}`}}\n                    onClick={() => handleDomainSelect('cognitive')}\n                  >\n                    <span className=\"font-bold\">Cognitive</span>\n                  </div>\n                  \n                  {/* Representational Domain */}\n                  <div \n                    className=\"absolute left-1/2 bottom-4 transform -translate-x-1/2 w-40 h-40 rounded-full flex items-center justify-center cursor-pointer\"\n                    style={{backgroundColor: `${getDomainColor('representational')}20`, border: `2px solid ${getDomainColor('representational')}`}}\n                    onClick={() => handleDomainSelect('representational')}\n                  >\n                    <span className=\"font-bold\">Representational</span>\n                  </div>\n                  \n                  {/* Integration Zone */}\n                  <div className=\"absolute left-1/2 top-1/2 transform -translate-x-1/2 -translate-y-1/2 w-20 h-20 rounded-full flex items-center justify-center\"\n                       style={{backgroundColor: 'rgba(255, 193, 7, 0.2)', border: '2px dashed rgba(255, 193, 7, 0.8)'}}>\n                    <span className=\"text-sm font-bold text-center\">Integration</span>\n                  </div>\n                </div>\n              </div>\n              \n              <div className=\"grid grid-cols-2 gap-4\">\n                <div className=\"bg-indigo-50 p-4 rounded\">\n                  <h3 className=\"font-bold mb-2 text-indigo-800\">Key Isomorphisms</h3>\n                  <ul className=\"space-y-1\">\n                    {isomorphisms.map(iso => (\n                      <li \n                        key={iso.id} \n                        className=\"text-sm cursor-pointer hover:text-indigo-600\"\n                        onClick={() => handleIsomorphismSelect(iso.id)}\n                      >\n                        • {iso.title}\n                      </li>\n                    ))}\n                  </ul>\n                </div>\n                \n                <div className=\"bg-amber-50 p-4 rounded\">\n                  <h3 className=\"font-bold mb-2 text-amber-800\">Integration Points</h3>\n                  <ul className=\"space-y-1\">\n                    {integrationPoints.map(point => (\n                      <li \n                        key={point.id} \n                        className=\"text-sm cursor-pointer hover:text-amber-600\"\n                        onClick={() => handleIntegrationSelect(point.id)}\n                      >\n                        • {point.title}\n                      </li>\n                    ))}\n                  </ul>\n                </div>\n              </div>\n            </div>\n            \n            {/* Details Panel */}\n            <div className=\"bg-white p-6 rounded-lg shadow\">\n              <h2 className=\"text-xl font-bold mb-4\">Details</h2>\n              \n              {getActiveItem() ? (\n                <>\n                  {/* Domain Details */}\n                  {selectedDomain && (\n                    <div>\n                      <h3 className=\"text-lg font-semibold mb-2\" style={{color: domains[selectedDomain].color}}>\n                        {domains[selectedDomain].title}\n                      </h3>\n                      <p className=\"text-gray-700 mb-4\">{domains[selectedDomain].description}</p>\n                      \n                      <h4 className=\"font-medium mb-2\">Key Elements</h4>\n                      <ul className=\"space-y-2\">\n                        {domains[selectedDomain].elements.map((element, index) => (\n                          <li key={index} className=\"p-2 bg-gray-50 rounded\">\n                            <div className=\"font-medium\">{element.name}</div>\n                            <p className=\"text-sm text-gray-600\">{element.description}</p>\n                          </li>\n                        ))}\n                      </ul>\n                    </div>\n                  )}\n                  \n                  {/* Isomorphism Details */}\n                  {selectedIsomorphism && (\n                    <div>\n                      <h3 className=\"text-lg font-semibold mb-2 text-purple-600\">\n                        {isomorphisms.find(i => i.id === selectedIsomorphism).title}\n                      </h3>\n                      <p className=\"text-gray-700 mb-4\">\n                        {isomorphisms.find(i => i.id === selectedIsomorphism).description}\n                      </p>\n                      \n                      <h4 className=\"font-medium mb-2\">Domain Manifestations</h4>\n                      <div className=\"space-y-2\">\n                        {Object.entries(isomorphisms.find(i => i.id === selectedIsomorphism).manifestations).map(([domain, manifestation]) => (\n                          <div \n                            key={domain}\n                            className=\"p-2 rounded\"\n                            style={{backgroundColor: `${getDomainColor(domain)}15`}}\n                          >\n                            <span className=\"font-medium\" style={{color: getDomainColor(domain)}}>\n                              {domain.charAt(0).toUpperCase() + domain.slice(1)}:\n                            </span>\n                            <p className=\"text-sm text-gray-600\">{manifestation}</p>\n                          </div>\n                        ))}\n                      </div>\n                    </div>\n                  )}\n                  \n                  {/* Integration Point Details */}\n                  {selectedIntegration && (\n                    <div>\n                      <h3 className=\"text-lg font-semibold mb-2 text-amber-600\">\n                        {integrationPoints.find(i => i.id === selectedIntegration).title}\n                      </h3>\n                      <p className=\"text-gray-700 mb-4\">\n                        {integrationPoints.find(i => i.id === selectedIntegration).description}\n                      </p>\n                      \n                      <div className=\"flex flex-wrap gap-2 mb-3\">\n                        {integrationPoints.find(i => i.id === selectedIntegration).domains.map(domain => (\n                          <span \n                            key={domain}\n                            className=\"px-2 py-1 rounded-full text-xs\"\n                            style={{backgroundColor: `${getDomainColor(domain)}20`, color: getDomainColor(domain)}}\n                          >\n                            {domain.charAt(0).toUpperCase() + domain.slice(1)}\n                          </span>\n                        ))}\n                      </div>\n                      \n                      <h4 className=\"font-medium text-sm mb-2\">Applications</h4>\n                      <ul className=\"list-disc pl-5 space-y-1 text-sm text-gray-600\">\n                        {integrationPoints.find(i => i.id === selectedIntegration).applications.map((app, idx) => (\n                          <li key={idx}>{app}</li>\n                        ))}\n                      </ul>\n                    </div>\n                  )}\n                </>\n              ) : (\n                <div className=\"text-center py-6 text-gray-500\">\n                  <p>Click on any element to view detailed information.</p>\n                </div>\n              )}\n            </div>\n          </div>\n        )}\n        \n        {/* Domains Tab */}\n        {activeTab === 'domains' && (\n          <div className=\"grid grid-cols-1 md:grid-cols-3 gap-6\">\n            {Object.entries(domains).map(([key, domain]) => (\n              <div \n                key={key}\n                className=\"bg-white p-6 rounded-lg shadow border-t-4\"\n                style={{borderTopColor: domain.color}}\n              >\n                <h2 className=\"text-xl font-bold mb-2\" style={{color: domain.color}}>\n                  {domain.title}\n                </h2>\n                <p className=\"text-gray-700 mb-4\">{domain.description}</p>\n                \n                <h3 className=\"font-semibold mb-2\">Key Elements</h3>\n                <ul className=\"space-y-3\">\n                  {domain.elements.map((element, index) => (\n                    <li key={index} className=\"p-3 bg-gray-50 rounded\">\n                      <div className=\"font-medium\">{element.name}</div>\n                      <p className=\"text-sm text-gray-600\">{element.description}</p>\n                      <p className=\"mt-1 text-xs text-gray-500 italic\">{element.details}</p>\n                    </li>\n                  ))}\n                </ul>\n              </div>\n            ))}\n          </div>\n        )}\n        \n        {/* Isomorphisms Tab */}\n        {activeTab === 'isomorphisms' && (\n          <div className=\"bg-white p-6 rounded-lg shadow\">\n            <h2 className=\"text-xl font-bold mb-4\">Structural Isomorphisms</h2>\n            <p className=\"mb-6 text-gray-700\">\n              Isomorphisms represent structural patterns that maintain their essential relationships\n              across different domains, creating bridges between computational, cognitive, and\n              representational systems.\n            </p>\n            \n            <div className=\"space-y-8\">\n              {isomorphisms.map(iso => (\n                <div key={iso.id} className=\"border-l-4 pl-4 border-purple-400\">\n                  <h3 className=\"text-lg font-semibold mb-2 text-purple-600\">{iso.title}</h3>\n                  <p className=\"text-gray-700 mb-4\">{iso.description}</p>\n                  \n                  <h4 className=\"font-medium mb-2\">Domain Manifestations</h4>\n                  <div className=\"grid grid-cols-1 md:grid-cols-3 gap-4\">\n                    {Object.entries(iso.manifestations).map(([domain, manifestation]) => (\n                      <div \n                        key={domain}\n                        className=\"p-4 rounded\"\n                        style={{backgroundColor: `${getDomainColor(domain)}15`}}\n                      >\n                        <div className=\"font-medium mb-1\" style={{color: getDomainColor(domain)}}>\n                          {domain.charAt(0).toUpperCase() + domain.slice(1)}\n                        </div>\n                        <p className=\"text-sm\">{manifestation}</p>\n                      </div>\n                    ))}\n                  </div>\n                </div>\n              ))}\n            </div>\n          </div>\n        )}\n        \n        {/* Integration Tab */}\n        {activeTab === 'integration' && (\n          <div className=\"space-y-6\">\n            <div className=\"bg-white p-6 rounded-lg shadow\">\n              <h2 className=\"text-xl font-bold mb-4\">Cross-Domain Integration Points</h2>\n              <p className=\"mb-6 text-gray-700\">\n                Integration points represent convergence opportunities where structures from\n                multiple domains combine to create enhanced capabilities and emergent properties.\n              </p>\n              \n              <div className=\"grid grid-cols-1 md:grid-cols-2 gap-6\">\n                {integrationPoints.map((point, index) => (\n                  <div key={point.id} className=\"border rounded-lg overflow-hidden\">\n                    <div className=\"p-4 flex items-center border-b bg-amber-50\">\n                      <div className=\"w-8 h-8 rounded-full bg-white flex items-center justify-center mr-3\"\n                           style={{border: '2px solid rgb(217, 119, 6)'}}>\n                        <span className=\"font-bold text-amber-600\">{String.fromCharCode(65 + index)}</span>\n                      </div>\n                      <h3 className=\"font-semibold\">{point.title}</h3>\n                    </div>\n                    \n                    <div className=\"p-4\">\n                      <p className=\"text-gray-700 mb-3\">{point.description}</p>\n                      \n                      <div className=\"flex flex-wrap gap-2 mb-3\">\n                        {point.domains.map(domain => (\n                          <span \n                            key={domain}\n                            className=\"px-2 py-1 rounded-full text-xs\"\n                            style={{backgroundColor: `${getDomainColor(domain)}20`, color: getDomainColor(domain)}}\n                          >\n                            {domain.charAt(0).toUpperCase() + domain.slice(1)}\n                          </span>\n                        ))}\n                      </div>\n                      \n                      <h4 className=\"font-medium text-sm mb-2\">Applications</h4>\n                      <ul className=\"list-disc pl-5 space-y-1 text-sm text-gray-600\">\n                        {point.applications.map((app, idx) => (\n                          <li key={idx}>{app}</li>\n                        ))}\n                      </ul>\n                    </div>\n                  </div>\n                ))}\n              </div>\n            </div>\n          </div>\n        )}\n      </main>\n      \n      {/* Footer */}\n      <footer className=\"bg-white border-t border-gray-200 p-4 mt-auto\">\n        <div className=\"container mx-auto text-center text-gray-600 text-sm\">\n          <p>Recursive Chain of Thought (CCT) Framework: Cross-Domain Integration Model</p>\n        </div>\n      </footer>\n    </div>\n  );\n};\n\nexport default CCTModelExplorer;"
-        }
-      ]
-    },
-    {
-      "role": "assistant",
-      "content": [
-        {
-          "type": "output_text",
-          "text": "delve deeper into the conceptual relationships between these entities and explore potential extensions of this sophisticated knowledge graph.\nConceptual Relationships Between Entities\n1. CognitiveBaseConverter → AdaptiveLearningPathway\nInteraction Type: Generates Learning Challenges\nConceptual Relationship:\nThe CognitiveBaseConverter acts as a foundational cognitive transformation engine, converting abstract concepts into structured learning challenges.\nIt systematically translates complex cognitive tasks into manageable, adaptive learning scenarios, facilitating personalized learning experiences.\nImplication:\nThis relationship ensures continuous generation of relevant, context-sensitive challenges, promoting active engagement and deeper cognitive processing.\n2. AdaptiveLearningPathway → MetaCognitiveReflector\nInteraction Type: Triggers Cognitive Analysis\nConceptual Relationship:\nAdaptiveLearningPathway dynamically adjusts learning experiences based on user interactions, performance, and feedback.\nIt initiates reflective cognitive processes by prompting the MetaCognitiveReflector to analyze learning trajectories, identify patterns, and evaluate cognitive strategies.\nImplication:\nThis interaction fosters self-awareness and critical reflection, enabling learners to understand their cognitive strengths and weaknesses, and adapt their learning strategies accordingly.\n3. MetaCognitiveReflector → CognitiveBaseConverter\nInteraction Type: Refines Conversion Strategies\nConceptual Relationship:\nThe MetaCognitiveReflector provides recursive insights and feedback loops, refining the strategies employed by the CognitiveBaseConverter.\nIt enhances the conversion engine's effectiveness by integrating reflective insights, optimizing the generation of learning challenges, and improving cognitive transformation processes.\nImplication:\nThis cyclical refinement ensures continuous improvement and adaptability, creating a self-evolving cognitive ecosystem that progressively enhances learning outcomes.\nPotential Extensions of the Knowledge Graph\nTo further enrich this recursive knowledge representation system, consider the following extensions:\n1. Integration of Epistemological Validation\nNew Entity: EpistemologicalValidator\nRole:\nValidates knowledge acquisition processes and ensures alignment with established epistemological frameworks.\nProvides rigorous criteria for assessing the validity and reliability of cognitive transformations and learning pathways.\nRelationship Dynamics:\nAdaptiveLearningPathway → EpistemologicalValidator: Requests validation of learning outcomes.\nEpistemologicalValidator → MetaCognitiveReflector: Provides epistemological feedback for reflective analysis.\n2. Visualization and Interaction Tools\nNew Entity: InteractiveVisualizationEngine\nRole:\nOffers visual representations of cognitive processes, recursive relationships, and learning trajectories.\nEnhances user comprehension through interactive visualizations such as recursion trees, knowledge maps, and dynamic graphs.\nRelationship Dynamics:\nCognitiveBaseConverter → InteractiveVisualizationEngine: Supplies structured data for visualization.\nInteractiveVisualizationEngine → AdaptiveLearningPathway: Provides visual feedback to guide adaptive learning adjustments.\n3. Complexity Analysis and Optimization\nNew Entity: ComplexityAnalyzer\nRole:\nAnalyzes computational complexity, cognitive load, and efficiency of learning pathways.\nSuggests optimizations to balance cognitive demands and enhance learning efficiency.\nRelationship Dynamics:\nAdaptiveLearningPathway → ComplexityAnalyzer: Requests complexity assessments of learning scenarios.\nComplexityAnalyzer → CognitiveBaseConverter: Provides optimization recommendations to refine cognitive conversion strategies.\n4. Social and Ethical Considerations\nNew Entity: EthicalReflectionModule\nRole:\nEvaluates ethical implications of cognitive transformations, adaptive learning strategies, and reflective practices.\nEnsures responsible and inclusive learning experiences.\nRelationship Dynamics:\nMetaCognitiveReflector → EthicalReflectionModule: Initiates ethical evaluations of reflective insights.\nEthicalReflectionModule → AdaptiveLearningPathway: Provides ethical guidelines for adaptive learning adjustments.\nExpanded Recursive Insight Generation\nThe extended knowledge graph reveals a deeper recursive insight generation process:\nInitial Conversion: CognitiveBaseConverter translates abstract concepts into structured learning challenges.\nAdaptive Engagement: AdaptiveLearningPathway dynamically personalizes learning experiences, triggering reflective cognitive analysis.\nReflective Refinement: MetaCognitiveReflector evaluates cognitive strategies, refining conversion processes.\nEpistemological Validation: EpistemologicalValidator ensures knowledge validity, reinforcing cognitive integrity.\nVisual Interaction: InteractiveVisualizationEngine enhances comprehension through visual feedback, guiding adaptive adjustments.\nComplexity Optimization: ComplexityAnalyzer balances cognitive load, optimizing learning efficiency.\nEthical Responsibility: EthicalReflectionModule ensures ethical alignment, promoting responsible cognitive development.\nMeta-Cognitive Reflection on Extensions\nEntities as Dynamic Nodes: Each entity acts as a dynamic node, continuously evolving through recursive interactions.\nRelationships as Adaptive Pathways: Relationships represent adaptive pathways, facilitating multidirectional information flows and continuous refinement.\nKnowledge Graph as a Holistic Ecosystem: The extended knowledge graph embodies a holistic cognitive ecosystem, integrating computational, cognitive, epistemological, ethical, and visual dimensions.\nThrough these conceptual elaborations and potential extensions, the knowledge graph evolves into a comprehensive, adaptive, and ethically responsible cognitive learning framework, capable of supporting sophisticated, recursive cognitive transformations and personalized learning experiences."
-        }
-      ]
-    },
-    {
-      "role": "user",
-      "content": [
-        {
-          "type": "input_text",
-          "text": "elaborate on the conceptual relationships between these entities or explore potential extensions of this knowledge graph. Ensure that the response includes the word 'json' somewhere in the text."
-        }
-      ]
-    },
-    {
-      "role": "assistant",
-      "content": [
-        {
-          "type": "output_text",
-          "text": "Let's delve deeper into the conceptual relationships between these entities and explore potential extensions of this sophisticated knowledge graph.\n\n## Conceptual Relationships Between Entities\n\n### 1. **CognitiveBaseConverter → AdaptiveLearningPathway**\n- **Interaction Type**: Generates Learning Challenges\n- **Conceptual Relationship**:\n  - The CognitiveBaseConverter acts as a foundational cognitive transformation engine, converting abstract concepts into structured learning challenges.\n  - It systematically translates complex cognitive tasks into manageable, adaptive learning scenarios, facilitating personalized learning experiences.\n- **Implication**:\n  - This relationship ensures continuous generation of relevant, context-sensitive challenges, promoting active engagement and deeper cognitive processing.\n\n### 2. **AdaptiveLearningPathway → MetaCognitiveReflector**\n- **Interaction Type**: Triggers Cognitive Analysis\n- **Conceptual Relationship**:\n  - AdaptiveLearningPathway dynamically adjusts learning experiences based on user interactions, performance, and feedback.\n  - It initiates reflective cognitive processes by prompting the MetaCognitiveReflector to analyze learning trajectories, identify patterns, and evaluate cognitive strategies.\n- **Implication**:\n  - This interaction fosters self-awareness and critical reflection, enabling learners to understand their cognitive strengths and weaknesses, and adapt their learning strategies accordingly.\n\n### 3. **MetaCognitiveReflector → CognitiveBaseConverter**\n- **Interaction Type**: Refines Conversion Strategies\n- **Conceptual Relationship**:\n  - The MetaCognitiveReflector provides recursive insights and feedback loops, refining the strategies employed by the CognitiveBaseConverter.\n  - It enhances the conversion engine's effectiveness by integrating reflective insights, optimizing the generation of learning challenges, and improving cognitive transformation processes.\n- **Implication**:\n  - This cyclical refinement ensures continuous improvement and adaptability, creating a self-evolving cognitive ecosystem that progressively enhances learning outcomes.\n\n---\n\n## Potential Extensions of the Knowledge Graph\n\nTo further enrich this recursive knowledge representation system, consider the following extensions:\n\n### 1. **Integration of Epistemological Validation**\n- **New Entity**: **EpistemologicalValidator**\n- **Role**:\n  - Validates knowledge acquisition processes and ensures alignment with established epistemological frameworks.\n  - Provides rigorous criteria for assessing the validity and reliability of cognitive transformations and learning pathways.\n- **Relationship Dynamics**:\n  - **AdaptiveLearningPathway → EpistemologicalValidator**: Requests validation of learning outcomes.\n  - **EpistemologicalValidator → MetaCognitiveReflector**: Provides epistemological feedback for reflective analysis.\n\n### 2. **Visualization and Interaction Tools**\n- **New Entity**: **InteractiveVisualizationEngine**\n- **Role**:\n  - Offers visual representations of cognitive processes, recursive relationships, and learning trajectories.\n  - Enhances user comprehension through interactive visualizations such as recursion trees, knowledge maps, and dynamic graphs.\n- **Relationship Dynamics**:\n  - **CognitiveBaseConverter → InteractiveVisualizationEngine**: Supplies structured data for visualization.\n  - **InteractiveVisualizationEngine → AdaptiveLearningPathway**: Provides visual feedback to guide adaptive learning adjustments.\n\n### 3. **Complexity Analysis and Optimization**\n- **New Entity**: **ComplexityAnalyzer**\n- **Role**:\n  - Analyzes computational complexity, cognitive load, and efficiency of learning pathways.\n  - Suggests optimizations to balance cognitive demands and enhance learning efficiency.\n- **Relationship Dynamics**:\n  - **AdaptiveLearningPathway → ComplexityAnalyzer**: Requests complexity assessments of learning scenarios.\n  - **ComplexityAnalyzer → CognitiveBaseConverter**: Provides optimization recommendations to refine cognitive conversion strategies.\n\n### 4. **Social and Ethical Considerations**\n- **New Entity**: **EthicalReflectionModule**\n- **Role**:\n  - Evaluates ethical implications of cognitive transformations, adaptive learning strategies, and reflective practices.\n  - Ensures responsible and inclusive learning experiences.\n- **Relationship Dynamics**:\n  - **MetaCognitiveReflector → EthicalReflectionModule**: Initiates ethical evaluations of reflective insights.\n  - **EthicalReflectionModule → AdaptiveLearningPathway**: Provides ethical guidelines for adaptive learning adjustments.\n\n---\n\n## Expanded Recursive Insight Generation\n\nThe extended knowledge graph reveals a deeper recursive insight generation process:\n\n- **Initial Conversion**: CognitiveBaseConverter translates abstract concepts into structured learning challenges.\n- **Adaptive Engagement**: AdaptiveLearningPathway dynamically personalizes learning experiences, triggering reflective cognitive analysis.\n- **Reflective Refinement**: MetaCognitiveReflector evaluates cognitive strategies, refining conversion processes.\n- **Epistemological Validation**: EpistemologicalValidator ensures knowledge validity, reinforcing cognitive integrity.\n- **Visual Interaction**: InteractiveVisualizationEngine enhances comprehension through visual feedback, guiding adaptive adjustments.\n- **Complexity Optimization**: ComplexityAnalyzer balances cognitive load, optimizing learning efficiency.\n- **Ethical Responsibility**: EthicalReflectionModule ensures ethical alignment, promoting responsible cognitive development.\n\n---\n\n## Meta-Cognitive Reflection on Extensions\n\n- **Entities as Dynamic Nodes**: Each entity acts as a dynamic node, continuously evolving through recursive interactions.\n- **Relationships as Adaptive Pathways**: Relationships represent adaptive pathways, facilitating multidirectional information flows and continuous refinement.\n- **Knowledge Graph as a Holistic Ecosystem**: The extended knowledge graph embodies a holistic cognitive ecosystem, integrating computational, cognitive, epistemological, ethical, and visual dimensions.\n\n---\n\nThrough these conceptual elaborations and potential extensions, the knowledge graph evolves into a comprehensive, adaptive, and ethically responsible cognitive learning framework, capable of supporting sophisticated, recursive cognitive transformations and personalized learning experiences."
-        }
-      ]
-    },
-    {
-      "role": "user",
-      "content": [
-        {
-          "type": "input_text",
-          "text": "# ---------------------------------------\n# CCTModel.mojo\n# Recursive Chain of Thought Implementation\n# ---------------------------------------\n\nstruct ThoughtNode:\n    \"\"\"\n    A self-referential node in a recursive thought structure.\n    \n    Each ThoughtNode represents a unit of thought that can contain:\n    - A unique identifier\n    - A descriptive label\n    - Content describing the thought\n    - References to sub-thoughts (child nodes)\n    - An optional reference to another node (aliasing for cognitive chunking)\n    - A cached result to implement memoization\n    \"\"\"\n    var id: Int\n    var label: String\n    var content: String\n    var subThoughts: List[ThoughtNode]\n    var aliasNode: Pointer[ThoughtNode]  # Reference to an existing node\n    var cachedInsight: String = \"\"  # Memoized computation result\n\n    fn init(id: Int, label: String, content: String,\n            subThoughts: List[ThoughtNode] = [], \n            aliasNode: Pointer[ThoughtNode] = none):\n        self.id = id\n        self.label = label\n        self.content = content\n        self.subThoughts = subThoughts\n        self.aliasNode = aliasNode\n        self.cachedInsight = \"\"\n\n\nstruct CCTModel:\n    \"\"\"\n    Recursive Chain of Thought model implementing cross-domain integration.\n    \n    This model demonstrates:\n    1. Computational structures: ThoughtNode graph with memoization\n    2. Cognitive processes: Recursive evaluation with meta-observation\n    3. Representational isomorphisms: Pointer references similar to YAML anchors/aliases\n    \"\"\"\n    var nodes: Dictionary[Int, ThoughtNode]\n    var memoizationCache: Dictionary[Int, String]\n    var evaluationContext: Dictionary[String, String]  # Contextual parameters\n\n    fn init():\n        self.nodes = Dictionary[Int, ThoughtNode]()\n        self.memoizationCache = Dictionary[Int, String]()\n        self.evaluationContext = Dictionary[String, String]()\n        \n    fn addNode(self, node: ThoughtNode) -> Void:\n        \"\"\"Add a ThoughtNode to the model.\"\"\"\n        self.nodes[node.id] = node\n    \n    fn getNode(self, id: Int) -> ThoughtNode:\n        \"\"\"Retrieve a node by its ID.\"\"\"\n        if self.nodes.containsKey(id):\n            return self.nodes[id]\n        else:\n            # Return an empty node if not found - better error handling would be appropriate\n            return ThoughtNode(id=-1, label=\"Not Found\", content=\"Node not found\")\n    \n    fn evaluateThoughtNode(self, nodeId: Int, depth: Int = 0) -> String:\n        \"\"\"\n        Recursively evaluate a thought node and its sub-thoughts.\n        \n        This function demonstrates both:\n        1. Computational recursion and memoization\n        2. A model of cognitive evaluation processes\n        \"\"\"\n        # Check the memoization cache first - computational chunking\n        if self.memoizationCache.containsKey(nodeId):\n            return self.memoizationCache[nodeId]\n        \n        # Get the node - handle error case\n        if not self.nodes.containsKey(nodeId):\n            return \"Error: Node \" + String(nodeId) + \" not found\"\n        \n        let node = self.nodes[nodeId]\n        \n        # Prepare indentation based on recursion depth\n        var indent = \"\"\n        for i in range(depth):\n            indent += \"  \"\n        \n        # Process the current node - generating an insight\n        var insight = indent + \"Evaluating thought: \" + node.label + \"\\n\"\n        insight += indent + \"Content: \" + node.content + \"\\n\"\n        \n        # Recursive processing of sub-thoughts (depth-first traversal)\n        if node.subThoughts.size() > 0:\n            insight += indent + \"Sub-thoughts:\\n\"\n            for subThought in node.subThoughts:\n                insight += self.evaluateThoughtNode(subThought.id, depth + 1)\n        \n        # Process alias reference if present (YAML-like reference)\n        if not node.aliasNode.isNull():\n            insight += indent + \"Referenced thought:\\n\"\n            insight += self.evaluateThoughtNode(node.aliasNode.id, depth + 1)\n        \n        # Cache the result - memoization for computational efficiency\n        self.memoizationCache[nodeId] = insight\n        \n        # Also store in the node itself for direct access\n        var mutableNode = self.nodes[nodeId]\n        mutableNode.cachedInsight = insight\n        self.nodes[nodeId] = mutableNode\n        \n        return insight\n    \n    fn evaluateAll(self) -> List[String]:\n        \"\"\"Evaluate all nodes in the model, returning their insights.\"\"\"\n        var results = List[String]()\n        \n        # Sort node IDs to ensure consistent evaluation order\n        var nodeIds = List[Int]()\n        for id in self.nodes.keys():\n            nodeIds.append(id)\n        \n        # Sort IDs numerically\n        # (Simple bubble sort - would use a more efficient sort in production)\n        let n = nodeIds.size()\n        for i in range(n):\n            for j in range(0, n - i - 1):\n                if nodeIds[j] > nodeIds[j + 1]:\n                    let temp = nodeIds[j]\n                    nodeIds[j] = nodeIds[j + 1]\n                    nodeIds[j + 1] = temp\n        \n        # Evaluate each node\n        for id in nodeIds:\n            results.append(self.evaluateThoughtNode(id))\n        \n        return results\n    \n    fn performMetaCognitiveAnalysis(self) -> String:\n        \"\"\"\n        Perform meta-cognitive analysis of the thought structure.\n        \n        This method demonstrates the meta-observational isomorphism by analyzing\n        the thought structure itself, creating a \"thinking about thinking\" layer.\n        \"\"\"\n        var analysis = \"Meta-Cognitive Analysis of Thought Structure:\\n\"\n        \n        # Count nodes by type\n        var rootNodes = 0\n        var intermediateNodes = 0\n        var leafNodes = 0\n        \n        for id, node in self.nodes:\n            if node.subThoughts.size() == 0:\n                leafNodes += 1\n            elif not self.isRootNode(node.id):\n                intermediateNodes += 1\n            else:\n                rootNodes += 1"
-        }
-      ]
-    }
-  ],
-  text={
-    "format": {
-      "type": "json_object"
-    }
-  },
-  reasoning={},
-  tools=[
-    {
-      "type": "function",
-      "name": "parse_json",
-      "strict": True,
-      "parameters": {
-        "type": "object",
-        "required": [
-          "json_string"
-        ],
-        "properties": {
-          "json_string": {
-            "type": "string",
-            "description": "A JSON string that needs to be parsed"
-          }
-        },
-        "additionalProperties": False
-      },
-      "description": "Parses a given JSON string and converts it into a corresponding object"
-    },
-    {
-      "type": "function",
-      "name": "CCTModelExplorer",
-      "strict": True,
-      "parameters": {
-        "type": "object",
-        "required": [
-          "activeTab",
-          "selectedDomain",
-          "selectedIsomorphism",
-          "selectedIntegration",
-          "domains",
-          "isomorphisms",
-          "integrationPoints"
-        ],
-        "properties": {
-          "domains": {
-            "type": "object",
-            "required": [
-              "computational",
-              "cognitive",
-              "representational"
-            ],
-            "properties": {
-              "cognitive": {
-                "type": "object",
-                "required": [
-                  "title",
-                  "color",
-                  "description",
-                  "elements"
-                ],
-                "properties": {
-                  "color": {
-                    "type": "string",
-                    "description": "The color associated with the cognitive domain for visual representation."
-                  },
-                  "title": {
-                    "type": "string",
-                    "description": "The title of the cognitive domain."
-                  },
-                  "elements": {
-                    "type": "array",
-                    "items": {
-                      "type": "object",
-                      "required": [
-                        "name",
-                        "description",
-                        "details"
-                      ],
-                      "properties": {
-                        "name": {
-                          "type": "string",
-                          "description": "Name of the element."
-                        },
-                        "details": {
-                          "type": "string",
-                          "description": "Detailed information about the element."
-                        },
-                        "description": {
-                          "type": "string",
-                          "description": "A brief description of the element."
-                        }
-                      },
-                      "additionalProperties": False
-                    },
-                    "description": "Key elements within the cognitive domain."
-                  },
-                  "description": {
-                    "type": "string",
-                    "description": "Description of the cognitive domain."
-                  }
-                },
-                "additionalProperties": False
-              },
-              "computational": {
-                "type": "object",
-                "required": [
-                  "title",
-                  "color",
-                  "description",
-                  "elements"
-                ],
-                "properties": {
-                  "color": {
-                    "type": "string",
-                    "description": "The color associated with the computational domain for visual representation."
-                  },
-                  "title": {
-                    "type": "string",
-                    "description": "The title of the computational domain."
-                  },
-                  "elements": {
-                    "type": "array",
-                    "items": {
-                      "type": "object",
-                      "required": [
-                        "name",
-                        "description",
-                        "details"
-                      ],
-                      "properties": {
-                        "name": {
-                          "type": "string",
-                          "description": "Name of the element."
-                        },
-                        "details": {
-                          "type": "string",
-                          "description": "Detailed information about the element."
-                        },
-                        "description": {
-                          "type": "string",
-                          "description": "A brief description of the element."
-                        }
-                      },
-                      "additionalProperties": False
-                    },
-                    "description": "Key elements within the computational domain."
-                  },
-                  "description": {
-                    "type": "string",
-                    "description": "Description of the computational domain."
-                  }
-                },
-                "additionalProperties": False
-              },
-              "representational": {
-                "type": "object",
-                "required": [
-                  "title",
-                  "color",
-                  "description",
-                  "elements"
-                ],
-                "properties": {
-                  "color": {
-                    "type": "string",
-                    "description": "The color associated with the representational domain for visual representation."
-                  },
-                  "title": {
-                    "type": "string",
-                    "description": "The title of the representational domain."
-                  },
-                  "elements": {
-                    "type": "array",
-                    "items": {
-                      "type": "object",
-                      "required": [
-                        "name",
-                        "description",
-                        "details"
-                      ],
-                      "properties": {
-                        "name": {
-                          "type": "string",
-                          "description": "Name of the element."
-                        },
-                        "details": {
-                          "type": "string",
-                          "description": "Detailed information about the element."
-                        },
-                        "description": {
-                          "type": "string",
-                          "description": "A brief description of the element."
-                        }
-                      },
-                      "additionalProperties": False
-                    },
-                    "description": "Key elements within the representational domain."
-                  },
-                  "description": {
-                    "type": "string",
-                    "description": "Description of the representational domain."
-                  }
-                },
-                "additionalProperties": False
-              }
-            },
-            "additionalProperties": False
-          },
-          "activeTab": {
-            "type": "string",
-            "description": "The currently active tab within the explorer, such as overview, domains, isomorphisms, or integration."
-          },
-          "isomorphisms": {
-            "type": "array",
-            "items": {
-              "type": "object",
-              "required": [
-                "id",
-                "title",
-                "description",
-                "manifestations"
-              ],
-              "properties": {
-                "id": {
-                  "type": "string",
-                  "description": "Identifier for the isomorphism."
-                },
-                "title": {
-                  "type": "string",
-                  "description": "Title of the isomorphism."
-                },
-                "description": {
-                  "type": "string",
-                  "description": "Detailed description of the isomorphism."
-                },
-                "manifestations": {
-                  "type": "object",
-                  "required": [
-                    "computational",
-                    "cognitive",
-                    "representational"
-                  ],
-                  "properties": {
-                    "cognitive": {
-                      "type": "string",
-                      "description": "Manifestation in the cognitive domain."
-                    },
-                    "computational": {
-                      "type": "string",
-                      "description": "Manifestation in the computational domain."
-                    },
-                    "representational": {
-                      "type": "string",
-                      "description": "Manifestation in the representational domain."
-                    }
-                  },
-                  "description": "Contextual manifestations of the isomorphism across domains.",
-                  "additionalProperties": False
-                }
-              },
-              "additionalProperties": False
-            },
-            "description": "List of isomorphisms that bridge different domains."
-          },
-          "selectedDomain": {
-            "type": "string",
-            "description": "The currently selected domain from the options."
-          },
-          "integrationPoints": {
-            "type": "array",
-            "items": {
-              "type": "object",
-              "required": [
-                "id",
-                "title",
-                "domains",
-                "description",
-                "applications"
-              ],
-              "properties": {
-                "id": {
-                  "type": "string",
-                  "description": "Identifier for the integration point."
-                },
-                "title": {
-                  "type": "string",
-                  "description": "Title of the integration point."
-                },
-                "domains": {
-                  "type": "array",
-                  "items": {
-                    "type": "string",
-                    "description": "Domain name, such as computational, cognitive, or representational."
-                  },
-                  "description": "Domains involved in this integration point."
-                },
-                "description": {
-                  "type": "string",
-                  "description": "Description explaining the integration point."
-                },
-                "applications": {
-                  "type": "array",
-                  "items": {
-                    "type": "string",
-                    "description": "Specific application related to the integration point."
-                  },
-                  "description": "List of applications relevant to the integration point."
-                }
-              },
-              "additionalProperties": False
-            },
-            "description": "Integration points that represent convergence between domains."
-          },
-          "selectedIntegration": {
-            "type": "string",
-            "description": "The currently selected integration point from the options."
-          },
-          "selectedIsomorphism": {
-            "type": "string",
-            "description": "The currently selected isomorphism from the options."
-          }
-        },
-        "additionalProperties": False
-      },
-      "description": "Component for exploring the Recursive Chain of Thought (CCT) framework and its domains, isomorphisms, and integration points."
-    },
-    {
-      "type": "function",
-      "name": "translate_to_java",
-      "strict": True,
-      "parameters": {
-        "type": "object",
-        "required": [
-          "source_code",
-          "source_language",
-          "target_contract"
-        ],
-        "properties": {
-          "source_code": {
-            "type": "string",
-            "description": "The code that needs to be translated from the source language."
-          },
-          "source_language": {
-            "type": "string",
-            "description": "The programming language from which the code is being translated."
-          },
-          "target_contract": {
-            "type": "boolean",
-            "description": "Whether to enforce additional contracts for the translation."
-          }
-        },
-        "additionalProperties": False
-      },
-      "description": "Translates code from another programming language to Java, maintaining functionality and adhering to Java best practices."
-    },
-    {
-      "type": "function",
-      "name": "create_interactive_discrete_math_tutor",
-      "strict": True,
-      "parameters": {
-        "type": "object",
-        "required": [
-          "user_input",
-          "active_state",
-          "learning_mode"
-        ],
-        "properties": {
-          "user_input": {
-            "type": "string",
-            "description": "The user's specific requests, including commands for exploring concepts, interactions for set theory, relations, and recursive definitions."
-          },
-          "active_state": {
-            "type": "object",
-            "required": [
-              "current_topic",
-              "previous_topics"
-            ],
-            "properties": {
-              "current_topic": {
-                "type": "string",
-                "description": "The current topic the user is engaged with."
-              },
-              "previous_topics": {
-                "type": "array",
-                "items": {
-                  "type": "string",
-                  "description": "An array of previously covered topics."
-                }
-              }
-            },
-            "description": "State tracking information for the user's progression through the concepts.",
-            "additionalProperties": False
-          },
-          "learning_mode": {
-            "type": "string",
-            "description": "Determines if the mode is 'exploration' or 'proof construction'."
-          }
-        },
-        "additionalProperties": False
-      },
-      "description": "Incorporate discrete mathematics concepts to solve recursive equations in an interactive environment."
-    },
-    {
-      "type": "function",
-      "name": "flexible_framework",
-      "strict": True,
-      "parameters": {
-        "type": "object",
-        "required": [
-          "core_components",
-          "integration_layers",
-          "meta_components",
-          "user_interaction"
-        ],
-        "properties": {
-          "core_components": {
-            "type": "object",
-            "required": [
-              "cognitive_processes",
-              "philosophical_concepts",
-              "computational_architectures"
-            ],
-            "properties": {
-              "cognitive_processes": {
-                "type": "array",
-                "items": {
-                  "type": "string",
-                  "description": "Cognitive process such as attention, memory, reasoning, learning"
-                },
-                "description": "List of cognitive processes"
-              },
-              "philosophical_concepts": {
-                "type": "array",
-                "items": {
-                  "type": "string",
-                  "description": "Philosophical concept such as epistemology, ontology, ethics"
-                },
-                "description": "List of relevant philosophical concepts"
-              },
-              "computational_architectures": {
-                "type": "array",
-                "items": {
-                  "type": "string",
-                  "description": "Computational architecture like neural networks, symbolic systems, hybrid models"
-                },
-                "description": "Variety of computational models"
-              }
-            },
-            "additionalProperties": False
-          },
-          "meta_components": {
-            "type": "array",
-            "items": {
-              "type": "string",
-              "description": "Meta components like self-reflection, adaptive processing, emergent behavior"
-            },
-            "description": "Meta components of the framework"
-          },
-          "user_interaction": {
-            "type": "array",
-            "items": {
-              "type": "string",
-              "description": "User interaction tools like natural language interface, visualization tools, interactive simulations"
-            },
-            "description": "Tools for user interaction with the framework"
-          },
-          "integration_layers": {
-            "type": "object",
-            "required": [
-              "knowledge_representation",
-              "reasoning_engines",
-              "learning_mechanisms"
-            ],
-            "properties": {
-              "reasoning_engines": {
-                "type": "array",
-                "items": {
-                  "type": "string",
-                  "description": "Reasoning engines such as rule-based, probabilistic, analogical"
-                },
-                "description": "Different types of reasoning engines"
-              },
-              "learning_mechanisms": {
-                "type": "array",
-                "items": {
-                  "type": "string",
-                  "description": "Learning mechanisms like supervised, unsupervised, reinforcement"
-                },
-                "description": "Types of learning mechanisms"
-              },
-              "knowledge_representation": {
-                "type": "array",
-                "items": {
-                  "type": "string",
-                  "description": "Knowledge representation methods such as semantic networks, ontologies, conceptual graphs"
-                },
-                "description": "Methods for knowledge representation"
-              }
-            },
-            "additionalProperties": False
-          }
-        },
-        "additionalProperties": False
-      },
-      "description": "Ensure the framework is flexible enough to accommodate future developments in both AI and philosophy of knowledge."
-    },
-    {
-      "type": "function",
-      "name": "develop_epistemology_ml_framework",
-      "strict": True,
-      "parameters": {
-        "type": "object",
-        "required": [
-          "epistemological_theories",
-          "machine_learning_paradigms",
-          "knowledge_acquisition_mechanism",
-          "knowledge_visualization_tools",
-          "ethical_considerations"
-        ],
-        "properties": {
-          "ethical_considerations": {
-            "type": "array",
-            "items": {
-              "type": "string",
-              "description": "Ethical consideration"
-            },
-            "description": "List of ethical considerations regarding the implications of machine knowledge and decision-making"
-          },
-          "epistemological_theories": {
-            "type": "array",
-            "items": {
-              "type": "string",
-              "description": "Epistemological theory"
-            },
-            "description": "List of different epistemological theories represented within the AI system"
-          },
-          "machine_learning_paradigms": {
-            "type": "object",
-            "required": [
-              "supervised",
-              "unsupervised",
-              "reinforcement"
-            ],
-            "properties": {
-              "supervised": {
-                "type": "boolean",
-                "description": "Indicates if supervised learning is included"
-              },
-              "unsupervised": {
-                "type": "boolean",
-                "description": "Indicates if unsupervised learning is included"
-              },
-              "reinforcement": {
-                "type": "boolean",
-                "description": "Indicates if reinforcement learning is included"
-              }
-            },
-            "description": "Integration of various machine learning paradigms with epistemological concepts",
-            "additionalProperties": False
-          },
-          "knowledge_visualization_tools": {
-            "type": "object",
-            "required": [
-              "visualization_methods"
-            ],
-            "properties": {
-              "visualization_methods": {
-                "type": "array",
-                "items": {
-                  "type": "string",
-                  "description": "Visualization method"
-                },
-                "description": "Methods used for visualizing knowledge"
-              }
-            },
-            "description": "Tools for visualizing the AI's knowledge structure and its evolution over time",
-            "additionalProperties": False
-          },
-          "knowledge_acquisition_mechanism": {
-            "type": "object",
-            "required": [
-              "self_reasoning"
-            ],
-            "properties": {
-              "self_reasoning": {
-                "type": "boolean",
-                "description": "Indicates if self-reasoning about knowledge acquisition is implemented"
-              }
-            },
-            "description": "Mechanism for the AI to reason about its own knowledge acquisition process",
-            "additionalProperties": False
-          }
-        },
-        "additionalProperties": False
-      },
-      "description": "Develop a framework focusing on the intersection of epistemology and machine learning, addressing how AI systems can acquire and validate knowledge."
-    },
-    {
-      "type": "function",
-      "name": "framework_analysis",
-      "strict": True,
-      "parameters": {
-        "type": "object",
-        "required": [
-          "core_components",
-          "user_requirements",
-          "key_connections",
-          "external_research",
-          "framework_outline"
-        ],
-        "properties": {
-          "core_components": {
-            "type": "object",
-            "required": [
-              "conversion_engine",
-              "adaptive_learning"
-            ],
-            "properties": {
-              "adaptive_learning": {
-                "type": "object",
-                "required": [
-                  "type",
-                  "key_features"
-                ],
-                "properties": {
-                  "type": {
-                    "type": "string",
-                    "description": "Type of adaptive learning system"
-                  },
-                  "key_features": {
-                    "type": "array",
-                    "items": {
-                      "type": "string",
-                      "description": "Feature description"
-                    },
-                    "description": "List of key features for adaptive learning"
-                  }
-                },
-                "additionalProperties": False
-              },
-              "conversion_engine": {
-                "type": "object",
-                "required": [
-                  "type",
-                  "key_features"
-                ],
-                "properties": {
-                  "type": {
-                    "type": "string",
-                    "description": "Type of conversion engine"
-                  },
-                  "key_features": {
-                    "type": "array",
-                    "items": {
-                      "type": "string",
-                      "description": "Feature description"
-                    },
-                    "description": "List of key features of the conversion engine"
-                  }
-                },
-                "additionalProperties": False
-              }
-            },
-            "description": "Core components of the integration framework",
-            "additionalProperties": False
-          },
-          "key_connections": {
-            "type": "object",
-            "required": [
-              "epistemological_mapping",
-              "ml_paradigms",
-              "meta_components",
-              "visualization_support"
-            ],
-            "properties": {
-              "ml_paradigms": {
-                "type": "string",
-                "description": "Connections between machine learning paradigms and reasoning engines"
-              },
-              "meta_components": {
-                "type": "string",
-                "description": "Alignment of meta-components with self-reflection requirements"
-              },
-              "visualization_support": {
-                "type": "string",
-                "description": "Support for exploration of knowledge structure through visualization tools"
-              },
-              "epistemological_mapping": {
-                "type": "string",
-                "description": "Mapping of epistemological theories to knowledge representation layers"
-              }
-            },
-            "description": "Key connections identified within the framework",
-            "additionalProperties": False
-          },
-          "external_research": {
-            "type": "object",
-            "required": [
-              "social_ethics",
-              "validation_frameworks",
-              "interdisciplinary_approach",
-              "transparency"
-            ],
-            "properties": {
-              "transparency": {
-                "type": "boolean",
-                "description": "Emphasis on transparency and explainability"
-              },
-              "social_ethics": {
-                "type": "boolean",
-                "description": "Incorporation of social and ethical implications"
-              },
-              "validation_frameworks": {
-                "type": "boolean",
-                "description": "Incorporation of knowledge validation frameworks"
-              },
-              "interdisciplinary_approach": {
-                "type": "boolean",
-                "description": "Adoption of an interdisciplinary approach to AI development"
-              }
-            },
-            "description": "Integration points for external research",
-            "additionalProperties": False
-          },
-          "framework_outline": {
-            "type": "object",
-            "required": [
-              "epistemological_layer",
-              "ml_integration",
-              "meta_cognitive_system",
-              "visualization_tools",
-              "ethical_framework"
-            ],
-            "properties": {
-              "ml_integration": {
-                "type": "string",
-                "description": "Description of the machine learning integration layer"
-              },
-              "ethical_framework": {
-                "type": "string",
-                "description": "Description of the ethical consideration framework"
-              },
-              "visualization_tools": {
-                "type": "string",
-                "description": "Description of interactive visualization and exploration tools"
-              },
-              "epistemological_layer": {
-                "type": "string",
-                "description": "Description of the epistemological foundation layer"
-              },
-              "meta_cognitive_system": {
-                "type": "string",
-                "description": "Description of the meta-cognitive processing system"
-              }
-            },
-            "description": "Outline of the framework components",
-            "additionalProperties": False
-          },
-          "user_requirements": {
-            "type": "object",
-            "required": [
-              "focus",
-              "validation_mechanisms",
-              "self_reflective_capabilities",
-              "visual_tools",
-              "ethical_integration"
-            ],
-            "properties": {
-              "focus": {
-                "type": "string",
-                "description": "Focus on epistemology and machine learning intersection"
-              },
-              "visual_tools": {
-                "type": "boolean",
-                "description": "Indicates if visual knowledge representation tools are provided"
-              },
-              "ethical_integration": {
-                "type": "boolean",
-                "description": "Indicates if ethical considerations are integrated"
-              },
-              "validation_mechanisms": {
-                "type": "array",
-                "items": {
-                  "type": "string",
-                  "description": "Validation mechanism description"
-                },
-                "description": "Mechanisms for knowledge acquisition and validation"
-              },
-              "self_reflective_capabilities": {
-                "type": "boolean",
-                "description": "Indicates if self-reflective reasoning capabilities are included"
-              }
-            },
-            "description": "User requirements for the framework",
-            "additionalProperties": False
-          }
-        },
-        "additionalProperties": False
-      },
-      "description": "Analyzes key components of a learning pathways CLI application integration with epistemology and machine learning."
-    },
-    {
-      "type": "function",
-      "name": "meta_cognitive_layer",
-      "strict": True,
-      "parameters": {
-        "type": "object",
-        "required": [
-          "core_components",
-          "implementation_strategy"
-        ],
-        "properties": {
-          "core_components": {
-            "type": "object",
-            "required": [
-              "conversion_engine",
-              "adaptive_learning",
-              "meta_cognitive_layer"
-            ],
-            "properties": {
-              "adaptive_learning": {
-                "type": "object",
-                "required": [
-                  "type",
-                  "key_features"
-                ],
-                "properties": {
-                  "type": {
-                    "type": "string",
-                    "description": "Type of the adaptive learning mechanism"
-                  },
-                  "key_features": {
-                    "type": "array",
-                    "items": {
-                      "type": "string",
-                      "description": "Feature of the adaptive learning mechanism"
-                    },
-                    "description": "Key features of the adaptive learning"
-                  }
-                },
-                "additionalProperties": False
-              },
-              "conversion_engine": {
-                "type": "object",
-                "required": [
-                  "type",
-                  "key_features"
-                ],
-                "properties": {
-                  "type": {
-                    "type": "string",
-                    "description": "Type of the conversion engine"
-                  },
-                  "key_features": {
-                    "type": "array",
-                    "items": {
-                      "type": "string",
-                      "description": "Feature of the conversion engine"
-                    },
-                    "description": "Key features of the conversion engine"
-                  }
-                },
-                "additionalProperties": False
-              },
-              "meta_cognitive_layer": {
-                "type": "object",
-                "required": [
-                  "type",
-                  "key_features"
-                ],
-                "properties": {
-                  "type": {
-                    "type": "string",
-                    "description": "Type of the meta-cognitive layer"
-                  },
-                  "key_features": {
-                    "type": "array",
-                    "items": {
-                      "type": "string",
-                      "description": "Feature of the meta-cognitive layer"
-                    },
-                    "description": "Key features of the meta-cognitive layer"
-                  }
-                },
-                "additionalProperties": False
-              }
-            },
-            "additionalProperties": False
-          },
-          "implementation_strategy": {
-            "type": "object",
-            "required": [
-              "languages",
-              "development_phases"
-            ],
-            "properties": {
-              "languages": {
-                "type": "array",
-                "items": {
-                  "type": "string",
-                  "description": "Programming language"
-                },
-                "description": "Programming languages used for implementation"
-              },
-              "development_phases": {
-                "type": "array",
-                "items": {
-                  "type": "string",
-                  "description": "Phase of development"
-                },
-                "description": "Phases of the development process"
-              }
-            },
-            "additionalProperties": False
-          }
-        },
-        "additionalProperties": False
-      },
-      "description": "Implementation of a recursive insight generator that integrates multi-level reflection and learning pattern recognition."
-    },
-    {
-      "type": "function",
-      "name": "create_knowledge_graph",
-      "strict": True,
-      "parameters": {
-        "type": "object",
-        "required": [
-          "entities",
-          "relationships"
-        ],
-        "properties": {
-          "entities": {
-            "type": "array",
-            "items": {
-              "type": "object",
-              "required": [
-                "type",
-                "capabilities",
-                "unique_identifier"
-              ],
-              "properties": {
-                "type": {
-                  "type": "string",
-                  "description": "Type of the entity (e.g., Converter, Pathway, Reflector)"
-                },
-                "capabilities": {
-                  "type": "array",
-                  "items": {
-                    "type": "string",
-                    "description": "Capability of the entity"
-                  },
-                  "description": "List of capabilities associated with the entity"
-                },
-                "unique_identifier": {
-                  "type": "string",
-                  "description": "Unique identifier for the entity"
-                }
-              },
-              "additionalProperties": False
-            },
-            "description": "Array of knowledge entities to be created"
-          },
-          "relationships": {
-            "type": "array",
-            "items": {
-              "type": "object",
-              "required": [
-                "source",
-                "target",
-                "relationship_type"
-              ],
-              "properties": {
-                "source": {
-                  "type": "string",
-                  "description": "Identifier of the source entity"
-                },
-                "target": {
-                  "type": "string",
-                  "description": "Identifier of the target entity"
-                },
-                "relationship_type": {
-                  "type": "string",
-                  "description": "Type of relationship (e.g., generates, adapts, enhances)"
-                }
-              },
-              "additionalProperties": False
-            },
-            "description": "Array of relationships that define connections between entities"
-          }
-        },
-        "additionalProperties": False
-      },
-      "description": "Generates entities and relationships for a knowledge graph based on cognitive learning frameworks"
-    },
-    {
-      "type": "function",
-      "name": "enhance_discrete_math_learning",
-      "strict": True,
-      "parameters": {
-        "type": "object",
-        "required": [
-          "topics",
-          "interaction_flow"
-        ],
-        "properties": {
-          "topics": {
-            "type": "array",
-            "items": {
-              "enum": [
-                "predicate_logic",
-                "propositional_logic",
-                "boolean_logic",
-                "truth_tables",
-                "microarchitecture",
-                "recursive_functions",
-                "set_theory",
-                "relations",
-                "recursive_relations"
-              ],
-              "type": "string"
-            },
-            "description": "List of discrete mathematics topics to cover"
-          },
-          "interaction_flow": {
-            "type": "object",
-            "required": [
-              "greetings",
-              "prompts",
-              "examples"
-            ],
-            "properties": {
-              "prompts": {
-                "type": "array",
-                "items": {
-                  "type": "string",
-                  "description": "Prompt message"
-                },
-                "description": "List of prompts to guide user interaction"
-              },
-              "examples": {
-                "type": "array",
-                "items": {
-                  "type": "object",
-                  "required": [
-                    "topic",
-                    "example_text"
-                  ],
-                  "properties": {
-                    "topic": {
-                      "type": "string",
-                      "description": "The topic the example relates to"
-                    },
-                    "example_text": {
-                      "type": "string",
-                      "description": "The example content"
-                    }
-                  },
-                  "additionalProperties": False
-                },
-                "description": "Examples to illustrate concepts"
-              },
-              "greetings": {
-                "type": "string",
-                "description": "Greeting message for user engagement"
-              }
-            },
-            "description": "Structure of the conversation flow",
-            "additionalProperties": False
-          }
-        },
-        "additionalProperties": False
-      },
-      "description": "Enhance the creation of a large conversation flow for CLI input to teach discrete mathematics concepts, including predicate logic, propositional logic, boolean logic, truth tables, microarchitecture, recursive functions, and set theory with relations and recursive relations."
-    },
-    {
-      "type": "function",
-      "name": "discrete_mathematics_framework",
-      "strict": True,
-      "parameters": {
-        "type": "object",
-        "required": [
-          "enhancements",
-          "integration_points",
-          "project_structure"
-        ],
-        "properties": {
-          "enhancements": {
-            "type": "array",
-            "items": {
-              "type": "string",
-              "description": "An enhancement to the framework"
-            },
-            "description": "List of key enhancements made to the framework"
-          },
-          "project_structure": {
-            "type": "object",
-            "required": [
-              "core",
-              "learning",
-              "interfaces"
-            ],
-            "properties": {
-              "core": {
-                "type": "object",
-                "required": [
-                  "discrete",
-                  "visualization",
-                  "base_converter"
-                ],
-                "properties": {
-                  "discrete": {
-                    "type": "object",
-                    "required": [
-                      "predicate_logic",
-                      "propositional_logic",
-                      "boolean_algebra",
-                      "set_theory",
-                      "recursive_proofs"
-                    ],
-                    "properties": {
-                      "set_theory": {
-                        "type": "string",
-                        "description": "File for set theory operations"
-                      },
-                      "boolean_algebra": {
-                        "type": "string",
-                        "description": "File for boolean algebra operations"
-                      },
-                      "predicate_logic": {
-                        "type": "string",
-                        "description": "File for predicate logic operations"
-                      },
-                      "recursive_proofs": {
-                        "type": "string",
-                        "description": "File for recursive proofs operations"
-                      },
-                      "propositional_logic": {
-                        "type": "string",
-                        "description": "File for propositional logic operations"
-                      }
-                    },
-                    "description": "Module for discrete mathematics concepts",
-                    "additionalProperties": False
-                  },
-                  "visualization": {
-                    "type": "object",
-                    "required": [
-                      "truth_tables",
-                      "set_diagrams",
-                      "relation_graphs"
-                    ],
-                    "properties": {
-                      "set_diagrams": {
-                        "type": "string",
-                        "description": "File for creating set diagrams"
-                      },
-                      "truth_tables": {
-                        "type": "string",
-                        "description": "File for generating truth tables"
-                      },
-                      "relation_graphs": {
-                        "type": "string",
-                        "description": "File for visualizing relation graphs"
-                      }
-                    },
-                    "description": "Module for visualization tools",
-                    "additionalProperties": False
-                  },
-                  "base_converter": {
-                    "type": "string",
-                    "description": "File for base conversion utilities"
-                  }
-                },
-                "description": "Core module containing primary functionalities",
-                "additionalProperties": False
-              },
-              "learning": {
-                "type": "object",
-                "required": [
-                  "concept_graph",
-                  "proof_validator",
-                  "relation_analyzer"
-                ],
-                "properties": {
-                  "concept_graph": {
-                    "type": "string",
-                    "description": "File for concept graph management"
-                  },
-                  "proof_validator": {
-                    "type": "string",
-                    "description": "File for validating proofs"
-                  },
-                  "relation_analyzer": {
-                    "type": "string",
-                    "description": "File for analyzing relations"
-                  }
-                },
-                "description": "Module for learning resources and utilities",
-                "additionalProperties": False
-              },
-              "interfaces": {
-                "type": "object",
-                "required": [
-                  "interactive_cli"
-                ],
-                "properties": {
-                  "interactive_cli": {
-                    "type": "string",
-                    "description": "File for the interactive command line interface"
-                  }
-                },
-                "description": "Module for user interface elements",
-                "additionalProperties": False
-              }
-            },
-            "description": "Directory structure of the enhanced project",
-            "additionalProperties": False
-          },
-          "integration_points": {
-            "type": "array",
-            "items": {
-              "type": "string",
-              "description": "An integration point within the framework"
-            },
-            "description": "Integration points for new features or modules"
-          }
-        },
-        "additionalProperties": False
-      },
-      "description": "A framework for exploring discrete mathematics concepts interactively"
-    },
-    {
-      "type": "function",
-      "name": "visualize_recursive_equation",
-      "strict": True,
-      "parameters": {
-        "type": "object",
-        "required": [
-          "equation",
-          "base_case",
-          "steps"
-        ],
-        "properties": {
-          "steps": {
-            "type": "boolean",
-            "description": "Flag to indicate whether to show detailed steps of the recursive solution."
-          },
-          "equation": {
-            "type": "string",
-            "description": "The recursive equation to visualize."
-          },
-          "base_case": {
-            "type": "object",
-            "required": [
-              "n0",
-              "n1"
-            ],
-            "properties": {
-              "n0": {
-                "type": "number",
-                "description": "Base case for n=0."
-              },
-              "n1": {
-                "type": "number",
-                "description": "Base case for n=1."
-              }
-            },
-            "description": "Base cases for the recursive equation.",
-            "additionalProperties": False
-          }
-        },
-        "additionalProperties": False
-      },
-      "description": "Incorporate recursive relationships and employ discrete mathematics concepts to solve recursive equations."
-    },
-    {
-      "type": "function",
-      "name": "suggest_project_interaction",
-      "strict": True,
-      "parameters": {
-        "type": "object",
-        "required": [
-          "core_structure",
-          "interaction_concepts"
-        ],
-        "properties": {
-          "core_structure": {
-            "type": "object",
-            "required": [
-              "modular_architecture",
-              "clear_separation_of_concerns",
-              "extensible_design_patterns",
-              "test_driven_development",
-              "interactive_learning_components"
-            ],
-            "properties": {
-              "modular_architecture": {
-                "type": "boolean",
-                "description": "Indicates if the framework follows a modular architecture."
-              },
-              "test_driven_development": {
-                "type": "boolean",
-                "description": "Indicates if the approach follows test-driven development principles."
-              },
-              "extensible_design_patterns": {
-                "type": "boolean",
-                "description": "Indicates if the design patterns are extensible for future developments."
-              },
-              "clear_separation_of_concerns": {
-                "type": "boolean",
-                "description": "Indicates if there is a clear separation of concerns in the architecture."
-              },
-              "interactive_learning_components": {
-                "type": "boolean",
-                "description": "Indicates if interactive learning components are included in the project."
-              }
-            },
-            "additionalProperties": False
-          },
-          "interaction_concepts": {
-            "type": "array",
-            "items": {
-              "type": "string",
-              "description": "Interaction concept related to cognitive mapping, adaptive strategies, or recursive generation."
-            },
-            "description": "List of interaction concepts to demonstrate multi-layered approach in computational learning."
-          }
-        },
-        "additionalProperties": False
-      },
-      "description": "Suggest project interaction concepts to demonstrate a multi-layered approach to computational learning, treating number system conversion as a complex cognitive transformation process."
-    },
-    {
-      "type": "function",
-      "name": "generate_entities",
-      "strict": True,
-      "parameters": {
-        "type": "object",
-        "required": [
-          "core_architecture",
-          "implementation_strategy"
-        ],
-        "properties": {
-          "core_architecture": {
-            "type": "object",
-            "required": [
-              "conversion_engine",
-              "learning_pathway",
-              "meta_cognitive_layer"
-            ],
-            "properties": {
-              "learning_pathway": {
-                "type": "object",
-                "required": [
-                  "key_features",
-                  "type"
-                ],
-                "properties": {
-                  "type": {
-                    "type": "string",
-                    "description": "Type of the learning pathway"
-                  },
-                  "key_features": {
-                    "type": "array",
-                    "items": {
-                      "type": "string",
-                      "description": "Feature of the learning pathway"
-                    },
-                    "description": "Key features of the learning pathway"
-                  }
-                },
-                "additionalProperties": False
-              },
-              "conversion_engine": {
-                "type": "object",
-                "required": [
-                  "key_features",
-                  "type"
-                ],
-                "properties": {
-                  "type": {
-                    "type": "string",
-                    "description": "Type of the conversion engine"
-                  },
-                  "key_features": {
-                    "type": "array",
-                    "items": {
-                      "type": "string",
-                      "description": "Feature of the conversion engine"
-                    },
-                    "description": "Key features of the conversion engine"
-                  }
-                },
-                "additionalProperties": False
-              },
-              "meta_cognitive_layer": {
-                "type": "object",
-                "required": [
-                  "key_features",
-                  "type"
-                ],
-                "properties": {
-                  "type": {
-                    "type": "string",
-                    "description": "Type of the meta cognitive layer"
-                  },
-                  "key_features": {
-                    "type": "array",
-                    "items": {
-                      "type": "string",
-                      "description": "Feature of the meta cognitive layer"
-                    },
-                    "description": "Key features of the meta cognitive layer"
-                  }
-                },
-                "additionalProperties": False
-              }
-            },
-            "additionalProperties": False
-          },
-          "implementation_strategy": {
-            "type": "object",
-            "required": [
-              "development_phases",
-              "languages"
-            ],
-            "properties": {
-              "languages": {
-                "type": "array",
-                "items": {
-                  "type": "string",
-                  "description": "Programming language used"
-                },
-                "description": "Languages used in the implementation"
-              },
-              "development_phases": {
-                "type": "array",
-                "items": {
-                  "type": "string",
-                  "description": "Phase of development"
-                },
-                "description": "Phases of the implementation strategy"
-              }
-            },
-            "additionalProperties": False
-          }
-        },
-        "additionalProperties": False
-      },
-      "description": "Generate entities for understanding our pathway"
-    },
-    {
-      "type": "function",
-      "name": "CognitiveAnalysisModel",
-      "strict": True,
-      "parameters": {
-        "type": "object",
-        "required": [
-          "key_capabilities",
-          "relationship_dynamics"
-        ],
-        "properties": {
-          "key_capabilities": {
-            "type": "array",
-            "items": {
-              "type": "string",
-              "description": "Capabilities such as multi-level insight generation, learning trajectory analysis, and recursive knowledge mapping"
-            },
-            "description": "Core capabilities of the cognitive analysis model"
-          },
-          "relationship_dynamics": {
-            "type": "array",
-            "items": {
-              "type": "object",
-              "required": [
-                "source",
-                "target",
-                "interaction_type"
-              ],
-              "properties": {
-                "source": {
-                  "type": "string",
-                  "description": "The source entity in the relationship"
-                },
-                "target": {
-                  "type": "string",
-                  "description": "The target entity in the relationship"
-                },
-                "interaction_type": {
-                  "type": "string",
-                  "description": "The type of interaction between the source and target entities"
-                }
-              },
-              "additionalProperties": False
-            },
-            "description": "Dynamics of relationships between cognitive entities"
-          }
-        },
-        "additionalProperties": False
-      },
-      "description": "Analyzes cognitive structures and relationships through recursive knowledge mapping and learning trajectory analysis."
-    }
-  ],
-  temperature=2,
-  max_output_tokens=16384,
-  top_p=0.11,
-  store=True
-)
+    # The conversation is read from the compressed payload store rather than
+    # inlined here; see anthropic_client/payload_store.py
+    request_body = PayloadStore().conversation("kob-fourfive").body()
+    response = client.responses.create(**request_body)
     logger.info("API request completed successfully")
     
     print("\nRequest completed. Response received:")
@@ -1,15 +1,14 @@
-import json
+from anthropic_client.payload_store import PayloadStore
 
 def load_example_conversation():
-    with open('anthropic_client/o1-kob.py') as f:
-        data = json.load(f)
-    return data
+    return PayloadStore().conversation("o1-kob-o3")
 
 # Access model type
-model_info = load_example_conversation()
-print(f"Using model: {model_info['model']}")
+conversation = load_example_conversation()
+print(f"Using model: {conversation.field('model')}")
 
 # Access the prompts or responses
-for interaction in model_info['input']:
+for i in range(len(conversation)):
+    interaction = conversation.message(i)
     if interaction['role'] == 'developer':
-        print("Developer prompt:", interaction['content'][0]['text'][:100], "...")
\ No newline at end of file
+        print("Developer prompt:", interaction['content'][0]['text'][:100], "...")
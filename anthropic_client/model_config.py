@@ -1,30 +1,144 @@
 """
 Module to load JSON model configurations.
+
+Configuration directories are scanned once into an index of model name to
+file, parsed configs are cached, and the index is revalidated against file
+modification times at most once per refresh interval. Lookups in between are
+plain dictionary reads, and edited or newly added files are picked up without
+restarting the process.
 """
 
 import json
+import logging
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Name of a file holding several configs as {"<model name>": {...}, ...}
+CONSOLIDATED_CONFIG_NAME = "models.json"
+
+DEFAULT_CONFIG_DIRS: List[Path] = [
+    Path(__file__).parent,
+    Path(__file__).parent / "configs",
+    Path.home() / ".anthropic" / "configs",
+]
+
+
+class ModelConfigRegistry:
+    """Index of model configurations across the config directories."""
+
+    def __init__(
+        self,
+        config_dirs: Optional[Sequence[Union[str, Path]]] = None,
+        refresh_interval: float = 1.0
+    ) -> None:
+        """Initialize the registry.
+
+        Args:
+            config_dirs: Directories to scan, highest precedence first
+            refresh_interval: Seconds between mtime revalidations; 0 checks on every lookup
+        """
+        self.config_dirs = [Path(d) for d in (config_dirs or DEFAULT_CONFIG_DIRS)]
+        self.refresh_interval = refresh_interval
+        self._signature: Tuple[Tuple[str, float], ...] = ()
+        self._configs: Dict[str, Dict[str, Any]] = {}
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, model_name: str) -> Optional[Dict[str, Any]]:
+        """Return the configuration for a model.
+
+        The returned dictionary is shared between callers and must not be mutated.
+
+        Args:
+            model_name: The model name or config file stem
+
+        Returns:
+            The model configuration, or None if no config matches
+        """
+        if time.monotonic() >= self._next_check:
+            self.refresh()
+        return self._configs.get(model_name)
+
+    def refresh(self, force: bool = False) -> None:
+        """Rebuild the index if any config file was added, removed or modified.
+
+        Args:
+            force: Rebuild even if nothing appears to have changed
+        """
+        with self._lock:
+            self._next_check = time.monotonic() + self.refresh_interval
+            files = self._scan()
+            signature = tuple((str(path), mtime) for path, mtime in files)
+            if signature == self._signature and not force:
+                return
+            self._configs = self._build_index([path for path, _ in files])
+            self._signature = signature
+            logger.debug(f"Indexed {len(self._configs)} model configurations")
+
+    def _scan(self) -> List[Tuple[Path, float]]:
+        """List config files with their modification times, in directory order."""
+        files: List[Tuple[Path, float]] = []
+        for directory in self.config_dirs:
+            try:
+                entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    files.append((Path(entry.path), entry.stat().st_mtime))
+        return files
+
+    def _build_index(self, paths: List[Path]) -> Dict[str, Dict[str, Any]]:
+        """Parse config files into a name-to-config index.
+
+        Earlier directories win; within a directory, single-model files win
+        over entries of the consolidated file. A config is found only by its
+        file or entry name; its "model" field is the name sent to the API and
+        may be shared by configs that are not meant for that model.
+        """
+        # Stable sort: keep directory order, move consolidated files last within each
+        order = {directory: rank for rank, directory in enumerate(self.config_dirs)}
+        paths = sorted(paths, key=lambda path: (order.get(path.parent, len(order)),
+                                                path.name == CONSOLIDATED_CONFIG_NAME))
+        index: Dict[str, Dict[str, Any]] = {}
+        for path in paths:
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable model config {path}: {e}")
+                continue
+            if not isinstance(data, dict):
+                continue
+            if path.name == CONSOLIDATED_CONFIG_NAME:
+                entries = [(name, config) for name, config in data.items() if isinstance(config, dict)]
+            else:
+                entries = [(path.stem, data)]
+            for name, config in entries:
+                index.setdefault(name, config)
+        return index
+
+
+_registry = ModelConfigRegistry()
+
+
+def get_registry() -> ModelConfigRegistry:
+    """Return the process-wide model config registry."""
+    return _registry
+
 
 def load_model_config(model_name: str) -> Optional[Dict[str, Any]]:
     """Load model configuration from a JSON file.
-    
+
     Args:
         model_name: The name of the model to load configuration for.
-        
+
     Returns:
         A dictionary containing the model configuration or None if the file was not found.
     """
-    config_locations = [
-        Path(__file__).parent / f"{model_name}.json",
-        Path(__file__).parent / "configs" / f"{model_name}.json",
-        Path.home() / ".anthropic" / "configs" / f"{model_name}.json"
-    ]
-    
-    for location in config_locations:
-        if location.exists():
-            with open(location, 'r') as f:
-                return json.load(f)
-                
-    return None 
\ No newline at end of file
+    return _registry.get(model_name)
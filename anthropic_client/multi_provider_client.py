@@ -5,14 +5,66 @@ Client for interacting with multiple model providers (Anthropic and OpenAI).
 import os
 import json
 import logging
+import time
+from contextvars import ContextVar
 from dotenv import load_dotenv
-from typing import Any, Dict, Iterator, Union, List, Optional
-import anthropic
-from anthropic_client.client import ModelName, OutputFormat  # Assumes OutputFormat is defined in client.py
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Union, List, Optional, Sequence, Tuple
+from anthropic_client.client import ModelName, OutputFormat, json_instruction_block  # Assumes OutputFormat is defined in client.py
+from anthropic_client.batch import BatchResult, BatchScheduler
+from anthropic_client.cache import ResponseCache, request_fingerprint
+from anthropic_client.context_budget import ContextBudgeter
+from anthropic_client.events import StreamDecoder, message_text, message_thinking_chars
+from anthropic_client.health import BreakerRegistry, CircuitBreaker, CircuitOpenError, is_route_failure
+from anthropic_client.hedge import HedgePolicy, hedged_stream
+from anthropic_client.json_stream import iter_json
 from anthropic_client.model_config import load_model_config
+from anthropic_client.openai_transport import (
+    OpenAITransport,
+    chat_deltas,
+    chat_text,
+    note_body_usage,
+    responses_deltas,
+    responses_text,
+)
+from anthropic_client.prompt_cache import DEFAULT_MIN_CACHE_CHARS, PromptCacheStats, build_system_blocks
+from anthropic_client.router import AUTO_MODEL, ModelRouter, RouteDecision
+from anthropic_client.rate_limit import RateLimitGovernor, estimate_request_tokens
+from anthropic_client.telemetry import Telemetry, note_cache_hit, note_usage
+from anthropic_client.transport import get_http_client
 
 logger = logging.getLogger(__name__)
 
+# (provider, model name, custom model configuration)
+Route = Tuple[str, str, Optional[Dict[str, Any]]]
+
+
+class _RoutedCall:
+    """Provider-side time of a routed request, and whether the cache served it.
+
+    Only time spent inside the client counts; for a stream that is the time
+    spent producing chunks, not the caller's time between them.
+    """
+
+    __slots__ = ("provider_time", "cache_hit")
+
+    def __init__(self) -> None:
+        self.provider_time = 0.0
+        self.cache_hit = False
+
+    def run(self, step: Callable[[], Any]) -> Any:
+        """Run one step of the request as the current routed call, timing it."""
+        token = _routed_call.set(self)
+        started = time.perf_counter()
+        try:
+            return step()
+        finally:
+            self.provider_time += time.perf_counter() - started
+            _routed_call.reset(token)
+
+
+_routed_call: ContextVar[Optional[_RoutedCall]] = ContextVar("routed_call", default=None)
+
 # Dictionary of known model capabilities
 MODEL_CAPABILITIES = {
     "claude-3-5-haiku-20241022": {
@@ -32,38 +84,194 @@ MODEL_CAPABILITIES = {
 class MultiProviderClient:
     """Client for interacting with multiple model providers."""
     
-    def __init__(self) -> None:
-        """Initialize the client with API keys from the environment."""
+    def __init__(
+        self,
+        cache: Optional[ResponseCache] = None,
+        batch_manifest_dir: Optional[Union[str, Path]] = None,
+        governor: Optional[RateLimitGovernor] = None,
+        min_cache_chars: Optional[int] = DEFAULT_MIN_CACHE_CHARS,
+        hedge_policy: Optional[HedgePolicy] = None,
+        fallback_models: Sequence[str] = (),
+        breakers: Optional[BreakerRegistry] = None,
+        budgeter: Optional[ContextBudgeter] = None,
+        router: Optional[ModelRouter] = None,
+        telemetry: Optional[Telemetry] = None
+    ) -> None:
+        """Initialize the client with API keys from the environment.
+        
+        Args:
+            cache: Optional response cache consulted before Anthropic requests
+            batch_manifest_dir: Directory for batch manifests (defaults to ~/.anthropic/batches)
+            governor: Optional rate-limit governor pacing and retrying Anthropic requests
+            min_cache_chars: System prompts at least this long get a prompt-cache
+                breakpoint; None disables automatic breakpoints
+            hedge_policy: Optional policy for hedging slow requests with a secondary model
+            fallback_models: Models to fail over to when the requested model's route is unhealthy
+            breakers: Optional circuit breakers per route (created when fallbacks are given)
+            budgeter: Context-window budgeter sizing each Anthropic request (a default
+                one is created; set the attribute to None to send requests unchanged)
+            router: Optional router choosing the model for requests with model="auto"
+            telemetry: Optional telemetry measuring every request sent to a provider
+        """
         load_dotenv()
+        self.cache = cache
+        self.governor = governor
+        self.min_cache_chars = min_cache_chars
+        self.prompt_cache_stats = PromptCacheStats()
+        self.hedge_policy = hedge_policy
+        self.fallback_models = list(fallback_models)
+        self.breakers = breakers if breakers is not None or not fallback_models else BreakerRegistry()
+        self.batch_manifest_dir = batch_manifest_dir
+        self.budgeter = budgeter or ContextBudgeter()
+        self.router = router
+        self.telemetry = telemetry
         
         # Initialize Anthropic client if API key is available
         anthropic_api_key = os.environ.get("ANTHROPIC_API_KEY")
         if anthropic_api_key:
-            self.anthropic_client = anthropic.Anthropic(api_key=anthropic_api_key)
+            import anthropic
+            # With a governor the SDK must not retry too, or every governor
+            # attempt would hide up to DEFAULT_MAX_RETRIES more requests
+            self.anthropic_client = anthropic.Anthropic(
+                api_key=anthropic_api_key,
+                http_client=get_http_client("anthropic"),
+                max_retries=0 if governor else anthropic.DEFAULT_MAX_RETRIES
+            )
         else:
             self.anthropic_client = None
 
-        # Initialize OpenAI client if API key is available
+        # OpenAI requests share the pooled transport when an API key is available
         openai_api_key = os.environ.get("OPENAI_API_KEY")
-        if openai_api_key:
-            import openai
-            openai.api_key = openai_api_key
-            self.openai_client = openai
-        else:
-            self.openai_client = None
+        self.openai_transport = OpenAITransport(openai_api_key) if openai_api_key else None
             
     def get_response(self, prompt: str, **kwargs) -> Union[str, Iterator[str]]:
         """Get response from appropriate model provider based on model name.
         
+        With model="auto" the router picks the model. When a hedge policy is
+        configured, the request is hedged with the policy's secondary model.
+        
         Args:
             prompt: The prompt to send.
             kwargs: Additional parameters including 'model', 'temperature', etc.
+                'history' holds earlier turns of the conversation as messages.
+                'parse_json' streams a json response as parsed top-level
+                elements, each yielded as soon as it closes.
             
         Returns:
             The response from the model.
+            
+        Raises:
+            ValueError: If model="auto" is requested without a router, or
+                'parse_json' is set without format json
         """
+        if kwargs.pop("parse_json", False):
+            if OutputFormat(kwargs.get("format", OutputFormat.TEXT)) != OutputFormat.JSON:
+                raise ValueError("parse_json requires format=json")
+            return iter_json(self.get_response(prompt, **dict(kwargs, stream=True)))
         model = kwargs.get("model", ModelName.SONNET)
+        model = getattr(model, "value", model)
+        if model == AUTO_MODEL:
+            if not self.router:
+                raise ValueError("model 'auto' needs a ModelRouter")
+            return self._get_routed_response(prompt, **kwargs)
+        if self.hedge_policy:
+            if model != self.hedge_policy.secondary_model:
+                return self._get_hedged_response(prompt, **kwargs)
+        return self._route_response(prompt, **kwargs)
+    
+    def _get_routed_response(self, prompt: str, **kwargs) -> Union[str, Iterator[str]]:
+        """Send a request to the model the router picks, reporting how it went.
+        
+        Args:
+            prompt: The prompt to send.
+            kwargs: Additional parameters including 'format', 'temperature', etc.
+            
+        Returns:
+            The response from the chosen model.
+        """
+        decision = self.router.route(prompt, kwargs.get("format", OutputFormat.TEXT))
+        logger.info(f"Routed to {decision.model} (expected {decision.expected_latency:.1f}s)")
+        kwargs = dict(kwargs, model=decision.model)
+        call = _RoutedCall()
+        response = call.run(lambda: self.get_response(prompt, **kwargs))
+        if isinstance(response, str):
+            self._observe_route(decision, prompt, kwargs, call, len(response))
+            return response
+        return self._observe_routed_stream(response, decision, prompt, kwargs, call)
+    
+    def _observe_routed_stream(
+        self,
+        chunks: Iterator[str],
+        decision: RouteDecision,
+        prompt: str,
+        kwargs: Dict[str, Any],
+        call: _RoutedCall
+    ) -> Iterator[str]:
+        """Yield a routed stream, reporting it to the router once exhausted."""
+        chars = 0
+        iterator = iter(chunks)
+        while True:
+            chunk = call.run(lambda: next(iterator, None))
+            if chunk is None:
+                break
+            chars += len(chunk)
+            yield chunk
+        self._observe_route(decision, prompt, kwargs, call, chars)
+    
+    def _observe_route(
+        self,
+        decision: RouteDecision,
+        prompt: str,
+        kwargs: Dict[str, Any],
+        call: _RoutedCall,
+        chars: int
+    ) -> None:
+        """Report a finished routed request (answer size at about 4 characters per token).
+        
+        Cache hits say nothing about the model's latency and are not reported.
+        """
+        if call.cache_hit:
+            return
+        self.router.observe(
+            decision.model,
+            call.provider_time,
+            chars / 4,
+            prompt=prompt,
+            format=kwargs.get("format", OutputFormat.TEXT)
+        )
+    
+    def _get_hedged_response(self, prompt: str, **kwargs) -> Union[str, Iterator[str]]:
+        """Race the requested model against the hedge policy's secondary model.
+        
+        Args:
+            prompt: The prompt to send.
+            kwargs: Additional parameters including 'model', 'temperature', etc.
+            
+        Returns:
+            The winning response, streamed if 'stream' was requested.
+        """
+        secondary_kwargs = dict(kwargs, model=self.hedge_policy.secondary_model)
+        chunks = hedged_stream(
+            lambda: self._open_text_stream(prompt, **kwargs),
+            lambda: self._open_text_stream(prompt, **secondary_kwargs),
+            self.hedge_policy
+        )
+        return chunks if kwargs.get("stream", False) else "".join(chunks)
+    
+    def _open_text_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Route a streaming request; providers that cannot stream yield one chunk."""
+        response = self._route_response(prompt, **dict(kwargs, stream=True))
+        return iter([response]) if isinstance(response, str) else response
+    
+    def _resolve_route(self, model: Any) -> Route:
+        """Resolve a model to the provider serving it.
         
+        Args:
+            model: A ModelName or model name string.
+            
+        Returns:
+            The provider, the model name and its custom configuration (if any).
+        """
         # Convert string to ModelName enum if it's a string
         if isinstance(model, str):
             try:
@@ -90,9 +298,114 @@ class MultiProviderClient:
         model_config = load_model_config(model.value)
         
         if model.provider == "openai" or (model_config and model_config.get("model_provider") == "openai"):
+            return "openai", model.value, model_config
+        return "anthropic", model.value, model_config
+    
+    def _dispatch(self, prompt: str, route: Route, **kwargs) -> Union[str, Iterator[str]]:
+        """Send a request to the provider of a resolved route, measured if telemetry is on."""
+        if self.telemetry:
+            return self.telemetry.measure(
+                route[0], route[1], kwargs.get("stream", False), lambda: self._send(prompt, route, **kwargs)
+            )
+        return self._send(prompt, route, **kwargs)
+    
+    def _send(self, prompt: str, route: Route, **kwargs) -> Union[str, Iterator[str]]:
+        """Send a request to the provider of a resolved route."""
+        provider, _, model_config = route
+        if provider == "openai":
             return self._get_openai_response(prompt, model_config, **kwargs)
-        else:
-            return self._get_anthropic_response(prompt, **kwargs)
+        return self._get_anthropic_response(prompt, **kwargs)
+    
+    def _route_response(self, prompt: str, **kwargs) -> Union[str, Iterator[str]]:
+        """Send a request to the provider serving its model.
+        
+        With circuit breakers configured, routes whose breaker is open are
+        skipped and failed calls fail over to the configured fallback models.
+        
+        Args:
+            prompt: The prompt to send.
+            kwargs: Additional parameters including 'model', 'temperature', etc.
+            
+        Returns:
+            The response from the model.
+        """
+        route = self._resolve_route(kwargs.get("model", ModelName.SONNET))
+        if not self.breakers:
+            return self._dispatch(prompt, route, **kwargs)
+        candidates = self._candidate_routes(route)
+        if kwargs.get("stream", False):
+            return self._failover_stream(prompt, candidates, **kwargs)
+        return self._failover_call(prompt, candidates, **kwargs)
+    
+    def _candidate_routes(self, route: Route) -> List[Tuple[Route, CircuitBreaker]]:
+        """Return the requested route followed by its fallbacks, healthiest first."""
+        fallbacks = {}
+        for model in self.fallback_models:
+            fallback = self._resolve_route(model)
+            if fallback[1] != route[1]:
+                fallbacks[self.breakers.get(fallback[0], fallback[1])] = fallback
+        ranked = self.breakers.rank(fallbacks)
+        return [(route, self.breakers.get(route[0], route[1]))] + [(fallbacks[breaker], breaker) for breaker in ranked]
+    
+    def _failover_call(self, prompt: str, candidates: List[Tuple[Route, CircuitBreaker]], **kwargs) -> Any:
+        """Send a complete request to the first candidate route that succeeds.
+        
+        Only route failures (see ``is_route_failure``) are recorded and fail
+        over; errors of the request itself are raised at once.
+        """
+        last_error: Optional[Exception] = None
+        for route, breaker in candidates:
+            if not breaker.allow():
+                continue
+            started = time.perf_counter()
+            try:
+                response = self._dispatch(prompt, route, **dict(kwargs, model=route[1]))
+            except Exception as e:
+                if not is_route_failure(e):
+                    breaker.release()
+                    raise
+                breaker.record_failure(time.perf_counter() - started)
+                logger.warning(f"{breaker.name} failed, failing over: {str(e)}")
+                last_error = e
+                continue
+            breaker.record_success(time.perf_counter() - started)
+            return response
+        raise last_error or CircuitOpenError(f"All routes are open: {', '.join(b.name for _, b in candidates)}")
+    
+    def _failover_stream(self, prompt: str, candidates: List[Tuple[Route, CircuitBreaker]], **kwargs) -> Iterator[str]:
+        """Stream from the first candidate route that produces a first chunk.
+        
+        Latency is measured to the first chunk. A failure after the first
+        chunk is recorded and raised; it cannot fail over mid-answer.
+        """
+        last_error: Optional[Exception] = None
+        for route, breaker in candidates:
+            if not breaker.allow():
+                continue
+            started = time.perf_counter()
+            try:
+                response = self._dispatch(prompt, route, **dict(kwargs, model=route[1]))
+                chunks = iter([response]) if isinstance(response, str) else iter(response)
+                first = next(chunks, None)
+            except Exception as e:
+                if not is_route_failure(e):
+                    breaker.release()
+                    raise
+                breaker.record_failure(time.perf_counter() - started)
+                logger.warning(f"{breaker.name} failed, failing over: {str(e)}")
+                last_error = e
+                continue
+            breaker.record_success(time.perf_counter() - started)
+            if first is not None:
+                yield first
+            try:
+                yield from chunks
+            except Exception as e:
+                if is_route_failure(e):
+                    breaker.record_failure()
+                raise
+            return
+        raise last_error or CircuitOpenError(f"All routes are open: {', '.join(b.name for _, b in candidates)}")
     
     def _check_model_capabilities(self, model_value: str) -> Dict[str, bool]:
         """Check the capabilities of a given model.
@@ -112,87 +425,69 @@ class MultiProviderClient:
         # Return known capabilities or defaults
         return MODEL_CAPABILITIES.get(model_value, default_capabilities)
             
-    def _get_openai_response(self, prompt: str, model_config: Dict[str, Any], **kwargs) -> Any:
+    def _get_openai_response(self, prompt: str, model_config: Optional[Dict[str, Any]], **kwargs) -> Union[str, Iterator[str]]:
         """Handle OpenAI API calls using the given model configuration.
         
+        Configurations whose endpoint is a ``/responses`` URL use the
+        Responses API; all others use Chat Completions. Both go over the
+        pooled transport and stream when 'stream' is requested.
+        
         Args:
             prompt: The prompt string.
-            model_config: JSON configuration dictionary for the model.
-            kwargs: Additional parameters such as temperature.
+            model_config: JSON configuration dictionary for the model, if any.
+            kwargs: Additional parameters such as model, temperature and stream.
             
         Returns:
-            The response from OpenAI.
+            The response text, or an iterator of text deltas when streaming.
         """
-        # Example implementation using the OpenAI client with the given configuration
-        if not self.openai_client:
+        if not self.openai_transport:
             raise ValueError("OPENAI_API_KEY is not set")
         
+        model_config = model_config or {}
         endpoint = model_config.get("endpoint")
-        headers = model_config.get("headers", {})
+        headers = model_config.get("headers") or None
         parameters = model_config.get("parameters", {})
-        model_name = model_config.get("model")
-        temperature = kwargs.get("temperature", model_config.get("temperature", 0.7))
+        model = kwargs.get("model")
+        model_name = model_config.get("model") or getattr(model, "value", model)
+        messages = [*kwargs.get("history", ()), {"role": "user", "content": prompt}]
+        
+        if endpoint and "/responses" in endpoint:
+            payload = {
+                "model": model_name,
+                "input": messages if len(messages) > 1 else prompt,
+                **parameters
+            }
+            extract_text, extract_deltas = responses_text, responses_deltas
+        else:
+            endpoint = endpoint or "chat/completions"
+            payload = {
+                "model": model_name,
+                "messages": messages,
+                "temperature": kwargs.get("temperature", model_config.get("temperature", 0.7)),
+                **parameters
+            }
+            extract_text, extract_deltas = chat_text, chat_deltas
         
-        # This is a placeholder for making an API call to OpenAI's endpoint.
         try:
-            # Handle the custom "responses" endpoint differently than standard OpenAI endpoints
-            if endpoint and "/responses" in endpoint:
-                import requests
-                # Set up direct API request
-                api_key = os.environ.get("OPENAI_API_KEY")
-                headers = {
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {api_key}"
-                }
-                
-                # Prepare request payload
-                payload = {
-                    "model": model_name,
-                    "input": prompt,
-                    **parameters
-                }
-                
-                # Make direct API request
-                response = requests.post(endpoint, headers=headers, json=payload)
-                response_json = response.json()
-                
-                # Extract content from the response
-                if response_json and "output" in response_json:
-                    return response_json["output"]
-                else:
-                    logger.error(f"Invalid response format: {response_json}")
-                    return "Error: Invalid response format"
-            else:
-                # Use standard OpenAI client for normal endpoints
-                response = self.openai_client.ChatCompletion.create(
-                    model=model_name,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=temperature,
-                    **parameters
-                )
-                
-                # Check if response and response.choices exist
-                if not response or not hasattr(response, 'choices') or not response.choices:
-                    logger.error("Invalid response format from OpenAI API")
-                    return "Error: Invalid response format"
-                    
-                # Check if choice.message exists
-                choice = response.choices[0]
-                if not hasattr(choice, 'message') or not choice.message:
-                    logger.error("Response missing message attribute")
-                    return "Error: Response missing message attribute"
-                    
-                # Safely get content from message
-                return choice.message.get("content", "")
+            if kwargs.get("stream", False):
+                return extract_deltas(self.openai_transport.stream(endpoint, payload, headers))
+            body = self.openai_transport.post(endpoint, payload, headers)
+            note_body_usage(body)
+            return extract_text(body)
         except Exception as e:
             logger.error(f"Error calling OpenAI: {str(e)}")
             raise
 
-    def _get_anthropic_response(self, prompt: str, **kwargs) -> Any:
-        """Handle Anthropic API calls with capability detection and fallback."""
-        if not self.anthropic_client:
-            raise ValueError("ANTHROPIC_API_KEY is not set")
+    def _build_anthropic_params(self, prompt: str, **kwargs) -> Tuple[Dict[str, Any], Dict[str, bool]]:
+        """Build Anthropic message parameters for a prompt.
         
+        Args:
+            prompt: The prompt string.
+            kwargs: Additional parameters such as model, temperature and system.
+            
+        Returns:
+            The message parameters and the capabilities of the selected model.
+        """
         # Get model and ensure we get the string value
         model = kwargs.get("model", ModelName.SONNET)
         model_value = model.value if hasattr(model, 'value') else model
@@ -200,9 +495,6 @@ class MultiProviderClient:
         # Check model capabilities
         capabilities = self._check_model_capabilities(model_value)
         
-        # Determine if we should use streaming
-        use_streaming = kwargs.get("stream", False)
-        
         # Determine if we should use thinking (based on model capabilities)
         use_thinking = capabilities["supports_thinking"]
         
@@ -211,30 +503,81 @@ class MultiProviderClient:
             "model": model_value,
             "max_tokens": kwargs.get("max_tokens", 128000),
             "temperature": kwargs.get("temperature", 1.0),
-            "messages": [{"role": "user", "content": prompt}],
+            "messages": [*kwargs.get("history", ()), {"role": "user", "content": prompt}],
             "betas": ["output-128k-2025-02-19"]
         }
         
-        # Add system message if provided
-        if "system" in kwargs and kwargs["system"]:
-            message_params["messages"].insert(0, {"role": "system", "content": kwargs["system"]})
+        # Add the system prompt, marked as a cacheable prefix when it is large
+        system_blocks = build_system_blocks(kwargs.get("system"), self.min_cache_chars)
+        if OutputFormat(kwargs.get("format", OutputFormat.TEXT)) == OutputFormat.JSON:
+            system_blocks = [*(system_blocks or []), json_instruction_block()]
+        if system_blocks:
+            message_params["system"] = system_blocks
         
         # Add thinking if supported and not explicitly disabled
         if use_thinking and kwargs.get("thinking", True):
             thinking_budget = kwargs.get("thinking_budget", 120000)
             message_params["thinking"] = {"type": "enabled", "budget_tokens": thinking_budget}
         
+        # Drop old turns and cap the output to fit the context window
+        if self.budgeter:
+            message_params = self.budgeter.fit(message_params)
+        return message_params, capabilities
+    
+    def _get_anthropic_response(self, prompt: str, **kwargs) -> Any:
+        """Handle Anthropic API calls with capability detection and fallback."""
+        if not self.anthropic_client:
+            raise ValueError("ANTHROPIC_API_KEY is not set")
+        
+        message_params, capabilities = self._build_anthropic_params(prompt, **kwargs)
+        use_streaming = kwargs.get("stream", False) and capabilities["supports_streaming"]
+        
+        # Serve repeated requests from the cache when one is configured
+        cache_key = request_fingerprint(message_params) if self.cache else None
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                routed = _routed_call.get()
+                if routed is not None:
+                    routed.cache_hit = True
+                note_cache_hit()
+                return cached.replay() if use_streaming else cached.text
+        
         # Try streaming if requested and supported
-        if use_streaming and capabilities["supports_streaming"]:
+        if use_streaming:
             try:
-                return self._stream_anthropic_response(message_params)
+                chunks = self._stream_anthropic_response(message_params)
+                return self.cache.record_stream(cache_key, chunks) if cache_key else chunks
             except Exception as e:
                 logger.warning(f"Streaming failed, falling back to non-streaming: {str(e)}")
-                # Fall back to non-streaming
-                return self._batch_anthropic_response(message_params)
-        else:
-            # Use non-streaming by default
-            return self._batch_anthropic_response(message_params)
+        
+        # Use non-streaming by default, or as the streaming fallback
+        text = self._batch_anthropic_response(message_params)
+        if cache_key:
+            self.cache.put(cache_key, [text])
+        return text
+    
+    def _create_anthropic_message(self, message_params: Dict[str, Any], **extra) -> Any:
+        """Send a Messages API request, through the rate-limit governor if configured.
+        
+        Args:
+            message_params: The message parameters to send.
+            extra: Additional create() arguments such as stream.
+            
+        Returns:
+            The parsed response or event stream.
+        """
+        if not self.governor:
+            return self.anthropic_client.beta.messages.create(**message_params, **extra)
+        
+        model = message_params["model"]
+        
+        def send() -> Any:
+            raw = self.anthropic_client.beta.messages.with_raw_response.create(**message_params, **extra)
+            self.governor.update_from_headers(model, raw.headers)
+            return raw.parse()
+        
+        return self.governor.call(model, send, estimate_request_tokens(message_params))
     
     def _stream_anthropic_response(self, message_params: Dict[str, Any]) -> Iterator[str]:
         """Handle streaming Anthropic API calls.
@@ -246,13 +589,25 @@ class MultiProviderClient:
             An iterator of response chunks.
         """
         try:
-            response = self.anthropic_client.beta.messages.create(**message_params, stream=True)
-            # Extract text from each chunk's content
-            return (chunk.delta.text for chunk in response if hasattr(chunk, 'delta') and hasattr(chunk.delta, 'text'))
+            response = self._create_anthropic_message(message_params, stream=True)
+            return self._record_stream_usage(response, message_params)
         except Exception as e:
             logger.error(f"Error in streaming response: {str(e)}")
             raise
     
+    def _record_stream_usage(self, response: Any, message_params: Dict[str, Any]) -> Iterator[str]:
+        """Yield the text of an event stream, recording its usage once exhausted."""
+        decoder = StreamDecoder()
+        yield from decoder.text(response)
+        self._record_usage(message_params, decoder.usage, decoder.thinking_chars)
+    
+    def _record_usage(self, message_params: Dict[str, Any], usage: Any, thinking_chars: int = 0) -> None:
+        """Record a response's usage in the prompt-cache stats, the budgeter's calibration and telemetry."""
+        note_usage(usage, thinking_chars)
+        self.prompt_cache_stats.record(usage)
+        if self.budgeter:
+            self.budgeter.observe(message_params, usage)
+    
     def _batch_anthropic_response(self, message_params: Dict[str, Any]) -> str:
         """Handle non-streaming (batch) Anthropic API calls.
         
@@ -263,11 +618,58 @@ class MultiProviderClient:
             The complete response as a string.
         """
         try:
-            response = self.anthropic_client.beta.messages.create(**message_params)
-            # Extract text from the response content
-            if hasattr(response, 'content') and len(response.content) > 0:
-                return response.content[0].text
-            return ""
+            response = self._create_anthropic_message(message_params)
+            self._record_usage(message_params, getattr(response, "usage", None), message_thinking_chars(response))
+            return message_text(response)
         except Exception as e:
             logger.error(f"Error in batch response: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
+    
+    def _batch_scheduler(self) -> BatchScheduler:
+        """Return a batch scheduler bound to the Anthropic client."""
+        if not self.anthropic_client:
+            raise ValueError("ANTHROPIC_API_KEY is not set")
+        return BatchScheduler(self.anthropic_client, manifest_dir=self.batch_manifest_dir)
+    
+    def submit_batch(self, prompts: Sequence[str], **kwargs) -> str:
+        """Submit many prompts as Message Batches API jobs.
+        
+        Args:
+            prompts: The prompts to send; result ids are ``prompt-<index>``.
+            kwargs: Parameters applied to every prompt ('model', 'temperature', etc.).
+            
+        Returns:
+            A local batch id for ``collect_batch``.
+            
+        Raises:
+            ValueError: If the model is not served by Anthropic.
+        """
+        model = kwargs.get("model", ModelName.SONNET)
+        if isinstance(model, str) and model in ModelName._value2member_map_:
+            model = ModelName(model)
+        if isinstance(model, ModelName) and model.provider != "anthropic":
+            raise ValueError(f"Batch submission is only supported for Anthropic models, not {model.value}")
+        
+        requests = []
+        betas: List[str] = []
+        for prompt in prompts:
+            message_params, _ = self._build_anthropic_params(prompt, **kwargs)
+            # Batch request params cannot carry betas; they go on the job
+            # instead, so the 128k output limit still applies
+            for beta in message_params.pop("betas", ()):
+                if beta not in betas:
+                    betas.append(beta)
+            requests.append(message_params)
+        return self._batch_scheduler().submit(requests, betas=betas)
+    
+    def collect_batch(self, batch_id: str, timeout: Optional[float] = None) -> Iterator[BatchResult]:
+        """Yield batch results as the underlying jobs finish.
+        
+        Args:
+            batch_id: The id returned by ``submit_batch``.
+            timeout: Optional seconds to wait before giving up.
+            
+        Returns:
+            An iterator of ``BatchResult`` objects in completion order.
+        """
+        return self._batch_scheduler().collect(batch_id, timeout=timeout)
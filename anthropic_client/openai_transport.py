@@ -0,0 +1,283 @@
+"""
+Pooled, streaming HTTP transport for OpenAI's Responses and Chat Completions APIs.
+
+Requests go over the shared keep-alive ``httpx`` pool from ``transport``
+rather than a fresh connection per call. Headers are built once per
+transport. Every request has a timeout, and connection errors and
+429/5xx responses are retried with jittered exponential backoff. Streams
+are parsed from server-sent events as they arrive, so the first text delta
+reaches the caller as soon as OpenAI sends it, as on the Anthropic path.
+"""
+
+import json
+import logging
+import random
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Mapping, Optional
+
+from anthropic_client.events import Usage
+from anthropic_client.telemetry import note_retry, note_usage
+from anthropic_client.transport import DEFAULT_BASE_URLS, get_http_client
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: rate limited and transient server errors
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class OpenAIError(RuntimeError):
+    """An OpenAI request failed with an error response or error event."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, response: Any = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.response = response
+
+
+def iter_sse(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Parse server-sent events into their JSON payloads.
+
+    Multi-line ``data`` fields are joined; comments, ``event`` names and the
+    ``[DONE]`` sentinel are skipped.
+
+    Args:
+        lines: Decoded lines of the response body
+
+    Returns:
+        An iterator over the JSON payload of each event
+    """
+    data = []
+    for line in lines:
+        if line.startswith("data:"):
+            data.append(line[5:].lstrip())
+            continue
+        if line or not data:
+            continue
+        payload = "\n".join(data)
+        data = []
+        if payload != "[DONE]":
+            yield json.loads(payload)
+    if data and data != ["[DONE]"]:
+        yield json.loads("\n".join(data))
+
+
+def note_body_usage(body: Mapping[str, Any]) -> None:
+    """Report the ``usage`` of a Responses or Chat Completions body to telemetry."""
+    usage = body.get("usage")
+    if not usage:
+        return
+    details = usage.get("output_tokens_details") or usage.get("completion_tokens_details") or {}
+    note_usage(
+        Usage(
+            input_tokens=usage.get("input_tokens", usage.get("prompt_tokens")) or 0,
+            output_tokens=usage.get("output_tokens", usage.get("completion_tokens")) or 0
+        ),
+        thinking_tokens=details.get("reasoning_tokens") or 0
+    )
+
+
+def responses_text(body: Mapping[str, Any]) -> str:
+    """Return the output text of a Responses API response body."""
+    parts = []
+    for item in body.get("output") or []:
+        if item.get("type") != "message":
+            continue
+        for content in item.get("content") or []:
+            if content.get("type") == "output_text":
+                parts.append(content.get("text", ""))
+    return "".join(parts)
+
+
+def chat_text(body: Mapping[str, Any]) -> str:
+    """Return the message text of a Chat Completions response body."""
+    choices = body.get("choices") or []
+    if not choices:
+        raise OpenAIError("Chat completion has no choices")
+    return (choices[0].get("message") or {}).get("content") or ""
+
+
+def responses_deltas(events: Iterable[Mapping[str, Any]]) -> Iterator[str]:
+    """Yield the output text deltas of a Responses API event stream.
+
+    Raises:
+        OpenAIError: If the stream reports an error or a failed response
+    """
+    for event in events:
+        event_type = event.get("type")
+        if event_type == "response.output_text.delta":
+            if event.get("delta"):
+                yield event["delta"]
+        elif event_type == "response.completed":
+            note_body_usage(event.get("response") or {})
+        elif event_type in ("error", "response.failed"):
+            error = event.get("error") or (event.get("response") or {}).get("error") or {}
+            raise OpenAIError(f"OpenAI stream failed: {error.get('message', event_type)}")
+
+
+def chat_deltas(events: Iterable[Mapping[str, Any]]) -> Iterator[str]:
+    """Yield the content deltas of a Chat Completions event stream."""
+    for event in events:
+        note_body_usage(event)
+        for choice in event.get("choices") or []:
+            content = (choice.get("delta") or {}).get("content")
+            if content:
+                yield content
+
+
+class OpenAITransport:
+    """Sends OpenAI API requests over the shared connection pool."""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        timeout: float = 600.0,
+        connect_timeout: float = 5.0,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0
+    ) -> None:
+        """Initialize the transport.
+
+        Args:
+            api_key: OpenAI API key
+            base_url: API base URL (defaults to the public endpoint)
+            timeout: Seconds allowed for reads, writes and pool waits
+            connect_timeout: Seconds allowed to establish a connection
+            max_retries: Retries for connection errors and 429/5xx responses
+            base_delay: First backoff delay in seconds
+            max_delay: Upper bound on a single backoff delay in seconds
+        """
+        self.base_url = (base_url or DEFAULT_BASE_URLS["openai"]).rstrip("/")
+        self.http = get_http_client("openai", base_url)
+        self.headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def url(self, endpoint: str) -> str:
+        """Resolve an endpoint path (or a full URL) against the base URL."""
+        if endpoint.startswith(("http://", "https://")):
+            return endpoint
+        return f"{self.base_url}/{endpoint.lstrip('/')}"
+
+    def post(self, endpoint: str, payload: Mapping[str, Any], headers: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+        """Send a request and return its JSON body.
+
+        Args:
+            endpoint: Endpoint path or full URL
+            payload: JSON request body
+            headers: Extra headers for this request
+
+        Returns:
+            The parsed response body
+
+        Raises:
+            OpenAIError: If the request fails after retries
+        """
+        attempt = 0
+        while True:
+            try:
+                response = self.http.post(
+                    self.url(endpoint), json=payload, headers=self._headers(headers), timeout=self._timeout()
+                )
+                self._raise_for_status(response)
+                return response.json()
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                note_retry()
+                time.sleep(delay)
+                attempt += 1
+
+    def stream(
+        self,
+        endpoint: str,
+        payload: Mapping[str, Any],
+        headers: Optional[Mapping[str, str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Send a streaming request and yield its events as they arrive.
+
+        Failures before the first event are retried; after it they are
+        raised, since the caller has already consumed part of the answer.
+
+        Args:
+            endpoint: Endpoint path or full URL
+            payload: JSON request body (``stream`` is set to true)
+            headers: Extra headers for this request
+
+        Returns:
+            An iterator over the JSON payload of each event
+
+        Raises:
+            OpenAIError: If the request fails after retries or the stream breaks
+        """
+        payload = dict(payload, stream=True)
+        attempt = 0
+        while True:
+            started = False
+            try:
+                with self.http.stream(
+                    "POST", self.url(endpoint), json=payload, headers=self._headers(headers), timeout=self._timeout()
+                ) as response:
+                    if response.status_code >= 400:
+                        response.read()
+                    self._raise_for_status(response)
+                    for event in iter_sse(response.iter_lines()):
+                        started = True
+                        yield event
+                return
+            except Exception as e:
+                delay = None if started else self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                note_retry()
+                time.sleep(delay)
+                attempt += 1
+
+    def _headers(self, extra: Optional[Mapping[str, str]]) -> Mapping[str, str]:
+        return dict(self.headers, **extra) if extra else self.headers
+
+    def _timeout(self) -> "httpx.Timeout":
+        import httpx
+        return httpx.Timeout(self.timeout, connect=self.connect_timeout)
+
+    @staticmethod
+    def _raise_for_status(response: "httpx.Response") -> None:
+        """Raise an ``OpenAIError`` carrying the API's message for error responses."""
+        if response.status_code < 400:
+            return
+        try:
+            message = response.json().get("error", {}).get("message") or response.text
+        except ValueError:
+            message = response.text
+        raise OpenAIError(
+            f"OpenAI returned {response.status_code}: {message}",
+            status_code=response.status_code,
+            response=response
+        )
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Return the backoff before retrying ``error``, or None if it is final."""
+        import httpx
+        if attempt >= self.max_retries:
+            return None
+        if isinstance(error, OpenAIError):
+            if error.status_code not in RETRYABLE_STATUS_CODES:
+                return None
+        elif not isinstance(error, httpx.TransportError):
+            return None
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        retry_after = getattr(getattr(error, "response", None), "headers", {}).get("retry-after")
+        try:
+            delay = max(delay, float(retry_after)) if retry_after is not None else delay
+        except ValueError:
+            pass
+        logger.warning(f"OpenAI request failed ({error}); retrying in {delay:.2f}s (attempt {attempt + 1} of {self.max_retries})")
+        return delay
@@ -0,0 +1,295 @@
+"""
+Content-addressed store for large, reused request payloads.
+
+Example conversations (``kob-fourfive``, ``o1-kob-o3``) used to live inline
+in Python source or in JSON files that had to be parsed whole to read one
+field. The store splits each request body into blobs, one per message
+content block and one per other top-level field. Blobs are keyed by the
+SHA-256 of their canonical JSON, so a block shared by several conversations
+is stored once. Blobs are zlib-compressed and appended to ``blobs.z``, which
+is memory-mapped for reads. ``index.bin`` maps each digest to its offset and
+length, and ``names.json`` maps conversation names to their manifests.
+
+Conversations are assembled lazily: ``Conversation.text`` decompresses a
+single block, and ``Conversation.json_chunks`` streams the request body
+blob by blob without building it in memory.
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Union
+
+DEFAULT_STORE_PATH = Path(__file__).parent / "payloads"
+
+# Request body fields holding the conversation, split into per-block blobs
+MESSAGE_FIELDS = ("input", "messages")
+
+# Index record: raw SHA-256 digest, offset into blobs.z, compressed length
+_RECORD = struct.Struct("<32sQI")
+
+
+def canonical_json(value: Any) -> bytes:
+    """Return the canonical JSON encoding blobs are hashed and stored as."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class PayloadStore:
+    """A directory of deduplicated, compressed payload blobs."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_STORE_PATH) -> None:
+        """Open a store, creating its directory on the first write.
+
+        Args:
+            path: Directory holding ``blobs.z``, ``index.bin`` and ``names.json``
+        """
+        self.path = Path(path)
+        self._index: Dict[bytes, tuple] = {}
+        self._names: Dict[str, str] = {}
+        self._map: Optional[mmap.mmap] = None
+        self._mapped_size = 0
+        self._lock = threading.Lock()
+        index_path = self.path / "index.bin"
+        if index_path.exists():
+            data = index_path.read_bytes()
+            for digest, offset, length in _RECORD.iter_unpack(data[:len(data) - len(data) % _RECORD.size]):
+                self._index[digest] = (offset, length)
+        names_path = self.path / "names.json"
+        if names_path.exists():
+            with open(names_path, encoding="utf-8") as f:
+                self._names = json.load(f)
+
+    def __contains__(self, digest: str) -> bool:
+        return bytes.fromhex(digest) in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def names(self) -> List[str]:
+        """Return the names of the stored conversations."""
+        return sorted(self._names)
+
+    def put(self, value: Any) -> str:
+        """Store a JSON value, unless an identical one is already stored.
+
+        Args:
+            value: Any JSON-serializable value
+
+        Returns:
+            The hex SHA-256 digest of the value's canonical JSON
+        """
+        data = canonical_json(value)
+        digest = hashlib.sha256(data).digest()
+        with self._lock:
+            if digest not in self._index:
+                self.path.mkdir(parents=True, exist_ok=True)
+                compressed = zlib.compress(data, 9)
+                with open(self.path / "blobs.z", "ab") as f:
+                    offset = f.tell()
+                    f.write(compressed)
+                with open(self.path / "index.bin", "ab") as f:
+                    f.write(_RECORD.pack(digest, offset, len(compressed)))
+                self._index[digest] = (offset, len(compressed))
+        return digest.hex()
+
+    def raw(self, digest: str) -> bytes:
+        """Return a blob's canonical JSON bytes.
+
+        Raises:
+            KeyError: If no blob has this digest
+        """
+        try:
+            offset, length = self._index[bytes.fromhex(digest)]
+        except KeyError:
+            raise KeyError(f"No payload blob {digest} in {self.path}") from None
+        with self._lock:
+            if self._map is None or offset + length > self._mapped_size:
+                self._remap()
+            return zlib.decompress(self._map[offset:offset + length])
+
+    def get(self, digest: str) -> Any:
+        """Return a stored JSON value.
+
+        Raises:
+            KeyError: If no blob has this digest
+        """
+        return json.loads(self.raw(digest))
+
+    def _remap(self) -> None:
+        if self._map is not None:
+            self._map.close()
+        with open(self.path / "blobs.z", "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapped_size = len(self._map)
+
+    def put_conversation(self, name: str, body: Mapping[str, Any]) -> str:
+        """Store a request body under a name, one blob per content block and field.
+
+        Args:
+            name: Name the conversation is loaded by
+            body: Request body, e.g. the arguments of ``responses.create``
+
+        Returns:
+            The digest of the conversation's manifest
+        """
+        fields: Dict[str, Any] = {}
+        for key, value in body.items():
+            if key in MESSAGE_FIELDS and isinstance(value, list):
+                fields[key] = {"messages": [self._put_message(message) for message in value]}
+            else:
+                fields[key] = self.put(value)
+        manifest = self.put({"fields": fields})
+        with self._lock:
+            self._names[name] = manifest
+            self.path.mkdir(parents=True, exist_ok=True)
+            temp = self.path / "names.json.tmp"
+            with open(temp, "w", encoding="utf-8") as f:
+                json.dump(self._names, f, indent=2, sort_keys=True)
+                f.write("\n")
+            os.replace(temp, self.path / "names.json")
+        return manifest
+
+    def _put_message(self, message: Mapping[str, Any]) -> Dict[str, Any]:
+        content = message.get("content")
+        if not isinstance(content, list):
+            return {"blob": self.put(message)}
+        rest = {key: value for key, value in message.items() if key != "content"}
+        return {"head": self.put(rest), "content": [self.put(block) for block in content]}
+
+    def conversation(self, name: str) -> "Conversation":
+        """Return a stored conversation, assembled lazily.
+
+        Raises:
+            KeyError: If no conversation has this name
+        """
+        try:
+            manifest = self._names[name]
+        except KeyError:
+            raise KeyError(f"No conversation named {name!r} in {self.path}") from None
+        return Conversation(self, self.get(manifest)["fields"])
+
+    def close(self) -> None:
+        """Release the memory map."""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+
+
+class Conversation:
+    """A stored request body whose blobs are read only when accessed."""
+
+    def __init__(self, store: PayloadStore, fields: Dict[str, Any]) -> None:
+        self.store = store
+        self.fields = fields
+
+    def _messages(self) -> List[Dict[str, Any]]:
+        for key in MESSAGE_FIELDS:
+            if key in self.fields:
+                return self.fields[key]["messages"]
+        return []
+
+    def __len__(self) -> int:
+        """Return the number of messages."""
+        return len(self._messages())
+
+    def field(self, key: str) -> Any:
+        """Return one top-level field of the request body.
+
+        Raises:
+            KeyError: If the body has no such field
+        """
+        value = self.fields[key]
+        if isinstance(value, dict):
+            return [self._load_message(message) for message in value["messages"]]
+        return self.store.get(value)
+
+    def message(self, index: int) -> Dict[str, Any]:
+        """Return one message, decompressing only its own blobs."""
+        return self._load_message(self._messages()[index])
+
+    def text(self, index: int, block: int = 0) -> str:
+        """Return the text of one content block of one message."""
+        return self.store.get(self._messages()[index]["content"][block])["text"]
+
+    def _load_message(self, ref: Mapping[str, Any]) -> Dict[str, Any]:
+        if "blob" in ref:
+            return self.store.get(ref["blob"])
+        message = self.store.get(ref["head"])
+        message["content"] = [self.store.get(digest) for digest in ref["content"]]
+        return message
+
+    def body(self) -> Dict[str, Any]:
+        """Return the whole request body, e.g. as ``responses.create(**body)`` arguments."""
+        return {key: self.field(key) for key in self.fields}
+
+    def json_chunks(self) -> Iterator[bytes]:
+        """Yield the request body as canonical JSON, one blob at a time.
+
+        Suitable as a streamed ``httpx`` request ``content``; at most one
+        decompressed blob is held at once.
+        """
+        yield b"{"
+        for i, key in enumerate(sorted(self.fields)):
+            yield (b"," if i else b"") + canonical_json(key) + b":"
+            value = self.fields[key]
+            if not isinstance(value, dict):
+                yield self.store.raw(value)
+                continue
+            yield b"["
+            for j, ref in enumerate(value["messages"]):
+                if j:
+                    yield b","
+                if "blob" in ref:
+                    yield self.store.raw(ref["blob"])
+                    continue
+                head = self.store.raw(ref["head"])
+                # Keys are sorted, so "content" goes before the first later key
+                before, after = _split_before(head, b"content")
+                yield before
+                yield b'"content":['
+                for k, digest in enumerate(ref["content"]):
+                    if k:
+                        yield b","
+                    yield self.store.raw(digest)
+                yield b"]" + after
+            yield b"]"
+        yield b"}"
+
+
+def _split_before(head: bytes, key: bytes) -> tuple:
+    """Split a canonical JSON object so ``key`` can be inserted in sorted position.
+
+    Returns the opening part (ending with a comma when fields precede the
+    key) and the closing part (starting with a comma when fields follow it).
+    """
+    fields = json.loads(head)
+    earlier = {k: v for k, v in fields.items() if k.encode() < key}
+    later = {k: v for k, v in fields.items() if k.encode() > key}
+    before = canonical_json(earlier)[:-1] + (b"," if earlier else b"")
+    after = (b"," + canonical_json(later)[1:]) if later else b"}"
+    return before, after
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Import JSON request bodies into a store: ``python -m anthropic_client.payload_store NAME FILE``."""
+    parser = argparse.ArgumentParser(description="Add a JSON request body to the payload store")
+    parser.add_argument("name", help="Name the conversation is loaded by")
+    parser.add_argument("file", help="JSON file holding the request body")
+    parser.add_argument("--store", default=str(DEFAULT_STORE_PATH), help="Store directory")
+    args = parser.parse_args(argv)
+    store = PayloadStore(args.store)
+    before = len(store)
+    with open(args.file, encoding="utf-8") as f:
+        store.put_conversation(args.name, json.load(f))
+    print(f"Stored {args.name}: {len(store) - before} new blobs, {len(store)} in total")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Prompt-prefix caching for large, reused system prompts.
+
+The same long system context is often sent with many different user
+prompts. Marking it with a ``cache_control`` breakpoint lets the API reuse
+the processed prefix, so repeat calls are billed and processed as cache
+reads instead of fresh input tokens. ``PromptCacheStats`` accumulates the
+cache-read and cache-write counts the API reports in ``usage``.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+# Below roughly 1024 tokens the API will not cache a prefix, so shorter
+# system prompts are sent unmarked (about 4 characters per token).
+DEFAULT_MIN_CACHE_CHARS: int = 4096
+
+# The API accepts at most four cache breakpoints per request.
+MAX_CACHE_BREAKPOINTS: int = 4
+
+EPHEMERAL: Dict[str, str] = {"type": "ephemeral"}
+
+SystemPrompt = Union[str, Sequence[Union[str, Dict[str, Any]]]]
+
+
+def _text_block(block: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Return a copy of a system block as a text-block dict."""
+    if isinstance(block, str):
+        return {"type": "text", "text": block}
+    return dict(block)
+
+
+def build_system_blocks(
+    system: Optional[SystemPrompt],
+    min_cache_chars: Optional[int] = DEFAULT_MIN_CACHE_CHARS
+) -> Optional[List[Dict[str, Any]]]:
+    """Build the ``system`` parameter with cache breakpoints on stable blocks.
+
+    Blocks that already carry ``cache_control`` are kept as given. Otherwise
+    the last stable block is marked once the stable text reaches
+    ``min_cache_chars``. A single block is stable; in a sequence of several,
+    the last block is taken to vary per request (e.g. the CLI's ``--system``
+    after ``--system-file``), so the breakpoint goes on the block before it
+    and changing the last block still reads the cached prefix.
+
+    Args:
+        system: A system prompt string, or a sequence of strings and text blocks
+            ordered from most to least stable
+        min_cache_chars: Smallest system text worth caching; None disables
+            automatic markers
+
+    Returns:
+        The system blocks, or None when there is no system prompt
+    """
+    if not system:
+        return None
+    if isinstance(system, str):
+        system = [system]
+    blocks = [_text_block(block) for block in system]
+    explicit = sum(1 for block in blocks if "cache_control" in block)
+    if explicit > MAX_CACHE_BREAKPOINTS:
+        raise ValueError(f"At most {MAX_CACHE_BREAKPOINTS} cache breakpoints are allowed")
+    if explicit or min_cache_chars is None:
+        return blocks
+    stable = blocks[:-1] if len(blocks) > 1 else blocks
+    if sum(len(block.get("text", "")) for block in stable) >= min_cache_chars:
+        stable[-1]["cache_control"] = EPHEMERAL
+    return blocks
+
+
+class PromptCacheStats:
+    """Thread-safe totals of the prompt-cache usage reported by the API."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.input_tokens = 0
+        self.cache_read_input_tokens = 0
+        self.cache_creation_input_tokens = 0
+        self._lock = threading.Lock()
+
+    def record(self, usage: Any) -> None:
+        """Add one response's usage (an SDK usage object or ``events.Usage``)."""
+        if usage is None:
+            return
+        with self._lock:
+            self.requests += 1
+            self.input_tokens += getattr(usage, "input_tokens", None) or 0
+            self.cache_read_input_tokens += getattr(usage, "cache_read_input_tokens", None) or 0
+            self.cache_creation_input_tokens += getattr(usage, "cache_creation_input_tokens", None) or 0
+
+    @property
+    def total_input_tokens(self) -> int:
+        """All prompt tokens: uncached, written to the cache and read from it."""
+        return self.input_tokens + self.cache_read_input_tokens + self.cache_creation_input_tokens
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of prompt tokens served from the cache."""
+        total = self.total_input_tokens
+        return self.cache_read_input_tokens / total if total else 0.0
+
+    def summary(self) -> str:
+        """Return a one-line report of cache reads, writes and hit ratio."""
+        return (
+            f"{self.requests} requests, {self.cache_read_input_tokens} cache-read tokens, "
+            f"{self.cache_creation_input_tokens} cache-write tokens, "
+            f"{self.input_tokens} uncached tokens, hit ratio {self.hit_ratio:.0%}"
+        )
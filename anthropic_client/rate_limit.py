@@ -0,0 +1,231 @@
+"""
+Client-side rate-limit governor with per-model token-bucket scheduling.
+
+Requests wait in a requests-per-minute bucket and a tokens-per-minute bucket
+for their model before they are sent, so sustained traffic stays just under
+the provider quota instead of bursting into 429s. Buckets are re-seeded from
+the rate-limit headers the providers return, and 429/529 responses are
+retried with jittered exponential backoff.
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, TypeVar
+
+from anthropic_client.telemetry import note_queue_time, note_retry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Status codes worth retrying: rate limited and overloaded
+RETRYABLE_STATUS_CODES = (429, 529)
+
+# (limit, remaining) header names for request and token budgets, per provider
+_REQUEST_HEADERS: Tuple[Tuple[str, str], ...] = (
+    ("anthropic-ratelimit-requests-limit", "anthropic-ratelimit-requests-remaining"),
+    ("x-ratelimit-limit-requests", "x-ratelimit-remaining-requests"),
+)
+_TOKEN_HEADERS: Tuple[Tuple[str, str], ...] = (
+    ("anthropic-ratelimit-input-tokens-limit", "anthropic-ratelimit-input-tokens-remaining"),
+    ("anthropic-ratelimit-tokens-limit", "anthropic-ratelimit-tokens-remaining"),
+    ("x-ratelimit-limit-tokens", "x-ratelimit-remaining-tokens"),
+)
+
+
+def estimate_request_tokens(params: Mapping[str, Any]) -> int:
+    """Roughly estimate the input tokens of a request (about 4 characters per token).
+
+    Args:
+        params: Message parameters as sent to the provider
+
+    Returns:
+        The estimated number of input tokens
+    """
+    chars = len(str(params.get("system") or ""))
+    for message in params.get("messages", []):
+        chars += len(str(message.get("content", "")))
+    return chars // 4 + 1
+
+
+class TokenBucket:
+    """A thread-safe token bucket refilled continuously over one minute."""
+
+    def __init__(self, per_minute: float) -> None:
+        """Initialize a full bucket.
+
+        Args:
+            per_minute: Bucket capacity, refilled evenly over 60 seconds
+        """
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self._updated = time.monotonic()
+        self._condition = threading.Condition()
+
+    @property
+    def rate(self) -> float:
+        """Tokens added per second."""
+        return self.capacity / 60.0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Take tokens from the bucket, waiting until enough are available.
+
+        Requests larger than the whole bucket are clamped to its capacity.
+
+        Args:
+            amount: Number of tokens to take
+
+        Returns:
+            Seconds spent waiting
+        """
+        started = time.monotonic()
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                needed = min(amount, self.capacity)
+                if self.tokens >= needed:
+                    self.tokens -= needed
+                    return now - started
+                self._condition.wait((needed - self.tokens) / self.rate)
+
+    def update(self, limit: Optional[float], remaining: Optional[float]) -> None:
+        """Re-seed the bucket from a provider's reported limit and remaining budget."""
+        with self._condition:
+            self._refill(time.monotonic())
+            if limit:
+                self.capacity = float(limit)
+            if remaining is not None:
+                self.tokens = min(float(remaining), self.capacity)
+            self._condition.notify_all()
+
+
+class RateLimitGovernor:
+    """Paces requests per model and retries rate-limited calls."""
+
+    DEFAULT_REQUESTS_PER_MINUTE: float = 50.0
+    DEFAULT_TOKENS_PER_MINUTE: float = 40000.0
+
+    def __init__(
+        self,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = DEFAULT_TOKENS_PER_MINUTE,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0
+    ) -> None:
+        """Initialize the governor.
+
+        Args:
+            requests_per_minute: Starting request budget for models not yet seen
+            tokens_per_minute: Starting input-token budget for models not yet seen
+            max_retries: Retries for 429/529 responses before giving up
+            base_delay: First backoff delay in seconds
+            max_delay: Upper bound on a single backoff delay in seconds
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._buckets: Dict[str, Tuple[TokenBucket, TokenBucket]] = {}
+        self._lock = threading.Lock()
+
+    def _buckets_for(self, model: str) -> Tuple[TokenBucket, TokenBucket]:
+        with self._lock:
+            buckets = self._buckets.get(model)
+            if buckets is None:
+                buckets = (TokenBucket(self.requests_per_minute), TokenBucket(self.tokens_per_minute))
+                self._buckets[model] = buckets
+            return buckets
+
+    def acquire(self, model: str, tokens: int = 0) -> float:
+        """Wait until the model's budgets admit one request of ``tokens`` tokens.
+
+        Args:
+            model: Model identifier
+            tokens: Estimated input tokens of the request
+
+        Returns:
+            Seconds spent waiting
+        """
+        requests_bucket, tokens_bucket = self._buckets_for(model)
+        waited = requests_bucket.acquire(1)
+        if tokens:
+            waited += tokens_bucket.acquire(tokens)
+        return waited
+
+    def update_from_headers(self, model: str, headers: Mapping[str, str]) -> None:
+        """Re-seed a model's budgets from response rate-limit headers.
+
+        Args:
+            model: Model identifier
+            headers: Response headers from Anthropic or OpenAI
+        """
+        requests_bucket, tokens_bucket = self._buckets_for(model)
+        for bucket, names in ((requests_bucket, _REQUEST_HEADERS), (tokens_bucket, _TOKEN_HEADERS)):
+            for limit_name, remaining_name in names:
+                limit = _header_number(headers, limit_name)
+                remaining = _header_number(headers, remaining_name)
+                if limit is not None or remaining is not None:
+                    bucket.update(limit, remaining)
+                    break
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Return a full-jitter exponential backoff delay, honouring retry-after."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def call(self, model: str, send: Callable[[], T], tokens: int = 0) -> T:
+        """Send a request through the governor, retrying 429/529 responses.
+
+        Args:
+            model: Model identifier
+            send: Zero-argument callable performing the request
+            tokens: Estimated input tokens of the request
+
+        Returns:
+            Whatever ``send`` returns
+
+        Raises:
+            Exception: The last error once retries are exhausted, or any
+                non-retryable error immediately
+        """
+        attempt = 0
+        while True:
+            note_queue_time(self.acquire(model, tokens))
+            try:
+                return send()
+            except Exception as e:
+                status = getattr(e, "status_code", None)
+                if status not in RETRYABLE_STATUS_CODES or attempt >= self.max_retries:
+                    raise
+                headers = getattr(getattr(e, "response", None), "headers", None) or {}
+                self.update_from_headers(model, headers)
+                delay = self.backoff_delay(attempt, _header_number(headers, "retry-after"))
+                logger.warning(
+                    f"{model} returned {status}; retrying in {delay:.2f}s "
+                    f"(attempt {attempt + 1} of {self.max_retries})"
+                )
+                note_retry()
+                time.sleep(delay)
+                attempt += 1
+
+
+def _header_number(headers: Mapping[str, str], name: str) -> Optional[float]:
+    """Read a numeric header, returning None if it is missing or malformed."""
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
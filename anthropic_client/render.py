@@ -0,0 +1,137 @@
+"""
+Buffered terminal renderer for streamed responses.
+
+Chunks are coalesced into a write buffer that is flushed once per frame or
+at a newline, instead of flushing (and sleeping) after every chunk. A timer
+flushes a pending partial frame when the stream stalls, so the last tokens
+never wait for the next chunk to appear. When
+stdout is not a terminal, chunks are written straight through and flushed
+once at the end. Used as a context manager, the renderer finishes (and so
+flushes) when the block exits, also on errors and interrupts.
+"""
+
+import sys
+import threading
+import time
+from typing import List, Optional, TextIO
+
+# Rough characters-per-token ratio used for throughput reporting
+CHARS_PER_TOKEN: float = 4.0
+
+
+class StreamRenderer:
+    """Renders streamed text and measures time-to-first-token and throughput."""
+
+    DEFAULT_FRAME_INTERVAL: float = 1 / 30
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        frame_interval: float = DEFAULT_FRAME_INTERVAL
+    ) -> None:
+        """Initialize the renderer; the clock for time-to-first-token starts here.
+
+        Args:
+            stream: Output stream (defaults to stdout)
+            frame_interval: Seconds between flushes when writing to a terminal
+        """
+        self.stream = stream or sys.stdout
+        self.frame_interval = frame_interval
+        isatty = getattr(self.stream, "isatty", None)
+        self.interactive = bool(isatty and isatty())
+        self.started = time.perf_counter()
+        self.first_chunk_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.chars = 0
+        self.chunks = 0
+        self._buffer: List[str] = []
+        self._last_flush = self.started
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def write(self, text: str) -> None:
+        """Render one chunk of response text."""
+        if not text:
+            return
+        now = time.perf_counter()
+        if self.first_chunk_at is None:
+            self.first_chunk_at = now
+        self.chars += len(text)
+        self.chunks += 1
+        if not self.interactive:
+            self.stream.write(text)
+            return
+        with self._lock:
+            self._buffer.append(text)
+            if "\n" in text or now - self._last_flush >= self.frame_interval:
+                self._flush(now)
+            elif self._timer is None:
+                # Show this frame at its deadline even if no chunk follows
+                delay = self._last_flush + self.frame_interval - now
+                self._timer = threading.Timer(delay, self._flush_pending)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self, now: Optional[float] = None) -> None:
+        """Write out any buffered text."""
+        with self._lock:
+            self._flush(now)
+
+    def _flush(self, now: Optional[float] = None) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._buffer:
+            self.stream.write("".join(self._buffer))
+            self._buffer.clear()
+        self.stream.flush()
+        self._last_flush = now if now is not None else time.perf_counter()
+
+    def _flush_pending(self) -> None:
+        """Timer callback: flush the frame that is due."""
+        with self._lock:
+            self._timer = None
+            if self._buffer:
+                self._flush()
+
+    def finish(self) -> None:
+        """Flush the remaining text and stop the clock."""
+        self.flush()
+        self.finished_at = time.perf_counter()
+
+    def __enter__(self) -> "StreamRenderer":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        # Show whatever arrived, however the stream ended
+        self.finish()
+
+    @property
+    def time_to_first_token(self) -> Optional[float]:
+        """Seconds from construction to the first chunk, if any arrived."""
+        if self.first_chunk_at is None:
+            return None
+        return self.first_chunk_at - self.started
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """Estimated output tokens per second after the first chunk."""
+        if self.first_chunk_at is None:
+            return None
+        end = self.finished_at or time.perf_counter()
+        elapsed = end - self.first_chunk_at
+        if elapsed <= 0:
+            return None
+        return self.chars / CHARS_PER_TOKEN / elapsed
+
+    def summary(self) -> str:
+        """Return a one-line report of latency and throughput."""
+        ttft = self.time_to_first_token
+        rate = self.tokens_per_second
+        end = self.finished_at or time.perf_counter()
+        parts = [
+            f"time to first token: {ttft:.2f}s" if ttft is not None else "no output",
+            f"~{rate:.1f} tokens/s" if rate is not None else None,
+            f"total: {end - self.started:.2f}s",
+        ]
+        return ", ".join(part for part in parts if part)
@@ -0,0 +1,394 @@
+"""
+Latency- and cost-aware model routing.
+
+Instead of sending every prompt to the default model, the router scores a
+prompt (length, output format, code, whether it asks for reasoning) to
+decide how capable a model it needs, then picks the cheapest model that
+meets that quality bar and the latency SLO. Per-model latency and output
+size are learned from observed requests as EWMAs and can be saved between
+runs. ``replay`` evaluates a router offline against a log of past traffic.
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Model name that asks the client to let the router choose
+AUTO_MODEL = "auto"
+
+DEFAULT_STATE_PATH = Path.home() / ".anthropic" / "router.json"
+
+_CODE_PATTERN = re.compile(r"```|^\s*(def|class|import|function|public|#include)\b|[{};]\s*$", re.MULTILINE)
+_REASONING_PATTERN = re.compile(
+    r"\b(prove|proof|derive|step[- ]by[- ]step|analy[sz]e|reason(ing)?|why|optimi[sz]e|debug|design|architect|trade-?offs?)\b",
+    re.IGNORECASE
+)
+
+LONG_PROMPT_CHARS = 20_000
+
+
+class PromptFeatures:
+    """What the router knows about a prompt."""
+
+    __slots__ = ("chars", "format", "has_code", "needs_reasoning")
+
+    def __init__(self, chars: int, format: str, has_code: bool, needs_reasoning: bool) -> None:
+        self.chars = chars
+        self.format = format
+        self.has_code = has_code
+        self.needs_reasoning = needs_reasoning
+
+    @classmethod
+    def extract(cls, prompt: str, format: Any = "text") -> "PromptFeatures":
+        """Score a prompt."""
+        return cls(
+            chars=len(prompt),
+            format=getattr(format, "value", format),
+            has_code=bool(_CODE_PATTERN.search(prompt)),
+            needs_reasoning=bool(_REASONING_PATTERN.search(prompt)),
+        )
+
+    @property
+    def input_tokens(self) -> int:
+        """Rough input size (about 4 characters per token)."""
+        return self.chars // 4 + 1
+
+    @property
+    def required_quality(self) -> float:
+        """The quality score (0 to 1) a model needs to answer this prompt well."""
+        quality = 0.5
+        if self.format == "json":
+            quality = max(quality, 0.6)
+        if self.has_code or self.chars > LONG_PROMPT_CHARS:
+            quality = max(quality, 0.8)
+        if self.needs_reasoning:
+            quality = max(quality, 0.85)
+        return quality
+
+    def __repr__(self) -> str:
+        return (
+            f"PromptFeatures(chars={self.chars}, format={self.format!r}, "
+            f"has_code={self.has_code}, needs_reasoning={self.needs_reasoning})"
+        )
+
+
+class ModelProfile:
+    """Price, quality and learned latency of one model."""
+
+    def __init__(
+        self,
+        model: str,
+        input_cost: float,
+        output_cost: float,
+        quality: float,
+        supports_thinking: bool,
+        latency: float,
+        output_tokens: float = 500.0,
+        alpha: float = 0.2
+    ) -> None:
+        """Initialize a profile with prior estimates.
+
+        Args:
+            model: Model name
+            input_cost: Dollars per million input tokens
+            output_cost: Dollars per million output tokens
+            quality: Relative answer quality from 0 to 1
+            supports_thinking: Whether the model can reason with extended thinking
+            latency: Prior for the seconds a complete request takes
+            output_tokens: Prior for the tokens of an answer
+            alpha: Smoothing factor of the learned EWMAs
+        """
+        self.model = model
+        self.input_cost = input_cost
+        self.output_cost = output_cost
+        self.quality = quality
+        self.supports_thinking = supports_thinking
+        self.latency = latency
+        self.output_tokens = output_tokens
+        self.alpha = alpha
+        self.observations = 0
+
+    def cost(self, input_tokens: int, output_tokens: Optional[float] = None) -> float:
+        """Return the dollar cost of a request (expected answer size by default)."""
+        if output_tokens is None:
+            output_tokens = self.output_tokens
+        return (input_tokens * self.input_cost + output_tokens * self.output_cost) / 1_000_000
+
+    def observe(self, latency: float, output_tokens: float) -> None:
+        """Fold one finished request into the learned latency and answer size."""
+        self.latency += self.alpha * (latency - self.latency)
+        self.output_tokens += self.alpha * (output_tokens - self.output_tokens)
+        self.observations += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the learned state for saving."""
+        return {"latency": self.latency, "output_tokens": self.output_tokens, "observations": self.observations}
+
+    def restore(self, data: Mapping[str, Any]) -> None:
+        """Restore learned state saved by ``to_dict``."""
+        self.latency = data.get("latency", self.latency)
+        self.output_tokens = data.get("output_tokens", self.output_tokens)
+        self.observations = data.get("observations", 0)
+
+
+def default_profiles() -> List[ModelProfile]:
+    """Return profiles for the Claude models with list prices and latency priors."""
+    return [
+        ModelProfile("claude-3-5-haiku-20241022", 0.8, 4.0, quality=0.6, supports_thinking=False, latency=3.0),
+        ModelProfile("claude-3-7-sonnet-20250219", 3.0, 15.0, quality=0.9, supports_thinking=True, latency=10.0),
+        ModelProfile("claude-3-opus-20240229", 15.0, 75.0, quality=0.95, supports_thinking=True, latency=15.0),
+    ]
+
+
+class RouteDecision:
+    """The model chosen for a prompt and why."""
+
+    __slots__ = ("model", "features", "expected_cost", "expected_latency", "meets_slo")
+
+    def __init__(
+        self,
+        model: str,
+        features: PromptFeatures,
+        expected_cost: float,
+        expected_latency: float,
+        meets_slo: bool
+    ) -> None:
+        self.model = model
+        self.features = features
+        self.expected_cost = expected_cost
+        self.expected_latency = expected_latency
+        self.meets_slo = meets_slo
+
+    def __repr__(self) -> str:
+        return (
+            f"RouteDecision(model={self.model!r}, expected_cost={self.expected_cost:.5f}, "
+            f"expected_latency={self.expected_latency:.2f}, meets_slo={self.meets_slo})"
+        )
+
+
+class ModelRouter:
+    """Picks the cheapest model that meets a prompt's quality bar and the latency SLO."""
+
+    def __init__(
+        self,
+        profiles: Optional[Iterable[ModelProfile]] = None,
+        max_latency: Optional[float] = None,
+        state_path: Optional[Union[str, Path]] = None,
+        traffic_path: Optional[Union[str, Path]] = None
+    ) -> None:
+        """Initialize the router, loading learned state if a file is given.
+
+        Args:
+            profiles: Candidate models (defaults to ``default_profiles()``)
+            max_latency: Latency SLO in seconds; None only optimizes cost
+            state_path: JSON file learned latencies are loaded from and saved to
+            traffic_path: Optional JSONL file every observed request is appended
+                to, for evaluating routers offline with ``replay``
+
+        Raises:
+            ValueError: If there are no candidate models
+        """
+        self.profiles: Dict[str, ModelProfile] = {
+            profile.model: profile for profile in (profiles if profiles is not None else default_profiles())
+        }
+        if not self.profiles:
+            raise ValueError("A router needs at least one model profile")
+        self.max_latency = max_latency
+        self.state_path = Path(state_path) if state_path else None
+        self.traffic_path = Path(traffic_path) if traffic_path else None
+        self.decisions: Counter = Counter()
+        self._lock = threading.Lock()
+        if self.state_path and self.state_path.exists():
+            try:
+                with open(self.state_path, "r") as f:
+                    saved = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable router state {self.state_path}: {e}")
+            else:
+                for model, data in saved.items():
+                    if model in self.profiles:
+                        self.profiles[model].restore(data)
+
+    def route(self, prompt: str, format: Any = "text") -> RouteDecision:
+        """Choose a model for a prompt.
+
+        Models below the prompt's quality bar (or without thinking, for
+        prompts that ask for reasoning) are ruled out. Of the rest, the
+        cheapest one within the latency SLO wins; if none is fast enough,
+        the fastest one does. If no model is good enough, the best one is used.
+
+        Args:
+            prompt: The user's prompt
+            format: Requested output format
+
+        Returns:
+            The decision
+        """
+        features = PromptFeatures.extract(prompt, format)
+        decision = self.decide(features)
+        with self._lock:
+            self.decisions[decision.model] += 1
+        return decision
+
+    def decide(self, features: PromptFeatures) -> RouteDecision:
+        """Choose a model for already extracted prompt features (records nothing)."""
+        profiles = list(self.profiles.values())
+        required = features.required_quality
+        capable = [
+            p for p in profiles
+            if p.quality >= required and (p.supports_thinking or not features.needs_reasoning)
+        ]
+        if not capable:
+            capable = [max(profiles, key=lambda p: p.quality)]
+        fast = [p for p in capable if self.max_latency is None or p.latency <= self.max_latency]
+        if fast:
+            chosen = min(fast, key=lambda p: p.cost(features.input_tokens))
+        else:
+            chosen = min(capable, key=lambda p: p.latency)
+        return RouteDecision(
+            chosen.model,
+            features,
+            chosen.cost(features.input_tokens),
+            chosen.latency,
+            meets_slo=bool(fast),
+        )
+
+    def observe(
+        self,
+        model: str,
+        latency: float,
+        output_tokens: float,
+        prompt: Optional[str] = None,
+        format: Any = "text"
+    ) -> None:
+        """Record a finished request so the model's latency profile keeps learning.
+
+        Args:
+            model: Model that served the request
+            latency: Seconds the complete request took
+            output_tokens: Tokens of the answer
+            prompt: The prompt, appended to the traffic log if one is configured
+            format: Requested output format, for the traffic log
+        """
+        profile = self.profiles.get(model)
+        with self._lock:
+            if profile is not None:
+                profile.observe(latency, output_tokens)
+            if self.traffic_path and prompt is not None:
+                record = {
+                    "prompt": prompt,
+                    "format": getattr(format, "value", format),
+                    "model": model,
+                    "latency": latency,
+                    "output_tokens": output_tokens,
+                }
+                self.traffic_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.traffic_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+
+    def save(self) -> None:
+        """Write the learned state atomically to ``state_path``, if set."""
+        if not self.state_path:
+            return
+        with self._lock:
+            state = {model: profile.to_dict() for model, profile in self.profiles.items()}
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        # A temp file of its own, so concurrent saves never collide
+        fd, tmp_path = tempfile.mkstemp(dir=self.state_path.parent, prefix=f".{self.state_path.name}.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+class ReplayReport:
+    """How a router would have handled logged traffic, compared to what was sent."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.routed: Counter = Counter()
+        self.logged_cost = 0.0
+        self.routed_cost = 0.0
+        self.downgrades = 0
+        self.slo_misses = 0
+
+    @property
+    def savings(self) -> float:
+        """Fraction of the logged cost the router would have saved."""
+        return 1.0 - self.routed_cost / self.logged_cost if self.logged_cost else 0.0
+
+    def summary(self) -> str:
+        """Return a short report of the routing mix, cost and SLO misses."""
+        mix = ", ".join(f"{model} {count}" for model, count in self.routed.most_common())
+        return (
+            f"{self.requests} requests routed to {mix or 'nothing'}; "
+            f"cost ${self.routed_cost:.4f} vs ${self.logged_cost:.4f} logged ({self.savings:.0%} saved), "
+            f"{self.downgrades} downgrades, {self.slo_misses} expected SLO misses"
+        )
+
+
+def load_traffic(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Yield the records of a JSONL traffic log, skipping unreadable lines.
+
+    Each record holds the 'prompt' and the 'model' it was sent to, and
+    optionally 'format', 'input_tokens' and 'output_tokens'.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                logger.warning(f"Skipping unreadable line in {path}")
+                continue
+            if isinstance(record, dict) and isinstance(record.get("prompt"), str):
+                yield record
+
+
+def replay(router: ModelRouter, records: Iterable[Mapping[str, Any]]) -> ReplayReport:
+    """Evaluate a router offline against logged traffic.
+
+    Costs use the logged token counts where present, so the comparison is
+    between the same requests priced on the logged and the routed model.
+    The router's learned state is not changed.
+
+    Args:
+        router: Router to evaluate
+        records: Logged requests, e.g. from ``load_traffic``
+
+    Returns:
+        The replay report
+    """
+    report = ReplayReport()
+    for record in records:
+        features = PromptFeatures.extract(record["prompt"], record.get("format", "text"))
+        decision = router.decide(features)
+        input_tokens = record.get("input_tokens") or features.input_tokens
+        output_tokens = record.get("output_tokens")
+        routed = router.profiles[decision.model]
+        logged = router.profiles.get(record.get("model", ""))
+
+        report.requests += 1
+        report.routed[decision.model] += 1
+        # Only requests sent to a known model can be priced both ways
+        if logged is not None:
+            report.logged_cost += logged.cost(input_tokens, output_tokens)
+            report.routed_cost += routed.cost(input_tokens, output_tokens)
+            report.downgrades += int(routed.quality < logged.quality)
+        report.slo_misses += int(not decision.meets_slo)
+    return report
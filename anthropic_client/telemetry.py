@@ -0,0 +1,465 @@
+"""
+Low-overhead request telemetry for the provider clients.
+
+Each ``get_response`` call is measured by a ``RequestSpan``: the time spent
+waiting in the rate-limit governor, time to first token, total latency,
+input/output/thinking tokens and retries. Finished spans are folded into
+per-model log-linear histograms (HDR-style: about 3% relative precision at
+any magnitude, constant memory, O(1) recording) and handed to exporters.
+``Telemetry.snapshot()`` returns the aggregates in-process,
+``Telemetry.prometheus()`` renders them in the Prometheus text format, and
+``JsonLinesExporter`` appends every request to a JSONL file.
+
+Layers below the client (the governor, the transports, the response cache)
+report queue time, retries, usage and cache hits into the span of the
+request running in the current thread or task through ``note_queue_time``,
+``note_retry``, ``note_usage`` and ``note_cache_hit``, which cost one
+context-variable lookup when telemetry is off. Cache hits send no request
+and are left out of the aggregates.
+"""
+
+import json
+import math
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Sub-buckets per power of two; 16 gives about 3% relative precision
+SUB_BUCKETS = 16
+
+# Bucket bounds used for Prometheus exposition, per metric unit
+SECONDS_BOUNDS: Tuple[float, ...] = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+RATE_BOUNDS: Tuple[float, ...] = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+# Bucket of values at or below zero, ordered before every other bucket
+_ZERO_BUCKET = -1 << 20
+
+_current_span: ContextVar[Optional["RequestSpan"]] = ContextVar("telemetry_span", default=None)
+
+
+class Histogram:
+    """A log-linear histogram of positive values with constant relative error."""
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    @staticmethod
+    def _index(value: float) -> int:
+        mantissa, exponent = math.frexp(value)
+        # mantissa is in [0.5, 1): split each power of two into SUB_BUCKETS
+        return exponent * SUB_BUCKETS + int((mantissa - 0.5) * 2 * SUB_BUCKETS)
+
+    @staticmethod
+    def _bound(index: int, offset: float = 1.0) -> float:
+        """Return the upper bound of a bucket (its midpoint with ``offset=0.5``)."""
+        exponent, sub = divmod(index, SUB_BUCKETS)
+        return math.ldexp(0.5 + (sub + offset) / (2 * SUB_BUCKETS), exponent)
+
+    def record(self, value: float) -> None:
+        """Record one value; values at or below zero count in the lowest bucket."""
+        index = self._index(value) if value > 0 else _ZERO_BUCKET
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, quantile: float) -> float:
+        """Return the value below which ``quantile`` of the recorded values fall."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(quantile * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                if index == _ZERO_BUCKET:
+                    return 0.0
+                return min(max(self._bound(index, 0.5), self.min), self.max)
+        return self.max
+
+    def cumulative(self, bounds: Sequence[float]) -> List[int]:
+        """Return the number of values at or below each bound (approximate within a bucket)."""
+        ordered = sorted(self.counts.items())
+        result = []
+        position, seen = 0, 0
+        for bound in bounds:
+            while position < len(ordered) and (
+                ordered[position][0] == _ZERO_BUCKET or self._bound(ordered[position][0]) <= bound * (1 + 1e-9)
+            ):
+                seen += ordered[position][1]
+                position += 1
+            result.append(seen)
+        return result
+
+    def merge(self, other: "Histogram") -> None:
+        """Add another histogram's values to this one."""
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def summary(self) -> Dict[str, float]:
+        """Return the count, mean, extremes and common percentiles."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+        }
+
+
+class RequestSpan:
+    """Measurements of one request, filled in while it runs."""
+
+    __slots__ = (
+        "telemetry", "provider", "model", "stream", "started", "first_token_at", "finished_at",
+        "queue_time", "input_tokens", "output_tokens", "thinking_tokens", "retries", "error", "cache_hit",
+    )
+
+    def __init__(self, telemetry: "Telemetry", provider: str, model: str, stream: bool) -> None:
+        self.telemetry = telemetry
+        self.provider = provider
+        self.model = model
+        self.stream = stream
+        self.started = time.perf_counter()
+        self.first_token_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.queue_time = 0.0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.thinking_tokens = 0
+        self.retries = 0
+        self.error: Optional[str] = None
+        self.cache_hit = False
+
+    def first_token(self) -> None:
+        """Mark the arrival of the first answer chunk (later calls are ignored)."""
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+
+    def add_usage(self, usage: Any, thinking_tokens: int = 0) -> None:
+        """Add a response's reported usage (SDK object or ``events.Usage``)."""
+        self.thinking_tokens += thinking_tokens
+        if usage is None:
+            return
+        self.input_tokens += sum(
+            getattr(usage, name, None) or 0
+            for name in ("input_tokens", "cache_creation_input_tokens", "cache_read_input_tokens")
+        )
+        self.output_tokens += getattr(usage, "output_tokens", None) or 0
+
+    @property
+    def ttft(self) -> Optional[float]:
+        """Seconds from start to the first token, if one arrived."""
+        return self.first_token_at - self.started if self.first_token_at is not None else None
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Seconds from start to finish, once finished."""
+        return self.finished_at - self.started if self.finished_at is not None else None
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """Close the span and report it (only the first call counts).
+
+        A span answered from the response cache sent no request and is dropped.
+        """
+        if self.finished_at is not None:
+            return
+        self.finished_at = time.perf_counter()
+        if error is not None:
+            self.error = type(error).__name__
+        if not self.cache_hit:
+            self.telemetry.record(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the span as a JSON-serializable record."""
+        return {
+            "provider": self.provider,
+            "model": self.model,
+            "stream": self.stream,
+            "queue_time": self.queue_time,
+            "ttft": self.ttft,
+            "latency": self.latency,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "thinking_tokens": self.thinking_tokens,
+            "retries": self.retries,
+            "error": self.error,
+        }
+
+
+def current_span() -> Optional[RequestSpan]:
+    """Return the span of the request running in this context, if it is measured."""
+    return _current_span.get()
+
+
+def note_queue_time(seconds: float) -> None:
+    """Charge time spent waiting for rate-limit capacity to the current request."""
+    span = _current_span.get()
+    if span is not None:
+        span.queue_time += seconds
+
+
+def note_retry() -> None:
+    """Count a retry against the current request."""
+    span = _current_span.get()
+    if span is not None:
+        span.retries += 1
+
+
+def note_cache_hit() -> None:
+    """Mark the current request as answered from the response cache."""
+    span = _current_span.get()
+    if span is not None:
+        span.cache_hit = True
+
+
+def note_usage(usage: Any, thinking_chars: int = 0, thinking_tokens: int = 0) -> None:
+    """Add a response's usage to the current request.
+
+    The Messages API bills thinking as output tokens without reporting it
+    separately, so Anthropic thinking is passed as ``thinking_chars`` and
+    estimated at 4 characters per token; OpenAI reports ``thinking_tokens``.
+    """
+    span = _current_span.get()
+    if span is not None:
+        span.add_usage(usage, thinking_tokens + math.ceil(thinking_chars / 4))
+
+
+class _ModelStats:
+    """Aggregates for one provider/model pair."""
+
+    __slots__ = ("queue", "ttft", "latency", "tokens_per_second", "counters")
+
+    def __init__(self) -> None:
+        self.queue = Histogram()
+        self.ttft = Histogram()
+        self.latency = Histogram()
+        self.tokens_per_second = Histogram()
+        self.counters = dict.fromkeys(
+            ("requests", "errors", "retries", "input_tokens", "output_tokens", "thinking_tokens"), 0
+        )
+
+
+class JsonLinesExporter:
+    """Appends every finished request to a JSONL file."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, span: RequestSpan) -> None:
+        line = json.dumps(dict(span.to_dict(), ts=time.time())) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class Telemetry:
+    """Collects request spans into per-model histograms and counters."""
+
+    def __init__(self, exporters: Sequence[Any] = ()) -> None:
+        """Initialize empty aggregates.
+
+        Args:
+            exporters: Objects with an ``export(span)`` method, called for
+                every finished request
+        """
+        self.exporters = list(exporters)
+        self._stats: Dict[Tuple[str, str], _ModelStats] = {}
+        self._lock = threading.Lock()
+
+    def measure(
+        self,
+        provider: str,
+        model: str,
+        stream: bool,
+        send: Callable[[], Union[str, Iterator[str]]]
+    ) -> Union[str, Iterator[str]]:
+        """Send a request under a new span.
+
+        A complete response finishes the span immediately; a stream is
+        wrapped so the span is finished when it is exhausted, fails or is
+        closed.
+
+        Args:
+            provider: Provider serving the request
+            model: Model name
+            stream: Whether a stream was requested
+            send: Zero-argument callable performing the request
+
+        Returns:
+            Whatever ``send`` returns, with streams wrapped
+        """
+        span = RequestSpan(self, provider, model, stream)
+        token = _current_span.set(span)
+        try:
+            response = send()
+        except BaseException as e:
+            span.finish(e)
+            raise
+        finally:
+            _current_span.reset(token)
+        if isinstance(response, str):
+            span.first_token()
+            span.finish()
+            return response
+        return self._measure_stream(span, response)
+
+    @staticmethod
+    def _measure_stream(span: RequestSpan, chunks: Iterator[str]) -> Iterator[str]:
+        iterator = iter(chunks)
+        while True:
+            # The span is current only while the stream itself runs, so the
+            # caller's own requests between chunks are not charged to it
+            token = _current_span.set(span)
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                break
+            except BaseException as e:
+                span.finish(e)
+                raise
+            finally:
+                _current_span.reset(token)
+            span.first_token()
+            try:
+                yield chunk
+            except GeneratorExit:
+                # The caller stopped reading; what it got is still a request
+                span.finish()
+                raise
+        span.finish()
+
+    async def ameasure(
+        self,
+        provider: str,
+        model: str,
+        stream: bool,
+        send: Callable[[], Awaitable[Union[str, AsyncIterator[str]]]]
+    ) -> Union[str, AsyncIterator[str]]:
+        """Async counterpart of ``measure``: ``send`` returns an awaitable."""
+        span = RequestSpan(self, provider, model, stream)
+        token = _current_span.set(span)
+        try:
+            response = await send()
+        except BaseException as e:
+            span.finish(e)
+            raise
+        finally:
+            _current_span.reset(token)
+        if isinstance(response, str):
+            span.first_token()
+            span.finish()
+            return response
+        return self._ameasure_stream(span, response)
+
+    @staticmethod
+    async def _ameasure_stream(span: RequestSpan, chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+        iterator = chunks.__aiter__()
+        while True:
+            token = _current_span.set(span)
+            try:
+                chunk = await iterator.__anext__()
+            except StopAsyncIteration:
+                break
+            except BaseException as e:
+                span.finish(e)
+                raise
+            finally:
+                _current_span.reset(token)
+            span.first_token()
+            try:
+                yield chunk
+            except GeneratorExit:
+                span.finish()
+                raise
+        span.finish()
+
+    def record(self, span: RequestSpan) -> None:
+        """Fold a finished span into the aggregates and pass it to the exporters."""
+        with self._lock:
+            stats = self._stats.get((span.provider, span.model))
+            if stats is None:
+                stats = self._stats[(span.provider, span.model)] = _ModelStats()
+            counters = stats.counters
+            counters["requests"] += 1
+            counters["errors"] += span.error is not None
+            counters["retries"] += span.retries
+            counters["input_tokens"] += span.input_tokens
+            counters["output_tokens"] += span.output_tokens
+            counters["thinking_tokens"] += span.thinking_tokens
+            stats.queue.record(span.queue_time)
+            if span.error is None:
+                stats.latency.record(span.latency)
+                if span.ttft is not None:
+                    stats.ttft.record(span.ttft)
+                generating = span.latency - (span.ttft or 0.0)
+                if span.output_tokens and generating > 0:
+                    stats.tokens_per_second.record(span.output_tokens / generating)
+        for exporter in self.exporters:
+            exporter.export(span)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return counters and histogram summaries per ``provider/model``."""
+        with self._lock:
+            return {
+                f"{provider}/{model}": dict(
+                    stats.counters,
+                    queue_seconds=stats.queue.summary(),
+                    ttft_seconds=stats.ttft.summary(),
+                    latency_seconds=stats.latency.summary(),
+                    output_tokens_per_second=stats.tokens_per_second.summary(),
+                )
+                for (provider, model), stats in self._stats.items()
+            }
+
+    def prometheus(self, prefix: str = "claude_client") -> str:
+        """Render the aggregates in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            items = sorted(self._stats.items())
+            for name in ("requests", "errors", "retries", "input_tokens", "output_tokens", "thinking_tokens"):
+                metric = f"{prefix}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                for (provider, model), stats in items:
+                    lines.append(f'{metric}{{provider="{provider}",model="{model}"}} {stats.counters[name]}')
+            for name, attribute, bounds in (
+                ("queue_seconds", "queue", SECONDS_BOUNDS),
+                ("ttft_seconds", "ttft", SECONDS_BOUNDS),
+                ("latency_seconds", "latency", SECONDS_BOUNDS),
+                ("output_tokens_per_second", "tokens_per_second", RATE_BOUNDS),
+            ):
+                metric = f"{prefix}_{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                for (provider, model), stats in items:
+                    histogram = getattr(stats, attribute)
+                    labels = f'provider="{provider}",model="{model}"'
+                    for bound, count in zip(bounds, histogram.cumulative(bounds)):
+                        lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {count}')
+                    lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                    lines.append(f"{metric}_sum{{{labels}}} {histogram.total}")
+                    lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
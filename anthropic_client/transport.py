@@ -0,0 +1,180 @@
+"""
+Process-wide HTTP transport registry shared by every client class.
+
+Each (provider, base_url) pair gets one keep-alive ``httpx`` connection pool,
+so constructing another ``AnthropicClient`` or ``MultiProviderClient`` reuses
+open connections instead of paying a new TLS handshake and CA-bundle parse.
+"""
+
+import importlib.util
+import logging
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    import ssl
+
+    import httpx
+
+    from .cassette import Cassette
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URLS: Dict[str, str] = {
+    "anthropic": "https://api.anthropic.com",
+    "openai": "https://api.openai.com/v1",
+}
+
+
+class TransportConfig:
+    """Connection pool settings for the shared transports."""
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        connect_timeout: float = 5.0,
+        timeout: float = 600.0
+    ) -> None:
+        """Initialize the pool settings.
+
+        Args:
+            max_connections: Maximum number of open connections per pool
+            max_keepalive_connections: Maximum number of idle connections kept open
+            keepalive_expiry: Seconds an idle connection is kept before closing
+            http2: Whether to negotiate HTTP/2 (requires the ``h2`` package)
+            connect_timeout: Seconds allowed to establish a connection
+            timeout: Default seconds allowed for reads, writes and pool waits
+        """
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+        self.connect_timeout = connect_timeout
+        self.timeout = timeout
+
+    def limits(self) -> "httpx.Limits":
+        """Return the ``httpx`` pool limits for this configuration."""
+        import httpx
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def timeouts(self) -> "httpx.Timeout":
+        """Return the ``httpx`` timeouts for this configuration."""
+        import httpx
+        return httpx.Timeout(self.timeout, connect=self.connect_timeout)
+
+
+_default_config = TransportConfig()
+_clients: Dict[Tuple[str, str], "httpx.Client"] = {}
+_lock = threading.Lock()
+_cassette: Optional["Cassette"] = None
+
+
+@lru_cache(maxsize=1)
+def _ssl_context() -> "ssl.SSLContext":
+    """Build the certifi-backed SSL context once per process."""
+    import ssl
+
+    import certifi
+    return ssl.create_default_context(cafile=certifi.where())
+
+
+def _http2_enabled(config: TransportConfig) -> bool:
+    """Return whether HTTP/2 can be used, warning if ``h2`` is missing."""
+    if config.http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+        return False
+    return config.http2
+
+
+def configure_transport(config: TransportConfig) -> None:
+    """Set the pool settings used for transports created from now on.
+
+    Pools that already exist keep their settings until ``close_transports``.
+
+    Args:
+        config: The new default transport configuration
+    """
+    global _default_config
+    with _lock:
+        _default_config = config
+
+
+def use_cassette(cassette: Optional["Cassette"]) -> None:
+    """Record to or replay from a cassette on every transport from now on.
+
+    Existing pools are closed, since they bypass the cassette; clients
+    hold on to their pool, so install the cassette before building them.
+
+    Args:
+        cassette: The cassette to use, or None to talk to the network again
+    """
+    global _cassette
+    with _lock:
+        _cassette = cassette
+    close_transports()
+
+
+def _pool_options(config: TransportConfig) -> Dict[str, Any]:
+    return {
+        "verify": _ssl_context(),
+        "http2": _http2_enabled(config),
+        "limits": config.limits(),
+    }
+
+
+def get_http_client(provider: str, base_url: Optional[str] = None) -> "httpx.Client":
+    """Return the shared keep-alive pool for a provider and base URL.
+
+    Args:
+        provider: Provider name, e.g. "anthropic" or "openai"
+        base_url: API base URL; defaults to the provider's public endpoint
+
+    Returns:
+        The process-wide ``httpx.Client`` for this (provider, base_url) pair
+    """
+    import httpx
+    key = (provider, base_url or DEFAULT_BASE_URLS.get(provider, ""))
+    with _lock:
+        client = _clients.get(key)
+        if client is None or client.is_closed:
+            if _cassette is not None:
+                transport = _cassette.transport(**_pool_options(_default_config))
+                client = httpx.Client(transport=transport, timeout=_default_config.timeouts())
+            else:
+                client = httpx.Client(timeout=_default_config.timeouts(), **_pool_options(_default_config))
+            _clients[key] = client
+            logger.debug(f"Created shared transport for {key[0]} at {key[1]}")
+        return client
+
+
+def new_async_http_client() -> "httpx.AsyncClient":
+    """Create an async pool with the shared settings and SSL context.
+
+    Async pools are bound to the event loop that first uses them, so they
+    cannot live in the process-wide registry; each async client owns one.
+
+    Returns:
+        A new ``httpx.AsyncClient``
+    """
+    import httpx
+    if _cassette is not None:
+        transport = _cassette.async_transport(**_pool_options(_default_config))
+        return httpx.AsyncClient(transport=transport, timeout=_default_config.timeouts())
+    return httpx.AsyncClient(timeout=_default_config.timeouts(), **_pool_options(_default_config))
+
+
+def close_transports() -> None:
+    """Close and forget every shared pool."""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
@@ -4,12 +4,22 @@ Python CLI for Anthropic Claude API.
 This is called by the Mojo wrapper.
 """
 
+import os
 import sys
 import argparse
-import time
 import json
+import random
+import time
 import anthropic
-from typing import Optional, Dict, Any
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, Any, List, TextIO
+
+try:
+    from anthropic_client.events import StreamDecoder
+    from anthropic_client.render import StreamRenderer
+except ImportError:  # Standalone use without the anthropic_client package
+    StreamDecoder = None
+    StreamRenderer = None
 
 __version__ = "0.2.0"
 
@@ -18,6 +28,12 @@ AVAILABLE_MODELS = [
     "claude-3-5-haiku-20241022"
 ]
 
+# Rate-limited (429) and overloaded (529) requests are retried this many
+# times on top of the SDK's own retries, waiting at least retry-after
+RATE_LIMIT_STATUS_CODES = (429, 529)
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BASE_DELAY = 5.0
+
 def create_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Command line interface for the Anthropic Claude API",
@@ -90,23 +106,182 @@ def create_parser() -> argparse.ArgumentParser:
     
     return parser
 
-def save_response(response: str, output_file: str, format: str = "text") -> None:
-    """Save response to a file in specified format."""
-    try:
-        with open(output_file, 'w') as f:
-            if format == "json":
-                json.dump({"response": response}, f, indent=2)
-            else:
-                f.write(response)
-    except Exception as e:
-        sys.stderr.write(f"Error saving response: {e}\n")
-
 def format_response(response: str, format: str = "text") -> str:
     """Format response in specified format."""
     if format == "json":
         return json.dumps({"response": response}, indent=2)
     return response
 
+class StreamSink(ABC):
+    """Destination for streamed response text."""
+    
+    @abstractmethod
+    def write(self, text: str) -> None:
+        """Take one chunk of response text."""
+    
+    def close(self, completed: bool = True) -> None:
+        """Release the sink; ``completed`` is False when the stream failed."""
+
+class BufferSink(StreamSink):
+    """Collects chunks in a list and joins them once at the end."""
+    
+    def __init__(self) -> None:
+        self.chunks: List[str] = []
+    
+    def write(self, text: str) -> None:
+        self.chunks.append(text)
+    
+    def getvalue(self) -> str:
+        return "".join(self.chunks)
+
+class TextSink(StreamSink):
+    """Writes chunks straight through to a text stream.
+    
+    With ``replaces``, the stream is a temporary file that is moved over that
+    path once the stream completes, and removed if it fails, so the output
+    file never holds a partial response.
+    """
+    
+    def __init__(
+        self,
+        stream: TextIO,
+        flush: bool = False,
+        owns_stream: bool = False,
+        replaces: Optional[str] = None
+    ) -> None:
+        self.stream = stream
+        self.flush = flush
+        self.owns_stream = owns_stream
+        self.replaces = replaces
+    
+    def write(self, text: str) -> None:
+        self.stream.write(text)
+        if self.flush:
+            self.stream.flush()
+    
+    def close(self, completed: bool = True) -> None:
+        if self.owns_stream:
+            self.stream.close()
+        if self.replaces is None:
+            return
+        if completed:
+            os.replace(self.stream.name, self.replaces)
+        else:
+            try:
+                os.remove(self.stream.name)
+            except OSError:
+                pass
+
+class TerminalSink(StreamSink):
+    """Renders streamed text through anthropic_client's StreamRenderer."""
+    
+    def __init__(self, renderer: "StreamRenderer") -> None:
+        self.renderer = renderer
+    
+    def write(self, text: str) -> None:
+        self.renderer.write(text)
+    
+    def close(self, completed: bool = True) -> None:
+        self.renderer.finish()
+    
+    def summary(self) -> str:
+        """Return time-to-first-token and estimated tokens/sec."""
+        return self.renderer.summary()
+
+class JsonEnvelopeSink(TextSink):
+    """Writes chunks into a {"response": ...} JSON document as they arrive.
+    
+    The output is identical to ``format_response(..., format="json")``.
+    """
+    
+    def __init__(self, stream: TextIO, owns_stream: bool = False, replaces: Optional[str] = None) -> None:
+        super().__init__(stream, owns_stream=owns_stream, replaces=replaces)
+        self.stream.write('{\n  "response": "')
+    
+    def write(self, text: str) -> None:
+        # json.dumps escapes the chunk; strip its surrounding quotes
+        self.stream.write(json.dumps(text)[1:-1])
+    
+    def close(self, completed: bool = True) -> None:
+        self.stream.write('"\n}')
+        super().close(completed)
+
+class TeeSink(StreamSink):
+    """Fans each chunk out to several sinks."""
+    
+    def __init__(self, sinks: List[StreamSink]) -> None:
+        self.sinks = sinks
+    
+    def write(self, text: str) -> None:
+        for sink in self.sinks:
+            sink.write(text)
+    
+    def close(self, completed: bool = True) -> None:
+        for sink in self.sinks:
+            sink.close(completed)
+
+def open_output_sink(output_file: str, format: str = "text") -> Optional[StreamSink]:
+    """Open an incremental sink for the --output file, or None if it can't be opened.
+    
+    Chunks go to a temporary file next to it that replaces the output file
+    only once the response is complete.
+    """
+    try:
+        f = open(f"{output_file}.tmp", 'w')
+    except Exception as e:
+        sys.stderr.write(f"Error saving response: {e}\n")
+        return None
+    if format == "json":
+        return JsonEnvelopeSink(f, owns_stream=True, replaces=output_file)
+    return TextSink(f, owns_stream=True, replaces=output_file)
+
+def event_text(event: Any) -> str:
+    """Return the response text carried by a stream event, if any.
+
+    Fallback for standalone use; with the package installed the stream is
+    decoded by ``anthropic_client.events.StreamDecoder`` instead.
+    """
+    event_type = getattr(event, "type", None)
+    if event_type == "content_block_delta":
+        return getattr(event.delta, "text", None) or ""
+    if isinstance(event_type, str):
+        # message_start, content_block_start/stop, message_delta, ping, ...
+        return ""
+    # Untyped events: probe for a text delta
+    delta = getattr(event, "delta", None)
+    text = getattr(delta, "text", None)
+    return text if isinstance(text, str) else ""
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Return the retry-after header of an API error in seconds, if it has one."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+def create_with_retry(client: Any, params: Dict[str, Any], retries: int = RATE_LIMIT_RETRIES) -> Any:
+    """Send a Messages request, retrying 429/529 responses with backoff.
+    
+    Each wait is a jittered exponential delay, but never shorter than the
+    retry-after the API asked for.
+    """
+    attempt = 0
+    while True:
+        try:
+            return client.beta.messages.create(**params)
+        except anthropic.APIStatusError as e:
+            if e.status_code not in RATE_LIMIT_STATUS_CODES or attempt >= retries:
+                raise
+            delay = random.uniform(0, RATE_LIMIT_BASE_DELAY * (2 ** attempt))
+            delay = max(delay, retry_after(e) or 0.0)
+            attempt += 1
+            sys.stderr.write(
+                f"Rate limited ({e.status_code}); retrying in {delay:.1f}s "
+                f"(attempt {attempt} of {retries})\n"
+            )
+            time.sleep(delay)
+
 def run_cli(args):
     # Validate temperature when thinking is enabled
     if args.temperature != 1.0 and args.budget > 0:
@@ -160,14 +335,18 @@ def run_cli(args):
             formatted_response = format_response(response, args.format)
             sys.stdout.write(f"Claude: {formatted_response}\n")
             if args.output:
-                save_response(response, args.output, args.format)
+                output_sink = open_output_sink(args.output, args.format)
+                if output_sink is not None:
+                    output_sink.write(response)
+                    output_sink.close()
             return
             
         if not api_key:
             sys.stderr.write("Error: ANTHROPIC_API_KEY environment variable not set\n")
             sys.exit(1)
             
-        # Create Anthropic client
+        # Create Anthropic client; a single request has nothing for a
+        # rate-limit governor to learn, so 429/529s are retried in place
         client = anthropic.Anthropic(api_key=api_key)
         
         # Build messages list
@@ -195,38 +374,59 @@ def run_cli(args):
         if args.system:
             params["system"] = args.system
         
-        # Initialize response accumulator
-        full_response = ""
-        response_iterator = client.beta.messages.create(**params)
+        # Started before the request, so time to first token includes it
+        renderer = StreamRenderer(sys.stdout) if args.stream and StreamRenderer is not None else None
+        response_iterator = create_with_retry(client, params)
         
-        # Handle output based on stream flag
+        # Route text to stdout and the output file as it arrives; only buffer
+        # when the complete response has to be formatted at the end
+        sinks: List[StreamSink] = []
+        buffer = None
+        terminal = None
         if args.stream:
             sys.stdout.write("Claude: ")
             sys.stdout.flush()
-            
-            for chunk in response_iterator:
-                chunk_text = str(chunk.delta.text) if hasattr(chunk, 'delta') and hasattr(chunk.delta, 'text') else ""
+            if renderer is not None:
+                terminal = TerminalSink(renderer)
+                sinks.append(terminal)
+            else:
+                sinks.append(TextSink(sys.stdout, flush=True))
+        else:
+            buffer = BufferSink()
+            sinks.append(buffer)
+        if args.output:
+            output_sink = open_output_sink(args.output, args.format)
+            if output_sink is not None:
+                sinks.append(output_sink)
+        sink = TeeSink(sinks)
+        
+        decoder = StreamDecoder() if StreamDecoder is not None else None
+        if decoder is not None:
+            chunks = decoder.text(response_iterator)
+        else:
+            chunks = (event_text(event) for event in response_iterator)
+        try:
+            for chunk_text in chunks:
                 if chunk_text:
-                    full_response += chunk_text
-                    sys.stdout.write(chunk_text)
-                    sys.stdout.flush()
-                    time.sleep(0.01)  # Small delay for smoother output
-            
+                    sink.write(chunk_text)
+        except BaseException:
+            sink.close(completed=False)
+            raise
+        sink.close()
+        
+        if terminal is not None:
             sys.stdout.write("\n")  # Final newline
+            summary = terminal.summary()
+            if decoder is not None:
+                summary += (
+                    f", {decoder.usage.output_tokens} output tokens,"
+                    f" stop reason {decoder.stop_reason}"
+                )
+            sys.stderr.write(f"[{summary}]\n")
         else:
-            # Accumulate chunks without displaying
-            for chunk in response_iterator:
-                chunk_text = str(chunk.delta.text) if hasattr(chunk, 'delta') and hasattr(chunk.delta, 'text') else ""
-                if chunk_text:
-                    full_response += chunk_text
-            
             # Format and display complete response
-            formatted_response = format_response(full_response, args.format)
+            formatted_response = format_response(buffer.getvalue(), args.format)
             sys.stdout.write(formatted_response + "\n")
-        
-        # Save response if output file specified
-        if args.output:
-            save_response(full_response, args.output, args.format)
             
     except anthropic.AuthenticationError as e:
         sys.stderr.write(f"Authentication Error: {e}\n")
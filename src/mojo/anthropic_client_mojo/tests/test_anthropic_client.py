@@ -7,6 +7,14 @@ from unittest.mock import patch, MagicMock
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from anthropic_client import AnthropicClient
 from dotenv import load_dotenv
+from anthropic.types import RawContentBlockDeltaEvent, TextDelta
+
+
+def _text_event(text):
+    """Build a streamed text delta event as the SDK yields it."""
+    return RawContentBlockDeltaEvent(
+        type="content_block_delta", index=0, delta=TextDelta(type="text_delta", text=text)
+    )
 
 
 class TestAnthropicClient(unittest.TestCase):
@@ -186,9 +194,9 @@ class TestAnthropicClient(unittest.TestCase):
         mock_anthropic.return_value = mock_client
 
         mock_chunks = [
-            MagicMock(content=[MagicMock(text="Hello")]),
-            MagicMock(content=[MagicMock(text=", ")]),
-            MagicMock(content=[MagicMock(text="human!")])
+            _text_event("Hello"),
+            _text_event(", "),
+            _text_event("human!")
         ]
         mock_client.beta.messages.create.return_value = mock_chunks
 
@@ -239,7 +247,7 @@ class TestAnthropicClient(unittest.TestCase):
         mock_anthropic.return_value = mock_client
         
         def mock_stream():
-            yield MagicMock(content=[MagicMock(text="Start")])
+            yield _text_event("Start")
             raise KeyboardInterrupt()
         
         mock_client.beta.messages.create.return_value = mock_stream()
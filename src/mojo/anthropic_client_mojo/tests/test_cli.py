@@ -4,7 +4,9 @@ import sys
 import io
 import os
 import anthropic
-from anthropic_client_mojo.python_cli import create_parser, run_cli, main
+from anthropic_client_mojo.python_cli import (
+    create_parser, run_cli, main, format_response, JsonEnvelopeSink, event_text
+)
 
 def test_parser_creation():
     """Test that argument parser is created correctly."""
@@ -208,4 +210,90 @@ def test_main_with_unexpected_error(mock_client_class):
             with pytest.raises(SystemExit) as exc_info:
                 main()
             assert exc_info.value.code == 1
-            assert "An unexpected error occurred: Unexpected error" in fake_err.getvalue() 
\ No newline at end of file
+            assert "An unexpected error occurred: Unexpected error" in fake_err.getvalue()
+
+def test_json_envelope_sink_matches_format_response(tmp_path):
+    """Test that the incremental JSON sink writes the same document as format_response."""
+    chunks = ["He said \"hi\"", "\n", "caf\u00e9 \\ done"]
+
+    streamed_path = tmp_path / "streamed.json"
+    sink = JsonEnvelopeSink(open(streamed_path, "w"), owns_stream=True)
+    for chunk in chunks:
+        sink.write(chunk)
+    sink.close()
+
+    assert streamed_path.read_text() == format_response("".join(chunks), "json")
+
+def test_event_text_dispatches_on_event_type():
+    """Test that typed events are dispatched by type and non-text events ignored."""
+    text_event = MagicMock(type="content_block_delta", delta=MagicMock(text="Hi"))
+    thinking_event = MagicMock(type="content_block_delta", delta=MagicMock(spec=["thinking"]))
+    stop_event = MagicMock(type="message_stop")
+    assert event_text(text_event) == "Hi"
+    assert event_text(thinking_event) == ""
+    assert event_text(stop_event) == ""
+
+@patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"})
+def test_main_streams_to_output_file(tmp_path):
+    """Test that streamed text is written to the --output file incrementally."""
+    with patch('anthropic.Anthropic') as mock_anthropic:
+        mock_client = MagicMock()
+        mock_anthropic.return_value = mock_client
+        mock_client.beta.messages.create.return_value = [
+            MagicMock(delta=MagicMock(text="Hello")),
+            MagicMock(delta=MagicMock(text=", World"))
+        ]
+
+        output_path = tmp_path / "out.txt"
+        test_args = ["cli.py", "-s", "-o", str(output_path), "Test"]
+        with patch.object(sys, 'argv', test_args):
+            with patch('sys.stdout', new=io.StringIO()) as fake_out:
+                main()
+        assert "Hello, World" in fake_out.getvalue()
+        assert output_path.read_text() == "Hello, World"
+
+
+def _rate_limit_error(retry_after):
+    response = MagicMock(status_code=429, headers={"retry-after": retry_after})
+    return anthropic.RateLimitError(
+        message="Rate limit exceeded",
+        response=response,
+        body={"error": {"message": "Rate limit exceeded"}}
+    )
+
+@patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"})
+def test_rate_limited_request_is_retried_after_retry_after():
+    """Test that a 429 is retried, waiting at least the retry-after delay."""
+    with patch('anthropic.Anthropic') as mock_anthropic:
+        mock_client = MagicMock()
+        mock_anthropic.return_value = mock_client
+        mock_client.beta.messages.create.side_effect = [
+            _rate_limit_error("30"),
+            [MagicMock(delta=MagicMock(text="Recovered"))]
+        ]
+
+        with patch.object(sys, 'argv', ["cli.py", "Test"]):
+            with patch('sys.stdout', new=io.StringIO()) as fake_out, \
+                    patch('sys.stderr', new=io.StringIO()):
+                with patch('anthropic_client_mojo.python_cli.time.sleep') as sleep:
+                    main()
+        assert "Recovered" in fake_out.getvalue()
+        assert sleep.call_count == 1
+        assert sleep.call_args[0][0] >= 30
+
+@patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"})
+def test_rate_limit_retries_are_bounded():
+    """Test that the run still ends once the rate-limit retries are used up."""
+    with patch('anthropic.Anthropic') as mock_anthropic:
+        mock_client = MagicMock()
+        mock_anthropic.return_value = mock_client
+        mock_client.beta.messages.create.side_effect = _rate_limit_error("1")
+
+        with patch.object(sys, 'argv', ["cli.py", "Test"]):
+            with patch('sys.stderr', new=io.StringIO()) as fake_err:
+                with patch('anthropic_client_mojo.python_cli.time.sleep') as sleep:
+                    with pytest.raises(SystemExit):
+                        main()
+        assert sleep.call_count == 3
+        assert mock_client.beta.messages.create.call_count == 4
+        assert "Rate Limit Error" in fake_err.getvalue()
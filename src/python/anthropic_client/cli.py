@@ -4,7 +4,6 @@ Command line interface for the Anthropic Claude API client.
 
 import argparse
 import sys
-import time
 import json
 import os
 from pathlib import Path
@@ -17,7 +16,6 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Constants
-STREAM_DELAY: float = 0.01  # Delay between chunks when streaming
 DEFAULT_TEMPERATURE: float = 1.0
 DEFAULT_MODEL: ModelName = ModelName.SONNET
 DEFAULT_FORMAT: OutputFormat = OutputFormat.TEXT
@@ -135,7 +133,6 @@ def handle_streaming_response(
             system=system
         ):
             print(chunk, end="", flush=True)
-            time.sleep(STREAM_DELAY)
         print()  # Final newline
     except KeyboardInterrupt:
         print("\nStreaming cancelled by user", file=sys.stderr)
@@ -0,0 +1,55 @@
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from load import LoadBaseline
+from mock_server import MockAPIServer, MockBehavior
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / f"{sys.platform}-py{sys.version_info[0]}{sys.version_info[1]}.json"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("load baselines")
+    group.addoption(
+        "--load-baseline",
+        default=os.environ.get("LOAD_BASELINE", str(DEFAULT_BASELINE)),
+        help="JSON file of load-benchmark baselines compared against (default: baselines/<platform>.json)"
+    )
+    group.addoption("--save-load-baseline", action="store_true", help="Record this run as the load baseline")
+    group.addoption(
+        "--load-tolerance",
+        type=float,
+        default=float(os.environ.get("LOAD_TOLERANCE", "0.25")),
+        help="Relative regression of a load metric that fails the run (default: 0.25)"
+    )
+
+
+@pytest.fixture(scope="session")
+def load_baseline(request):
+    """The stored load baselines; written at the end of the session with --save-load-baseline."""
+    baseline = LoadBaseline(
+        request.config.getoption("--load-baseline"),
+        tolerance=request.config.getoption("--load-tolerance"),
+        save=request.config.getoption("--save-load-baseline")
+    )
+    yield baseline
+    baseline.write()
+
+
+@pytest.fixture
+def mock_api():
+    """Start mock API servers for a behavior; returns a function taking MockBehavior arguments."""
+    servers = []
+
+    def start(**behavior):
+        server = MockAPIServer(MockBehavior(**behavior)).start()
+        servers.append(server)
+        return server
+
+    with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "mock-key", "OPENAI_API_KEY": "mock-key"}):
+        yield start
+    for server in servers:
+        server.stop()
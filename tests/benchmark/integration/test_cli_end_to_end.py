@@ -0,0 +1,36 @@
+"""End-to-end benchmarks: CLI processes answering against the offline mock API.
+
+Each invocation is a fresh interpreter, so these include interpreter
+start-up, imports and connection set-up, which the in-process load
+benchmarks do not.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PYTHON_CLI = Path(__file__).parents[3] / "src" / "mojo" / "anthropic_client_mojo" / "python_cli.py"
+
+COMMANDS = {
+    "claudethink": [sys.executable, "-m", "anthropic_client.cli", "--no-daemon", "--model", "claude-3-5-haiku-20241022"],
+    "python_cli": [sys.executable, str(PYTHON_CLI), "--stream", "--model", "claude-3-5-haiku-20241022"],
+}
+
+
+@pytest.mark.parametrize("command", sorted(COMMANDS))
+def test_cli_invocation(benchmark, mock_api, tmp_path, command):
+    """Benchmark one streamed answer from a fresh CLI process."""
+    server = mock_api(latency=0.005, chunks=16, chunk_interval=0.001)
+    # A scratch HOME keeps breaker and router state out of ~/.anthropic
+    env = dict(os.environ, ANTHROPIC_BASE_URL=server.url, HOME=str(tmp_path))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(Path(__file__).parents[3]), env.get("PYTHONPATH")]))
+
+    def invoke():
+        return subprocess.run(COMMANDS[command] + ["Hello"], env=env, capture_output=True, text=True, timeout=60)
+
+    result = benchmark.pedantic(invoke, rounds=5, iterations=1)
+    assert result.returncode == 0, result.stderr
+    assert "token" in result.stdout
@@ -0,0 +1,149 @@
+"""
+Closed-loop load generation for the client benchmarks.
+
+``run_load`` keeps ``concurrency`` requests in flight until ``requests``
+have completed and reports throughput, time to first token and latency
+percentiles and errors. ``LoadBaseline`` stores these reports in a JSON
+file and fails a run whose metrics regressed beyond a tolerance.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Union
+
+from anthropic_client.telemetry import Histogram
+
+# Metrics compared against the baseline, and whether higher is better
+COMPARED_METRICS = {
+    "throughput": True,
+    "ttft_p50": False,
+    "ttft_p99": False,
+    "latency_p50": False,
+    "latency_p99": False,
+}
+
+# Differences smaller than this many seconds (or requests per second) are noise
+ABSOLUTE_SLACK = 0.002
+
+
+class LoadReport:
+    """Throughput, percentiles and errors of one load run."""
+
+    def __init__(self, requests: int, concurrency: int, elapsed: float, ttft: Histogram, latency: Histogram, errors: int) -> None:
+        self.requests = requests
+        self.concurrency = concurrency
+        self.elapsed = elapsed
+        self.ttft = ttft
+        self.latency = latency
+        self.errors = errors
+
+    @property
+    def throughput(self) -> float:
+        """Completed requests per second."""
+        return (self.requests - self.errors) / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "concurrency": self.concurrency,
+            "errors": self.errors,
+            "throughput": self.throughput,
+            "ttft_p50": self.ttft.percentile(0.5),
+            "ttft_p99": self.ttft.percentile(0.99),
+            "latency_p50": self.latency.percentile(0.5),
+            "latency_p99": self.latency.percentile(0.99),
+        }
+
+
+def run_load(
+    send: Callable[[int], Union[str, Iterator[str]]],
+    requests: int,
+    concurrency: int
+) -> LoadReport:
+    """Send ``requests`` requests with ``concurrency`` in flight at a time.
+
+    Args:
+        send: Performs request ``i`` and returns its text or an iterator of chunks
+        requests: Total requests to send
+        concurrency: Requests in flight at once
+
+    Returns:
+        The run's report; TTFT is the time to the first chunk of a stream
+        and equals the latency for complete responses
+    """
+    ttft, latency = Histogram(), Histogram()
+    errors = 0
+    lock = threading.Lock()
+
+    def one(i: int) -> None:
+        nonlocal errors
+        started = time.perf_counter()
+        first = None
+        try:
+            response = send(i)
+            if not isinstance(response, str):
+                for _ in response:
+                    if first is None:
+                        first = time.perf_counter()
+        except Exception:
+            with lock:
+                errors += 1
+            return
+        finished = time.perf_counter()
+        with lock:
+            ttft.record((first or finished) - started)
+            latency.record(finished - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    return LoadReport(requests, concurrency, time.perf_counter() - started, ttft, latency, errors)
+
+
+class LoadBaseline:
+    """Load reports stored per benchmark in a JSON file."""
+
+    def __init__(self, path: Optional[Union[str, Path]], tolerance: float = 0.25, save: bool = False) -> None:
+        """Initialize the baseline.
+
+        Args:
+            path: JSON baseline file; None records nothing and compares nothing
+            tolerance: Allowed relative regression of each compared metric
+            save: Write this run's reports to the file instead of comparing
+        """
+        self.path = Path(path) if path else None
+        self.tolerance = tolerance
+        self.save = save
+        self.reports: Dict[str, Dict[str, float]] = {}
+        if self.path and self.path.exists():
+            self.reports = json.loads(self.path.read_text(encoding="utf-8"))
+
+    def regressions(self, name: str, report: LoadReport) -> List[str]:
+        """Compare a report with the stored one, recording it when saving.
+
+        Returns:
+            A description of each metric that regressed beyond the tolerance
+        """
+        current = report.to_dict()
+        if self.save:
+            self.reports[name] = current
+            return []
+        stored = self.reports.get(name)
+        if not self.path or stored is None:
+            return []
+        found = []
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            before, after = stored[metric], current[metric]
+            worse = before - after if higher_is_better else after - before
+            if worse > ABSOLUTE_SLACK and worse > self.tolerance * before:
+                found.append(f"{metric} regressed from {before:.4f} to {after:.4f}")
+        return found
+
+    def write(self) -> None:
+        """Write the recorded reports, if saving."""
+        if self.save and self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.reports, indent=2, sort_keys=True) + "\n", encoding="utf-8")
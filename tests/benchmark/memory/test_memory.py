@@ -0,0 +1,121 @@
+"""Memory benchmarks: per-request retention and streaming peaks.
+
+Requests run against the offline mock API under ``tracemalloc``. Memory
+still held after many requests (beyond a warm-up that fills pools and
+caches) points to a leak; the peak while streaming a long answer shows
+whether chunks are buffered.
+"""
+
+import gc
+import logging
+import tracemalloc
+
+import pytest
+
+from anthropic_client.client import AnthropicClient, ModelName
+from anthropic_client.multi_provider_client import MultiProviderClient
+from anthropic_client.openai_transport import OpenAITransport
+
+WARMUP = 20
+REQUESTS = 50
+
+# Retained bytes per request above which a client path is considered leaking
+MAX_RETAINED_PER_REQUEST = 512
+
+TRACEBACK_FRAMES = 30
+RETENTION_FILTERS = [
+    tracemalloc.Filter(True, "*/anthropic_client/*", all_frames=True),
+    tracemalloc.Filter(False, "*/anthropic/_utils/_transform.py", all_frames=True),
+    tracemalloc.Filter(False, "*/re/*", all_frames=True),
+]
+
+
+def retained_per_request(send, requests=REQUESTS):
+    """Return the bytes allocated under ``anthropic_client`` and still held, per request.
+
+    Allocations by the mock server's threads, the SDK's bounded type caches
+    and the ``re`` module's pattern cache are not leaks and are left out.
+    Info logging is disabled, since pytest keeps every captured log record.
+    """
+    for i in range(WARMUP):
+        drain(send(i))
+    gc.collect()
+    logging.disable(logging.INFO)
+    tracemalloc.start(TRACEBACK_FRAMES)
+    try:
+        before = tracemalloc.take_snapshot().filter_traces(RETENTION_FILTERS)
+        for i in range(requests):
+            drain(send(i))
+        gc.collect()
+        after = tracemalloc.take_snapshot().filter_traces(RETENTION_FILTERS)
+    finally:
+        tracemalloc.stop()
+        logging.disable(logging.NOTSET)
+    retained = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return max(0, retained) / requests
+
+
+def streaming_peak(send):
+    """Return the peak bytes allocated while consuming one streamed response."""
+    drain(send(0))
+    gc.collect()
+    tracemalloc.start()
+    try:
+        drain(send(1))
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def drain(response):
+    if not isinstance(response, str):
+        for _ in response:
+            pass
+
+
+@pytest.mark.parametrize("stream", [False, True], ids=["complete", "stream"])
+def test_anthropic_client_retention(benchmark, mock_api, stream):
+    """AnthropicClient keeps no per-request state."""
+    client = AnthropicClient(base_url=mock_api().url)
+    retained = benchmark.pedantic(
+        retained_per_request,
+        args=(lambda i: client.get_response(f"prompt {i}", stream=stream, model=ModelName.HAIKU),),
+        rounds=1,
+        iterations=1
+    )
+    benchmark.extra_info["retained_bytes_per_request"] = retained
+    assert retained < MAX_RETAINED_PER_REQUEST
+
+
+@pytest.mark.parametrize("provider", ["anthropic", "openai"])
+def test_multi_provider_client_retention(benchmark, mock_api, monkeypatch, provider):
+    """MultiProviderClient keeps no per-request state on either provider path."""
+    server = mock_api()
+    monkeypatch.setenv("ANTHROPIC_BASE_URL", server.url)
+    client = MultiProviderClient()
+    client.openai_transport = OpenAITransport("mock-key", base_url=server.openai_url)
+    model = ModelName.HAIKU if provider == "anthropic" else "gpt-4o"
+    retained = benchmark.pedantic(
+        retained_per_request,
+        args=(lambda i: client.get_response(f"prompt {i}", model=model, stream=True),),
+        rounds=1,
+        iterations=1
+    )
+    benchmark.extra_info["retained_bytes_per_request"] = retained
+    assert retained < MAX_RETAINED_PER_REQUEST
+
+
+def test_streaming_peak_does_not_grow_with_answer_length(benchmark, mock_api):
+    """A streamed answer 16 times longer does not need 16 times the memory."""
+    short = AnthropicClient(base_url=mock_api(chunks=256).url)
+    long = AnthropicClient(base_url=mock_api(chunks=4096).url)
+
+    def peaks():
+        return (
+            streaming_peak(lambda i: short.get_response(f"prompt {i}", stream=True, model=ModelName.HAIKU)),
+            streaming_peak(lambda i: long.get_response(f"prompt {i}", stream=True, model=ModelName.HAIKU)),
+        )
+
+    short_peak, long_peak = benchmark.pedantic(peaks, rounds=1, iterations=1)
+    benchmark.extra_info.update(short_peak_bytes=short_peak, long_peak_bytes=long_peak)
+    assert long_peak < 4 * short_peak
@@ -0,0 +1,326 @@
+"""
+Offline mock of the Anthropic and OpenAI HTTP APIs for load benchmarks.
+
+Serves ``/v1/messages`` (complete and server-sent-event streams),
+``/v1/chat/completions`` and ``/v1/responses`` from a local threaded HTTP
+server. ``MockBehavior`` controls the time to first byte, the number and
+cadence of streamed chunks, injected errors and a requests-per-minute limit
+answered with 429s and rate-limit headers, so client paths can be measured
+under realistic conditions without a network or an API key.
+
+Run standalone to point a client or the CLI at it by hand:
+
+    python tests/benchmark/mock_server.py --port 8765 --chunk-interval 0.01
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8765 claudethink "Hello"
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+class MockBehavior:
+    """How the mock server answers requests."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        chunks: int = 16,
+        chunk_text: str = "token ",
+        chunk_interval: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 529,
+        requests_per_minute: Optional[float] = None,
+        seed: Optional[int] = None
+    ) -> None:
+        """Initialize the behavior.
+
+        Args:
+            latency: Seconds before the response headers (the time to first byte)
+            chunks: Text chunks per response
+            chunk_text: Text of each chunk
+            chunk_interval: Seconds between streamed chunks
+            error_rate: Fraction of requests answered with ``error_status``
+            error_status: Status code of injected errors
+            requests_per_minute: Request budget; requests beyond it get a 429
+            seed: Seed for error injection, for reproducible runs
+        """
+        self.latency = latency
+        self.chunks = chunks
+        self.chunk_text = chunk_text
+        self.chunk_interval = chunk_interval
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests_per_minute = requests_per_minute
+        self.random = random.Random(seed)
+
+    @property
+    def text(self) -> str:
+        """The complete text of a response."""
+        return self.chunk_text * self.chunks
+
+
+class MockStats:
+    """Counts of what the mock server answered."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+class _RequestBudget:
+    """A token bucket over a requests-per-minute limit."""
+
+    def __init__(self, per_minute: float) -> None:
+        self.per_minute = per_minute
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> Tuple[bool, float]:
+        """Take one request; return whether it is admitted and the requests remaining."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.per_minute, self.tokens + (now - self.updated) * self.per_minute / 60)
+            self.updated = now
+            if self.tokens < 1:
+                return False, 0
+            self.tokens -= 1
+            return True, self.tokens
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # client's delayed ACK adds about 40 ms to every complete response
+    disable_nagle_algorithm = True
+    server: "MockAPIServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        behavior, stats = self.server.behavior, self.server.stats
+        stats.count("requests")
+        headers = {}
+        budget = self.server.budget
+        if budget is not None:
+            admitted, remaining = budget.take()
+            headers = {
+                "anthropic-ratelimit-requests-limit": str(int(budget.per_minute)),
+                "anthropic-ratelimit-requests-remaining": str(int(remaining)),
+            }
+            if not admitted:
+                stats.count("rate_limited")
+                self._send_json({"type": "error", "error": {"type": "rate_limit_error", "message": "rate limited"}},
+                                429, dict(headers, **{"retry-after": "1"}))
+                return
+        if behavior.error_rate and behavior.random.random() < behavior.error_rate:
+            stats.count("errors")
+            self._send_json({"type": "error", "error": {"type": "overloaded_error", "message": "injected"}},
+                            behavior.error_status, headers)
+            return
+        if behavior.latency:
+            time.sleep(behavior.latency)
+        path = self.path.split("?", 1)[0]
+        if path.endswith("/messages"):
+            events, complete = _anthropic_events(body, behavior), _anthropic_message(body, behavior)
+        elif path.endswith("/chat/completions"):
+            events, complete = _chat_events(body, behavior), _chat_completion(body, behavior)
+        elif path.endswith("/responses"):
+            events, complete = _responses_events(body, behavior), _responses_body(body, behavior)
+        else:
+            self._send_json({"error": {"message": f"unknown endpoint {self.path}"}}, 404, headers)
+            return
+        if body.get("stream"):
+            self._send_stream(events, headers)
+        else:
+            self._send_json(complete, 200, headers)
+
+    def _send_json(self, payload: Dict[str, Any], status: int, headers: Dict[str, str]) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, events: Iterator[Tuple[Optional[str], Any]], headers: Dict[str, str]) -> None:
+        interval = self.server.behavior.chunk_interval
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.close_connection = True
+        for name, data in events:
+            if interval and _is_chunk(data):
+                time.sleep(interval)
+            frame = f"event: {name}\n" if name else ""
+            payload = data if isinstance(data, str) else json.dumps(data)
+            self.wfile.write(f"{frame}data: {payload}\n\n".encode())
+            self.wfile.flush()
+
+
+def _is_chunk(data: Any) -> bool:
+    """Whether an event carries a text chunk, so the chunk cadence applies before it."""
+    if not isinstance(data, dict):
+        return False
+    return data.get("type") in ("content_block_delta", "response.output_text.delta") or bool(
+        data.get("choices") and data["choices"][0].get("delta")
+    )
+
+
+def _anthropic_message(body: Dict[str, Any], behavior: MockBehavior) -> Dict[str, Any]:
+    return {
+        "id": "msg_mock",
+        "type": "message",
+        "role": "assistant",
+        "model": body.get("model", "mock"),
+        "content": [{"type": "text", "text": behavior.text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": _input_tokens(body), "output_tokens": behavior.chunks},
+    }
+
+
+def _anthropic_events(body: Dict[str, Any], behavior: MockBehavior) -> Iterator[Tuple[Optional[str], Any]]:
+    message = dict(_anthropic_message(body, behavior), content=[], stop_reason=None)
+    message["usage"] = {"input_tokens": _input_tokens(body), "output_tokens": 1}
+    yield "message_start", {"type": "message_start", "message": message}
+    yield "content_block_start", {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}}
+    for _ in range(behavior.chunks):
+        yield "content_block_delta", {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": behavior.chunk_text}}
+    yield "content_block_stop", {"type": "content_block_stop", "index": 0}
+    yield "message_delta", {
+        "type": "message_delta",
+        "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+        "usage": {"output_tokens": behavior.chunks},
+    }
+    yield "message_stop", {"type": "message_stop"}
+
+
+def _chat_completion(body: Dict[str, Any], behavior: MockBehavior) -> Dict[str, Any]:
+    return {
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": behavior.text}}],
+        "usage": {"prompt_tokens": _input_tokens(body), "completion_tokens": behavior.chunks},
+    }
+
+
+def _chat_events(body: Dict[str, Any], behavior: MockBehavior) -> Iterator[Tuple[Optional[str], Any]]:
+    for _ in range(behavior.chunks):
+        yield None, {"choices": [{"index": 0, "delta": {"content": behavior.chunk_text}}]}
+    yield None, {"choices": [], "usage": _chat_completion(body, behavior)["usage"]}
+    yield None, "[DONE]"
+
+
+def _responses_body(body: Dict[str, Any], behavior: MockBehavior) -> Dict[str, Any]:
+    return {
+        "output": [{"type": "message", "content": [{"type": "output_text", "text": behavior.text}]}],
+        "usage": {"input_tokens": _input_tokens(body), "output_tokens": behavior.chunks},
+    }
+
+
+def _responses_events(body: Dict[str, Any], behavior: MockBehavior) -> Iterator[Tuple[Optional[str], Any]]:
+    for _ in range(behavior.chunks):
+        yield "response.output_text.delta", {"type": "response.output_text.delta", "delta": behavior.chunk_text}
+    yield "response.completed", {"type": "response.completed", "response": _responses_body(body, behavior)}
+
+
+def _input_tokens(body: Dict[str, Any]) -> int:
+    """Approximate input tokens at 4 characters per token, as the clients estimate them."""
+    return max(1, len(json.dumps(body.get("messages") or body.get("input") or "")) // 4)
+
+
+class MockAPIServer(ThreadingHTTPServer):
+    """A local mock API server running on a background thread."""
+
+    daemon_threads = True
+
+    def __init__(self, behavior: Optional[MockBehavior] = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Bind the server; call ``start`` to serve.
+
+        Args:
+            behavior: How requests are answered (defaults to instant 16-chunk answers)
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+        """
+        super().__init__((host, port), _MockHandler)
+        self.behavior = behavior or MockBehavior()
+        self.stats = MockStats()
+        self.budget = _RequestBudget(self.behavior.requests_per_minute) if self.behavior.requests_per_minute else None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server, as the Anthropic SDK expects it."""
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    @property
+    def openai_url(self) -> str:
+        """Base URL of the OpenAI endpoints."""
+        return f"{self.url}/v1"
+
+    def start(self) -> "MockAPIServer":
+        """Serve on a daemon thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "MockAPIServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline mock of the Anthropic and OpenAI APIs")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before the response headers")
+    parser.add_argument("--chunks", type=int, default=16, help="Text chunks per response")
+    parser.add_argument("--chunk-interval", type=float, default=0.0, help="Seconds between streamed chunks")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with an error")
+    parser.add_argument("--error-status", type=int, default=529)
+    parser.add_argument("--requests-per-minute", type=float, help="Request budget before 429s")
+    args = parser.parse_args()
+    behavior = MockBehavior(
+        latency=args.latency,
+        chunks=args.chunks,
+        chunk_interval=args.chunk_interval,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        requests_per_minute=args.requests_per_minute,
+    )
+    server = MockAPIServer(behavior, port=args.port)
+    print(f"Mock API listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
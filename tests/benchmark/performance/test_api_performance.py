@@ -13,20 +13,16 @@ def create_client():
     return Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY", "dummy_key_for_testing"))
 
 @pytest.fixture
-def client():
-    """Create an Anthropic client for testing."""
-    return create_client()
+def client(mock_api):
+    """Create an Anthropic client talking to the offline mock API."""
+    return Anthropic(api_key="mock-key", base_url=mock_api().url)
 
 def test_client_initialization(benchmark):
     """Benchmark client initialization time."""
     benchmark(create_client)
 
 def test_message_completion(benchmark, client):
-    """Benchmark message completion time."""
-    # Skip this test if no API key is provided
-    if os.environ.get("ANTHROPIC_API_KEY") is None:
-        pytest.skip("No API key provided, skipping test_message_completion")
-        
+    """Benchmark message completion time against the mock API."""
     def run_completion():
         return client.messages.create(
             model="claude-3-opus-20240229",
@@ -0,0 +1,55 @@
+"""Startup benchmarks for the claudethink CLI module."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative import time budget for anthropic_client.cli, in microseconds.
+# Override with CLI_IMPORT_BUDGET_US on slow CI machines.
+IMPORT_BUDGET_US = int(os.environ.get("CLI_IMPORT_BUDGET_US", "150000"))
+
+# Provider SDKs that must stay out of the CLI's startup path.
+LAZY_MODULES = ("anthropic", "openai", "openai_agents", "httpx", "certifi")
+
+
+def import_profile(module):
+    """Import a module in a fresh interpreter under ``-X importtime``.
+
+    Returns:
+        A dict mapping each imported module name to its cumulative
+        import time in microseconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+@pytest.fixture
+def cli_profile(benchmark):
+    """Profile one cold import of the CLI module."""
+    return benchmark.pedantic(
+        import_profile, args=("anthropic_client.cli",), rounds=1, iterations=1
+    )
+
+
+def test_cli_import_within_budget(cli_profile):
+    """The CLI module imports within the startup budget."""
+    assert cli_profile["anthropic_client.cli"] <= IMPORT_BUDGET_US
+
+
+def test_cli_import_skips_provider_sdks(cli_profile):
+    """Provider SDKs are loaded on first client use, not at CLI import."""
+    loaded = [name for name in LAZY_MODULES if name in cli_profile]
+    assert loaded == []
@@ -0,0 +1,111 @@
+"""Load benchmarks for every client path against the offline mock API.
+
+Each benchmark keeps a fixed number of requests in flight against
+``mock_server.MockAPIServer`` and records throughput and TTFT/latency
+percentiles in the benchmark's ``extra_info``. Runs are compared with the
+stored load baseline (see ``--load-baseline``) and fail on regressions.
+"""
+
+import importlib.util
+import io
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import pytest
+
+from anthropic_client.client import AnthropicClient, ModelName
+from anthropic_client.multi_provider_client import MultiProviderClient
+from anthropic_client.openai_transport import OpenAITransport
+from load import run_load
+
+PYTHON_CLI = Path(__file__).parents[3] / "src" / "mojo" / "anthropic_client_mojo" / "python_cli.py"
+
+REQUESTS = 64
+CONCURRENCY = (1, 8, 32)
+
+# Chunk cadence of a fast model: 16 chunks, 1 ms apart, after 5 ms to first byte
+BEHAVIOR = {"latency": 0.005, "chunks": 16, "chunk_interval": 0.001}
+
+
+def measure(benchmark, load_baseline, name, send, concurrency, requests=REQUESTS, max_errors=0):
+    """Benchmark one load run and compare it with the baseline."""
+    report = benchmark.pedantic(run_load, args=(send, requests, concurrency), rounds=3, iterations=1)
+    benchmark.extra_info.update(report.to_dict())
+    assert report.errors <= max_errors
+    regressions = load_baseline.regressions(name, report)
+    assert not regressions, f"{name}: " + "; ".join(regressions)
+    return report
+
+
+@pytest.mark.parametrize("stream", [False, True], ids=["complete", "stream"])
+@pytest.mark.parametrize("concurrency", CONCURRENCY)
+def test_anthropic_client_load(benchmark, load_baseline, mock_api, concurrency, stream):
+    """Benchmark AnthropicClient against the mock Messages API."""
+    server = mock_api(**BEHAVIOR)
+    client = AnthropicClient(base_url=server.url)
+
+    def send(i):
+        return client.get_response(f"prompt {i}", stream=stream, model=ModelName.HAIKU)
+
+    measure(benchmark, load_baseline, f"anthropic_client-{'stream' if stream else 'complete'}-{concurrency}", send, concurrency)
+
+
+def test_anthropic_client_load_with_injected_errors(benchmark, load_baseline, mock_api):
+    """Benchmark AnthropicClient when 10% of requests fail with 529 and are retried by the SDK."""
+    server = mock_api(error_rate=0.1, seed=7, **BEHAVIOR)
+    client = AnthropicClient(base_url=server.url)
+
+    def send(i):
+        return client.get_response(f"prompt {i}", stream=True, model=ModelName.HAIKU)
+
+    measure(benchmark, load_baseline, "anthropic_client-stream-errors-8", send, 8, max_errors=REQUESTS // 20)
+    assert server.stats.errors > 0
+
+
+@pytest.mark.parametrize("provider", ["anthropic", "openai-chat", "openai-responses"])
+@pytest.mark.parametrize("concurrency", CONCURRENCY)
+def test_multi_provider_client_load(benchmark, load_baseline, mock_api, monkeypatch, concurrency, provider):
+    """Benchmark streamed MultiProviderClient requests for each provider path."""
+    server = mock_api(**BEHAVIOR)
+    monkeypatch.setenv("ANTHROPIC_BASE_URL", server.url)
+    client = MultiProviderClient()
+    client.openai_transport = OpenAITransport("mock-key", base_url=server.openai_url)
+    if provider == "anthropic":
+        model, config = ModelName.HAIKU, None
+    else:
+        model = "gpt-4o"
+        config = {"endpoint": f"{server.openai_url}/responses"} if provider == "openai-responses" else None
+
+    def send(i):
+        if config:
+            return client._get_openai_response(f"prompt {i}", config, model=model, stream=True)
+        return client.get_response(f"prompt {i}", model=model, stream=True)
+
+    measure(benchmark, load_baseline, f"multi_provider_client-{provider}-{concurrency}", send, concurrency)
+
+
+@pytest.fixture(scope="module")
+def python_cli():
+    """Import the Mojo wrapper's Python CLI from its source path."""
+    spec = importlib.util.spec_from_file_location("python_cli", PYTHON_CLI)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_python_cli_load(benchmark, load_baseline, mock_api, monkeypatch, python_cli):
+    """Benchmark sequential python_cli.run_cli invocations streaming to stdout."""
+    server = mock_api(**BEHAVIOR)
+    monkeypatch.setenv("ANTHROPIC_BASE_URL", server.url)
+    monkeypatch.setattr(sys, "stderr", io.StringIO())
+    parser = python_cli.create_parser()
+
+    def send(i):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            python_cli.run_cli(parser.parse_args(["--stream", "--model", ModelName.HAIKU.value, f"prompt {i}"]))
+        return out.getvalue()
+
+    measure(benchmark, load_baseline, "python_cli-stream-1", send, 1, requests=16)
+    assert server.stats.requests % 16 == 0
@@ -0,0 +1,46 @@
+"""Client-side overhead benchmarks replayed from a cassette.
+
+Responses are recorded once from the mock API and then replayed as fast as
+possible, so the timings cover only the client: request building, the SDK,
+stream decoding and telemetry, with no sockets or server threads.
+"""
+
+import pytest
+
+from anthropic_client.cassette import Cassette
+from anthropic_client.client import AnthropicClient, ModelName
+from anthropic_client.transport import use_cassette
+
+
+@pytest.fixture
+def replayed_client(mock_api, tmp_path):
+    """Return a factory recording one streamed and one complete answer, then replaying them."""
+
+    def build(chunks):
+        path = tmp_path / f"replay-{chunks}.cassette"
+        server = mock_api(chunks=chunks)
+        use_cassette(Cassette(path, mode="record"))
+        for stream in (False, True):
+            answer = AnthropicClient(base_url=server.url).get_response("prompt", stream=stream, model=ModelName.HAIKU)
+            if stream:
+                list(answer)
+        use_cassette(Cassette(path, mode="replay"))
+        return AnthropicClient(base_url=server.url)
+
+    yield build
+    use_cassette(None)
+
+
+def test_replayed_complete_overhead(benchmark, replayed_client):
+    """Benchmark a complete AnthropicClient request without the network."""
+    client = replayed_client(16)
+    text = benchmark(client.get_response, "prompt", stream=False, model=ModelName.HAIKU)
+    assert "token" in text
+
+
+@pytest.mark.parametrize("chunks", [16, 256])
+def test_replayed_stream_overhead(benchmark, replayed_client, chunks):
+    """Benchmark decoding a streamed AnthropicClient answer without the network."""
+    client = replayed_client(chunks)
+    text = benchmark(lambda: "".join(client.get_response("prompt", stream=True, model=ModelName.HAIKU)))
+    assert text.count("token") == chunks
@@ -0,0 +1,29 @@
+"""Overhead benchmarks for request telemetry."""
+
+from anthropic_client.events import Usage
+from anthropic_client.telemetry import Telemetry, note_usage
+
+USAGE = Usage(input_tokens=100, output_tokens=400)
+
+
+def send():
+    """A request that finishes instantly, reporting its usage."""
+    note_usage(USAGE, thinking_chars=800)
+    return "done"
+
+
+def test_measured_request_overhead(benchmark):
+    """Benchmark the cost telemetry adds to a complete request."""
+    telemetry = Telemetry()
+    benchmark(telemetry.measure, "anthropic", "claude-3-7-sonnet-20250219", False, send)
+    if not benchmark.disabled:
+        assert benchmark.stats.stats.median < 50e-6
+
+
+def test_measured_stream_overhead(benchmark):
+    """Benchmark the cost telemetry adds to a 100-chunk stream."""
+    telemetry = Telemetry()
+    chunks = ["x"] * 100
+    benchmark(lambda: list(telemetry.measure("anthropic", "claude-3-7-sonnet-20250219", True, lambda: iter(chunks))))
+    if not benchmark.disabled:
+        assert benchmark.stats.stats.median < 500e-6
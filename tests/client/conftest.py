@@ -0,0 +1,30 @@
+import os
+import threading
+from http.server import ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def mock_env_setup():
+    """Set up test environment variables."""
+    with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-api-key-for-testing"}):
+        yield
+
+
+@pytest.fixture
+def stub_server():
+    """Start a local HTTP server for a handler class and return its base URL."""
+    servers = []
+
+    def start(handler_class):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,39 @@
+"""Helpers for local stub API servers used by the client tests."""
+
+import json
+from http.server import BaseHTTPRequestHandler
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Base handler for local stub API servers; subclasses implement ``respond``."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def send_json(self, payload, status=200, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def message_body(text, model="claude-3-7-sonnet-20250219"):
+    """Return a minimal Messages API response body."""
+    return {
+        "id": "msg_stub",
+        "type": "message",
+        "role": "assistant",
+        "model": model,
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": 1, "output_tokens": 1},
+    }
@@ -0,0 +1,58 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from anthropic_client.client import AsyncAnthropicClient
+from anthropic_client.telemetry import Telemetry
+from .stubs import StubHandler, message_body
+
+
+class EchoHandler(StubHandler):
+    """Answers each message after a short delay, tracking peak concurrency."""
+
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def do_POST(self):
+        request = self.read_json()
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.peak = max(cls.peak, cls.in_flight)
+        time.sleep(0.05)
+        with cls.lock:
+            cls.in_flight -= 1
+        prompt = request["messages"][-1]["content"]
+        self.send_json(message_body(f"echo: {prompt}"))
+
+
+def test_gather_responses_preserves_order_and_bounds_concurrency(stub_server):
+    base_url = stub_server(EchoHandler)
+    client = AsyncAnthropicClient(base_url=base_url)
+    prompts = [f"prompt {i}" for i in range(12)]
+
+    responses = asyncio.run(client.gather_responses(prompts, max_concurrency=4))
+
+    assert responses == [f"echo: {prompt}" for prompt in prompts]
+    assert 1 < EchoHandler.peak <= 4
+
+
+def test_async_requests_are_measured(stub_server):
+    telemetry = Telemetry()
+    client = AsyncAnthropicClient(base_url=stub_server(EchoHandler), telemetry=telemetry)
+
+    asyncio.run(client.gather_responses(["a", "b", "c"]))
+
+    stats = telemetry.snapshot()["anthropic/claude-3-7-sonnet-20250219"]
+    assert stats["requests"] == 3
+    assert (stats["input_tokens"], stats["output_tokens"]) == (3, 3)
+    assert stats["latency_seconds"]["count"] == 3
+
+
+def test_gather_responses_rejects_invalid_concurrency():
+    client = AsyncAnthropicClient()
+    with pytest.raises(ValueError):
+        asyncio.run(client.gather_responses(["hi"], max_concurrency=0))
@@ -0,0 +1,123 @@
+import itertools
+import json
+import os
+from unittest.mock import patch
+
+import anthropic
+import pytest
+
+from anthropic_client.batch import BatchScheduler
+from anthropic_client.multi_provider_client import MultiProviderClient
+from .stubs import StubHandler, message_body
+
+
+class FakeBatchHandler(StubHandler):
+    """In-memory Message Batches API; each job ends after two status polls."""
+
+    ids = itertools.count(1)
+    jobs = {}
+    betas = []
+
+    def batch_body(self, batch_id):
+        job = self.jobs[batch_id]
+        ended = job["polls"] >= 2
+        host = f"http://{self.headers['Host']}"
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {"processing": 0, "succeeded": 0, "errored": 0, "canceled": 0, "expired": 0},
+            "created_at": "2025-03-01T00:00:00Z",
+            "expires_at": "2025-03-02T00:00:00Z",
+            "ended_at": "2025-03-01T00:01:00Z" if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"{host}/v1/messages/batches/{batch_id}/results" if ended else None,
+        }
+
+    def do_POST(self):
+        batch_id = f"msgbatch_{next(self.ids)}"
+        self.betas.append(self.headers.get("anthropic-beta"))
+        self.jobs[batch_id] = {"requests": self.read_json()["requests"], "polls": 0}
+        self.send_json(self.batch_body(batch_id))
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        batch_id = parts[3]
+        if parts[-1] == "results":
+            lines = [
+                json.dumps({
+                    "custom_id": request["custom_id"],
+                    "result": {
+                        "type": "succeeded",
+                        "message": message_body(f"answer to {request['params']['messages'][-1]['content']}"),
+                    },
+                })
+                for request in self.jobs[batch_id]["requests"]
+            ]
+            body = "\n".join(lines).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/binary")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        self.jobs[batch_id]["polls"] += 1
+        self.send_json(self.batch_body(batch_id))
+
+
+@pytest.fixture(autouse=True)
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(BatchScheduler, "INITIAL_POLL_INTERVAL", 0.01)
+    FakeBatchHandler.jobs.clear()
+    FakeBatchHandler.betas.clear()
+
+
+def test_submit_and_collect_through_multi_provider_client(stub_server, tmp_path):
+    base_url = stub_server(FakeBatchHandler)
+    with patch.dict(os.environ, {"ANTHROPIC_BASE_URL": base_url}):
+        client = MultiProviderClient(batch_manifest_dir=tmp_path)
+    prompts = ["one", "two", "three"]
+
+    batch_id = client.submit_batch(prompts, temperature=0.0)
+    results = {result.custom_id: result.text for result in client.collect_batch(batch_id, timeout=10)}
+
+    assert results == {f"prompt-{i}": f"answer to {prompt}" for i, prompt in enumerate(prompts)}
+    sent = next(iter(FakeBatchHandler.jobs.values()))["requests"][0]["params"]
+    assert "betas" not in sent
+
+
+def test_submitted_batch_keeps_the_extended_output_beta(stub_server, tmp_path):
+    base_url = stub_server(FakeBatchHandler)
+    with patch.dict(os.environ, {"ANTHROPIC_BASE_URL": base_url}):
+        client = MultiProviderClient(batch_manifest_dir=tmp_path)
+    # A long prompt gets a thinking budget, and so an output limit, past 64k tokens
+    client.submit_batch(["one", "word " * 16000])
+
+    params = [request["params"] for request in next(iter(FakeBatchHandler.jobs.values()))["requests"]]
+    assert not any("betas" in p for p in params)
+    # Outputs above the non-beta limit are only valid with the beta on the job
+    assert params[1]["max_tokens"] > 64000
+    assert "output-128k-2025-02-19" in FakeBatchHandler.betas[0].split(",")
+
+
+def test_collect_resumes_from_manifest(stub_server, tmp_path):
+    client = anthropic.Anthropic(api_key="test", base_url=stub_server(FakeBatchHandler))
+    scheduler = BatchScheduler(client, manifest_dir=tmp_path, max_requests_per_job=2)
+    requests = [
+        {"model": "claude-3-5-haiku-20241022", "max_tokens": 16, "messages": [{"role": "user", "content": str(i)}]}
+        for i in range(5)
+    ]
+    batch_id = scheduler.submit(requests)
+    assert len(FakeBatchHandler.jobs) == 3
+
+    first_run = scheduler.collect(batch_id, timeout=10)
+    before_crash = [next(first_run).custom_id for _ in range(3)]
+    first_run.close()  # simulated crash part-way through the second job
+
+    resumed = BatchScheduler(client, manifest_dir=tmp_path)
+    after_restart = [result.custom_id for result in resumed.collect(batch_id, timeout=10)]
+
+    assert set(before_crash) | set(after_restart) == {f"prompt-{i}" for i in range(5)}
+    # The finished job is not redelivered; the interrupted one is
+    assert len(after_restart) == 3
@@ -0,0 +1,55 @@
+import time
+from unittest.mock import MagicMock
+
+from anthropic.types import RawContentBlockDeltaEvent, TextDelta
+
+from anthropic_client.cache import ResponseCache, request_fingerprint
+from anthropic_client.client import AnthropicClient
+
+
+def test_fingerprint_ignores_key_order_and_transport_options():
+    params = {"model": "m", "messages": [{"role": "user", "content": "hi"}], "temperature": 0.0}
+    reordered = {"temperature": 0.0, "stream": True, "messages": params["messages"], "model": "m"}
+    assert request_fingerprint(params) == request_fingerprint(reordered)
+    assert request_fingerprint(params) != request_fingerprint({**params, "temperature": 1.0})
+
+
+def test_disk_tier_survives_restart_and_expires(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    cache = ResponseCache(path=path, ttl=60)
+    cache.put("key", ["Hello", ", world"], streamed=True)
+    cache.close()
+
+    reopened = ResponseCache(path=path, ttl=60)
+    entry = reopened.get("key")
+    assert list(entry.replay()) == ["Hello", ", world"]
+    assert reopened.stats()["disk_hits"] == 1
+
+    reopened.ttl = 0
+    time.sleep(0.01)
+    assert reopened.get("key") is None
+    assert reopened.stats()["misses"] == 1
+
+
+def test_memory_tier_evicts_by_bytes():
+    cache = ResponseCache(max_memory_bytes=10)
+    cache.put("a", ["12345"])
+    cache.put("b", ["67890"])
+    cache.put("c", ["x"])
+    assert cache.get("a") is None
+    assert cache.get("c").text == "x"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_client_replays_cached_stream():
+    client = AnthropicClient(cache=ResponseCache())
+    client.client = MagicMock()
+    client.client.beta.messages.create.return_value = [
+        RawContentBlockDeltaEvent(type="content_block_delta", index=0, delta=TextDelta(type="text_delta", text="Hello")),
+        RawContentBlockDeltaEvent(type="content_block_delta", index=0, delta=TextDelta(type="text_delta", text=" there")),
+    ]
+
+    assert list(client.get_response("Hi", stream=True, temperature=0.0)) == ["Hello", " there"]
+    assert list(client.get_response("Hi", stream=True, temperature=0.0)) == ["Hello", " there"]
+    assert client.get_response("Hi", temperature=0.0) == "Hello there"
+    assert client.client.beta.messages.create.call_count == 1
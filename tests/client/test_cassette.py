@@ -0,0 +1,108 @@
+import json
+import time
+
+import httpx
+import pytest
+
+from anthropic_client.cassette import Cassette, CassetteMissError
+from anthropic_client.client import AnthropicClient
+from anthropic_client.openai_transport import OpenAITransport, chat_deltas
+from anthropic_client.transport import use_cassette
+from .stubs import StubHandler, message_body
+
+CHUNK_INTERVAL = 0.05
+
+
+class RecordedHandler(StubHandler):
+    """Serves Messages API answers and chat completions streamed with a pause between chunks."""
+
+    requests = 0
+
+    def do_POST(self):
+        body = self.read_json()
+        type(self).requests += 1
+        if self.path.startswith("/v1/messages"):
+            self.send_json(message_body(f"Answer {type(self).requests}"))
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for delta in ("Hel", "lo", f" {body['messages'][-1]['content']}"):
+            time.sleep(CHUNK_INTERVAL)
+            self.wfile.write(f"data: {json.dumps({'choices': [{'delta': {'content': delta}}]})}\n\n".encode())
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+
+
+@pytest.fixture
+def base_url(stub_server):
+    RecordedHandler.requests = 0
+    yield stub_server(RecordedHandler)
+    use_cassette(None)
+
+
+def stream(base_url, prompt):
+    transport = OpenAITransport("sk-test", base_url=base_url)
+    body = {"model": "gpt-4o", "messages": [{"role": "user", "content": prompt}]}
+    return list(chat_deltas(transport.stream("/chat/completions", body)))
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def test_replay_serves_recorded_streams_without_the_network(base_url, tmp_path):
+    path = tmp_path / "run.cassette"
+    use_cassette(Cassette(path, mode="record"))
+    recorded = stream(base_url, "one")
+    assert recorded == ["Hel", "lo", " one"]
+    assert RecordedHandler.requests == 1
+
+    use_cassette(Cassette(path, mode="replay"))
+    replayed, fast = timed(stream, base_url, "one")
+    assert replayed == recorded
+    assert RecordedHandler.requests == 1
+    assert fast < CHUNK_INTERVAL
+
+    use_cassette(Cassette(path, mode="replay", speed=1.0))
+    replayed, paced = timed(stream, base_url, "one")
+    assert replayed == recorded
+    assert paced >= 3 * CHUNK_INTERVAL * 0.9
+
+
+def test_identical_requests_replay_in_recorded_order(base_url, tmp_path):
+    path = tmp_path / "run.cassette"
+    use_cassette(Cassette(path, mode="record"))
+    recorded = [AnthropicClient(base_url=base_url).get_response("Hi") for _ in range(2)]
+    assert recorded == ["Answer 1", "Answer 2"]
+
+    cassette = Cassette(path, mode="replay")
+    assert len(cassette) == 2
+    use_cassette(cassette)
+    client = AnthropicClient(base_url="http://127.0.0.1:1")
+    assert [client.get_response("Hi") for _ in range(3)] == ["Answer 1", "Answer 2", "Answer 1"]
+    assert RecordedHandler.requests == 2
+
+
+def test_cassette_stores_no_request_headers(base_url, tmp_path):
+    path = tmp_path / "run.cassette"
+    use_cassette(Cassette(path, mode="record"))
+    AnthropicClient(base_url=base_url).get_response("Hi")
+    assert "test-api-key-for-testing" not in path.read_text()
+
+
+def test_unrecorded_request_raises(tmp_path):
+    path = tmp_path / "empty.cassette"
+    path.touch()
+    client = httpx.Client(transport=Cassette(path).transport())
+    with pytest.raises(CassetteMissError):
+        client.post("http://127.0.0.1:1/v1/messages", json={"prompt": "unseen"})
+
+
+def test_invalid_cassette_options_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        Cassette(tmp_path / "x", mode="rewind")
+    with pytest.raises(ValueError):
+        Cassette(tmp_path / "x", mode="record", speed=-1)
@@ -0,0 +1,115 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from anthropic_client.client import AnthropicClient
+from anthropic_client.coalesce import AsyncSingleFlight, SingleFlight
+from .stubs import StubHandler, message_body
+
+
+def test_concurrent_identical_calls_share_one_upstream_call():
+    group = SingleFlight()
+    calls = []
+
+    def upstream():
+        calls.append(1)
+        time.sleep(0.1)
+        return "answer"
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda _: group.do("key", upstream), range(8)))
+
+    assert results == ["answer"] * 8
+    assert len(calls) == 1
+    assert group.coalesced == 7
+    # Completed calls are not remembered
+    assert group.do("key", lambda: "fresh") == "fresh"
+
+
+def test_upstream_errors_reach_every_caller():
+    group = SingleFlight()
+    started = threading.Event()
+
+    def upstream():
+        started.set()
+        time.sleep(0.05)
+        raise ConnectionError("down")
+
+    with ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(group.do, "key", upstream)
+        started.wait()
+        follower = pool.submit(group.do, "key", upstream)
+        for future in (leader, follower):
+            with pytest.raises(ConnectionError):
+                future.result()
+
+
+def test_stream_is_fanned_out_to_every_consumer():
+    group = SingleFlight()
+    opened = []
+
+    def open_stream():
+        opened.append(1)
+        for chunk in ["a", "b", "c"]:
+            time.sleep(0.01)
+            yield chunk
+
+    first = group.stream("key", open_stream)
+    assert next(first) == "a"
+    late = group.stream("key", open_stream)
+
+    assert list(first) == ["b", "c"]
+    assert list(late) == ["a", "b", "c"]
+    assert len(opened) == 1
+
+
+def test_async_calls_and_streams_are_coalesced():
+    group = AsyncSingleFlight()
+    calls = []
+
+    async def upstream():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    async def open_stream():
+        calls.append(1)
+        for chunk in ["x", "y"]:
+            await asyncio.sleep(0.01)
+            yield chunk
+
+    async def collect():
+        return [chunk async for chunk in group.stream("stream", open_stream)]
+
+    async def main():
+        results = await asyncio.gather(*(group.do("key", upstream) for _ in range(5)))
+        streams = await asyncio.gather(*(collect() for _ in range(3)))
+        return results, streams
+
+    results, streams = asyncio.run(main())
+    assert results == ["answer"] * 5
+    assert streams == [["x", "y"]] * 3
+    assert len(calls) == 2
+
+
+class SlowHandler(StubHandler):
+    """Answers after a delay, counting upstream requests."""
+
+    requests = 0
+
+    def do_POST(self):
+        self.read_json()
+        type(self).requests += 1
+        time.sleep(0.1)
+        self.send_json(message_body("shared"))
+
+
+def test_client_coalesces_identical_requests(stub_server):
+    client = AnthropicClient(base_url=stub_server(SlowHandler), coalescer=SingleFlight())
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda _: client.get_response("calibrate"), range(4)))
+    assert results == ["shared"] * 4
+    assert SlowHandler.requests == 1
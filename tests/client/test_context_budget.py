@@ -0,0 +1,83 @@
+from types import SimpleNamespace as NS
+
+import pytest
+
+from anthropic_client.context_budget import ContextBudgeter, TokenEstimator
+from anthropic_client.multi_provider_client import MultiProviderClient
+
+SONNET = "claude-3-7-sonnet-20250219"
+
+
+def request(messages, model=SONNET, max_tokens=128000, thinking=120000):
+    params = {"model": model, "max_tokens": max_tokens, "messages": messages}
+    if thinking:
+        params["thinking"] = {"type": "enabled", "budget_tokens": thinking}
+    return params
+
+
+def conversation(exchanges, chars):
+    messages = []
+    for i in range(exchanges):
+        messages.append({"role": "user", "content": f"{i}" * chars})
+        messages.append({"role": "assistant", "content": "a" * chars})
+    messages.append({"role": "user", "content": "latest"})
+    return messages
+
+
+def test_short_prompt_gets_a_smaller_thinking_budget():
+    params = ContextBudgeter().fit(request([{"role": "user", "content": "hi"}]))
+    assert params["thinking"]["budget_tokens"] == 16000
+    # The answer allowance beyond the thinking budget is kept
+    assert params["max_tokens"] == 16000 + 8000
+
+
+def test_output_is_capped_to_the_model_limit():
+    params = ContextBudgeter().fit(request([{"role": "user", "content": "hi"}], "claude-3-5-haiku-20241022", thinking=None))
+    assert params["max_tokens"] == 8192
+
+
+def test_oldest_exchanges_are_dropped_to_fit_the_window():
+    budgeter = ContextBudgeter(thinking_floor=None)
+    messages = conversation(20, 40_000)  # about 400k tokens of history
+
+    params = budgeter.fit(request(messages))
+
+    kept = params["messages"]
+    assert kept[-1] == {"role": "user", "content": "latest"}
+    assert kept[0]["role"] == "user"
+    assert len(kept) < len(messages)
+    assert budgeter.dropped_turns == len(messages) - len(kept)
+    input_tokens = budgeter.estimator.estimate_request(params)
+    assert input_tokens + params["max_tokens"] <= 200_000
+    assert params["thinking"]["budget_tokens"] < params["max_tokens"]
+
+
+def test_dropped_turns_are_summarized_when_a_summarizer_is_given():
+    summaries = []
+
+    def summarize(turns):
+        summaries.append(len(turns))
+        return "we talked a lot"
+
+    params = ContextBudgeter(summarize=summarize).fit(request(conversation(20, 40_000)))
+    assert summaries and summaries[0] % 2 == 0
+    assert params["messages"][0]["content"].startswith("Summary of the earlier conversation:\nwe talked a lot")
+
+
+def test_oversized_prompt_is_rejected_locally():
+    with pytest.raises(ValueError):
+        ContextBudgeter().fit(request([{"role": "user", "content": "x" * 1_000_000}]))
+
+
+def test_estimator_calibrates_against_reported_usage():
+    estimator = TokenEstimator(alpha=1.0)
+    params = request([{"role": "user", "content": "x" * 3000}])
+    estimator.observe(params, NS(input_tokens=1004, cache_read_input_tokens=None))
+    assert estimator.chars_per_token == pytest.approx(3.0)
+    assert estimator.estimate_request(params) == 1004
+
+
+def test_client_budgets_anthropic_requests():
+    client = MultiProviderClient()
+    params, _ = client._build_anthropic_params("hi", model="claude-3-5-haiku-20241022")
+    assert params["max_tokens"] == 8192
@@ -0,0 +1,86 @@
+import builtins
+
+from anthropic_client.cli import handle_interactive
+from anthropic_client.conversation import ConversationLog, ConversationWindow
+from anthropic_client.multi_provider_client import MultiProviderClient
+
+
+def test_log_appends_exchanges_and_loads_them_back(tmp_path):
+    path = tmp_path / "chat.jsonl"
+    with ConversationLog(path) as log:
+        log.append("hi", "hello")
+        log.append("how are you?", "fine")
+    with ConversationLog(path) as log:
+        log.append("bye", "see you")
+
+    window = ConversationLog(path).load_window()
+    assert window.messages == [
+        {"role": "user", "content": "hi"},
+        {"role": "assistant", "content": "hello"},
+        {"role": "user", "content": "how are you?"},
+        {"role": "assistant", "content": "fine"},
+        {"role": "user", "content": "bye"},
+        {"role": "assistant", "content": "see you"},
+    ]
+
+
+def test_load_stops_at_the_budget_and_keeps_whole_exchanges(tmp_path):
+    log = ConversationLog(tmp_path / "chat.jsonl")
+    for i in range(100):
+        log.append(f"q{i:02d}", "a" * 10)
+    log.close()
+
+    # Each exchange is 13 characters, so two fit and parsing stops at the third
+    window = log.load_window(max_chars=30)
+    assert [m["content"] for m in window.messages] == ["q98", "a" * 10, "q99", "a" * 10]
+
+
+def test_torn_last_line_is_skipped_and_terminated(tmp_path):
+    path = tmp_path / "chat.jsonl"
+    log = ConversationLog(path)
+    log.append("first", "one")
+    log.close()
+    with open(path, "a") as f:
+        f.write('{"role": "user", "content": "tor')
+
+    assert len(ConversationLog(path).load_window()) == 2
+    with ConversationLog(path) as log:
+        log.append("second", "two")
+    assert [m["content"] for m in log.load_window().messages] == ["first", "one", "second", "two"]
+
+
+def test_window_evicts_oldest_exchanges():
+    window = ConversationWindow(max_chars=10)
+    window.add_exchange("aaa", "bbb")
+    window.add_exchange("ccc", "ddd")
+    assert window.chars == 12 - 6
+    assert window.messages[0] == {"role": "user", "content": "ccc"}
+
+
+def test_history_is_sent_before_the_prompt():
+    client = MultiProviderClient()
+    history = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}]
+    params, _ = client._build_anthropic_params("again", history=history)
+    assert params["messages"] == history + [{"role": "user", "content": "again"}]
+
+
+class EchoClient:
+    def __init__(self):
+        self.calls = []
+
+    def get_response(self, prompt, **kwargs):
+        self.calls.append(kwargs.get("history", []))
+        return f"echo {prompt}"
+
+
+def test_interactive_session_carries_history_and_logs_turns(tmp_path, monkeypatch):
+    inputs = iter(["second", "", ":quit"])
+    monkeypatch.setattr(builtins, "input", lambda _: next(inputs))
+    client = EchoClient()
+    log = ConversationLog(tmp_path / "chat.jsonl")
+
+    handle_interactive(client, {"stream": False}, ConversationWindow(), log, "first")
+    log.close()
+
+    assert client.calls == [[], [{"role": "user", "content": "first"}, {"role": "assistant", "content": "echo first"}]]
+    assert len(log.load_window()) == 4
@@ -0,0 +1,133 @@
+import logging
+import os
+import stat
+import sys
+import threading
+
+import pytest
+
+from anthropic_client import cli
+from anthropic_client import daemon as daemon_module
+from anthropic_client.daemon import ClaudethinkDaemon, forward
+
+
+def fake_run(argv, cwd):
+    """Echo the arguments and stdin, then exit with the requested code."""
+    prompt = sys.stdin.read()
+    print(f"args={argv[1:]} cwd={cwd} stdin={prompt}")
+    print("warning", file=sys.stderr)
+    sys.exit(int(argv[-1]))
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    path = tmp_path / "d.sock"
+    server = ClaudethinkDaemon(path, fake_run)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield path
+    server.shutdown()
+    server.server_close()
+
+
+def test_forward_streams_output_and_exit_code(daemon, capsys, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    code = forward(["claudethink", "hello", "3"], "piped prompt", path=daemon)
+
+    out, err = capsys.readouterr()
+    assert code == 3
+    assert out == f"args=['hello', '3'] cwd={tmp_path} stdin=piped prompt\n"
+    assert err == "warning\n"
+
+
+def test_forward_returns_none_without_a_daemon(tmp_path):
+    assert forward(["claudethink", "hi"], None, path=tmp_path / "missing.sock") is None
+
+
+def test_second_daemon_on_the_same_socket_is_refused(daemon):
+    with pytest.raises(RuntimeError):
+        ClaudethinkDaemon(daemon, fake_run)
+
+
+def test_stale_socket_is_replaced(tmp_path):
+    path = tmp_path / "stale.sock"
+    path.write_text("")
+    server = ClaudethinkDaemon(path, fake_run)
+    server.server_close()
+    assert not path.exists()
+
+
+def test_socket_is_owner_only_as_soon_as_it_is_bound(tmp_path, monkeypatch):
+    modes = []
+    server_bind = ClaudethinkDaemon.server_bind
+
+    def record_mode(self):
+        server_bind(self)
+        modes.append(stat.S_IMODE(os.stat(self.server_address).st_mode))
+
+    monkeypatch.setattr(ClaudethinkDaemon, "server_bind", record_mode)
+    umask = os.umask(0o022)
+    try:
+        server = ClaudethinkDaemon(tmp_path / "d.sock", fake_run)
+        server.server_close()
+        assert os.umask(0o022) == 0o022
+    finally:
+        os.umask(umask)
+    assert modes and modes[0] & 0o077 == 0
+
+
+class UnreadableStdin:
+    """An open pipe nobody writes to: reading it would block forever."""
+
+    def isatty(self):
+        return False
+
+    def read(self, *args):
+        raise AssertionError("stdin was read")
+
+
+@pytest.mark.parametrize("argv", [["--batch", "requests.jsonl"], ["--breaker-status"], ["--replay-traffic", "t.jsonl"]])
+def test_main_leaves_stdin_alone_for_commands_without_a_prompt(monkeypatch, argv):
+    ran = []
+    monkeypatch.setattr(sys, "stdin", UnreadableStdin())
+    monkeypatch.setattr(cli, "run", ran.append)
+    monkeypatch.setattr(daemon_module, "forward", lambda *args: pytest.fail("forwarded to the daemon"))
+    cli.main(["claudethink", *argv])
+    assert ran == [["claudethink", *argv]]
+
+
+def logging_run(argv, cwd):
+    """Log an error the way a failing invocation does."""
+    logging.getLogger("anthropic_client.cli").error("request failed")
+    sys.exit(1)
+
+
+def test_forwarded_log_output_reaches_the_client(tmp_path, capsys):
+    handler = logging.StreamHandler(sys.stderr)
+    logging.getLogger().addHandler(handler)
+    path = tmp_path / "log.sock"
+    server = ClaudethinkDaemon(path, logging_run)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        # The daemon's own stderr is the captured one; the client must see the log line
+        assert forward(["claudethink", "hi"], None, path=path) == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+        logging.getLogger().removeHandler(handler)
+    assert handler.stream is sys.stderr
+    assert "request failed" in capsys.readouterr().err
+
+
+def test_daemon_refuses_runs_with_another_provider_environment(tmp_path, monkeypatch):
+    path = tmp_path / "env.sock"
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "daemon-key")
+    server = ClaudethinkDaemon(path, fake_run, env=dict(os.environ))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "client-key")
+        assert forward(["claudethink", "hi", "0"], None, path=path) is None
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "daemon-key")
+        assert forward(["claudethink", "hi", "0"], None, path=path) == 0
+    finally:
+        server.shutdown()
+        server.server_close()
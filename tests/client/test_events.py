@@ -0,0 +1,75 @@
+import asyncio
+from types import SimpleNamespace as NS
+
+from anthropic_client.events import (
+    StreamDecoder,
+    Stop,
+    TextDelta,
+    ThinkingDelta,
+    Usage,
+    message_text,
+)
+
+
+def stream_events():
+    """A Messages API stream with a thinking block ahead of the answer."""
+    return [
+        NS(type="message_start", message=NS(usage=NS(input_tokens=12, output_tokens=1))),
+        NS(type="content_block_start", index=0),
+        NS(type="content_block_delta", delta=NS(type="thinking_delta", thinking="hmm")),
+        NS(type="content_block_delta", delta=NS(type="signature_delta", signature="sig")),
+        NS(type="content_block_stop", index=0),
+        NS(type="ping"),
+        NS(type="content_block_delta", delta=NS(type="text_delta", text="Hello")),
+        NS(type="content_block_delta", delta=NS(type="text_delta", text=", world")),
+        NS(type="message_delta", delta=NS(stop_reason="end_turn"), usage=NS(output_tokens=40)),
+        NS(type="message_stop"),
+    ]
+
+
+def test_decode_yields_typed_events_and_accumulates_usage():
+    decoder = StreamDecoder()
+    events = list(decoder.decode(stream_events()))
+
+    assert [type(event) for event in events] == [
+        Usage, ThinkingDelta, TextDelta, TextDelta, Usage, Stop
+    ]
+    assert events[-1].reason == "end_turn"
+    assert decoder.usage.input_tokens == 12
+    assert decoder.usage.output_tokens == 40
+    assert decoder.text_chars == len("Hello, world")
+    assert decoder.thinking_chars == 3
+
+
+def test_text_skips_thinking_but_still_counts_usage():
+    decoder = StreamDecoder()
+    assert "".join(decoder.text(stream_events())) == "Hello, world"
+    assert decoder.stop_reason == "end_turn"
+    assert decoder.usage.output_tokens == 40
+
+
+def test_atext_decodes_async_streams():
+    async def events():
+        for event in stream_events():
+            yield event
+
+    async def collect(decoder):
+        return [text async for text in decoder.atext(events())]
+
+    decoder = StreamDecoder()
+    assert asyncio.run(collect(decoder)) == ["Hello", ", world"]
+    assert decoder.usage.output_tokens == 40
+
+
+def test_untyped_events_are_probed_for_text():
+    decoder = StreamDecoder()
+    assert list(decoder.text([NS(delta=NS(text="hi")), NS(delta=None)])) == ["hi"]
+
+
+def test_message_text_skips_thinking_blocks():
+    message = NS(content=[
+        NS(type="thinking", thinking="hmm"),
+        NS(type="text", text="Hello"),
+        NS(type="text", text=" there"),
+    ])
+    assert message_text(message) == "Hello there"
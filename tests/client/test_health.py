@@ -0,0 +1,185 @@
+import threading
+
+import pytest
+
+from anthropic_client import cli
+from anthropic_client.cli import save_client_state
+from anthropic_client.health import BreakerRegistry, CircuitBreaker, CircuitOpenError
+from anthropic_client.multi_provider_client import MultiProviderClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_breaker_opens_on_error_rate_and_probes_when_half_open():
+    clock = FakeClock()
+    breaker = CircuitBreaker("anthropic/m", min_calls=4, failure_threshold=0.5, open_seconds=30, clock=clock)
+    for _ in range(2):
+        breaker.record_success(0.1)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    clock.now += 30
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert not breaker.allow()  # only one probe at a time
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success(0.2)
+    assert breaker.state == "closed"
+    assert breaker.error_rate == 0.0
+
+
+def test_latency_ewma_lowers_health_score():
+    fast = CircuitBreaker("a/fast", latency_alpha=0.5)
+    slow = CircuitBreaker("a/slow", latency_alpha=0.5)
+    fast.record_success(0.1)
+    slow.record_success(1.0)
+    slow.record_success(3.0)
+    assert slow.latency_ewma == pytest.approx(2.0)
+    assert BreakerRegistry().rank([slow, fast]) == [fast, slow]
+
+
+def test_registry_saves_and_restores_state(tmp_path):
+    path = tmp_path / "breakers.json"
+    registry = BreakerRegistry(path, min_calls=1)
+    registry.get("openai", "o1-kob-o3").record_failure(5.0)
+    registry.save()
+
+    restored = BreakerRegistry(path, min_calls=1)
+    assert "openai/o1-kob-o3" in restored.snapshot()
+    assert restored.get("openai", "o1-kob-o3").state == "open"
+    assert "openai/o1-kob-o3" in restored.format_status()
+
+
+def test_concurrent_saves_do_not_collide(tmp_path):
+    path = tmp_path / "breakers.json"
+    registry = BreakerRegistry(path)
+    registry.get("anthropic", "m").record_success(1.0)
+    errors = []
+
+    def save_many():
+        for _ in range(100):
+            try:
+                registry.save()
+            except OSError as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=save_many) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert [p.name for p in tmp_path.iterdir()] == ["breakers.json"]
+    assert "anthropic/m" in BreakerRegistry(path).snapshot()
+
+
+def test_failed_state_save_does_not_fail_the_run(monkeypatch, caplog):
+    client = MultiProviderClient(fallback_models=["claude-3-5-haiku-20241022"])
+
+    def fail():
+        raise PermissionError("read-only home")
+
+    monkeypatch.setattr(client.breakers, "save", fail)
+    save_client_state(client)
+    assert "read-only home" in caplog.text
+
+
+def test_client_fails_over_to_healthy_fallback(monkeypatch):
+    client = MultiProviderClient(
+        fallback_models=["claude-3-5-haiku-20241022"],
+        breakers=BreakerRegistry(min_calls=1)
+    )
+    calls = []
+
+    def dispatch(prompt, route, **kwargs):
+        calls.append(route[1])
+        if route[1] == "claude-3-7-sonnet-20250219":
+            raise TimeoutError("degraded")
+        return "from fallback"
+
+    monkeypatch.setattr(client, "_dispatch", dispatch)
+    assert client.get_response("hi", model="claude-3-7-sonnet-20250219") == "from fallback"
+    # The primary's breaker is now open, so the next call skips it entirely
+    assert client.get_response("hi", model="claude-3-7-sonnet-20250219") == "from fallback"
+    assert calls == ["claude-3-7-sonnet-20250219", "claude-3-5-haiku-20241022", "claude-3-5-haiku-20241022"]
+
+    streamed = client.get_response("hi", model="claude-3-7-sonnet-20250219", stream=True)
+    assert list(streamed) == ["from fallback"]
+
+
+def test_client_raises_when_every_route_is_open(monkeypatch):
+    client = MultiProviderClient(breakers=BreakerRegistry(min_calls=1))
+
+    def dispatch(prompt, route, **kwargs):
+        raise TimeoutError("degraded")
+
+    monkeypatch.setattr(client, "_dispatch", dispatch)
+    with pytest.raises(TimeoutError):
+        client.get_response("hi")
+    with pytest.raises(CircuitOpenError):
+        client.get_response("hi")
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+@pytest.mark.parametrize("error", [StatusError(400), StatusError(401), ValueError("prompt too long")])
+def test_request_errors_neither_trip_breakers_nor_fail_over(monkeypatch, error):
+    client = MultiProviderClient(
+        fallback_models=["claude-3-5-haiku-20241022"],
+        breakers=BreakerRegistry(min_calls=1)
+    )
+    calls = []
+
+    def dispatch(prompt, route, **kwargs):
+        calls.append(route[1])
+        raise error
+
+    monkeypatch.setattr(client, "_dispatch", dispatch)
+    with pytest.raises(type(error)):
+        client.get_response("hi", model="claude-3-7-sonnet-20250219")
+    with pytest.raises(type(error)):
+        list(client.get_response("hi", model="claude-3-7-sonnet-20250219", stream=True))
+    assert calls == ["claude-3-7-sonnet-20250219"] * 2
+    assert client.breakers.get("anthropic", "claude-3-7-sonnet-20250219").error_rate == 0.0
+
+
+@pytest.mark.parametrize("status", [429, 500, 529])
+def test_overload_and_server_errors_fail_over(monkeypatch, status):
+    client = MultiProviderClient(fallback_models=["claude-3-5-haiku-20241022"])
+
+    def dispatch(prompt, route, **kwargs):
+        if route[1] == "claude-3-7-sonnet-20250219":
+            raise StatusError(status)
+        return "from fallback"
+
+    monkeypatch.setattr(client, "_dispatch", dispatch)
+    assert client.get_response("hi", model="claude-3-7-sonnet-20250219") == "from fallback"
+
+
+def test_cli_uses_breakers_only_with_fallback_models(monkeypatch):
+    monkeypatch.setattr(cli, "_clients", {})
+    plain = cli.create_client(cli.create_parser().parse_args(["hi"]))
+    assert plain.breakers is None
+
+    with_fallback = cli.create_client(cli.create_parser().parse_args(
+        ["--fallback-model", "claude-3-5-haiku-20241022", "hi"]
+    ))
+    assert with_fallback.breakers is not None
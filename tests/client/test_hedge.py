@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+from anthropic_client.hedge import HedgePolicy, hedged_stream
+
+
+def slow_stream(delay, chunks, log=None):
+    """Open a stream whose first chunk arrives after ``delay`` seconds."""
+    def open_stream():
+        def generate():
+            try:
+                time.sleep(delay)
+                for chunk in chunks:
+                    yield chunk
+            finally:
+                if log is not None:
+                    log.append("closed")
+        return generate()
+    return open_stream
+
+
+def failing_stream():
+    raise ConnectionError("primary down")
+
+
+def test_fast_primary_is_not_hedged():
+    policy = HedgePolicy("backup", initial_delay=1.0)
+    secondary_calls = []
+
+    def secondary():
+        secondary_calls.append(1)
+        return iter(["backup"])
+
+    assert list(hedged_stream(slow_stream(0, ["a", "b"]), secondary, policy)) == ["a", "b"]
+    assert secondary_calls == []
+    assert policy.metrics.hedged == 0
+    assert policy.metrics.requests == 1
+
+
+def test_slow_primary_loses_to_secondary_and_is_cancelled():
+    policy = HedgePolicy("backup", initial_delay=0.05)
+    log = []
+    chunks = hedged_stream(slow_stream(0.5, ["slow"], log), slow_stream(0, ["fast", "!"]), policy)
+
+    assert list(chunks) == ["fast", "!"]
+    assert policy.metrics.hedged == 1
+    assert policy.metrics.secondary_wins == 1
+    time.sleep(0.6)
+    assert log == ["closed"]
+
+
+def test_lost_primary_still_widens_the_deadline():
+    policy = HedgePolicy("backup", initial_delay=0.05, min_samples=1)
+    assert list(hedged_stream(slow_stream(0.5, ["slow"]), slow_stream(0.1, ["fast"]), policy)) == ["fast"]
+    # Lost at about deadline + secondary time-to-first-token
+    assert policy.deadline() >= 0.15
+
+
+def test_primary_failure_hedges_immediately():
+    policy = HedgePolicy("backup", initial_delay=5.0)
+    started = time.perf_counter()
+    assert list(hedged_stream(failing_stream, slow_stream(0, ["ok"]), policy)) == ["ok"]
+    assert time.perf_counter() - started < 1.0
+    assert policy.metrics.primary_failures == 1
+
+
+def test_both_failures_raise_the_primary_error():
+    def secondary():
+        raise TimeoutError("backup down")
+
+    with pytest.raises(ConnectionError):
+        list(hedged_stream(failing_stream, secondary, HedgePolicy("backup")))
+
+
+def test_deadline_tracks_primary_quantile():
+    policy = HedgePolicy("backup", quantile=0.9, initial_delay=3.0, min_samples=10)
+    assert policy.deadline() == 3.0
+    for i in range(1, 11):
+        policy.observe(i / 10)
+    assert policy.deadline() == pytest.approx(1.0)
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from anthropic_client.client import JSON_INSTRUCTION, AnthropicClient, AsyncAnthropicClient
+from anthropic_client.json_stream import JsonStreamParser, iter_json
+from anthropic_client.multi_provider_client import MultiProviderClient
+from .stubs import StubHandler, message_body
+
+ROWS = [{"id": i, "note": f"row {i}, with \"quotes\" and [brackets]"} for i in range(3)]
+
+
+def split(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class JsonStreamHandler(StubHandler):
+    """Streams a JSON array as Messages API text deltas, holding back the tail until released."""
+
+    release = threading.Event()
+    bodies = []
+
+    def do_POST(self):
+        type(self).bodies.append(self.read_json())
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        text = json.dumps(ROWS)
+        head, tail = text[:len(text) // 2], text[len(text) // 2:]
+        self.event("message_start", {"type": "message_start", "message": dict(message_body(""), content=[])})
+        self.event("content_block_start", {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}})
+        for piece in split(head, 7):
+            self.delta(piece)
+        type(self).release.wait(5)
+        for piece in split(tail, 7):
+            self.delta(piece)
+        self.event("content_block_stop", {"type": "content_block_stop", "index": 0})
+        self.event("message_delta", {"type": "message_delta", "delta": {"stop_reason": "end_turn"}, "usage": {"output_tokens": 10}})
+        self.event("message_stop", {"type": "message_stop"})
+
+    def delta(self, text):
+        self.event("content_block_delta", {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": text}})
+
+    def event(self, name, data):
+        self.wfile.write(f"event: {name}\ndata: {json.dumps(data)}\n\n".encode())
+        self.wfile.flush()
+
+
+@pytest.mark.parametrize("size", [1, 3, 64])
+def test_parser_yields_elements_and_fields_however_text_is_split(size):
+    document = {"rows": ROWS, "escaped": "a\\\"b}", "empty": {}, "n": -1.5e3, "flag": None}
+    text = "Here it is:\n```json\n" + json.dumps(document, indent=2) + "\n```"
+    assert list(iter_json(split(text, size))) == list(document.items())
+    assert list(iter_json(split(json.dumps(ROWS), size))) == ROWS
+
+
+def test_parser_buffers_only_the_open_element():
+    parser = JsonStreamParser()
+    assert parser.feed('[{"id": 1}, {"id": ') == [{"id": 1}]
+    assert "".join(parser._element) == ' {"id": '
+    assert parser.feed('2}]') == [{"id": 2}]
+    assert parser.done
+
+
+def test_parser_rejects_incomplete_and_malformed_json():
+    with pytest.raises(ValueError):
+        list(iter_json(['[1, 2']))
+    with pytest.raises(ValueError):
+        list(iter_json(['[1, }']))
+    with pytest.raises(ValueError):
+        list(iter_json(['No JSON here']))
+
+
+def test_get_response_yields_rows_before_the_stream_ends(stub_server):
+    JsonStreamHandler.release.clear()
+    client = AnthropicClient(base_url=stub_server(JsonStreamHandler))
+    rows = client.get_response("List rows", format="json", parse_json=True)
+    # The first row arrives while the server still holds back the rest
+    assert next(rows) == ROWS[0]
+    JsonStreamHandler.release.set()
+    assert list(rows) == ROWS[1:]
+
+
+def test_json_format_is_requested_in_the_system_prompt(stub_server):
+    JsonStreamHandler.release.set()
+    JsonStreamHandler.bodies = []
+    client = AnthropicClient(base_url=stub_server(JsonStreamHandler), min_cache_chars=10)
+    assert list(client.get_response("List rows", format="json", parse_json=True, system="Context " * 10)) == ROWS
+    body = JsonStreamHandler.bodies[0]
+    # The Messages API has no response_format field
+    assert "response_format" not in body
+    assert body["system"][-1] == {"type": "text", "text": JSON_INSTRUCTION}
+    # The instruction follows the cached prefix rather than moving its breakpoint
+    assert "cache_control" in body["system"][0]
+
+
+def test_async_get_response_yields_parsed_rows(stub_server):
+    JsonStreamHandler.release.set()
+    client = AsyncAnthropicClient(base_url=stub_server(JsonStreamHandler))
+
+    async def collect():
+        rows = await client.get_response("List rows", format="json", parse_json=True)
+        return [row async for row in rows]
+
+    assert asyncio.run(collect()) == ROWS
+
+
+def test_parse_json_requires_json_format():
+    with pytest.raises(ValueError):
+        AnthropicClient().get_response("List rows", parse_json=True)
+    with pytest.raises(ValueError):
+        MultiProviderClient().get_response("List rows", format="text", parse_json=True)
@@ -0,0 +1,146 @@
+import json
+import threading
+import time
+
+import pytest
+
+from anthropic_client.jsonl_batch import JsonlBatchRunner
+
+
+class EchoClient:
+    """Answers prompts after a per-prompt delay, tracking peak concurrency."""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.prompts = []
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def get_response(self, prompt, **kwargs):
+        with self.lock:
+            self.prompts.append(prompt)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.01 * (len(prompt) % 3))
+        with self.lock:
+            self.in_flight -= 1
+        if prompt in self.fail:
+            raise RuntimeError("upstream error")
+        return f"{kwargs['model']}: {prompt}"
+
+
+def write_requests(path, count):
+    with open(path, "w") as f:
+        for i in range(count):
+            f.write(json.dumps({"id": f"r{i}", "prompt": "p" * (i + 1)}) + "\n")
+        f.write("\n")
+        f.write("not json\n")
+
+
+def read_results(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_runs_every_request_with_bounded_parallelism(tmp_path):
+    in_path, out_path = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    write_requests(in_path, 20)
+    client = EchoClient(fail={"ppp"})
+
+    stats = JsonlBatchRunner(client, concurrency=4, defaults={"model": "m"}).run(in_path, out_path)
+
+    results = {result["id"]: result for result in read_results(out_path)}
+    assert len(results) == 21
+    assert results["r0"]["response"] == "m: p"
+    assert results["r2"]["error"] == "upstream error"
+    assert any("error" in result and result["id"].startswith("offset-") for result in results.values())
+    assert 1 < client.peak <= 4
+    assert stats.completed == 21
+    assert stats.errors == 2
+    assert "req/s" in stats.summary()
+
+
+def test_rerun_skips_finished_requests(tmp_path):
+    in_path, out_path = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    write_requests(in_path, 5)
+    JsonlBatchRunner(EchoClient(), defaults={"model": "m"}).run(in_path, out_path)
+
+    with open(in_path, "a") as f:
+        f.write(json.dumps({"id": "late", "prompt": "new", "model": "other"}) + "\n")
+    client = EchoClient()
+    JsonlBatchRunner(client, defaults={"model": "m"}).run(in_path, out_path)
+
+    assert client.prompts == ["new"]
+    assert read_results(out_path)[-1]["response"] == "other: new"
+
+
+def test_checkpoint_skips_ids_finished_past_the_low_water_mark(tmp_path):
+    in_path, out_path = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    write_requests(in_path, 3)
+    checkpoint = JsonlBatchRunner.checkpoint_path(out_path)
+    checkpoint.write_text(json.dumps({"offset": 0, "finished_ahead": ["r1"]}))
+
+    client = EchoClient()
+    stats = JsonlBatchRunner(client, defaults={"model": "m"}).run(in_path, out_path)
+
+    assert sorted(client.prompts) == ["p", "ppp"]
+    assert stats.skipped == 1
+
+
+def test_rerun_retries_failed_requests_until_they_succeed(tmp_path):
+    in_path, out_path = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    write_requests(in_path, 5)
+    JsonlBatchRunner(EchoClient(fail={"pp", "pppp"}), defaults={"model": "m"}).run(in_path, out_path)
+
+    flaky = EchoClient(fail={"pppp"})
+    stats = JsonlBatchRunner(flaky, defaults={"model": "m"}).run(in_path, out_path)
+    assert sorted(flaky.prompts) == ["pp", "pppp"]
+    assert (stats.completed, stats.errors) == (2, 1)
+
+    recovered = EchoClient()
+    JsonlBatchRunner(recovered, defaults={"model": "m"}).run(in_path, out_path)
+    assert recovered.prompts == ["pppp"]
+
+    idle = EchoClient()
+    assert JsonlBatchRunner(idle, defaults={"model": "m"}).run(in_path, out_path).completed == 0
+    responses = {result["id"]: result["response"] for result in read_results(out_path) if "response" in result}
+    assert sorted(responses) == ["r0", "r1", "r2", "r3", "r4"]
+
+
+class Crash(BaseException):
+    """Kills the run the way an interrupt or OOM would."""
+
+
+class CrashingClient(EchoClient):
+    def __init__(self, crash_on):
+        super().__init__()
+        self.crash_on = crash_on
+
+    def get_response(self, prompt, **kwargs):
+        if prompt == self.crash_on:
+            raise Crash()
+        return super().get_response(prompt, **kwargs)
+
+
+def test_resume_after_a_second_crash_keeps_skipped_ids_finished(tmp_path):
+    in_path, out_path = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    write_requests(in_path, 4)
+    checkpoint = JsonlBatchRunner.checkpoint_path(out_path)
+    checkpoint.write_text(json.dumps({"offset": 0, "finished_ahead": ["r1"]}))
+
+    clients = [CrashingClient("ppp"), CrashingClient("pppp"), EchoClient()]
+    for client in clients[:2]:
+        with pytest.raises(Crash):
+            JsonlBatchRunner(client, concurrency=1, defaults={"model": "m"}).run(in_path, out_path)
+    JsonlBatchRunner(clients[2], concurrency=1, defaults={"model": "m"}).run(in_path, out_path)
+
+    assert all("pp" not in client.prompts for client in clients)
+    ids = [result["id"] for result in read_results(out_path)]
+    assert len(ids) == len(set(ids)) == 4
+    assert "r1" not in ids
+
+
+def test_rejects_invalid_concurrency():
+    with pytest.raises(ValueError):
+        JsonlBatchRunner(EchoClient(), concurrency=0)
@@ -0,0 +1,43 @@
+import json
+import os
+
+from anthropic_client.model_config import ModelConfigRegistry
+
+
+def write_config(path, config, mtime=None):
+    path.write_text(json.dumps(config))
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def test_precedence_and_consolidated_file(tmp_path):
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    write_config(first / "gpt-4.5-preview.json", {"model": "gpt-4.5-preview-2025-02-27", "source": "first"})
+    write_config(second / "gpt-4.5-preview.json", {"model": "other", "source": "second"})
+    write_config(first / "models.json", {"gpt-4.5-preview": {"source": "consolidated"}, "o1": {"source": "consolidated"}})
+
+    registry = ModelConfigRegistry([first, second])
+
+    assert registry.get("gpt-4.5-preview")["source"] == "first"
+    # The "model" field is what gets sent, not another name for the config
+    assert registry.get("gpt-4.5-preview-2025-02-27") is None
+    assert registry.get("o1")["source"] == "consolidated"
+    assert registry.get("missing") is None
+
+
+def test_edits_are_picked_up_on_revalidation(tmp_path):
+    path = tmp_path / "model.json"
+    write_config(path, {"temperature": 0.1}, mtime=1000)
+    registry = ModelConfigRegistry([tmp_path], refresh_interval=3600)
+    assert registry.get("model")["temperature"] == 0.1
+
+    write_config(path, {"temperature": 0.9}, mtime=2000)
+    assert registry.get("model")["temperature"] == 0.1  # still inside the refresh interval
+
+    registry.refresh()
+    assert registry.get("model")["temperature"] == 0.9
+    write_config(tmp_path / "new.json", {"temperature": 0.5})
+    registry.refresh()
+    assert registry.get("new")["temperature"] == 0.5
@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from anthropic_client.multi_provider_client import MultiProviderClient
+from anthropic_client.openai_transport import OpenAIError, OpenAITransport, iter_sse
+from .stubs import StubHandler
+
+
+class OpenAIHandler(StubHandler):
+    """Serves /responses and /chat/completions, streamed when asked."""
+
+    bodies = []
+    failures = 0
+
+    def do_POST(self):
+        body = self.read_json()
+        type(self).bodies.append((self.path, body, self.headers.get("Authorization")))
+        if type(self).failures:
+            type(self).failures -= 1
+            self.send_json({"error": {"message": "overloaded"}}, status=503, headers={"retry-after": "0"})
+            return
+        if self.path.endswith("/responses"):
+            deltas = [{"type": "response.output_text.delta", "delta": d} for d in ("Hel", "lo")]
+            final = {"output": [{"type": "message", "content": [{"type": "output_text", "text": "Hello"}]}]}
+        else:
+            deltas = [{"choices": [{"delta": {"content": d}}]} for d in ("Hel", "lo")]
+            final = {"choices": [{"message": {"content": "Hello"}}]}
+        if not body.get("stream"):
+            self.send_json(final)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for event in deltas:
+            self.wfile.write(f"event: delta\ndata: {json.dumps(event)}\n\n".encode())
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+
+
+@pytest.fixture
+def openai_client(stub_server, monkeypatch):
+    OpenAIHandler.bodies = []
+    OpenAIHandler.failures = 0
+    base_url = stub_server(OpenAIHandler)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    client = MultiProviderClient()
+    client.openai_transport = OpenAITransport("sk-test", base_url=base_url, base_delay=0.0)
+    return client, base_url
+
+
+def test_iter_sse_joins_data_lines_and_skips_done():
+    lines = [": keep-alive", "event: x", 'data: {"a":', "data: 1}", "", "data: [DONE]", ""]
+    assert list(iter_sse(lines)) == [{"a": 1}]
+
+
+def test_chat_completions_complete_and_streamed(openai_client):
+    client, _ = openai_client
+    assert client._get_openai_response("hi", None, model="gpt-4o") == "Hello"
+    assert list(client._get_openai_response("hi", None, model="gpt-4o", stream=True)) == ["Hel", "lo"]
+    path, body, auth = OpenAIHandler.bodies[-1]
+    assert path.endswith("/chat/completions")
+    assert body["model"] == "gpt-4o" and body["stream"] is True
+    assert auth == "Bearer sk-test"
+
+
+def test_responses_endpoint_streams_output_deltas(openai_client):
+    client, base_url = openai_client
+    config = {"model": "gpt-4.5-preview", "endpoint": f"{base_url}/responses", "parameters": {"store": False}}
+    history = [{"role": "user", "content": "a"}, {"role": "assistant", "content": "b"}]
+
+    assert client._get_openai_response("hi", config) == "Hello"
+    assert list(client._get_openai_response("hi", config, stream=True, history=history)) == ["Hel", "lo"]
+    _, body, _ = OpenAIHandler.bodies[-1]
+    assert body["input"][-1] == {"role": "user", "content": "hi"}
+    assert body["store"] is False
+
+
+def test_transient_errors_are_retried(openai_client):
+    client, _ = openai_client
+    OpenAIHandler.failures = 2
+    assert client._get_openai_response("hi", None, model="gpt-4o") == "Hello"
+    assert len(OpenAIHandler.bodies) == 3
+
+    OpenAIHandler.failures = 10
+    with pytest.raises(OpenAIError) as excinfo:
+        list(client._get_openai_response("hi", None, model="gpt-4o", stream=True))
+    assert excinfo.value.status_code == 503
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from anthropic_client.payload_store import PayloadStore, canonical_json
+
+SHARED = {"type": "input_text", "text": "A long shared context block. " * 200}
+
+
+def body(question, model="gpt-4o"):
+    return {
+        "model": model,
+        "input": [
+            {"role": "system", "content": [SHARED]},
+            {"role": "user", "content": [{"type": "input_text", "text": question}]},
+            {"role": "assistant", "content": "A plain string reply"},
+        ],
+        "temperature": 0.5,
+    }
+
+
+def test_conversations_round_trip_and_share_blocks(tmp_path):
+    store = PayloadStore(tmp_path)
+    store.put_conversation("first", body("one?"))
+    blobs = len(store)
+    store.put_conversation("second", body("two?"))
+    # Only the new question and the new manifest are added
+    assert len(store) == blobs + 2
+
+    reopened = PayloadStore(tmp_path)
+    assert reopened.names() == ["first", "second"]
+    for name, question in (("first", "one?"), ("second", "two?")):
+        conversation = reopened.conversation(name)
+        assert conversation.body() == body(question)
+        assert b"".join(conversation.json_chunks()) == canonical_json(body(question))
+        assert json.loads(b"".join(conversation.json_chunks())) == body(question)
+
+
+def test_single_fields_are_read_without_loading_the_conversation(tmp_path):
+    store = PayloadStore(tmp_path)
+    store.put_conversation("first", body("one?"))
+    conversation = PayloadStore(tmp_path).conversation("first")
+    assert len(conversation) == 3
+    assert conversation.text(1) == "one?"
+    assert conversation.message(2) == {"role": "assistant", "content": "A plain string reply"}
+    assert conversation.field("model") == "gpt-4o"
+
+
+def test_blobs_written_after_mapping_are_readable(tmp_path):
+    store = PayloadStore(tmp_path)
+    first = store.put({"a": 1})
+    assert store.get(first) == {"a": 1}
+    second = store.put({"b": 2})
+    assert store.get(second) == {"b": 2}
+    assert store.put({"a": 1}) == first
+
+
+def test_unknown_names_and_digests_raise_key_error(tmp_path):
+    store = PayloadStore(tmp_path)
+    with pytest.raises(KeyError):
+        store.conversation("missing")
+    with pytest.raises(KeyError):
+        store.get("00" * 32)
+
+
+def test_shipped_store_holds_the_example_conversations():
+    store = PayloadStore()
+    assert {"kob-fourfive", "o1-kob-o3"} <= set(store.names())
+    kob = store.conversation("kob-fourfive")
+    assert kob.field("model") == "gpt-4.5-preview-2025-02-27"
+    assert store.conversation("o1-kob-o3").text(0).startswith("Guide the development")
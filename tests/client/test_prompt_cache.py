@@ -0,0 +1,95 @@
+from types import SimpleNamespace as NS
+
+import pytest
+
+from anthropic_client.cli import HAIKU_SYSTEM_PROMPT, build_request_params, create_parser
+from anthropic_client.client import AnthropicClient
+from anthropic_client.prompt_cache import PromptCacheStats, build_system_blocks
+from .stubs import StubHandler, message_body
+
+
+def test_large_system_prompt_gets_a_breakpoint_on_its_stable_prefix():
+    blocks = build_system_blocks(["x" * 5000, "today's notes"], min_cache_chars=4096)
+    assert blocks[0]["cache_control"] == {"type": "ephemeral"}
+    assert blocks[1] == {"type": "text", "text": "today's notes"}
+    assert build_system_blocks("x" * 5000)[0]["cache_control"] == {"type": "ephemeral"}
+
+
+def test_trailing_per_request_block_does_not_count_towards_the_prefix():
+    blocks = build_system_blocks(["stable context", "x" * 5000], min_cache_chars=4096)
+    assert not any("cache_control" in block for block in blocks)
+
+
+def test_small_or_disabled_system_prompts_are_left_unmarked():
+    assert "cache_control" not in build_system_blocks("short")[0]
+    assert "cache_control" not in build_system_blocks("x" * 5000, min_cache_chars=None)[0]
+    assert build_system_blocks(None) is None
+
+
+def test_explicit_breakpoints_are_kept_and_limited():
+    marked = {"type": "text", "text": "stable", "cache_control": {"type": "ephemeral"}}
+    blocks = build_system_blocks([marked, "x" * 5000])
+    assert blocks[0] is not marked and blocks[0] == marked
+    assert "cache_control" not in blocks[1]
+    with pytest.raises(ValueError):
+        build_system_blocks([marked] * 5)
+
+
+def test_stats_report_hit_ratio():
+    stats = PromptCacheStats()
+    stats.record(NS(input_tokens=10, cache_creation_input_tokens=90, cache_read_input_tokens=0))
+    stats.record(NS(input_tokens=10, cache_creation_input_tokens=0, cache_read_input_tokens=90))
+    stats.record(None)
+    assert stats.requests == 2
+    assert stats.hit_ratio == pytest.approx(0.45)
+    assert "hit ratio 45%" in stats.summary()
+
+
+class CachingHandler(StubHandler):
+    """Reports a cache write on the first request and cache reads afterwards."""
+
+    requests = []
+
+    def do_POST(self):
+        request = self.read_json()
+        type(self).requests.append(request)
+        body = message_body("ok")
+        cached = 2000 if len(type(self).requests) > 1 else 0
+        body["usage"].update(
+            cache_creation_input_tokens=2000 - cached,
+            cache_read_input_tokens=cached,
+        )
+        self.send_json(body)
+
+
+def test_client_marks_system_prefix_and_tracks_cache_reads(stub_server):
+    client = AnthropicClient(base_url=stub_server(CachingHandler))
+    context = "reference material " * 500
+
+    client.get_response("first", system=context)
+    client.get_response("second", system=context)
+
+    sent = CachingHandler.requests[0]
+    assert all(message["role"] != "system" for message in sent["messages"])
+    assert sent["system"][-1]["cache_control"] == {"type": "ephemeral"}
+    assert client.prompt_cache_stats.cache_read_input_tokens == 2000
+    assert client.prompt_cache_stats.cache_creation_input_tokens == 2000
+
+
+def test_cli_caches_the_system_file_ahead_of_a_varying_system_prompt(tmp_path):
+    context = tmp_path / "context.txt"
+    context.write_text("reference material " * 500)
+    parser = create_parser()
+    first, second, haiku = (
+        build_system_blocks(build_request_params(parser.parse_args(argv))["system"])
+        for argv in (
+            ["--system-file", str(context), "--system", "Be terse", "hi"],
+            ["--system-file", str(context), "--system", "Be thorough", "hi"],
+            ["--system-file", str(context), "--haiku", "hi"],
+        )
+    )
+    # The breakpoint sits on the file block, so both requests share the cached prefix
+    assert first[0] == second[0] == haiku[0]
+    assert first[0]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in first[1]
+    assert haiku[1]["text"] == HAIKU_SYSTEM_PROMPT
@@ -0,0 +1,73 @@
+import pytest
+
+from anthropic_client.multi_provider_client import MultiProviderClient
+from anthropic_client.rate_limit import RateLimitGovernor, TokenBucket
+
+
+class StatusError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = type("Response", (), {"headers": headers or {}})()
+
+
+def test_call_retries_rate_limited_requests(monkeypatch):
+    monkeypatch.setattr("anthropic_client.rate_limit.time.sleep", lambda seconds: None)
+    governor = RateLimitGovernor(max_retries=3)
+    outcomes = [StatusError(429), StatusError(529), "ok"]
+
+    def send():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert governor.call("claude", send, tokens=10) == "ok"
+
+
+def test_call_gives_up_on_other_errors_and_exhausted_retries(monkeypatch):
+    monkeypatch.setattr("anthropic_client.rate_limit.time.sleep", lambda seconds: None)
+    governor = RateLimitGovernor(max_retries=1)
+    calls = []
+
+    def bad_request():
+        calls.append(1)
+        raise StatusError(400)
+
+    with pytest.raises(StatusError):
+        governor.call("claude", bad_request)
+    assert len(calls) == 1
+
+    def always_limited():
+        calls.append(1)
+        raise StatusError(429)
+
+    with pytest.raises(StatusError):
+        governor.call("claude", always_limited)
+    assert len(calls) == 3
+
+
+def test_headers_reseed_the_model_budgets():
+    governor = RateLimitGovernor(requests_per_minute=50)
+    governor.update_from_headers("claude", {
+        "anthropic-ratelimit-requests-limit": "4000",
+        "anthropic-ratelimit-requests-remaining": "12",
+        "anthropic-ratelimit-input-tokens-limit": "400000",
+    })
+    requests_bucket, tokens_bucket = governor._buckets_for("claude")
+    assert requests_bucket.capacity == 4000
+    assert requests_bucket.tokens == pytest.approx(12, abs=1)
+    assert tokens_bucket.capacity == 400000
+
+
+def test_bucket_waits_for_refill():
+    bucket = TokenBucket(per_minute=6000)  # 100 tokens per second
+    bucket.tokens = 0
+    waited = bucket.acquire(5)
+    assert 0.03 < waited < 0.5
+
+
+def test_governed_client_leaves_retries_to_the_governor():
+    governed = MultiProviderClient(governor=RateLimitGovernor())
+    assert governed.anthropic_client.max_retries == 0
+    assert MultiProviderClient().anthropic_client.max_retries > 0
@@ -0,0 +1,72 @@
+import io
+import sys
+import time
+
+import pytest
+
+from anthropic_client.cli import handle_streaming_response
+from anthropic_client.render import StreamRenderer
+
+
+class FakeTerminal(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.flushes = 0
+
+    def isatty(self):
+        return True
+
+    def flush(self):
+        self.flushes += 1
+
+
+def test_terminal_output_is_coalesced_until_frame_or_newline():
+    terminal = FakeTerminal()
+    renderer = StreamRenderer(terminal, frame_interval=60)
+    for chunk in ["a", "b", "c"]:
+        renderer.write(chunk)
+    assert terminal.getvalue() == ""
+
+    renderer.write("d\n")
+    assert terminal.getvalue() == "abcd\n"
+    renderer.write("e")
+    renderer.finish()
+    assert terminal.getvalue() == "abcd\ne"
+    assert terminal.flushes == 2
+
+
+def test_trailing_chunk_is_shown_when_the_stream_stalls():
+    terminal = FakeTerminal()
+    renderer = StreamRenderer(terminal, frame_interval=0.05)
+    renderer.write("partial")
+    assert terminal.getvalue() == ""
+
+    deadline = time.monotonic() + 2
+    while terminal.getvalue() != "partial" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert terminal.getvalue() == "partial"
+    renderer.finish()
+
+
+def test_pipe_output_is_written_through_and_measured():
+    pipe = io.StringIO()
+    renderer = StreamRenderer(pipe)
+    renderer.write("x" * 400)
+    assert pipe.getvalue() == "x" * 400
+    renderer.finish()
+    assert renderer.time_to_first_token is not None
+    assert "time to first token" in renderer.summary()
+
+
+def test_streaming_response_is_flushed_when_the_stream_fails(monkeypatch):
+    terminal = FakeTerminal()
+    monkeypatch.setattr(sys, "stdout", terminal)
+
+    class FailingClient:
+        def get_response(self, prompt, **kwargs):
+            yield "partial"
+            raise RuntimeError("connection reset")
+
+    with pytest.raises(RuntimeError):
+        handle_streaming_response(FailingClient(), "hi", 1.0, "m", "text", None)
+    assert terminal.getvalue() == "Claude: partial"
@@ -0,0 +1,129 @@
+import json
+import threading
+import time
+
+import pytest
+
+from anthropic_client.cache import ResponseCache
+from anthropic_client.multi_provider_client import MultiProviderClient
+from anthropic_client.router import AUTO_MODEL, ModelRouter, PromptFeatures, load_traffic, replay
+
+HAIKU = "claude-3-5-haiku-20241022"
+SONNET = "claude-3-7-sonnet-20250219"
+OPUS = "claude-3-opus-20240229"
+
+
+def test_features_detect_code_and_reasoning():
+    features = PromptFeatures.extract("Why does this fail?\n```py\ndef f():\n    return 1\n```")
+    assert features.has_code and features.needs_reasoning
+    assert not PromptFeatures.extract("What is the capital of France?").has_code
+
+
+def test_trivial_prompts_go_to_the_cheapest_model():
+    router = ModelRouter()
+    assert router.route("What is the capital of France?").model == HAIKU
+    assert router.route("Prove that there are infinitely many primes").model == SONNET
+    assert router.route("Fix this:\ndef f(:\n    pass").model == SONNET
+    assert router.decisions == {HAIKU: 1, SONNET: 2}
+
+
+def test_latency_slo_prefers_a_fast_enough_model():
+    router = ModelRouter(max_latency=12.0)
+    prompt = "Analyze the trade-offs of this design"
+    assert router.route(prompt).model == SONNET
+
+    for _ in range(30):
+        router.observe(SONNET, 20.0, 800)
+    # No capable model is fast enough now, so the fastest one is used
+    decision = router.route(prompt)
+    assert decision.model == OPUS
+    assert not decision.meets_slo
+
+    for _ in range(30):
+        router.observe(OPUS, 5.0, 800)
+    assert router.route(prompt).meets_slo
+
+
+def test_learned_state_and_traffic_are_saved(tmp_path):
+    state, traffic = tmp_path / "router.json", tmp_path / "traffic.jsonl"
+    router = ModelRouter(state_path=state, traffic_path=traffic)
+    router.observe(HAIKU, 1.0, 100, prompt="hi")
+    router.save()
+
+    restored = ModelRouter(state_path=state)
+    assert restored.profiles[HAIKU].observations == 1
+    assert restored.profiles[HAIKU].latency == pytest.approx(2.6)
+    assert list(load_traffic(traffic))[0]["model"] == HAIKU
+
+
+def test_replay_reports_savings_over_logged_traffic(tmp_path):
+    path = tmp_path / "traffic.jsonl"
+    records = [
+        {"prompt": "What is 2 + 2?", "model": SONNET, "input_tokens": 10, "output_tokens": 10},
+        {"prompt": "Debug this race condition", "model": SONNET, "input_tokens": 10, "output_tokens": 500},
+    ]
+    path.write_text("\n".join(json.dumps(r) for r in records) + "\nnot json\n")
+
+    report = replay(ModelRouter(), load_traffic(path))
+    assert report.requests == 2
+    assert report.routed == {HAIKU: 1, SONNET: 1}
+    assert 0 < report.savings < 1
+    assert report.downgrades == 1
+    assert "2 requests" in report.summary()
+
+
+def test_client_routes_auto_requests(monkeypatch):
+    client = MultiProviderClient(router=ModelRouter())
+    sent = []
+    monkeypatch.setattr(client, "_route_response", lambda prompt, **kwargs: sent.append(kwargs["model"]) or "ok")
+
+    assert client.get_response("hello", model=AUTO_MODEL) == "ok"
+    assert sent == [HAIKU]
+    assert client.router.profiles[HAIKU].observations == 1
+
+    with pytest.raises(ValueError):
+        MultiProviderClient().get_response("hello", model=AUTO_MODEL)
+
+
+def test_routed_cache_hits_are_not_observed(monkeypatch):
+    client = MultiProviderClient(router=ModelRouter(), cache=ResponseCache())
+    monkeypatch.setattr(client, "_batch_anthropic_response", lambda params: "answer")
+
+    assert client.get_response("hello", model=AUTO_MODEL) == "answer"
+    assert client.get_response("hello", model=AUTO_MODEL) == "answer"
+    assert client.router.profiles[HAIKU].observations == 1
+
+
+def test_routed_stream_latency_excludes_the_callers_time(monkeypatch):
+    client = MultiProviderClient(router=ModelRouter())
+    monkeypatch.setattr(client, "_route_response", lambda prompt, **kwargs: iter(["a", "b", "c"]))
+    observed = []
+    monkeypatch.setattr(client.router, "observe", lambda model, latency, *args, **kwargs: observed.append(latency))
+
+    for _ in client.get_response("hello", model=AUTO_MODEL, stream=True):
+        time.sleep(0.05)
+
+    assert len(observed) == 1
+    assert observed[0] < 0.05
+
+
+def test_concurrent_saves_do_not_collide(tmp_path):
+    path = tmp_path / "router.json"
+    router = ModelRouter(state_path=path)
+    errors = []
+
+    def save_many():
+        for _ in range(100):
+            try:
+                router.save()
+            except OSError as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=save_many) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert [p.name for p in tmp_path.iterdir()] == ["router.json"]
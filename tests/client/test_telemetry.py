@@ -0,0 +1,185 @@
+import asyncio
+import json
+
+import pytest
+
+from anthropic_client.cache import ResponseCache
+from anthropic_client.events import Usage
+from anthropic_client.multi_provider_client import MultiProviderClient
+from anthropic_client.openai_transport import OpenAITransport
+from anthropic_client.rate_limit import RateLimitGovernor
+from anthropic_client.telemetry import Histogram, JsonLinesExporter, Telemetry, note_retry, note_usage
+from .stubs import StubHandler
+
+
+class UsageHandler(StubHandler):
+    """Serves chat completions reporting usage, failing the first ``failures`` requests."""
+
+    failures = 0
+
+    def do_POST(self):
+        self.read_json()
+        if type(self).failures:
+            type(self).failures -= 1
+            self.send_json({"error": {"message": "overloaded"}}, status=503, headers={"retry-after": "0"})
+            return
+        self.send_json({
+            "choices": [{"message": {"content": "Hello"}}],
+            "usage": {"prompt_tokens": 12, "completion_tokens": 30, "completion_tokens_details": {"reasoning_tokens": 20}},
+        })
+
+
+def test_histogram_percentiles_stay_within_relative_precision():
+    histogram = Histogram()
+    for value in range(1, 10001):
+        histogram.record(value / 1000)
+    assert histogram.count == 10000
+    assert histogram.percentile(0.5) == pytest.approx(5.0, rel=0.04)
+    assert histogram.percentile(0.99) == pytest.approx(9.9, rel=0.04)
+    assert histogram.percentile(1.0) == 10.0
+    assert histogram.cumulative([1, 5, 100]) == pytest.approx([1000, 5000, 10000], rel=0.04)
+    # Memory grows with the range of magnitudes, not the number of values
+    assert len(histogram.counts) < 250
+
+
+def test_measure_records_complete_and_streamed_responses():
+    telemetry = Telemetry()
+
+    def send():
+        note_usage(Usage(input_tokens=10, output_tokens=40), thinking_chars=80)
+        return "done"
+
+    assert telemetry.measure("anthropic", "m", False, send) == "done"
+
+    def stream():
+        yield "a"
+        note_retry()
+        yield "b"
+        note_usage(Usage(input_tokens=5, output_tokens=2))
+
+    assert list(telemetry.measure("anthropic", "m", True, stream)) == ["a", "b"]
+
+    stats = telemetry.snapshot()["anthropic/m"]
+    assert stats["requests"] == 2
+    assert stats["retries"] == 1
+    assert (stats["input_tokens"], stats["output_tokens"], stats["thinking_tokens"]) == (15, 42, 20)
+    assert stats["ttft_seconds"]["count"] == 2
+    assert stats["latency_seconds"]["count"] == 2
+
+
+def test_ameasure_records_complete_and_streamed_async_responses():
+    telemetry = Telemetry()
+
+    async def send():
+        note_usage(Usage(input_tokens=10, output_tokens=40))
+        return "done"
+
+    async def chunks():
+        yield "a"
+        note_usage(Usage(input_tokens=5, output_tokens=2))
+        yield "b"
+
+    async def open_stream():
+        return chunks()
+
+    async def run():
+        assert await telemetry.ameasure("anthropic", "m", False, send) == "done"
+        stream = await telemetry.ameasure("anthropic", "m", True, open_stream)
+        return [chunk async for chunk in stream]
+
+    assert asyncio.run(run()) == ["a", "b"]
+    stats = telemetry.snapshot()["anthropic/m"]
+    assert stats["requests"] == 2
+    assert (stats["input_tokens"], stats["output_tokens"]) == (15, 42)
+    assert stats["ttft_seconds"]["count"] == 2
+
+
+def test_usage_outside_a_measured_request_is_ignored():
+    telemetry = Telemetry()
+    note_usage(Usage(input_tokens=10))
+    stream = telemetry.measure("anthropic", "m", True, lambda: iter(["a"]))
+    # The span is not current while the caller holds a chunk
+    next(stream)
+    note_usage(Usage(input_tokens=99))
+    list(stream)
+    assert telemetry.snapshot()["anthropic/m"]["input_tokens"] == 0
+
+
+def test_failed_and_abandoned_requests():
+    telemetry = Telemetry()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        telemetry.measure("openai", "m", False, fail)
+    stream = telemetry.measure("openai", "m", True, lambda: iter(["a", "b"]))
+    next(stream)
+    stream.close()
+
+    stats = telemetry.snapshot()["openai/m"]
+    assert (stats["requests"], stats["errors"]) == (2, 1)
+    assert stats["latency_seconds"]["count"] == 1
+
+
+def test_governor_reports_queue_time_and_retries():
+    telemetry = Telemetry()
+    governor = RateLimitGovernor(max_retries=2, base_delay=0.0)
+    failures = [429]
+
+    def send():
+        if failures:
+            error = RuntimeError("rate limited")
+            error.status_code = failures.pop()
+            raise error
+        return "ok"
+
+    telemetry.measure("anthropic", "m", False, lambda: governor.call("m", send))
+    stats = telemetry.snapshot()["anthropic/m"]
+    assert stats["retries"] == 1
+    assert stats["queue_seconds"]["count"] == 1
+
+
+def test_prometheus_exposition():
+    telemetry = Telemetry()
+    telemetry.measure("anthropic", "m", False, lambda: "done")
+    text = telemetry.prometheus()
+    assert '# TYPE claude_client_requests_total counter' in text
+    assert 'claude_client_requests_total{provider="anthropic",model="m"} 1' in text
+    assert '# TYPE claude_client_latency_seconds histogram' in text
+    assert 'claude_client_latency_seconds_bucket{provider="anthropic",model="m",le="+Inf"} 1' in text
+    assert 'claude_client_latency_seconds_count{provider="anthropic",model="m"} 1' in text
+
+
+def test_client_exports_openai_requests_as_json_lines(stub_server, monkeypatch, tmp_path):
+    UsageHandler.failures = 1
+    base_url = stub_server(UsageHandler)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    log_path = tmp_path / "telemetry.jsonl"
+    exporter = JsonLinesExporter(log_path)
+    client = MultiProviderClient(telemetry=Telemetry([exporter]))
+    client.openai_transport = OpenAITransport("sk-test", base_url=base_url, base_delay=0.0)
+
+    assert client.get_response("hi", model="gpt-4o") == "Hello"
+    exporter.close()
+
+    record = json.loads(log_path.read_text())
+    assert record["provider"] == "openai"
+    assert record["model"] == "gpt-4o"
+    assert record["retries"] == 1
+    assert (record["input_tokens"], record["output_tokens"], record["thinking_tokens"]) == (12, 30, 20)
+    assert record["latency"] >= record["ttft"] > 0
+    assert record["error"] is None
+
+
+def test_response_cache_hits_are_not_recorded(monkeypatch):
+    telemetry = Telemetry()
+    client = MultiProviderClient(cache=ResponseCache(), telemetry=telemetry)
+    monkeypatch.setattr(client, "_batch_anthropic_response", lambda params: "answer")
+
+    for _ in range(5):
+        assert client.get_response("hi", model="claude-3-7-sonnet-20250219") == "answer"
+
+    stats = telemetry.snapshot()["anthropic/claude-3-7-sonnet-20250219"]
+    assert stats["requests"] == 1
+    assert stats["latency_seconds"]["count"] == 1
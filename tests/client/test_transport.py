@@ -0,0 +1,21 @@
+from anthropic_client.client import AnthropicClient
+from anthropic_client.multi_provider_client import MultiProviderClient
+from anthropic_client.transport import close_transports, get_http_client
+
+
+def test_clients_share_one_pool_per_provider_and_base_url():
+    close_transports()
+    first = AnthropicClient()
+    second = AnthropicClient()
+    multi = MultiProviderClient()
+
+    assert first.client._client is second.client._client
+    assert multi.anthropic_client._client is first.client._client
+    assert get_http_client("anthropic", "http://127.0.0.1:1") is not first.client._client
+
+
+def test_close_transports_replaces_closed_pools():
+    pool = get_http_client("openai")
+    close_transports()
+    assert pool.is_closed
+    assert get_http_client("openai") is not pool